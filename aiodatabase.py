@@ -0,0 +1,212 @@
+"""Awaitable wrappers around the blocking `database` API.
+
+Every function in `database` blocks the calling thread on SQLite. That is
+fine for the single-player games, but an asyncio server hosting many `Game`
+sessions in one process would stall its event loop on each lookup. This
+module runs the same calls on a dedicated, bounded thread pool instead:
+
+    row = await aiodatabase.get_item_data("Valiant Sword")
+    await aiodatabase.save_game("slot1", scene_manager)
+
+Worker threads each keep their own pooled connection (see
+`database.ConnectionPool`), so the number of workers also bounds the number
+of connections the server holds. Identical content lookups that are already
+in flight are coalesced: if a hundred sessions ask for the same item at
+once, one query runs and every caller receives its row.
+"""
+
+import asyncio
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+import database
+
+# Worker threads in the default facade. Kept below the connection pool's
+# default `max_size` so workers never fall back to overflow connections.
+MAX_WORKERS: int = 4
+
+
+class AsyncDatabase:
+    """Runs `database` calls on a bounded executor from asyncio code.
+
+    Attributes:
+        max_workers (int): The most database calls that run at once.
+    """
+
+    def __init__(self, max_workers: int = MAX_WORKERS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="aiodatabase")
+        # In-flight lookups per event loop, keyed by (function name, args).
+        self._inflight: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Future]]" = \
+            weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "coalesced": 0}
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Runs a blocking call on the executor and awaits its result."""
+        with self._lock:
+            self._stats["calls"] += 1
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _coalesced(self, name: str, *args: Any) -> Any:
+        """Runs a read-only `database` function, sharing identical in-flight calls."""
+        loop = asyncio.get_running_loop()
+        inflight = self._inflight.setdefault(loop, {})
+        key = (name, args)
+        future = inflight.get(key)
+        if future is None:
+            with self._lock:
+                self._stats["calls"] += 1
+            future = loop.run_in_executor(self._executor, getattr(database, name), *args)
+            inflight[key] = future
+            future.add_done_callback(lambda done: inflight.pop(key, None) if inflight.get(key) is done else None)
+        else:
+            with self._lock:
+                self._stats["coalesced"] += 1
+        # Shielded so one caller's cancellation does not cancel the others.
+        return await asyncio.shield(future)
+
+    async def get_character_data(self, name: str) -> Optional[Any]:
+        """Awaitable `database.get_character_data`."""
+        return await self._coalesced("get_character_data", name)
+
+    async def get_item_data(self, name: str) -> Optional[Any]:
+        """Awaitable `database.get_item_data`."""
+        return await self._coalesced("get_item_data", name)
+
+    async def get_weapon_data(self, item_id: int) -> Optional[Any]:
+        """Awaitable `database.get_weapon_data`."""
+        return await self._coalesced("get_weapon_data", item_id)
+
+    async def get_armor_data(self, item_id: int) -> Optional[Any]:
+        """Awaitable `database.get_armor_data`."""
+        return await self._coalesced("get_armor_data", item_id)
+
+    async def load_items_bulk(self, names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Awaitable `database.load_items_bulk`.
+
+        Bulk results are mutable dictionaries, so they are never shared
+        between callers.
+        """
+        return await self._run(database.load_items_bulk, list(names))
+
+    async def load_characters_bulk(self, names: List[str]) -> Dict[str, Any]:
+        """Awaitable `database.load_characters_bulk`."""
+        return await self._run(database.load_characters_bulk, list(names))
+
+    async def load_scene_content(self, item_names: List[str], character_names: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Awaitable `database.load_scene_content`."""
+        return await self._run(database.load_scene_content, list(item_names), list(character_names))
+
+    async def save_game(self, save_name: str, scene_manager: Any) -> int:
+        """Awaitable `database.save_game`.
+
+        The scene is encoded on a worker thread, so the session that owns
+        `scene_manager` must not modify it until the save completes.
+        """
+        return await self._run(database.save_game, save_name, scene_manager)
+
+    async def autosave(self, save_name: str, scene_manager: Any) -> Dict[str, Any]:
+        """Awaitable `database.autosave`, with the same caveat as `save_game`."""
+        return await self._run(database.autosave, save_name, scene_manager)
+
+    async def load_game(self, save_name: str) -> Optional[Any]:
+        """Awaitable `database.load_game`.
+
+        Every call decodes its own copy of the game, so loads are never
+        coalesced.
+        """
+        return await self._run(database.load_game, save_name)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the facade's counters.
+
+        Returns:
+            Dict[str, int]: Counts of `calls` submitted to the executor and
+            lookups that were `coalesced` into an in-flight call.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def close(self, wait: bool = True) -> None:
+        """Shuts down the executor.
+
+        Args:
+            wait (bool): Whether to wait for running calls to finish.
+        """
+        self._executor.shutdown(wait=wait)
+
+
+_default: Optional[AsyncDatabase] = None
+_default_lock = threading.Lock()
+
+
+def get_default() -> AsyncDatabase:
+    """Returns the shared facade used by the module-level functions."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = AsyncDatabase()
+    return _default
+
+
+def close() -> None:
+    """Shuts down the shared facade; it is recreated on next use."""
+    global _default
+    with _default_lock:
+        facade, _default = _default, None
+    if facade is not None:
+        facade.close()
+
+
+async def get_character_data(name: str) -> Optional[Any]:
+    """Awaitable `database.get_character_data` on the shared facade."""
+    return await get_default().get_character_data(name)
+
+
+async def get_item_data(name: str) -> Optional[Any]:
+    """Awaitable `database.get_item_data` on the shared facade."""
+    return await get_default().get_item_data(name)
+
+
+async def get_weapon_data(item_id: int) -> Optional[Any]:
+    """Awaitable `database.get_weapon_data` on the shared facade."""
+    return await get_default().get_weapon_data(item_id)
+
+
+async def get_armor_data(item_id: int) -> Optional[Any]:
+    """Awaitable `database.get_armor_data` on the shared facade."""
+    return await get_default().get_armor_data(item_id)
+
+
+async def load_items_bulk(names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Awaitable `database.load_items_bulk` on the shared facade."""
+    return await get_default().load_items_bulk(names)
+
+
+async def load_characters_bulk(names: List[str]) -> Dict[str, Any]:
+    """Awaitable `database.load_characters_bulk` on the shared facade."""
+    return await get_default().load_characters_bulk(names)
+
+
+async def load_scene_content(item_names: List[str], character_names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Awaitable `database.load_scene_content` on the shared facade."""
+    return await get_default().load_scene_content(item_names, character_names)
+
+
+async def save_game(save_name: str, scene_manager: Any) -> int:
+    """Awaitable `database.save_game` on the shared facade."""
+    return await get_default().save_game(save_name, scene_manager)
+
+
+async def autosave(save_name: str, scene_manager: Any) -> Dict[str, Any]:
+    """Awaitable `database.autosave` on the shared facade."""
+    return await get_default().autosave(save_name, scene_manager)
+
+
+async def load_game(save_name: str) -> Optional[Any]:
+    """Awaitable `database.load_game` on the shared facade."""
+    return await get_default().load_game(save_name)
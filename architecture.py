@@ -20,7 +20,9 @@ events in a decoupled manner.
 from abc import ABC, abstractmethod
 import time
 import math
-import random
+
+import pathfinding
+import rng
 
 class Subject(ABC):
     """The Subject interface declares a set of methods for managing subscribers."""
@@ -357,9 +359,11 @@ class DamageCalculation:
 
 class AICombatBehavior:
     """Manages the combat behavior of AI-controlled characters."""
-    def __init__(self, movement_system): # Add movement_system as a dependency
+    def __init__(self, movement_system, random_stream=None): # Add movement_system as a dependency
         print("AICombatBehavior initialized.")
         self.movement_system = movement_system # Store movement_system
+        # Rolls come from this stream, or the session's "ai_combat" stream (see `rng`).
+        self.random_stream = random_stream
 
     def determine_action(self, ai_character_data, target_character_data, game_state_data):
         """
@@ -403,8 +407,6 @@ class AICombatBehavior:
         # - Consider environmental factors (e.g., cover, hazards) from game_state_data.
         # - Use abilities based on availability, effectiveness against target type, and current situation.
 
-        import random
-
         # Prioritize retreating if low health
         if ai_health < 30 and "retreat" in ai_abilities: # Assuming "retreat" is a possible ability/action
             print(f"AI ({ai_character_id}) has low health. Decides to retreat.")
@@ -445,7 +447,8 @@ class AICombatBehavior:
             # Example caster behavior: use a random ability if available and not on cooldown (simplified)
             usable_abilities = [ab for ab in ai_abilities if ab not in ["melee_attack", "ranged_attack", "retreat", "defend", "move_towards", "move_away"]]
             if usable_abilities:
-                chosen_ability = random.choice(usable_abilities)
+                rolls = self.random_stream if self.random_stream is not None else rng.stream("ai_combat")
+                chosen_ability = rolls.choice(usable_abilities)
                 print(f"Caster AI ({ai_character_id}) decides to use ability: {chosen_ability}.")
                 determined_action = chosen_ability
             else:
@@ -487,18 +490,31 @@ class WeaponAbilityManagement:
 
 
 class WorldLoadingStreaming:
-    """Manages loading and streaming of the game world."""
-    def __init__(self):
+    """Manages loading and streaming of the game world.
+
+    Areas are the chunks of a `streaming.ChunkStreamer`; without a streamer,
+    loading an area is only announced.
+    """
+    def __init__(self, streamer=None):
         print("WorldLoadingStreaming initialized.")
+        self.streamer = streamer
 
     def load_area(self, area_id):
-        """Loads a new area of the game world.
+        """Starts loading an area of the game world in the background.
 
         Args:
-            area_id (str): The ID of the area to load.
+            area_id (str | tuple): The chunk to load, as "column,row" or a
+                (column, row) pair.
+
+        Returns:
+            bool: True if a load was started.
         """
-        # TODO: Load and stream game world data
         print(f"WorldLoadingStreaming loading area: {area_id}.")
+        if self.streamer is None:
+            return False
+        if isinstance(area_id, str):
+            area_id = tuple(int(part) for part in area_id.split(","))
+        return self.streamer.request(area_id)
 
 class CollisionDetection:
     """Manages collision detection."""
@@ -520,23 +536,30 @@ class CollisionDetection:
         return False # Example collision result
 
 class MapNavigationSystem:
-    """Manages map navigation and pathfinding."""
-    def __init__(self):
+    """Manages map navigation and pathfinding.
+
+    Paths are searched on the tiles of a scene, around its solid objects
+    (see `pathfinding`); without a scene there is no map to search.
+    """
+    def __init__(self, scene=None):
         print("MapNavigationSystem initialized.")
+        self.scene = scene
 
     def find_path(self, start_point, end_point):
         """Finds a path from a start point to an end point.
 
         Args:
-            start_point (tuple): The starting position.
-            end_point (tuple): The ending position.
+            start_point (tuple): The starting (x, y) tile.
+            end_point (tuple): The ending (x, y) tile.
 
         Returns:
-            list: A list of waypoints representing the path.
+            list: The (x, y) tiles to step on, one at a time, ending with
+            `end_point`; None if there is no scene or no way through.
         """
-        # TODO: Implement pathfinding algorithms
         print(f"MapNavigationSystem finding path from {start_point} to {end_point}.")
-        return ["waypoint1", "waypoint2"] # Example path
+        if self.scene is None:
+            return None
+        return pathfinding.find_scene_path(self.scene, tuple(start_point), tuple(end_point))
 
 class ExplorationTraversal(Observer): # Inherit from Observer
     """Manages exploration and traversal of the game world."""
@@ -0,0 +1,342 @@
+"""Monte Carlo combat balance simulation for `game` characters.
+
+`Player.attack` rolls evasion, misses and critical hits, and Reverie's
+Chaos Unleashed picks a random effect, so a single fight says little about
+whether a matchup is fair. `simulate` plays a matchup many times and
+aggregates the outcomes:
+
+    report = balance.simulate("aeron_vs_kane", fights=10000)
+    print(report.win_rate, report.percentile(90))
+    print(report.format())
+
+Each fight is an abstract melee: every combatant is in range of every
+enemy, players act first each round using `default_tactic`, and enemies
+run their own `Enemy.update` AI against the first living player. Fight `i`
+of a run starts a new `rng` session with seed `seed + i`, so a run's results
+depend only on its seed, not on how many processes played it.
+Fights are split into chunks and played across a `ProcessPoolExecutor`;
+there is no shared state between chunks, so throughput grows with the
+number of cores.
+
+Usage:
+    python balance.py [matchup] [--fights N] [--workers N] [--seed N]
+"""
+
+import argparse
+import math
+import os
+import types
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import events
+import game
+import rng
+
+# Fight outcomes.
+PLAYERS = "players"
+ENEMIES = "enemies"
+DRAW = "draw"
+
+# Rounds after which a fight is called a draw.
+MAX_ROUNDS: int = 200
+
+# A matchup returns fresh `(players, enemies)` lists for one fight.
+Matchup = Callable[[], Tuple[List[game.Player], List[game.Enemy]]]
+
+# One fight's result: its outcome and the number of rounds it lasted.
+FightResult = Tuple[str, int]
+
+
+def _equip(player, *items):
+    """Equips items on a player without going through the inventory."""
+    for item in items:
+        player.equipment.slots[item.slot] = item
+    player.invalidate_stats()
+    return player
+
+
+def _kane():
+    """Creates Kane as he is set up for the Aethelgard battle."""
+    kane = game.Kane()
+    kane.health = 250
+    kane.attack_damage = 20
+    return kane
+
+
+def _goblins(count):
+    """Creates a pack of goblins."""
+    return [game.Enemy(name=f"Goblin {i + 1}", type="Goblin", health=50, attack_damage=8) for i in range(count)]
+
+
+def aeron_vs_kane():
+    """Aeron, with his sword and plate, against Kane."""
+    aeron = _equip(game.Aeron(), game.Weapon("Valiant Sword", "A blade that shines with honor.", 25),
+                   game.Armor("Aethelgard Plate", "Sturdy plate armor of a royal knight.", 15))
+    return [aeron], [_kane()]
+
+
+def reverie_vs_kane():
+    """Reverie, unarmed, against Kane."""
+    return [game.Reverie()], [_kane()]
+
+
+def anastasia_vs_goblins():
+    """Anastasia, unarmed, against a pack of three goblins."""
+    return [game.Anastasia()], _goblins(3)
+
+
+def party_vs_kane():
+    """Aeron, Reverie and Anastasia against Kane."""
+    players, _ = aeron_vs_kane()
+    return players + [game.Reverie(), game.Anastasia()], [_kane()]
+
+
+MATCHUPS: Dict[str, Matchup] = {
+    "aeron_vs_kane": aeron_vs_kane,
+    "reverie_vs_kane": reverie_vs_kane,
+    "anastasia_vs_goblins": anastasia_vs_goblins,
+    "party_vs_kane": party_vs_kane,
+}
+
+
+def default_tactic(player, allies, enemies):
+    """Takes one player's turn.
+
+    Reverie unleashes chaos whenever her Enigma is full and otherwise casts
+    her strongest affordable spell. Anastasia enters Lucid Dream as soon as
+    she can, collapses it on her next turn, and otherwise puts enemies to
+    sleep when none are asleep. Everyone else, and anyone out of mana,
+    attacks.
+
+    Args:
+        player (Player): The player acting.
+        allies (list): The living players, including `player`.
+        enemies (list): The living enemies; never empty.
+    """
+    target = enemies[0]
+    if isinstance(player, game.Reverie):
+        if player.enigma >= player.max_enigma:
+            player.chaos_unleashed(target)
+            return
+        affordable = [name for name, spell in player.spells.items() if spell["cost"] <= player.mana]
+        if affordable:
+            player.cast_spell(max(affordable, key=lambda name: player.spells[name]["damage"]), target)
+            return
+    elif isinstance(player, game.Anastasia):
+        if player.is_lucid_dream_active:
+            player.oneiric_collapse(enemies, allies)
+            return
+        if player.dream_weave >= player.max_dream_weave:
+            player.activate_lucid_dream()
+            return
+        awake = [enemy for enemy in enemies if 'sleep' not in enemy.status_effects]
+        if len(awake) == len(enemies) and player.mana >= 20:
+            player.lulling_whisper(awake)
+            return
+    player.attack(target)
+
+
+def fight(matchup: Matchup, seed: int, max_rounds: int = MAX_ROUNDS,
+          tactic: Callable = default_tactic) -> FightResult:
+    """Plays one seeded fight.
+
+    Args:
+        matchup (Matchup): Creates the combatants.
+        seed (int): The `rng` session seed.
+        max_rounds (int): The number of rounds after which the fight is a draw.
+        tactic (Callable): Takes each player's turn; see `default_tactic`.
+
+    Returns:
+        FightResult: The outcome and the number of rounds played.
+    """
+    rng.reset(seed)
+    players, enemies = matchup()
+    for enemy in enemies:
+        enemy.x, enemy.state = 1, 'attacking'
+    # Enemies read their target from `scene_manager.scene.player_character`.
+    arena = types.SimpleNamespace(scene=types.SimpleNamespace(player_character=players[0]))
+    for round_number in range(1, max_rounds + 1):
+        for player in players:
+            living_enemies = [enemy for enemy in enemies if enemy.health > 0]
+            if not living_enemies:
+                break
+            if player.health > 0:
+                tactic(player, [ally for ally in players if ally.health > 0], living_enemies)
+                player.update(1)
+        if all(enemy.health <= 0 for enemy in enemies):
+            return PLAYERS, round_number
+        for enemy in enemies:
+            target = next((player for player in players if player.health > 0), None)
+            if target is None:
+                break
+            if enemy.health > 0:
+                arena.scene.player_character = target
+                enemy.update(arena)
+        if all(player.health <= 0 for player in players):
+            return ENEMIES, round_number
+    return DRAW, max_rounds
+
+
+def _fight_chunk(matchup: Union[str, Matchup], seeds: Sequence[int], max_rounds: int) -> List[FightResult]:
+    """Plays a chunk of fights in a worker process."""
+    if isinstance(matchup, str):
+        matchup = MATCHUPS[matchup]
+    return [fight(matchup, seed, max_rounds) for seed in seeds]
+
+
+def _silence_events():
+    """Worker initializer: stops the event bus printing every blow."""
+    events.bus.echo = False
+
+
+class BalanceReport:
+    """Aggregated outcomes of many fights of one matchup.
+
+    Attributes:
+        matchup (str): The matchup's name.
+        fights (int): The number of fights played.
+        outcomes (Counter): The number of fights per outcome.
+        rounds (Counter): The number of fights per length, in rounds.
+        kill_rounds (Counter): Like `rounds`, for the fights the players won.
+    """
+
+    def __init__(self, matchup: str, results: Sequence[FightResult]):
+        self.matchup = matchup
+        self.fights = len(results)
+        self.outcomes = Counter(outcome for outcome, _ in results)
+        self.rounds = Counter(rounds for _, rounds in results)
+        self.kill_rounds = Counter(rounds for outcome, rounds in results if outcome == PLAYERS)
+
+    @property
+    def win_rate(self) -> float:
+        """float: The fraction of fights the players won."""
+        return self.outcomes[PLAYERS] / self.fights if self.fights else 0.0
+
+    def percentile(self, percent: float, wins_only: bool = True) -> Optional[int]:
+        """Returns a nearest-rank percentile of fight length.
+
+        Args:
+            percent (float): The percentile, from 0 to 100.
+            wins_only (bool): Only count the fights the players won, giving
+                the time to kill.
+
+        Returns:
+            Optional[int]: The length in rounds, or None without fights.
+        """
+        counts = self.kill_rounds if wins_only else self.rounds
+        total = sum(counts.values())
+        if not total:
+            return None
+        rank = max(1, math.ceil(percent / 100 * total))
+        seen = 0
+        for rounds in sorted(counts):
+            seen += counts[rounds]
+            if seen >= rank:
+                return rounds
+        return max(counts)
+
+    def histogram(self, bin_width: int = 1, wins_only: bool = True) -> List[Tuple[int, int]]:
+        """Groups fight lengths into bins.
+
+        Args:
+            bin_width (int): The number of rounds per bin.
+            wins_only (bool): Only count the fights the players won.
+
+        Returns:
+            list: `(first_round, fights)` for each bin from the shortest to
+            the longest fight, including empty bins.
+        """
+        counts = self.kill_rounds if wins_only else self.rounds
+        if not counts:
+            return []
+        bins = Counter()
+        for rounds, count in counts.items():
+            bins[rounds // bin_width * bin_width] += count
+        first, last = min(bins), max(bins)
+        return [(start, bins[start]) for start in range(first, last + 1, bin_width)]
+
+    def format(self, width: int = 40, bins: int = 12) -> str:
+        """Renders the report as text with a time-to-kill histogram.
+
+        Args:
+            width (int): The length of the longest histogram bar.
+            bins (int): The approximate number of histogram bins.
+        """
+        lines = [f"{self.matchup}: {self.fights} fights",
+                 f"  players win {self.win_rate:.1%}, enemies win {self.outcomes[ENEMIES] / max(1, self.fights):.1%}, "
+                 f"draws {self.outcomes[DRAW] / max(1, self.fights):.1%}"]
+        if self.kill_rounds:
+            lines.append("  rounds to kill: " + ", ".join(
+                f"p{percent} {self.percentile(percent)}" for percent in (10, 50, 90, 99)))
+            span = max(self.kill_rounds) - min(self.kill_rounds) + 1
+            bin_width = max(1, math.ceil(span / bins))
+            histogram = self.histogram(bin_width)
+            peak = max(count for _, count in histogram)
+            for start, count in histogram:
+                label = f"{start}" if bin_width == 1 else f"{start}-{start + bin_width - 1}"
+                lines.append(f"  {label:>9} | {'#' * round(count / peak * width):<{width}} {count}")
+        return "\n".join(lines)
+
+    def __repr__(self) -> str:
+        return f"BalanceReport({self.matchup!r}, fights={self.fights}, win_rate={self.win_rate:.3f})"
+
+
+def simulate(matchup: Union[str, Matchup], fights: int = 1000, seed: int = 0, workers: Optional[int] = None,
+             max_rounds: int = MAX_ROUNDS, chunk_size: Optional[int] = None) -> BalanceReport:
+    """Plays many seeded fights of a matchup and aggregates the results.
+
+    Args:
+        matchup (str | Matchup): A name from `MATCHUPS`, or a module-level
+            function creating the combatants (it must be picklable).
+        fights (int): The number of fights to play.
+        seed (int): Fight `i` is played with seed `seed + i`.
+        workers (Optional[int]): The number of processes; the CPU count by
+            default. With 1, the fights are played in this process.
+        max_rounds (int): The number of rounds after which a fight is a draw.
+        chunk_size (Optional[int]): The number of fights sent to a process
+            at a time; by default the fights are split into about four
+            chunks per worker.
+
+    Returns:
+        BalanceReport: The aggregated outcomes. They are the same for any
+        `workers` and `chunk_size`.
+    """
+    name = matchup if isinstance(matchup, str) else matchup.__name__
+    seeds = range(seed, seed + fights)
+    if workers == 1:
+        service, echo = rng.service, events.bus.echo
+        events.bus.echo = False
+        try:
+            return BalanceReport(name, _fight_chunk(matchup, seeds, max_rounds))
+        finally:
+            rng.service = service
+            events.bus.echo = echo
+
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(fights / (workers * 4)))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_silence_events) as executor:
+        chunks = [seeds[start:start + chunk_size] for start in range(0, fights, chunk_size)]
+        results = []
+        for chunk in executor.map(_fight_chunk, [matchup] * len(chunks), chunks, [max_rounds] * len(chunks)):
+            results.extend(chunk)
+    return BalanceReport(name, results)
+
+
+def main(argv=None) -> BalanceReport:
+    """Simulates a matchup from the command line and prints the report."""
+    parser = argparse.ArgumentParser(description="Simulate a combat matchup many times.")
+    parser.add_argument("matchup", nargs="?", choices=sorted(MATCHUPS), default="aeron_vs_kane")
+    parser.add_argument("--fights", type=int, default=10000)
+    parser.add_argument("--workers", type=int, help="number of processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    report = simulate(args.matchup, fights=args.fights, seed=args.seed, workers=args.workers)
+    print(report.format())
+    return report
+
+
+if __name__ == "__main__":
+    main()
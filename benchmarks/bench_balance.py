@@ -0,0 +1,42 @@
+"""Measures how `balance.simulate` throughput scales with worker processes.
+
+Plays the same seeded fights with 1, 2, 4, ... workers, up to the CPU
+count, and prints fights per second and the speedup over one worker.
+
+Usage:
+    python benchmarks/bench_balance.py [fights] [matchup]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import balance  # noqa: E402
+
+
+def main(fights=20000, matchup="aeron_vs_kane"):
+    """Runs the comparison and prints a small report."""
+    cpus = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus:
+        counts.append(cpus)
+    print(f"{fights} fights of {matchup}, {cpus} CPUs")
+    print(f"{'workers':<10}{'fights/s':>12}{'speedup':>10}")
+    baseline = None
+    results = {}
+    for workers in counts:
+        start = time.perf_counter()
+        balance.simulate(matchup, fights=fights, workers=workers)
+        rate = fights / (time.perf_counter() - start)
+        baseline = baseline or rate
+        results[workers] = rate
+        print(f"{workers:<10}{rate:>12.0f}{rate / baseline:>10.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20000, *sys.argv[2:3])
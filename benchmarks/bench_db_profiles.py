@@ -0,0 +1,80 @@
+"""Compares SQLite read and write throughput under each connection profile.
+
+For every entry in `database.PRAGMA_PROFILES`, creates a fresh content
+database and measures:
+
+* content reads: single-row `Items` lookups (bypassing `ContentCache`),
+* save writes: one committed `INSERT OR REPLACE` of a snapshot-sized blob
+  into `SaveGames` per operation, as a per-turn save would do,
+* save reads: fetching those blobs back by slot name.
+
+Usage:
+    python benchmarks/bench_db_profiles.py [operations]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import database  # noqa: E402
+
+ITEM_NAMES = ["Valiant Sword", "Aethelgard Plate", "Poison Dart", "Missing Item"]
+SAVE_SLOTS = 16
+SAVE_BLOB = os.urandom(16 * 1024)
+
+
+def _rate(operations, func):
+    """Runs `func` and returns its throughput in operations per second."""
+    start = time.perf_counter()
+    func()
+    return operations / (time.perf_counter() - start)
+
+
+def bench_profile(profile, operations):
+    """Measures the three workloads against a new database for `profile`."""
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = database.get_db_connection(os.path.join(tmp, "bench.db"), profile=profile)
+        database.create_schema(conn.cursor())
+        database.populate_initial_data(conn.cursor())
+        conn.commit()
+
+        def content_reads():
+            for i in range(operations):
+                database.get_item_data(ITEM_NAMES[i % len(ITEM_NAMES)], conn=conn)
+
+        def save_writes():
+            for i in range(operations):
+                conn.execute(
+                    "INSERT OR REPLACE INTO SaveGames (save_name, format_version, saved_at, data) VALUES (?, 1, ?, ?)",
+                    (f"slot{i % SAVE_SLOTS}", time.time(), SAVE_BLOB))
+                conn.commit()
+
+        def save_reads():
+            for i in range(operations):
+                conn.execute("SELECT data FROM SaveGames WHERE save_name = ?",
+                             (f"slot{i % SAVE_SLOTS}",)).fetchone()
+
+        results = (
+            _rate(operations, content_reads),
+            _rate(operations, save_writes),
+            _rate(operations, save_reads),
+        )
+        conn.close()
+    return results
+
+
+def main(operations=2000):
+    """Runs every profile and prints a small report."""
+    results = {profile: bench_profile(profile, operations) for profile in database.PRAGMA_PROFILES}
+    print(f"{operations} operations per workload (ops/s)")
+    print(f"{'profile':<12}{'content reads':>15}{'save writes':>13}{'save reads':>12}")
+    for profile, (reads, writes, save_reads) in results.items():
+        print(f"{profile:<12}{reads:>15.0f}{writes:>13.0f}{save_reads:>12.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
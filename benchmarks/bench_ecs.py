@@ -0,0 +1,69 @@
+"""Compares `ecs.World` storage against plain `game.GameObject` instances.
+
+Measures the memory held per entity and the time to total every entity's
+health and to move every entity one step, for both representations.
+
+Usage:
+    python benchmarks/bench_ecs.py [entity_count]
+"""
+
+import os
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import ecs  # noqa: E402
+import game  # noqa: E402
+
+
+def measure(build):
+    """Returns what `build` returns and the bytes it left allocated."""
+    tracemalloc.start()
+    try:
+        result = build()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def build_world(entity_count):
+    """Creates a world holding `entity_count` goblins."""
+    world = ecs.World()
+    for i in range(entity_count):
+        world.spawn(name=f"Goblin {i}", symbol='g', x=i % 1000, y=i // 1000, health=50, speed=2)
+    return world
+
+
+def main(entity_count=100000, repeat=5):
+    """Runs the comparison and prints a small report."""
+    objects, object_bytes = measure(lambda: [game.GameObject(name=f"Goblin {i}", symbol='g', x=i % 1000,
+                                                             y=i // 1000, health=50, speed=2)
+                                             for i in range(entity_count)])
+    world, world_bytes = measure(lambda: build_world(entity_count))
+    xs = world.raw_column("x")
+
+    def move_world():
+        for eid in world.ids():
+            xs[eid] += 1
+
+    def move_objects():
+        for obj in objects:
+            obj.x += 1
+
+    results = {
+        "sum health": (timeit.timeit(lambda: sum(world.column("health")), number=repeat),
+                       timeit.timeit(lambda: sum(obj.health for obj in objects), number=repeat)),
+        "move all": (timeit.timeit(move_world, number=repeat), timeit.timeit(move_objects, number=repeat)),
+    }
+    print(f"{entity_count} entities")
+    print(f"{'':<12}{'world':>12}{'objects':>12}")
+    print(f"{'bytes/each':<12}{world_bytes / entity_count:>12.0f}{object_bytes / entity_count:>12.0f}")
+    for name, (soa, aos) in results.items():
+        print(f"{name + ' ms':<12}{soa / repeat * 1e3:>12.2f}{aos / repeat * 1e3:>12.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
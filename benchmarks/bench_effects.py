@@ -0,0 +1,72 @@
+"""Compares the status effect timer wheel against walking every effect.
+
+Gives each of many enemies several long-lasting effects plus a short
+poison, then times one turn of `update_status_effects` against the old
+per-turn loop, which decremented every record of every object.
+
+Usage:
+    python benchmarks/bench_effects.py [object_count]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import events  # noqa: E402
+import game  # noqa: E402
+
+
+def walk_all(obj):
+    """The old `update_status_effects`: visit and decrement every record."""
+    effects_to_remove = []
+    for effect, data in list(obj.status_effects.items()):
+        if effect == 'poison':
+            potency = data.get('potency', 1)
+            obj.take_damage(potency)
+            events.bus.emit(events.EFFECT_TICK, target=obj.name, amount=potency, detail=effect)
+        data['duration'] -= 1
+        obj.mark_dirty()
+        if data['duration'] <= 0:
+            effects_to_remove.append(effect)
+    for effect in effects_to_remove:
+        if effect in obj.status_effects:
+            del obj.status_effects[effect]
+            events.bus.emit(events.EFFECT_EXPIRED, target=obj.name, detail=effect)
+
+
+def build(object_count, lasting=8):
+    """Creates enemies with `lasting` long effects each, one in ten poisoned."""
+    enemies = [game.Enemy(name=f"Goblin {i}", health=10 ** 6) for i in range(object_count)]
+    for i, enemy in enumerate(enemies):
+        for effect in ("slow", "confusion", "armor_break", "empowered", "evasion", "psychic_damage",
+                       "vulnerable", "sleep")[:lasting]:
+            enemy.status_effects.add(effect, 1000)
+        if i % 10 == 0:
+            enemy.apply_status_effect("poison", 1000, potency=1)
+    return enemies
+
+
+def main(object_count=5000, turns=20):
+    """Runs the comparison and prints a small report."""
+    echo, events.bus.echo = events.bus.echo, False
+    try:
+        results = {}
+        for name, update in (("timer wheel", game.Enemy.update_status_effects), ("walk all", walk_all)):
+            enemies = build(object_count)
+            start = time.perf_counter()
+            for _ in range(turns):
+                for enemy in enemies:
+                    update(enemy)
+            results[name] = (time.perf_counter() - start) / turns
+    finally:
+        events.bus.echo = echo
+    print(f"{object_count} objects x 9 effects, {turns} turns (milliseconds per turn)")
+    for name, seconds in results.items():
+        print(f"{name:<14}{seconds * 1e3:>10.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,86 @@
+"""Compares the batched enemy AI turn against updating enemies one by one.
+
+Fills a scene with chasing enemies around a sturdy player and times a world
+turn run through `SceneManager.update_objects` (`game`) and
+`SceneManager.update_enemies` (`rpg`) against the original per-object
+`update` loops.
+
+Usage:
+    python benchmarks/bench_enemy_ai.py [enemy_count]
+"""
+
+import contextlib
+import io
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import game  # noqa: E402
+import rpg  # noqa: E402
+
+
+def build_game(enemy_count, size=400):
+    """Creates a `game` scene manager with `enemy_count` enemies."""
+    rng = random.Random(3)
+    scene = game.Scene("Horde", width=size, height=size)
+    manager = game.SceneManager(scene, game.Game(), setup_scene=False)
+    scene.set_player(game.Player(name="Aeron", x=size // 2, y=size // 2))
+    scene.player_character.health = 10 ** 9
+    for i in range(enemy_count):
+        enemy = game.Enemy(name=f"Goblin {i}", x=rng.randrange(size), y=rng.randrange(size))
+        enemy.aggro_range = size * 2
+        scene.add_object(enemy)
+    return manager
+
+
+def build_rpg(enemy_count, size=400):
+    """Creates an `rpg` scene manager with `enemy_count` enemies."""
+    rng = random.Random(3)
+    manager = rpg.TrollCaveScene(rpg.Game())
+    manager.scene = rpg.Scene("Horde", width=size, height=size)
+    manager.scene.set_player(rpg.Player(name="Aeron", x=size // 2, y=size // 2))
+    manager.scene.player_character.health = 10 ** 9
+    for i in range(enemy_count):
+        manager.scene.add_object(rpg.Enemy(f"Troll {i}", x=rng.randrange(size), y=rng.randrange(size)))
+    return manager
+
+
+def game_sequential(manager):
+    """The original `AethelgardBattle.run` world turn."""
+    for obj in manager.scene.game_objects:
+        obj.update(manager)
+
+
+def rpg_sequential(manager):
+    """The original `TrollCaveScene.update` AI turn."""
+    for obj in manager.scene.game_objects:
+        if isinstance(obj, rpg.Enemy):
+            obj.update(manager)
+
+
+def main(enemy_count=5000, turns=20):
+    """Runs the comparison and prints a small report."""
+    cases = {
+        "game": (build_game, game_sequential, game.SceneManager.update_objects),
+        "rpg": (build_rpg, rpg_sequential, rpg.SceneManager.update_enemies),
+    }
+    results = {}
+    print(f"{enemy_count} enemies, {turns} turns (milliseconds per turn)")
+    print(f"{'engine':<8}{'batched':>12}{'sequential':>12}")
+    with contextlib.redirect_stdout(io.StringIO()):  # Silence combat messages.
+        for name, (build, sequential, batched) in cases.items():
+            timings = []
+            for turn in (batched, sequential):
+                manager = build(enemy_count)
+                timings.append(timeit.timeit(lambda: turn(manager), number=turns) / turns * 1e3)
+            results[name] = tuple(timings)
+    for name, (batched, sequential) in results.items():
+        print(f"{name:<8}{batched:>12.2f}{sequential:>12.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
@@ -0,0 +1,56 @@
+"""Compares recording combat events on `events.EventBus` against printing them.
+
+Times one formatted `print` per hit (into a discarded stream, as the games
+used to do) against `emit` on a silent bus, a bus with a `CombatLog`
+subscribed, and an echoing bus.
+
+Usage:
+    python benchmarks/bench_events.py [event_count]
+"""
+
+import contextlib
+import io
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import events  # noqa: E402
+
+
+def main(event_count=100000):
+    """Runs the comparison and prints a small report."""
+    names = [f"Goblin {i % 50}" for i in range(event_count)]
+
+    def printed():
+        for name in names:
+            print(f"Aeron attacks {name} with Sword for 12 damage.")
+
+    def emitted(bus):
+        def run():
+            emit = bus.emit
+            for name in names:
+                emit(events.ATTACK, "Aeron", name, 12, "Sword")
+        return run
+
+    logged = events.EventBus()
+    events.CombatLog().attach(logged)
+    runs = {
+        "print": printed,
+        "emit (silent)": emitted(events.EventBus()),
+        "emit (CombatLog)": emitted(logged),
+        "emit (echo)": emitted(events.EventBus(echo=True)),
+    }
+    results = {}
+    with contextlib.redirect_stdout(io.StringIO()):
+        for name, run in runs.items():
+            results[name] = min(timeit.repeat(run, number=1, repeat=3))
+    print(f"{event_count} events (nanoseconds per event)")
+    for name, seconds in results.items():
+        print(f"{name:<18}{seconds / event_count * 1e9:>10.0f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100000)
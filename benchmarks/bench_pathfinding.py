@@ -0,0 +1,129 @@
+"""Compares Jump Point Search against plain A* on large grids.
+
+Searches corner to corner (or side to side) across `size` x `size` maps of
+three kinds: open ground, walls with a single gap each every 20 columns,
+and 20% of tiles blocked at random. Reports the milliseconds per search
+and the tiles taken off the open set, which must lead to paths of the same
+length. A last line shows what reusing a pathfinder's buffers saves over
+allocating them for every search.
+
+Then times hordes of enemies chasing a player across a walled scene, each
+reading its step from the shared flow field, against searching a path for
+every enemy.
+
+Usage:
+    python benchmarks/bench_pathfinding.py [size]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import game  # noqa: E402
+import pathfinding  # noqa: E402
+
+
+def build_maps(size, seed=2):
+    """Returns the maps by name, with the start and goal of each."""
+    rolls = random.Random(seed)
+    corner, far = (0, 0), (size - 1, size - 1)
+    maps = {"open": (pathfinding.Grid(size, size), corner, far)}
+
+    walls = pathfinding.Grid(size, size)
+    for x in range(10, size, 20):
+        gap = rolls.randrange(size)
+        for y in range(size):
+            if y != gap:
+                walls.set_blocked(x, y)
+    maps["walls"] = (walls, (0, size // 2), (size - 1, size // 2))
+
+    scattered = pathfinding.Grid(size, size)
+    for _ in range(size * size // 5):
+        scattered.set_blocked(rolls.randrange(size), rolls.randrange(size))
+    scattered.set_blocked(*corner, blocked=False)
+    scattered.set_blocked(*far, blocked=False)
+    maps["scattered 20%"] = (scattered, corner, far)
+    return maps
+
+
+def time_search(finder, grid, start, goal, jump):
+    """Returns (seconds, tiles expanded, path length) of one search."""
+    begin = time.perf_counter()
+    path = finder.find_path(grid, start, goal, jump=jump)
+    return time.perf_counter() - begin, finder.expanded, len(path)
+
+
+def main(size=1000):
+    """Runs the comparison and prints a small report."""
+    maps = build_maps(size)
+    finder = pathfinding.Pathfinder()
+    finder.find_path(pathfinding.Grid(size, size), (0, 0), (1, 0))  # Allocate the buffers up front.
+    print(f"{size}x{size} maps (milliseconds per search, tiles expanded)")
+    print(f"{'map':<16}{'JPS':>10}{'A*':>10}{'JPS tiles':>12}{'A* tiles':>12}{'length':>8}")
+    results = {}
+    for name, (grid, start, goal) in maps.items():
+        jps = time_search(finder, grid, start, goal, jump=True)
+        astar = time_search(finder, grid, start, goal, jump=False)
+        assert jps[2] == astar[2], name
+        results[name] = (jps, astar)
+        print(f"{name:<16}{jps[0] * 1e3:>10.1f}{astar[0] * 1e3:>10.1f}{jps[1]:>12}{astar[1]:>12}{jps[2]:>8}")
+
+    grid, start, goal = maps["open"]
+    fresh = time_search(pathfinding.Pathfinder(), grid, start, goal, jump=True)[0]
+    reused = time_search(finder, grid, start, goal, jump=True)[0]
+    print(f"open map, JPS: {fresh * 1e3:.1f} ms with new buffers, {reused * 1e3:.1f} ms reusing them")
+    return results
+
+
+def horde_cost(enemy_counts=(10, 100, 1000), size=200, turns=10, seed=4):
+    """Times the enemies' steps for a turn as the player paces between walls.
+
+    The scene has a wall with one gap every 20 columns. Each turn the player
+    moves a tile, so the flow field starts over, and every enemy then reads
+    its step with `Enemy.step_towards`; for comparison, each enemy also
+    searches its own path with `Terrain.find_path`.
+    """
+    results = {}
+    for count in enemy_counts:
+        rolls = random.Random(seed)
+        scene = game.Scene("Horde", size, size)
+        player = game.Player(name="Aeron", x=size // 2 + 5, y=size // 2)
+        scene.set_player(player)
+        for x in range(10, size, 20):
+            gap = rolls.randrange(size)
+            for y in range(size):
+                if y != gap:
+                    scene.add_object(game.Item("Wall", '#', x, y))
+        enemies = []
+        while len(enemies) < count:
+            x, y = rolls.randrange(size), rolls.randrange(size)
+            if x % 20 != 10:
+                enemies.append(game.Enemy(name="Goblin", x=x, y=y))
+        terrain = pathfinding.terrain(scene, game.Enemy.blocks_path)
+        timings = [0.0, 0.0]
+        for turn in range(turns):
+            player.x += 1 if turn % 2 else -1
+            goal = (player.x, player.y)
+            start = time.perf_counter()
+            for enemy in enemies:
+                enemy.step_towards(player, scene)
+            timings[0] += time.perf_counter() - start
+            start = time.perf_counter()
+            for enemy in enemies:
+                terrain.find_path((enemy.x, enemy.y), goal)
+            timings[1] += time.perf_counter() - start
+        results[count] = (timings[0] / turns, timings[1] / turns)
+    print(f"{size}x{size} walled scene, {turns} turns (milliseconds per turn)")
+    print(f"{'enemies':>8}{'flow field':>12}{'path each':>12}")
+    for count, (shared, separate) in results.items():
+        print(f"{count:>8}{shared * 1e3:>12.1f}{separate * 1e3:>12.1f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
+    print()
+    horde_cost()
@@ -0,0 +1,124 @@
+"""Compares the diff renderer against clearing and reprinting every frame.
+
+Fills a large map with scenery and a few wandering characters, then renders
+a run of turns both ways: the old draw (reset the terminal, sort the
+objects, print every row) and `render.TerminalRenderer`. Reports the bytes
+written per frame, which is what a slow SSH link pays for, and the time
+spent per frame.
+
+Then paints a 40x10 camera viewport over ever larger worlds with the same
+density of scenery, against painting every object, to show that the cost
+of a frame follows the screen size rather than the world size.
+
+Usage:
+    python benchmarks/bench_render.py [width] [height]
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import game  # noqa: E402
+import render  # noqa: E402
+import rng  # noqa: E402
+
+
+def build(width, height, walkers=10):
+    """Creates a scene with a rock on every seventh cell and some characters."""
+    scene = game.Scene("Benchmark", width, height)
+    scene.set_player(game.Player(name="Aeron", x=0, y=0))
+    for i in range(0, width * height, 7):
+        scene.add_object(game.Item("Rock", '*', i % width, i // width))
+    for i in range(walkers):
+        scene.add_object(game.Character(name=f"Walker {i}", x=i, y=i % height))
+    return scene
+
+
+def full_redraw(out, scene, width, height):
+    """The old draw: reset, sort every object, print every row."""
+    out.write("\033c")
+    out.write(f"--- {scene.name} ---\n")
+    grid = [['.' for _ in range(width)] for _ in range(height)]
+    for obj in sorted(scene.game_objects, key=lambda o: 0 if isinstance(o, game.Character) else -1):
+        if 0 <= obj.x < width and 0 <= obj.y < height:
+            grid[obj.y][obj.x] = obj.symbol
+    for row in grid:
+        out.write(" ".join(row) + "\n")
+
+
+def diff_redraw(renderer, scene, width, height):
+    """The new draw through `TerminalRenderer`."""
+    grid = render.paint(width, height, scene.game_objects, scene.get_objects_of_type(game.Character))
+    renderer.render([f"--- {scene.name} ---"], grid, [])
+
+
+def viewport_cost(world_sizes=(100, 500, 1500), frames=50, spacing=50):
+    """Times 40x10 camera frames over square worlds of growing size.
+
+    The world has one rock per `spacing` cells everywhere. Each frame is
+    drawn by the camera's spatial query and, for comparison, by painting
+    every object in the scene through the same viewport offset.
+    """
+    results = {}
+    for size in world_sizes:
+        scene = game.Scene("World", size, size)
+        player = game.Player(name="Aeron", x=size // 2, y=size // 2)
+        scene.set_player(player)
+        for i in range(0, size * size, spacing):
+            scene.add_object(game.Item("Rock", '*', i % size, i // size))
+        camera = render.Camera(40, 10)
+        scene.index  # Built once, like any scene's first query.
+        timings = []
+        for culled in (True, False):
+            start = time.perf_counter()
+            for frame in range(frames):
+                player.x = size // 2 + frame % 20 - 10
+                camera.follow(player, size, size)
+                if culled:
+                    camera.paint(scene, game.Character)
+                else:
+                    render.paint(camera.width, camera.height, scene.game_objects,
+                                 scene.get_objects_of_type(game.Character), origin=(camera.x, camera.y))
+            timings.append((time.perf_counter() - start) / frames)
+        results[size] = (len(scene.game_objects), *timings)
+    print(f"40x10 viewport, {frames} frames (milliseconds per frame)")
+    print(f"{'world':>12}{'objects':>10}{'camera':>10}{'scan all':>10}")
+    for size, (objects, culled, scanned) in results.items():
+        print(f"{f'{size}x{size}':>12}{objects:>10}{culled * 1e3:>10.3f}{scanned * 1e3:>10.3f}")
+    return results
+
+
+def main(width=120, height=40, frames=100):
+    """Runs the comparison and prints a small report."""
+    results = {}
+    for name in ("full redraw", "diff renderer"):
+        rolls = rng.RandomStream(1)
+        scene = build(width, height)
+        walkers = scene.get_objects_of_type(game.Character)
+        out = io.StringIO()
+        renderer = render.TerminalRenderer(out)
+        start = time.perf_counter()
+        for _ in range(frames):
+            for walker in walkers:
+                walker.x = min(width - 1, max(0, walker.x + rolls.randint(-1, 1)))
+                walker.y = min(height - 1, max(0, walker.y + rolls.randint(-1, 1)))
+            if name == "full redraw":
+                full_redraw(out, scene, width, height)
+            else:
+                diff_redraw(renderer, scene, width, height)
+        seconds = time.perf_counter() - start
+        results[name] = (len(out.getvalue()) / frames, seconds / frames)
+    print(f"{width}x{height} map, {len(scene.game_objects)} objects, {frames} frames")
+    print(f"{'':<16}{'bytes/frame':>12}{'ms/frame':>10}")
+    for name, (size, seconds) in results.items():
+        print(f"{name:<16}{size:>12.0f}{seconds * 1e3:>10.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
+    print()
+    viewport_cost()
@@ -0,0 +1,43 @@
+"""Compares `rng.RandomStream` rolls against the global `random` module.
+
+Times single `uniform` and `randint` rolls on a stream and on a
+`random.Random`, and the per-roll cost of drawing a batch with
+`uniforms` and `randints`.
+
+Usage:
+    python benchmarks/bench_rng.py [batch_size]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import rng  # noqa: E402
+
+
+def main(batch_size=1000, repeat=200):
+    """Runs the comparison and prints a small report."""
+    stream = rng.RandomService(1).stream("bench")
+    generator = random.Random(1)
+    rolls = batch_size * repeat
+    results = {
+        "uniform": (timeit.timeit(lambda: stream.uniform(0, 100), number=rolls),
+                    timeit.timeit(lambda: generator.uniform(0, 100), number=rolls)),
+        "randint": (timeit.timeit(lambda: stream.randint(100, 200), number=rolls),
+                    timeit.timeit(lambda: generator.randint(100, 200), number=rolls)),
+        "uniforms (batch)": (timeit.timeit(lambda: stream.uniforms(batch_size, 0, 100), number=repeat), None),
+        "randints (batch)": (timeit.timeit(lambda: stream.randints(batch_size, 100, 200), number=repeat), None),
+    }
+    print(f"{rolls} rolls each, batches of {batch_size} (nanoseconds per roll)")
+    print(f"{'roll':<18}{'stream':>10}{'random':>10}")
+    for name, (streamed, builtin) in results.items():
+        builtin_text = f"{builtin / rolls * 1e9:>10.0f}" if builtin is not None else f"{'-':>10}"
+        print(f"{name:<18}{streamed / rolls * 1e9:>10.0f}{builtin_text}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
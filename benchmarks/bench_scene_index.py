@@ -0,0 +1,74 @@
+"""Compares indexed `Scene` position queries against a linear scan.
+
+Fills a scene with randomly placed enemies and times `get_object_at`,
+`get_objects_in_radius`, a by-name `find_object`, the living-enemy listing
+and a move, each against the equivalent scan over `game_objects`.
+
+Usage:
+    python benchmarks/bench_scene_index.py [object_count]
+"""
+
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import game  # noqa: E402
+
+
+def build_scene(object_count, size=1000):
+    """Creates a `size` x `size` scene holding `object_count` enemies."""
+    rng = random.Random(1)
+    scene = game.Scene("Benchmark Field", width=size, height=size)
+    for i in range(object_count):
+        scene.add_object(game.Enemy(name=f"Goblin {i}", x=rng.randrange(size), y=rng.randrange(size)))
+    return scene
+
+
+def main(object_count=10000, repeat=2000):
+    """Runs the comparison and prints a small report."""
+    scene = build_scene(object_count)
+    objects = scene.game_objects
+    mover = objects[0]
+    scene.get_object_at(0, 0)  # Build the index outside the timed runs.
+
+    def scan_at():
+        return next((obj for obj in objects if obj.x == 500 and obj.y == 500), None)
+
+    def scan_radius():
+        return [obj for obj in objects if (obj.x - 500) ** 2 + (obj.y - 500) ** 2 <= 100]
+
+    def scan_name():
+        return next((obj for obj in objects if isinstance(obj, game.Enemy) and obj.name.lower() == "goblin 5000"
+                     and obj.health > 0), None)
+
+    def scan_alive():
+        return [obj for obj in objects if isinstance(obj, game.Enemy) and obj.health > 0]
+
+    def move():
+        mover.move(1, 1)
+        mover.move(-1, -1)
+
+    results = {
+        "point": (timeit.timeit(lambda: scene.get_object_at(500, 500), number=repeat),
+                  timeit.timeit(scan_at, number=repeat)),
+        "radius 10": (timeit.timeit(lambda: scene.get_objects_in_radius(500, 500, 10), number=repeat),
+                      timeit.timeit(scan_radius, number=repeat)),
+        "name": (timeit.timeit(lambda: scene.find_object("goblin 5000", game.Enemy, alive=True), number=repeat),
+                 timeit.timeit(scan_name, number=repeat)),
+        "alive": (timeit.timeit(lambda: scene.get_objects_of_type(game.Enemy, alive=True), number=repeat),
+                  timeit.timeit(scan_alive, number=repeat)),
+        "move x2": (timeit.timeit(move, number=repeat), None),
+    }
+    print(f"{object_count} objects, {repeat} runs each (microseconds per query)")
+    print(f"{'query':<12}{'indexed':>12}{'scan':>12}")
+    for name, (indexed, scan) in results.items():
+        scan_text = f"{scan / repeat * 1e6:>12.1f}" if scan is not None else f"{'-':>12}"
+        print(f"{name:<12}{indexed / repeat * 1e6:>12.1f}{scan_text}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000)
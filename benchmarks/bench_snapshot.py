@@ -0,0 +1,112 @@
+"""Compares the binary snapshot format against an equivalent JSON encoding.
+
+Builds an `AethelgardBattle` scene padded with extra enemies, then saves and
+restores it with `snapshot` and with a straightforward JSON document of the
+same object graph, reporting encoded size and encode/decode time for each.
+
+Usage:
+    python benchmarks/bench_snapshot.py [enemy_count]
+"""
+
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import database  # noqa: E402
+import game  # noqa: E402
+import snapshot  # noqa: E402
+
+
+def build_scene_manager(enemy_count):
+    """Creates a battle scene with `enemy_count` extra enemies."""
+    scene = game.Scene("Benchmark Battle")
+    manager = game.AethelgardBattle(scene, game.Game(), setup_scene=False)
+    manager.setup()
+    for i in range(enemy_count):
+        enemy = game.Enemy(name=f"Goblin {i}", x=i % 40, y=i % 10, type="Goblin")
+        enemy.apply_status_effect("poison", 3, potency=2)
+        scene.add_object(enemy)
+    return manager
+
+
+def to_json_document(root):
+    """Encodes an object graph as JSON, tagging objects and back-references."""
+    ids = {}
+    traits = {}
+
+    def state_of(obj):
+        cls = type(obj)
+        if cls not in traits:
+            traits[cls] = (snapshot._has_custom_getstate(cls), snapshot._slot_names(cls))
+        return snapshot._capture(obj, *traits[cls])
+
+    def encode(value):
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, (list, tuple)):
+            return [encode(v) for v in value]
+        if isinstance(value, dict):
+            return {k: encode(v) for k, v in value.items()}
+        if id(value) in ids:
+            return {"__ref__": ids[id(value)]}
+        ids[id(value)] = len(ids)
+        document = {"__class__": snapshot.class_key(type(value)), "__id__": ids[id(value)]}
+        for name, attr in state_of(value).items():
+            document[name] = encode(attr)
+        return document
+
+    return json.dumps(encode(root))
+
+
+def from_json_document(text):
+    """Restores an object graph written by `to_json_document`."""
+    objects = {}
+
+    def decode(value):
+        if isinstance(value, list):
+            return [decode(v) for v in value]
+        if not isinstance(value, dict):
+            return value
+        if "__ref__" in value:
+            return objects[value["__ref__"]]
+        if "__class__" not in value:
+            return {k: decode(v) for k, v in value.items()}
+        cls = database._resolve_class(value["__class__"])
+        obj = cls.__new__(cls)
+        objects[value["__id__"]] = obj
+        snapshot.set_state(obj, {k: decode(v) for k, v in value.items() if k not in ("__class__", "__id__")})
+        return obj
+
+    return decode(json.loads(text))
+
+
+def main(enemy_count=2000, repeat=20):
+    """Runs the comparison and prints a small report."""
+    manager = build_scene_manager(enemy_count)
+    binary = snapshot.encode_snapshot(manager, database._is_snapshottable)
+    text = to_json_document(manager)
+
+    results = {
+        "snapshot": (
+            len(binary),
+            timeit.timeit(lambda: snapshot.encode_snapshot(manager, database._is_snapshottable), number=repeat),
+            timeit.timeit(lambda: snapshot.decode_snapshot(binary, database._resolve_class), number=repeat),
+        ),
+        "json": (
+            len(text.encode("utf-8")),
+            timeit.timeit(lambda: to_json_document(manager), number=repeat),
+            timeit.timeit(lambda: from_json_document(text), number=repeat),
+        ),
+    }
+    print(f"{len(manager.scene.game_objects)} game objects, {repeat} runs each")
+    print(f"{'format':<10}{'bytes':>10}{'encode ms':>12}{'decode ms':>12}")
+    for name, (size, encode_time, decode_time) in results.items():
+        print(f"{name:<10}{size:>10}{encode_time / repeat * 1000:>12.2f}{decode_time / repeat * 1000:>12.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
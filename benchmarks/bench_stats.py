@@ -0,0 +1,69 @@
+"""Compares cached derived stats against rebuilding them on every hit.
+
+Equips a player with a weapon and armor, then times a run of attacks on an
+enemy and hits taken, once with the cached `stats` and once with the old
+per-call aggregation, which rebuilt the equipment totals on every swing and
+every hit.
+
+Usage:
+    python benchmarks/bench_stats.py [exchanges]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import events  # noqa: E402
+import game  # noqa: E402
+
+
+def uncached_stats(self):
+    """The old aggregation: equipment totals and effects, every call."""
+    stats = {
+        "damage": self.strength // 2 + self.equipment.get_total_stats()["damage"],
+        "defense": self.defense + self.equipment.get_total_stats()["defense"],
+        "damage_taken": 1,
+        "miss_chance": max(0, 5 - self.dexterity / 4),
+        "crit_chance": 5 + self.dexterity / 2,
+    }
+    if 'armor_break' in self.status_effects:
+        stats["defense"] = 0
+    return stats
+
+
+def build():
+    """Creates an equipped player and a sturdy enemy."""
+    player = game.Player(name="Aeron")
+    player.health = 10 ** 9
+    player.equipment.slots["weapon"] = game.Weapon("Sword", "Sharp", 8)
+    player.equipment.slots["armor"] = game.Armor("Mail", "Heavy", 4)
+    player.invalidate_stats()
+    return player, game.Enemy(name="Goblin", health=10 ** 9)
+
+
+def main(exchanges=50000):
+    """Runs the comparison and prints a small report."""
+    echo, events.bus.echo = events.bus.echo, False
+    results = {}
+    try:
+        for name, stats in (("cached", game.Player.stats), ("rebuilt", property(uncached_stats))):
+            game.Player.stats = stats
+            player, enemy = build()
+            start = time.perf_counter()
+            for _ in range(exchanges):
+                player.attack(enemy)
+                player.take_damage(10)
+            results[name] = (time.perf_counter() - start) / exchanges
+    finally:
+        del game.Player.stats
+        events.bus.echo = echo
+    print(f"{exchanges} attack/hit exchanges (microseconds per exchange)")
+    for name, seconds in results.items():
+        print(f"{name:<10}{seconds * 1e6:>10.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50000)
@@ -0,0 +1,77 @@
+"""Measures chunk streaming while walking across a large world.
+
+Stores a world of `size` x `size` tiles with one rock per 64 tiles in a
+scratch database, then walks the player across it diagonally, one tile per
+turn, leaving the background thread `pause` seconds between turns as a
+player would. Reports how many objects were resident at most (against the
+whole world) and the time each turn spent in `Scene.stream`, on average and
+at worst; loads and writes happen off that path.
+
+Usage:
+    python benchmarks/bench_streaming.py [size]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import database  # noqa: E402
+import game  # noqa: E402
+import streaming  # noqa: E402
+
+
+def store_world(world, size, spacing=8):
+    """Writes every chunk of the world straight to the database."""
+    chunk_size = streaming.CHUNK_SIZE
+    total = 0
+    for cy in range(size // chunk_size):
+        for cx in range(size // chunk_size):
+            rocks = [game.Item("Rock", '*', x, y)
+                     for y in range(cy * chunk_size, (cy + 1) * chunk_size, spacing)
+                     for x in range(cx * chunk_size, (cx + 1) * chunk_size, spacing)]
+            database.save_world_chunk(world, (cx, cy), rocks)
+            total += len(rocks)
+    return total
+
+
+def main(size=1024, radius=2, pause=0.002):
+    """Runs the walk and prints a small report."""
+    saved_file = database.DB_FILE
+    with tempfile.TemporaryDirectory() as scratch:
+        database.DB_FILE = os.path.join(scratch, "bench_streaming.db")
+        try:
+            start = time.perf_counter()
+            total = store_world("bench", size)
+            stored_seconds = time.perf_counter() - start
+            scene = game.Scene("Bench", size, size)
+            player = game.Player(name="Aeron", x=0, y=0)
+            scene.set_player(player)
+            streamer = streaming.ChunkStreamer(scene, "bench", radius=radius, max_chunks=(2 * radius + 3) ** 2)
+            timings = []
+            peak = 0
+            for step in range(size):
+                player.x = player.y = step
+                start = time.perf_counter()
+                scene.stream()
+                timings.append(time.perf_counter() - start)
+                peak = max(peak, len(scene.game_objects))
+                time.sleep(pause)
+            stats = streamer.stats()
+            streamer.close()
+        finally:
+            database.close_pools()
+            database.DB_FILE = saved_file
+    print(f"{size}x{size} world, {total} objects stored in {stored_seconds:.1f}s, radius {radius}")
+    print(f"peak resident objects   {peak:>10}")
+    print(f"stream ms/turn (mean)   {sum(timings) / len(timings) * 1e3:>10.3f}")
+    print(f"stream ms/turn (worst)  {max(timings) * 1e3:>10.3f}")
+    print(f"chunks loaded/evicted   {stats['loaded']:>5}/{stats['evicted']}")
+    print(f"loads cancelled         {stats['cancelled']:>10}")
+    return timings
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1024)
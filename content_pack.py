@@ -0,0 +1,291 @@
+"""A read-only, memory-mapped pack of the game's static content tables.
+
+The content tables (characters, items, weapons, armor, abilities, locations
+and lore) never change while the game runs, so there is no need to open
+SQLite, run the schema DDL and query them on every startup. This module
+compiles them once into a packed file that the game `mmap`s and reads
+directly. Because the mapping is read-only and backed by the page cache,
+several game or worker processes opening the same pack share its pages.
+
+The pack is a build artifact: rebuild it whenever the content database
+changes, either with `build_content_pack` or from the command line::
+
+    python content_pack.py [db_file] [pack_file]
+
+Format:
+    A pack is a fixed header followed by row records, key indexes and a
+    directory::
+
+        magic (4 bytes, b"MHCP") | format version (uint16) |
+        directory offset (uint64) | directory length (uint64)
+
+    Every row is stored as a `marshal` (version 4) tuple of column values.
+    Each table has a marshalled list of the ``(offset, length)`` of its rows,
+    and each indexed column a marshalled ``{key: (offset, length)}`` index.
+    The directory is a marshalled ``{table: (columns, rows_location,
+    {column: index_location})}`` mapping, where locations are
+    ``(offset, length)`` pairs.
+
+    Indexes are only decoded the first time a table is looked up by that
+    column, and rows are only decoded when they are returned.
+
+Note:
+    Like `snapshot`, the reader trusts its input; packs are meant to be
+    built from the game's own database.
+"""
+
+import marshal
+import mmap
+import os
+import sqlite3
+import struct
+import sys
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+# The default filename for the packed content.
+PACK_FILE: str = "game_content.pack"
+# Identifies a content pack.
+MAGIC = b"MHCP"
+# Bumped whenever the file layout changes incompatibly.
+FORMAT_VERSION = 1
+# The marshal version is pinned so packs don't change with the interpreter.
+MARSHAL_VERSION = 4
+
+# The tables compiled into a pack, each with the columns it is indexed by.
+PACKED_TABLES: Dict[str, Tuple[str, ...]] = {
+    "Characters": ("name", "character_id"),
+    "Items": ("name", "item_id"),
+    "Weapons": ("weapon_id",),
+    "Armor": ("armor_id",),
+    "Abilities": ("name", "ability_id"),
+    "Locations": ("name", "location_id"),
+    "Lore": ("title", "lore_id"),
+}
+
+_HEADER = struct.Struct(">4sHQQ")
+
+
+class PackedRow:
+    """A row read from a content pack.
+
+    Behaves like the `sqlite3.Row` objects returned by the `database`
+    accessors: values can be read by column name or position, `keys()`
+    lists the column names and `dict(row)` converts it to a dictionary.
+    """
+
+    __slots__ = ("_positions", "_values")
+
+    def __init__(self, positions: Dict[str, int], values: Tuple[Any, ...]):
+        self._positions = positions
+        self._values = values
+
+    def __getitem__(self, key: Any) -> Any:
+        if isinstance(key, str):
+            try:
+                key = self._positions[key]
+            except KeyError:
+                raise IndexError("No item with that key") from None
+        return self._values[key]
+
+    def keys(self) -> list:
+        """Returns the row's column names, in table order."""
+        return list(self._positions)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, PackedRow):
+            return self._positions.keys() == other._positions.keys() and self._values == other._values
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._values)
+
+    def __repr__(self) -> str:
+        return f"PackedRow({dict(zip(self._positions, self._values))!r})"
+
+
+def _write_record(out: Any, value: Any) -> Tuple[int, int]:
+    """Appends a marshalled value to `out` and returns its (offset, length)."""
+    data = marshal.dumps(value, MARSHAL_VERSION)
+    location = (out.tell(), len(data))
+    out.write(data)
+    return location
+
+
+def build_content_pack(db_file: str, pack_file: str = PACK_FILE) -> int:
+    """Compiles the content tables of a database into a pack file.
+
+    The pack is written to a temporary file and moved into place, so a game
+    that has the old pack mapped keeps reading a consistent file.
+
+    Args:
+        db_file (str): The SQLite content database to compile.
+        pack_file (str): The path of the pack to write.
+
+    Returns:
+        int: The total number of rows packed.
+
+    Raises:
+        sqlite3.Error: If the database is missing one of `PACKED_TABLES`.
+    """
+    conn = sqlite3.connect(f"file:{db_file}?mode=ro", uri=True)
+    tmp_file = f"{pack_file}.tmp"
+    row_total = 0
+    try:
+        with open(tmp_file, "wb") as out:
+            out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, 0))
+            directory = {}
+            for table, key_columns in PACKED_TABLES.items():
+                cursor = conn.execute(f"SELECT * FROM {table} ORDER BY rowid")
+                columns = tuple(description[0] for description in cursor.description)
+                positions = [columns.index(column) for column in key_columns]
+                indexes: Dict[str, Dict[Any, Tuple[int, int]]] = {column: {} for column in key_columns}
+                locations = []
+                for row in cursor:
+                    record = marshal.dumps(tuple(row), MARSHAL_VERSION)
+                    location = (out.tell(), len(record))
+                    out.write(record)
+                    locations.append(location)
+                    for column, position in zip(key_columns, positions):
+                        # Mirrors `SELECT ... WHERE col = ?` returning the first row.
+                        indexes[column].setdefault(row[position], location)
+                rows_location = _write_record(out, locations)
+                index_locations = {column: _write_record(out, index) for column, index in indexes.items()}
+                directory[table] = (columns, rows_location, index_locations)
+                row_total += len(locations)
+            directory_location = _write_record(out, directory)
+            out.seek(0)
+            out.write(_HEADER.pack(MAGIC, FORMAT_VERSION, *directory_location))
+        os.replace(tmp_file, pack_file)
+    finally:
+        conn.close()
+        if os.path.exists(tmp_file):
+            os.remove(tmp_file)
+    return row_total
+
+
+class ContentPack:
+    """A read-only view of a content pack, backed by `mmap`.
+
+    Attributes:
+        path (str): The pack file that is mapped.
+        tables (Tuple[str, ...]): The names of the packed tables.
+    """
+
+    def __init__(self, path: str = PACK_FILE):
+        """Maps a pack file and reads its directory.
+
+        Args:
+            path (str): The pack file to open.
+
+        Raises:
+            OSError: If the file cannot be opened.
+            ValueError: If the file is not a pack or was written by a newer
+                format version.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if len(self._map) < _HEADER.size:
+                raise ValueError(f"{path} is not a content pack")
+            magic, version, *directory_location = _HEADER.unpack_from(self._map)
+            if magic != MAGIC:
+                raise ValueError(f"{path} is not a content pack")
+            if version > FORMAT_VERSION:
+                raise ValueError(f"Content pack format {version} is newer than supported ({FORMAT_VERSION})")
+            directory = self._load(directory_location)
+        except Exception:
+            self._map.close()
+            raise
+        self._tables = {
+            table: ({column: i for i, column in enumerate(columns)}, rows_location, index_locations)
+            for table, (columns, rows_location, index_locations) in directory.items()
+        }
+        self._indexes: Dict[Tuple[str, str], Dict[Any, Tuple[int, int]]] = {}
+        self.tables = tuple(self._tables)
+
+    def _load(self, location: Tuple[int, int]) -> Any:
+        """Decodes the marshalled value stored at an (offset, length) location."""
+        offset, length = location
+        return marshal.loads(self._map[offset:offset + length])
+
+    def _index(self, table: str, column: str) -> Dict[Any, Tuple[int, int]]:
+        """Returns the decoded key index of a table column."""
+        index = self._indexes.get((table, column))
+        if index is None:
+            try:
+                location = self._tables[table][2][column]
+            except KeyError:
+                raise ValueError(f"{table}.{column} is not indexed in the content pack") from None
+            index = self._indexes[(table, column)] = self._load(location)
+        return index
+
+    def get(self, table: str, column: str, value: Any) -> Optional[PackedRow]:
+        """Looks up the row of `table` whose `column` equals `value`.
+
+        Args:
+            table (str): A packed table name.
+            column (str): One of the table's indexed columns.
+            value (Any): The key to look up.
+
+        Returns:
+            Optional[PackedRow]: The matching row, or `None`.
+
+        Raises:
+            ValueError: If the table or column is not indexed in the pack.
+        """
+        location = self._index(table, column).get(value)
+        if location is None:
+            return None
+        return PackedRow(self._tables[table][0], self._load(location))
+
+    def rows(self, table: str) -> Iterator[PackedRow]:
+        """Yields every row of a packed table in its original order.
+
+        Args:
+            table (str): A packed table name.
+
+        Raises:
+            KeyError: If the table is not in the pack.
+        """
+        positions, rows_location, _ = self._tables[table]
+        for location in self._load(rows_location):
+            yield PackedRow(positions, self._load(location))
+
+    def close(self) -> None:
+        """Unmaps the pack. Rows already returned remain usable."""
+        self._map.close()
+
+    def __enter__(self) -> "ContentPack":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+def open_content_pack(path: str = PACK_FILE) -> Optional[ContentPack]:
+    """Opens a pack if a usable one exists at `path`.
+
+    Args:
+        path (str): The pack file to open.
+
+    Returns:
+        Optional[ContentPack]: The mapped pack, or `None` if the file is
+        missing, not a pack, or from a newer format version.
+    """
+    try:
+        return ContentPack(path)
+    except (OSError, ValueError):
+        return None
+
+
+if __name__ == '__main__':
+    db_path = sys.argv[1] if len(sys.argv) > 1 else "game_content.db"
+    pack_path = sys.argv[2] if len(sys.argv) > 2 else PACK_FILE
+    print(f"Packed {build_content_pack(db_path, pack_path)} content rows into {pack_path}.")
@@ -4,27 +4,99 @@ This module is responsible for all database operations, including creating the
 database schema, populating it with initial game content, and providing an
 API for querying and modifying game data. It is designed to be the central
 repository for all persistent game information, such as character stats,
-item properties, and quest details.
-
-The module also includes placeholder functions for saving and loading game
-states, which are intended to be implemented or mocked for testing purposes.
-To avoid circular dependencies with the main game logic, it uses a dynamic
-class loader (`set_class_loader`) to instantiate game object classes from
+item properties, and quest details. Lookups share long-lived, per-thread
+connections through a `ConnectionPool` rather than reconnecting on every
+call, and content rows are served from an in-process LRU `ContentCache`.
+Connections can be opened with a named PRAGMA profile (`PRAGMA_PROFILES`),
+such as `"throughput"` for WAL journaling and larger caches. At startup,
+`open_content` can serve content from a prebuilt, memory-mapped
+`content_pack` instead, skipping SQLite and the schema DDL entirely.
+`audit_query_plans` (or ``python database.py audit``) checks that none of
+the module's queries falls back to a full table scan.
+
+The module also saves and loads complete game states as compact binary
+snapshots (see the `snapshot` module) in the `SaveGames` table, and can
+autosave incrementally, writing only changed objects as a delta chain in
+`SaveGameDeltas`. Worlds too large to keep resident are stored as chunks
+of objects in `WorldChunks` (see the `streaming` module). To avoid
+circular dependencies with the main game logic, it uses a dynamic class
+loader (`set_class_loader`) to instantiate game object classes from
 database records.
 """
 
+import marshal
+import os
 import sqlite3
+import sys
 import json
-from typing import Callable, Optional, Any, Dict, List
+import threading
+import weakref
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Optional, Any, Dict, Iterator, List, Tuple
+
+import content_pack
+import snapshot
 
 # The default filename for the SQLite database.
 DB_FILE: str = "game_content.db"
 
 # A global callable used to dynamically load game object classes.
-_class_loader: Optional[Callable[[str, Dict[str, Any]], Any]] = None
+_class_loader: Optional[Callable[[str], Optional[type]]] = None
+# Class loaders registered per module, used to resolve snapshot class keys.
+_class_loaders: Dict[str, Callable[[str], Optional[type]]] = {}
+
+# Content tables whose single-row lookups are served from `ContentCache`.
+_CACHED_TABLES = ("Characters", "Items", "Weapons", "Armor")
+
+# The read-only content pack that serves content lookups, if one is in use.
+_content_pack: Optional[content_pack.ContentPack] = None
+
+# Named connection profiles. Each sets the size of the per-connection
+# prepared statement cache and the PRAGMAs run when a connection is opened.
+# "default" keeps SQLite's stock settings (rollback journal,
+# synchronous=FULL); "throughput" trades a little durability on power loss
+# for much cheaper commits and reads.
+PRAGMA_PROFILES: Dict[str, Dict[str, Any]] = {
+    "default": {
+        "cached_statements": 128,
+        "pragmas": (),
+    },
+    "throughput": {
+        "cached_statements": 512,
+        "pragmas": (
+            ("journal_mode", "WAL"),
+            # With WAL, NORMAL only syncs at checkpoints; commits stay atomic.
+            ("synchronous", "NORMAL"),
+            # Negative sizes are in KiB: a 32 MiB page cache.
+            ("cache_size", -32768),
+            ("mmap_size", 256 * 1024 * 1024),
+            ("temp_store", "MEMORY"),
+        ),
+    },
+}
+
+# The profile used by pooled connections. WAL leaves `-wal`/`-shm` files next
+# to the database while connections are open, so callers that delete the
+# database file must close the pools first (see `close_pools`).
+DB_PROFILE: str = "default"
+
+
+def _connect(db_file: str, profile: str, **kwargs: Any) -> sqlite3.Connection:
+    """Opens a connection configured with a named `PRAGMA_PROFILES` entry."""
+    try:
+        settings = PRAGMA_PROFILES[profile]
+    except KeyError:
+        raise ValueError(f"Unknown database profile: {profile!r}") from None
+    conn = sqlite3.connect(db_file, cached_statements=settings["cached_statements"], **kwargs)
+    conn.row_factory = sqlite3.Row
+    for name, value in settings["pragmas"]:
+        conn.execute(f"PRAGMA {name} = {value}")
+    return conn
 
 
-def get_db_connection(db_file: str = DB_FILE) -> sqlite3.Connection:
+def get_db_connection(db_file: str = DB_FILE, profile: str = "default") -> sqlite3.Connection:
     """Establishes and configures a connection to the SQLite database.
 
     This function connects to the specified SQLite database file and sets the
@@ -34,13 +106,367 @@ def get_db_connection(db_file: str = DB_FILE) -> sqlite3.Connection:
     Args:
         db_file (str): The file path for the SQLite database. Defaults to the
             global `DB_FILE` constant.
+        profile (str): The name of a `PRAGMA_PROFILES` entry, e.g.
+            `"throughput"` for WAL journaling and tuned caches.
 
     Returns:
         sqlite3.Connection: A database connection object ready for use.
+
+    Raises:
+        ValueError: If `profile` is not a known profile name.
     """
-    conn = sqlite3.connect(db_file)
-    conn.row_factory = sqlite3.Row
-    return conn
+    return _connect(db_file, profile)
+
+
+class ConnectionPool:
+    """A bounded, thread-safe pool of per-thread SQLite connections.
+
+    Opening a SQLite connection is far more expensive than running one of the
+    module's single-row lookups, so the pool keeps one connection per thread
+    alive between calls. Each checkout runs a cheap health check; connections
+    that fail it (for example because the database file was deleted and
+    recreated underneath them) are discarded and replaced.
+
+    When `max_size` threads already hold pooled connections, further threads
+    receive a temporary overflow connection that is closed when released.
+
+    Attributes:
+        db_file (str): The database file that pooled connections point at.
+        max_size (int): The maximum number of connections kept alive.
+        profile (str): The `PRAGMA_PROFILES` entry new connections use.
+    """
+
+    def __init__(self, db_file: str = DB_FILE, max_size: int = 8, profile: Optional[str] = None):
+        self.db_file = db_file
+        self.max_size = max_size
+        self.profile = DB_PROFILE if profile is None else profile
+        if self.profile not in PRAGMA_PROFILES:
+            raise ValueError(f"Unknown database profile: {self.profile!r}")
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # Maps thread ident -> (thread, connection, file identity).
+        self._connections: Dict[int, Tuple[threading.Thread, sqlite3.Connection, Optional[Tuple[int, int]]]] = {}
+        self._stats = {"hits": 0, "misses": 0, "overflows": 0, "discarded": 0}
+
+    def _file_identity(self) -> Optional[Tuple[int, int]]:
+        """Returns the (device, inode) pair of the database file, if any."""
+        try:
+            st = os.stat(self.db_file)
+        except OSError:
+            return None
+        return (st.st_dev, st.st_ino)
+
+    def _open(self) -> sqlite3.Connection:
+        """Opens a connection that may be closed from a reaping thread."""
+        return _connect(self.db_file, self.profile, check_same_thread=False)
+
+    def _is_healthy(self, conn: sqlite3.Connection, identity: Optional[Tuple[int, int]]) -> bool:
+        """Checks that a pooled connection is usable and still on the same file."""
+        if self._file_identity() != identity:
+            return False
+        try:
+            conn.execute("SELECT 1")
+        except sqlite3.Error:
+            return False
+        return True
+
+    def _reap_dead_threads(self) -> None:
+        """Closes connections owned by threads that have exited. Caller holds the lock."""
+        for ident, (thread, conn, _) in list(self._connections.items()):
+            if not thread.is_alive():
+                del self._connections[ident]
+                conn.close()
+
+    def _acquire(self) -> Tuple[sqlite3.Connection, bool]:
+        """Returns this thread's connection and whether it is an overflow one."""
+        ident = threading.get_ident()
+        with self._lock:
+            entry = self._connections.get(ident)
+        if entry is not None:
+            _, conn, identity = entry
+            if self._is_healthy(conn, identity):
+                with self._lock:
+                    self._stats["hits"] += 1
+                return conn, False
+            with self._lock:
+                self._connections.pop(ident, None)
+                self._stats["discarded"] += 1
+            conn.close()
+
+        conn = self._open()
+        with self._lock:
+            self._stats["misses"] += 1
+            if len(self._connections) >= self.max_size:
+                self._reap_dead_threads()
+            if len(self._connections) >= self.max_size:
+                self._stats["overflows"] += 1
+                return conn, True
+            self._connections[ident] = (threading.current_thread(), conn, self._file_identity())
+        return conn, False
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Checks out the calling thread's connection for the `with` block.
+
+        The transaction is committed when the block exits normally and rolled
+        back if it raises. Re-entrant use from the same thread yields the same
+        connection and leaves transaction control to the outermost block.
+
+        Yields:
+            sqlite3.Connection: A connection with `row_factory` set to
+            `sqlite3.Row`.
+        """
+        depth = getattr(self._local, "depth", 0)
+        if depth:
+            self._local.depth = depth + 1
+            try:
+                yield self._local.conn
+            finally:
+                self._local.depth = depth
+            return
+
+        conn, overflow = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            self._local.depth = 0
+            self._local.conn = None
+            if overflow:
+                conn.close()
+
+    def stats(self) -> Dict[str, int]:
+        """Returns a snapshot of the pool's counters.
+
+        Returns:
+            Dict[str, int]: Counts of `hits` (reused connections), `misses`
+            (newly opened connections), `overflows` (temporary connections
+            handed out while the pool was full), `discarded` (connections
+            that failed a health check) and `size` (connections held).
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._connections)
+        return snapshot
+
+    def close_all(self) -> None:
+        """Closes every pooled connection and empties the pool."""
+        with self._lock:
+            entries = list(self._connections.values())
+            self._connections.clear()
+        for _, conn, _ in entries:
+            conn.close()
+
+
+# One pool per database file, created on first use.
+_pools: Dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_file: str = DB_FILE) -> ConnectionPool:
+    """Returns the shared connection pool for a database file.
+
+    Args:
+        db_file (str): The file path for the SQLite database. Defaults to the
+            global `DB_FILE` constant.
+
+    Returns:
+        ConnectionPool: The pool serving `db_file`.
+    """
+    pool = _pools.get(db_file)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.setdefault(db_file, ConnectionPool(db_file))
+    return pool
+
+
+def pool_stats(db_file: str = DB_FILE) -> Dict[str, int]:
+    """Returns the hit/miss counters of the pool for a database file.
+
+    Args:
+        db_file (str): The file path for the SQLite database.
+
+    Returns:
+        Dict[str, int]: See `ConnectionPool.stats`.
+    """
+    return get_pool(db_file).stats()
+
+
+def close_pools() -> None:
+    """Closes all pooled connections for every database file."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close_all()
+
+
+_STAMP_QUERY = ("SELECT version, (SELECT schema_version FROM pragma_schema_version) "
+                "FROM ContentVersion WHERE id = 1")
+
+
+class ContentCache:
+    """A size-bounded LRU cache for rarely-changing content rows.
+
+    Character, item, weapon and armor rows almost never change at runtime,
+    so the accessors serve them from memory. Entries are keyed by table and
+    lookup key and evicted least-recently-used first once `max_size` is
+    reached. Misses (rows that do not exist) are cached too.
+
+    The cache notices content and schema changes through a version stamp
+    made of the `ContentVersion` counter, which triggers bump on every write
+    to a cached table, and SQLite's `schema_version`. To keep hot lookups off
+    the database entirely, the stamp is re-read at most once every
+    `stamp_interval` seconds; call `invalidate` for immediate effect.
+
+    Attributes:
+        max_size (int): The maximum number of cached rows.
+        stamp_interval (float): Minimum seconds between version stamp checks.
+        db_file (str): The database whose version stamp is tracked.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, max_size: int = 1024, stamp_interval: float = 1.0, db_file: str = DB_FILE):
+        self.max_size = max_size
+        self.stamp_interval = stamp_interval
+        self.db_file = db_file
+        self._entries: "OrderedDict[Tuple[str, Any], Optional[sqlite3.Row]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._next_stamp_check = 0.0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def _read_stamp(self) -> Optional[Tuple[int, int]]:
+        """Reads the (content version, schema version) stamp from the database."""
+        try:
+            with get_pool(self.db_file).connection() as conn:
+                row = conn.execute(_STAMP_QUERY).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return (row[0], row[1]) if row else None
+
+    def _check_stamp(self) -> None:
+        """Clears the cache if the version stamp changed since the last check."""
+        now = time.monotonic()
+        if now < self._next_stamp_check:
+            return
+        stamp = self._read_stamp()
+        with self._lock:
+            self._next_stamp_check = now + self.stamp_interval
+            if stamp != self._stamp:
+                if self._entries:
+                    self._stats["invalidations"] += 1
+                self._entries.clear()
+                self._stamp = stamp
+
+    def get(self, table: str, key: Any, loader: Callable[[], Optional[sqlite3.Row]]) -> Optional[sqlite3.Row]:
+        """Returns a cached row, calling `loader` to fetch it on a miss.
+
+        Args:
+            table (str): The table the row belongs to.
+            key (Any): The lookup key within that table.
+            loader (Callable): Fetches the row from the database.
+
+        Returns:
+            Optional[sqlite3.Row]: The cached or freshly loaded row.
+        """
+        self._check_stamp()
+        cache_key = (table, key)
+        with self._lock:
+            row = self._entries.get(cache_key, self._MISSING)
+            if row is not self._MISSING:
+                self._entries.move_to_end(cache_key)
+                self._stats["hits"] += 1
+                return row
+            self._stats["misses"] += 1
+
+        row = loader()
+        with self._lock:
+            self._entries[cache_key] = row
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return row
+
+    def invalidate(self, table: Optional[str] = None, key: Any = _MISSING) -> None:
+        """Drops cached rows.
+
+        Args:
+            table (Optional[str]): Only drop rows from this table. Drops
+                everything when omitted.
+            key (Any): Only drop the row with this key. Requires `table`.
+        """
+        with self._lock:
+            if table is None:
+                self._entries.clear()
+                # Force the next lookup to re-read the version stamp.
+                self._stamp = None
+                self._next_stamp_check = 0.0
+            elif key is not self._MISSING:
+                self._entries.pop((table, key), None)
+            else:
+                for cache_key in [k for k in self._entries if k[0] == table]:
+                    del self._entries[cache_key]
+            self._stats["invalidations"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns a snapshot of the cache's counters.
+
+        Returns:
+            Dict[str, int]: Counts of `hits`, `misses`, `evictions`,
+            `invalidations` and the current `size`.
+        """
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot["size"] = len(self._entries)
+        return snapshot
+
+
+# The cache in front of the pooled content accessors.
+_content_cache = ContentCache()
+
+
+def invalidate_content_cache(table: Optional[str] = None, key: Any = ContentCache._MISSING) -> None:
+    """Drops cached content rows; see `ContentCache.invalidate`.
+
+    Args:
+        table (Optional[str]): Only drop rows from this table.
+        key (Any): Only drop the row with this key (e.g. a character name).
+    """
+    _content_cache.invalidate(table, key)
+
+
+def content_cache_stats() -> Dict[str, int]:
+    """Returns the content cache's hit/miss counters.
+
+    Returns:
+        Dict[str, int]: See `ContentCache.stats`.
+    """
+    return _content_cache.stats()
+
+
+# (index name, table, column) for every secondary index in the schema.
+_FOREIGN_KEY_INDEXES = (
+    ("idx_npcs_faction", "NonPlayerCharacters", "faction_id"),
+    ("idx_npcs_dialogue", "NonPlayerCharacters", "dialogue_id"),
+    ("idx_character_abilities_ability", "CharacterAbilities", "ability_id"),
+    ("idx_character_inventory_item", "CharacterInventory", "item_id"),
+    ("idx_locations_parent", "Locations", "parent_location_id"),
+    ("idx_quests_start_location", "Quests", "start_location_id"),
+    ("idx_quests_end_location", "Quests", "end_location_id"),
+    ("idx_quests_faction", "Quests", "faction_id"),
+    ("idx_dialogues_next", "Dialogues", "next_dialogue_id"),
+    ("idx_dialogues_condition_quest", "Dialogues", "condition_quest_id"),
+    ("idx_lore_location", "Lore", "location_id"),
+)
 
 
 def create_schema(cursor: sqlite3.Cursor) -> None:
@@ -221,6 +647,72 @@ def create_schema(cursor: sqlite3.Cursor) -> None:
         FOREIGN KEY (location_id) REFERENCES Locations(location_id)
     )""")
 
+    # Secondary indexes on foreign keys. Primary keys and UNIQUE columns
+    # are indexed by SQLite already; these cover the reverse lookups
+    # (children of a location, quests starting at a location, what points at
+    # a dialogue node, who holds an item) that would otherwise scan.
+    for index_name, table, column in _FOREIGN_KEY_INDEXES:
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table} ({column})")
+
+    create_save_schema(cursor)
+
+    # Content version stamp, bumped by triggers whenever cached content changes.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS ContentVersion (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    )""")
+    cursor.execute("INSERT OR IGNORE INTO ContentVersion (id, version) VALUES (1, 0)")
+    for table in _CACHED_TABLES:
+        for operation in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_{operation.lower()}_version
+            AFTER {operation} ON {table}
+            BEGIN
+                UPDATE ContentVersion SET version = version + 1 WHERE id = 1;
+            END""")
+
+
+def create_save_schema(cursor: sqlite3.Cursor) -> None:
+    """Creates the saved game tables if they don't exist.
+
+    These are the only tables the game writes to while it runs: saved games
+    and streamed world chunks. They are created by `create_schema`, and on
+    demand by the save functions when the content comes from a
+    `content_pack` and `init_db` was never run.
+
+    Args:
+        cursor (sqlite3.Cursor): A database cursor to execute the SQL commands.
+    """
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS SaveGames (
+        save_name TEXT PRIMARY KEY,
+        format_version INTEGER NOT NULL,
+        saved_at REAL NOT NULL,
+        data BLOB NOT NULL
+    )""")
+
+    # Incremental saves: a base snapshot followed by deltas, per save slot.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS SaveGameDeltas (
+        save_name TEXT NOT NULL,
+        sequence INTEGER NOT NULL,
+        is_base BOOLEAN NOT NULL,
+        saved_at REAL NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (save_name, sequence)
+    )""")
+
+    # Streamed worlds: the objects of each chunk of a world, as a snapshot.
+    cursor.execute("""
+    CREATE TABLE IF NOT EXISTS WorldChunks (
+        world TEXT NOT NULL,
+        cx INTEGER NOT NULL,
+        cy INTEGER NOT NULL,
+        data BLOB NOT NULL,
+        PRIMARY KEY (world, cx, cy)
+    )""")
+
 
 def populate_initial_data(cursor: sqlite3.Cursor) -> None:
     """Populates the database with the initial set of game content.
@@ -255,53 +747,104 @@ def init_db(db_file: str = DB_FILE) -> None:
     """Initializes the database by creating and populating it.
 
     This function serves as the main entry point for setting up the database.
-    It establishes a connection, creates the schema if it doesn't exist, and
-    populates the tables with initial game data.
+    It checks out a pooled connection, creates the schema if it doesn't exist,
+    and populates the tables with initial game data.
 
     Args:
         db_file (str): The file path for the SQLite database. Defaults to the
             global `DB_FILE` constant.
     """
-    conn = get_db_connection(db_file)
-    cursor = conn.cursor()
-    create_schema(cursor)
-    populate_initial_data(cursor)
-    conn.commit()
-    conn.close()
+    with get_pool(db_file).connection() as conn:
+        cursor = conn.cursor()
+        create_schema(cursor)
+        populate_initial_data(cursor)
+    _content_cache.invalidate()
+
+
+def use_content_pack(pack: Optional[content_pack.ContentPack]) -> None:
+    """Serves content lookups from a content pack instead of SQLite.
+
+    Once set, the accessors and bulk loaders read from the pack whenever no
+    explicit connection is passed. Passing `None` switches back to SQLite.
+
+    Args:
+        pack (Optional[content_pack.ContentPack]): The pack to use.
+    """
+    global _content_pack
+    _content_pack = pack
+    _content_cache.invalidate()
+
+
+def open_content(db_file: str = DB_FILE, pack_file: str = content_pack.PACK_FILE) -> bool:
+    """Prepares game content at startup, preferring a prebuilt content pack.
+
+    If `pack_file` holds a usable pack it is memory-mapped and used for all
+    content lookups, and no schema DDL is run; the save tables are created
+    on first use. Otherwise the database is initialized with `init_db`.
+
+    Args:
+        db_file (str): The file path for the SQLite database.
+        pack_file (str): The content pack built by
+            `content_pack.build_content_pack`.
+
+    Returns:
+        bool: `True` if the content pack is in use, `False` if the game fell
+        back to the SQLite content tables.
+    """
+    pack = content_pack.open_content_pack(pack_file)
+    if pack is None:
+        init_db(db_file)
+        return False
+    use_content_pack(pack)
+    return True
+
 
 _ALLOWED_TABLES = {"Characters", "Items", "Weapons", "Armor"}
 _ALLOWED_FIELDS = {"name", "weapon_id", "armor_id"}
 
-def _query_single_row(table, field, value):
-    """Fetches a single row from the given table where field matches value."""
+
+def _single_row_query(table: str, field: str) -> str:
+    """Returns the SQL `_query_single_row` runs for an allow-listed column."""
+    return f"SELECT * FROM {table} WHERE {field} = ?"
+
+
+def _query_single_row(table: str, field: str, value: Any,
+                      conn: Optional[sqlite3.Connection] = None) -> Optional[sqlite3.Row]:
+    """Fetches a single row from the given table where field matches value.
+
+    Args:
+        table (str): The table to query. Must be in `_ALLOWED_TABLES`.
+        field (str): The column to match on. Must be in `_ALLOWED_FIELDS`.
+        value (Any): The value the column must equal.
+        conn (Optional[sqlite3.Connection]): An optional existing database
+            connection. If provided, the query runs on it directly and
+            bypasses the content cache. Otherwise the row is served from the
+            cache, falling back to a pooled connection on a miss.
+
+    Returns:
+        Optional[sqlite3.Row]: The first matching row, or `None`.
+
+    Raises:
+        ValueError: If `table` or `field` is not on the allow-list.
+    """
     if table not in _ALLOWED_TABLES:
         raise ValueError(f"Invalid table name: {table!r}")
     if field not in _ALLOWED_FIELDS:
         raise ValueError(f"Invalid field name: {field!r}")
-    conn = get_db_connection()
-    cursor = conn.cursor()
-    cursor.execute(f"SELECT * FROM {table} WHERE {field} = ?", (value,))
-    result = cursor.fetchone()
-    conn.close()
-    return result
-
-def get_character_data(name):
-    """Fetches a character's data from the database."""
-    return _query_single_row("Characters", "name", name)
-
-def get_item_data(name):
-    """Fetches an item's base data from the Items table."""
-    return _query_single_row("Items", "name", name)
-
-def get_weapon_data(item_id):
-    """Fetches a weapon's specific data from the Weapons table."""
-    return _query_single_row("Weapons", "weapon_id", item_id)
-
-def get_armor_data(item_id):
-    """Fetches armor's specific data from the Armor table."""
-    return _query_single_row("Armor", "armor_id", item_id)
-
-def set_class_loader(loader: Callable[[str, Dict[str, Any]], Any]) -> None:
+    query = _single_row_query(table, field)
+    if conn is not None:
+        return conn.execute(query, (value,)).fetchone()
+    if _content_pack is not None:
+        return _content_pack.get(table, field, value)
+
+    def load() -> Optional[sqlite3.Row]:
+        with get_pool().connection() as pooled_conn:
+            return pooled_conn.execute(query, (value,)).fetchone()
+
+    return _content_cache.get(table, value, load)
+
+
+def set_class_loader(loader: Callable[[str], Optional[type]], module: Optional[str] = None) -> None:
     """Sets the global function used for dynamically loading classes.
 
     This function is a key part of decoupling the database module from the
@@ -310,11 +853,17 @@ def set_class_loader(loader: Callable[[str, Dict[str, Any]], Any]) -> None:
     classes are instantiated from database records.
 
     Args:
-        loader (Callable): A function that accepts a class name (str) and a
-            data dictionary and returns an instance of the corresponding class.
+        loader (Callable): A function that accepts a class name (str) and
+            returns the corresponding class, or `None` if it is unknown.
+        module (Optional[str]): The module whose classes the loader provides
+            (usually the caller's `__name__`). Registering per module lets
+            `game.py` and `rpg.py`, which both define e.g. `Player`, load
+            their own saves.
     """
     global _class_loader
     _class_loader = loader
+    if module is not None:
+        _class_loaders[module] = loader
 
 
 def get_character_data(name: str, conn: Optional[sqlite3.Connection] = None) -> Optional[sqlite3.Row]:
@@ -323,25 +872,14 @@ def get_character_data(name: str, conn: Optional[sqlite3.Connection] = None) ->
     Args:
         name (str): The name of the character to look up.
         conn (Optional[sqlite3.Connection]): An optional existing database
-            connection. If not provided, a new one will be created.
+            connection. If not provided, the cached, pooled lookup is used.
 
     Returns:
         Optional[sqlite3.Row]: A `sqlite3.Row` object containing the
         character's data, which allows for dictionary-style access to columns.
         Returns `None` if no character with the given name is found.
     """
-    close_conn = False
-    if conn is None:
-        conn = get_db_connection()
-        close_conn = True
-
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Characters WHERE name = ?", (name,))
-    character_data = cursor.fetchone()
-
-    if close_conn:
-        conn.close()
-    return character_data
+    return _query_single_row("Characters", "name", name, conn)
 
 
 def get_item_data(name: str, conn: Optional[sqlite3.Connection] = None) -> Optional[sqlite3.Row]:
@@ -356,18 +894,7 @@ def get_item_data(name: str, conn: Optional[sqlite3.Connection] = None) -> Optio
         Optional[sqlite3.Row]: A `sqlite3.Row` object with the item's base
         data (e.g., name, description, value), or `None` if not found.
     """
-    close_conn = False
-    if conn is None:
-        conn = get_db_connection()
-        close_conn = True
-
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Items WHERE name = ?", (name,))
-    item_data = cursor.fetchone()
-
-    if close_conn:
-        conn.close()
-    return item_data
+    return _query_single_row("Items", "name", name, conn)
 
 
 def get_weapon_data(item_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[sqlite3.Row]:
@@ -384,18 +911,7 @@ def get_weapon_data(item_id: int, conn: Optional[sqlite3.Connection] = None) ->
         stats (e.g., damage, type), or `None` if no weapon with the given
         ID is found.
     """
-    close_conn = False
-    if conn is None:
-        conn = get_db_connection()
-        close_conn = True
-
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Weapons WHERE weapon_id = ?", (item_id,))
-    weapon_data = cursor.fetchone()
-
-    if close_conn:
-        conn.close()
-    return weapon_data
+    return _query_single_row("Weapons", "weapon_id", item_id, conn)
 
 
 def get_armor_data(item_id: int, conn: Optional[sqlite3.Connection] = None) -> Optional[sqlite3.Row]:
@@ -412,61 +928,672 @@ def get_armor_data(item_id: int, conn: Optional[sqlite3.Connection] = None) -> O
         stats (e.g., defense), or `None` if no armor with the given ID is
         found.
     """
-    close_conn = False
+    return _query_single_row("Armor", "armor_id", item_id, conn)
+
+
+# SQLite's default limit on bound parameters is 999 on older builds.
+_MAX_BATCH_PARAMS = 500
+
+
+def _batched(values: List[Any], size: int = _MAX_BATCH_PARAMS) -> Iterator[List[Any]]:
+    """Yields successive slices of `values` no longer than `size`."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+_ITEMS_BULK_QUERY = """
+    SELECT i.*, w.damage, w.weapon_type, w.attack_speed, a.defense, a.armor_type
+    FROM Items i
+    LEFT JOIN Weapons w ON w.weapon_id = i.item_id
+    LEFT JOIN Armor a ON a.armor_id = i.item_id
+    WHERE i.name IN ({placeholders})"""
+_CHARACTERS_BULK_QUERY = "SELECT * FROM Characters WHERE name IN ({placeholders})"
+
+
+def load_items_bulk(names: List[str], conn: Optional[sqlite3.Connection] = None) -> Dict[str, Dict[str, Any]]:
+    """Retrieves fully joined item records for many items at once.
+
+    Each record combines the item's `Items` row with its `Weapons` and
+    `Armor` stats in a single `LEFT JOIN` query, so resolving an item no
+    longer needs a follow-up `get_weapon_data`/`get_armor_data` call. Stat
+    columns that do not apply to the item (e.g. `defense` for a sword) are
+    `None`.
+
+    Args:
+        names (List[str]): The names of the items to look up.
+        conn (Optional[sqlite3.Connection]): An optional existing database
+            connection. If not provided, a pooled connection is used.
+
+    Returns:
+        Dict[str, Dict[str, Any]]: The records keyed by item name, in the
+        order requested. Names that are not found are omitted.
+    """
+    unique_names = list(dict.fromkeys(names))
+    if not unique_names:
+        return {}
+    if conn is None and _content_pack is not None:
+        return _load_items_from_pack(_content_pack, unique_names)
     if conn is None:
-        conn = get_db_connection()
-        close_conn = True
+        with get_pool().connection() as pooled_conn:
+            return load_items_bulk(unique_names, pooled_conn)
+
+    records = {}
+    for batch in _batched(unique_names):
+        placeholders = ", ".join("?" * len(batch))
+        rows = conn.execute(_ITEMS_BULK_QUERY.format(placeholders=placeholders), batch)
+        for row in rows:
+            records[row["name"]] = dict(row)
+    return {name: records[name] for name in unique_names if name in records}
+
+
+def _load_items_from_pack(pack: content_pack.ContentPack, names: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Builds the `load_items_bulk` records from a content pack."""
+    records = {}
+    for name in names:
+        item = pack.get("Items", "name", name)
+        if item is None:
+            continue
+        record = dict(item)
+        weapon = pack.get("Weapons", "weapon_id", item["item_id"])
+        armor = pack.get("Armor", "armor_id", item["item_id"])
+        for column in ("damage", "weapon_type", "attack_speed"):
+            record[column] = weapon[column] if weapon is not None else None
+        for column in ("defense", "armor_type"):
+            record[column] = armor[column] if armor is not None else None
+        records[name] = record
+    return records
+
+
+def load_characters_bulk(names: List[str], conn: Optional[sqlite3.Connection] = None) -> Dict[str, sqlite3.Row]:
+    """Retrieves the `Characters` rows for many characters at once.
+
+    Args:
+        names (List[str]): The names of the characters to look up.
+        conn (Optional[sqlite3.Connection]): An optional existing database
+            connection. If not provided, a pooled connection is used.
+
+    Returns:
+        Dict[str, sqlite3.Row]: The rows keyed by character name, in the
+        order requested. Names that are not found are omitted.
+    """
+    unique_names = list(dict.fromkeys(names))
+    if not unique_names:
+        return {}
+    if conn is None and _content_pack is not None:
+        rows = ((name, _content_pack.get("Characters", "name", name)) for name in unique_names)
+        return {name: row for name, row in rows if row is not None}
+    if conn is None:
+        with get_pool().connection() as pooled_conn:
+            return load_characters_bulk(unique_names, pooled_conn)
+
+    records = {}
+    for batch in _batched(unique_names):
+        placeholders = ", ".join("?" * len(batch))
+        for row in conn.execute(_CHARACTERS_BULK_QUERY.format(placeholders=placeholders), batch):
+            records[row["name"]] = row
+    return {name: records[name] for name in unique_names if name in records}
+
+
+def load_scene_content(item_names: List[str], character_names: List[str],
+                       conn: Optional[sqlite3.Connection] = None) -> Dict[str, Dict[str, Any]]:
+    """Hydrates all the content a scene needs in a fixed number of queries.
 
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM Armor WHERE armor_id = ?", (item_id,))
-    armor_data = cursor.fetchone()
+    This is the bulk counterpart to calling `get_item_data`,
+    `get_weapon_data`, `get_armor_data` and `get_character_data` once per
+    object: it costs one query for the items and one for the characters
+    (per 500 names), regardless of how many objects the scene contains.
 
-    if close_conn:
-        conn.close()
-    return armor_data
+    Args:
+        item_names (List[str]): The names of the items to load.
+        character_names (List[str]): The names of the characters to load.
+        conn (Optional[sqlite3.Connection]): An optional existing database
+            connection. If not provided, a single pooled connection is used
+            for both queries.
 
+    Returns:
+        Dict[str, Dict[str, Any]]: A dictionary with an `items` mapping (see
+        `load_items_bulk`) and a `characters` mapping (see
+        `load_characters_bulk`).
+    """
+    if conn is None and _content_pack is None:
+        with get_pool().connection() as pooled_conn:
+            return load_scene_content(item_names, character_names, pooled_conn)
+    return {
+        "items": load_items_bulk(item_names, conn),
+        "characters": load_characters_bulk(character_names, conn),
+    }
+
+
+# Guards the recursive walks against cycles in hand-edited content.
+_MAX_RECURSION_DEPTH = 256
+
+_LOCATION_SUBTREE_QUERY = """
+    WITH RECURSIVE subtree(location_id, depth) AS (
+        SELECT location_id, 0 FROM Locations WHERE {root_column} = ?
+        UNION ALL
+        SELECT child.location_id, subtree.depth + 1
+        FROM Locations child JOIN subtree ON child.parent_location_id = subtree.location_id
+        WHERE subtree.depth < ?
+    )
+    SELECT l.*, subtree.depth FROM subtree JOIN Locations l ON l.location_id = subtree.location_id
+    ORDER BY subtree.depth, l.location_id"""
+
+_DIALOGUE_CHAIN_QUERY = """
+    WITH RECURSIVE chain(dialogue_id, position) AS (
+        SELECT ?, 0
+        UNION ALL
+        SELECT d.next_dialogue_id, chain.position + 1
+        FROM chain JOIN Dialogues d ON d.dialogue_id = chain.dialogue_id
+        WHERE d.next_dialogue_id IS NOT NULL AND chain.position < ?
+    )
+    SELECT d.*, chain.position FROM chain JOIN Dialogues d ON d.dialogue_id = chain.dialogue_id
+    ORDER BY chain.position"""
+
+
+def load_location_subtree(root: Any, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    """Retrieves a location and every location nested beneath it.
+
+    The `parent_location_id` tree is walked with a single recursive query
+    rather than one query per level.
 
-def save_game(save_name: str, scene_manager: Any) -> None:
-    """Saves the current game state to the database.
+    Args:
+        root (Any): The root location's `location_id` (int) or `name` (str).
+        conn (Optional[sqlite3.Connection]): An optional existing database
+            connection. If not provided, the content pack is used when one
+            is loaded, otherwise a pooled connection.
 
-    Note:
-        This is a placeholder function. A full implementation would involve
-        serializing the state of the `scene_manager` and all its contained
-        game objects into the database.
+    Returns:
+        List[Dict[str, Any]]: The `Locations` rows as dictionaries with an
+        added `depth` (0 for the root), breadth-first, ordered by depth and
+        then `location_id`. Empty if the root does not exist.
+    """
+    if conn is None and _content_pack is not None:
+        return _location_subtree_from_pack(_content_pack, root)
+    if conn is None:
+        with get_pool().connection() as pooled_conn:
+            return load_location_subtree(root, pooled_conn)
+    query = _LOCATION_SUBTREE_QUERY.format(root_column="name" if isinstance(root, str) else "location_id")
+    locations, seen = [], set()
+    for row in conn.execute(query, (root, _MAX_RECURSION_DEPTH)):
+        # A cycle would revisit locations at greater depths; keep the first visit.
+        if row["location_id"] not in seen:
+            seen.add(row["location_id"])
+            locations.append(dict(row))
+    return locations
+
+
+def _location_subtree_from_pack(pack: content_pack.ContentPack, root: Any) -> List[Dict[str, Any]]:
+    """Builds the `load_location_subtree` result from a content pack."""
+    root_row = pack.get("Locations", "name" if isinstance(root, str) else "location_id", root)
+    if root_row is None:
+        return []
+    children: Dict[Any, List[Dict[str, Any]]] = {}
+    for row in pack.rows("Locations"):
+        children.setdefault(row["parent_location_id"], []).append(dict(row))
+    locations = [dict(root_row, depth=0)]
+    seen = {root_row["location_id"]}
+    level = locations
+    while level and level[0]["depth"] < _MAX_RECURSION_DEPTH:
+        next_level = []
+        for parent in level:
+            for child in children.get(parent["location_id"], ()):
+                if child["location_id"] not in seen:
+                    seen.add(child["location_id"])
+                    next_level.append(dict(child, depth=parent["depth"] + 1))
+        next_level.sort(key=lambda location: location["location_id"])
+        locations.extend(next_level)
+        level = next_level
+    return locations
+
+
+def load_dialogue_chain(dialogue_id: int, conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    """Retrieves a dialogue and every dialogue that follows it.
+
+    The `next_dialogue_id` chain is followed with a single recursive query.
+    See `game.DialogueManager.from_database` to turn the rows into a
+    conversation.
+
+    Args:
+        dialogue_id (int): The first dialogue of the chain.
+        conn (Optional[sqlite3.Connection]): An optional existing database
+            connection. If not provided, a pooled connection is used.
+
+    Returns:
+        List[Dict[str, Any]]: The `Dialogues` rows as dictionaries with an
+        added `position` (0 for the first), in chain order. If the chain
+        loops back on itself it stops before the first repeated dialogue,
+        whose id is still the last row's `next_dialogue_id`. Empty if the
+        dialogue does not exist.
+    """
+    if conn is None:
+        with get_pool().connection() as pooled_conn:
+            return load_dialogue_chain(dialogue_id, pooled_conn)
+    chain, seen = [], set()
+    for row in conn.execute(_DIALOGUE_CHAIN_QUERY, (dialogue_id, _MAX_RECURSION_DEPTH)):
+        if row["dialogue_id"] in seen:
+            break
+        seen.add(row["dialogue_id"])
+        chain.append(dict(row))
+    return chain
+
+
+def _resolve_class(key: str) -> Optional[type]:
+    """Maps a snapshot class key (``"module:Name"``) back to a class.
+
+    The loader registered for the key's module is preferred; the most
+    recently registered loader is used as a fallback, e.g. when a save
+    written by the imported `game` module is loaded by `game.py` running as
+    `__main__`.
+
+    Args:
+        key (str): A key produced by `snapshot.class_key`.
+
+    Returns:
+        Optional[type]: The class, or `None` if no loader knows it.
+    """
+    module, _, name = key.rpartition(":")
+    loader = _class_loaders.get(module, _class_loader)
+    if loader is None:
+        return None
+    return loader(name)
+
+
+def _is_snapshottable(cls: type) -> bool:
+    """Checks that a class will be resolvable when a save is loaded."""
+    return _resolve_class(snapshot.class_key(cls)) is cls
+
+
+_SAVE_UPSERT = "INSERT OR REPLACE INTO SaveGames (save_name, format_version, saved_at, data) VALUES (?, ?, ?, ?)"
+_SAVE_SELECT = "SELECT data FROM SaveGames WHERE save_name = ?"
+_SAVE_DELETE = "DELETE FROM SaveGames WHERE save_name = ?"
+_DELTA_INSERT = "INSERT INTO SaveGameDeltas (save_name, sequence, is_base, saved_at, data) VALUES (?, ?, ?, ?, ?)"
+_DELTAS_SELECT = "SELECT sequence, is_base, data FROM SaveGameDeltas WHERE save_name = ? ORDER BY sequence"
+_DELTAS_DELETE = "DELETE FROM SaveGameDeltas WHERE save_name = ?"
+_CHUNK_UPSERT = "INSERT OR REPLACE INTO WorldChunks (world, cx, cy, data) VALUES (?, ?, ?, ?)"
+_CHUNK_SELECT = "SELECT data FROM WorldChunks WHERE world = ? AND cx = ? AND cy = ?"
+_CHUNKS_SELECT = "SELECT cx, cy FROM WorldChunks WHERE world = ? ORDER BY cy, cx"
+
+
+@contextmanager
+def _save_connection() -> Iterator[sqlite3.Connection]:
+    """Checks out a pooled connection with the save tables in place."""
+    with get_pool().connection() as conn:
+        create_save_schema(conn.cursor())
+        yield conn
+
+
+def save_game(save_name: str, scene_manager: Any) -> int:
+    """Saves the current game state to the `SaveGames` table.
+
+    The whole object graph reachable from `scene_manager` (its scene, game
+    objects, inventories, equipment, status effects and dialogue state) is
+    encoded with the compact binary `snapshot` format and stored under
+    `save_name`, replacing any previous save (full or incremental) in that
+    slot.
 
     Args:
         save_name (str): The identifier for the save slot.
         scene_manager (Any): The main `SceneManager` object, which contains
             the complete state of the game to be saved.
+
+    Returns:
+        int: The size of the stored snapshot in bytes.
+
+    Raises:
+        TypeError: If the game state contains an object whose class was not
+            registered through `set_class_loader`.
     """
-    # In a real implementation, this would serialize the scene_manager
-    # and store it in the database. For now, we'll just acknowledge it.
-    print(f"Game state for '{save_name}' saved (simulation).")
+    data = snapshot.encode_snapshot(scene_manager, _is_snapshottable)
+    with _save_connection() as conn:
+        conn.execute(_SAVE_UPSERT, (save_name, snapshot.FORMAT_VERSION, time.time(), data))
+        conn.execute(_DELTAS_DELETE, (save_name,))
+    _autosavers.pop(save_name, None)
+    return len(data)
 
 
-def load_game(save_name: str) -> None:
-    """Loads a game state from the database.
+def load_game(save_name: str) -> Optional[Any]:
+    """Loads a game state from the `SaveGames` table.
 
-    Note:
-        This is a placeholder function. A full implementation would deserialize
-        data from the database and reconstruct the `SceneManager` state. It
-        currently returns `None` to allow for testing the game's startup
-        and loading logic without a full save system.
+    Incremental saves written by `autosave` take precedence over a full save
+    in the same slot. Classes are resolved through the loaders registered
+    with `set_class_loader`, and objects are restored without running their
+    constructors.
 
     Args:
         save_name (str): The identifier for the save slot to load.
 
     Returns:
-        None: This function currently returns `None` to indicate that no save
-        file was loaded, allowing calling code to handle the case of starting
-        a new game.
+        Optional[Any]: The restored `SceneManager`, or `None` if there is no
+        save in that slot, allowing calling code to start a new game instead.
+
+    Raises:
+        ValueError: If the stored snapshot is corrupt, was written by a newer
+            format version, or references an unknown class.
+    """
+    with _save_connection() as conn:
+        chain = _read_delta_chain(conn, save_name)
+        row = None if chain else conn.execute(_SAVE_SELECT, (save_name,)).fetchone()
+    if chain:
+        _, scene_record, entity_records = chain
+        return snapshot.decode_linked(scene_record, entity_records, _resolve_class)
+    if row is None:
+        return None
+    return snapshot.decode_snapshot(row["data"], _resolve_class)
+
+
+def _read_delta_chain(conn: sqlite3.Connection, save_name: str) -> Optional[Tuple[int, bytes, Dict[int, bytes]]]:
+    """Merges a slot's incremental save chain into its current state.
+
+    Returns:
+        Optional[Tuple[int, bytes, Dict[int, bytes]]]: The last sequence
+        number, the latest scene record and the latest record of every live
+        object, or `None` if the slot has no incremental saves.
+
+    Raises:
+        ValueError: If the chain does not start with a base snapshot.
     """
-    # This function is intended to be mocked in tests.
-    # Returning None simulates the behavior of a save not being found.
-    return None
+    rows = conn.execute(_DELTAS_SELECT, (save_name,)).fetchall()
+    if not rows:
+        return None
+    if not rows[0]["is_base"]:
+        raise ValueError(f"Incremental save {save_name!r} has no base snapshot")
+    entity_records: Dict[int, bytes] = {}
+    scene_record = b""
+    for row in rows:
+        row_scene_record, changed, removed = marshal.loads(row["data"])
+        if row_scene_record is not None:
+            scene_record = row_scene_record
+        entity_records.update(changed)
+        for entity_id in removed:
+            entity_records.pop(entity_id, None)
+    return rows[-1]["sequence"], scene_record, entity_records
+
+
+def compact_save(save_name: str) -> int:
+    """Folds a slot's incremental save chain into a single base snapshot.
+
+    The merge works on the stored records, so it needs neither the live game
+    nor a decode of the saved objects.
+
+    Args:
+        save_name (str): The save slot to compact.
+
+    Returns:
+        int: The number of chain rows that were folded into the new base.
+    """
+    with _save_connection() as conn:
+        chain = _read_delta_chain(conn, save_name)
+        if chain is None:
+            return 0
+        sequence, scene_record, entity_records = chain
+        folded = conn.execute(_DELTAS_DELETE, (save_name,)).rowcount
+        conn.execute(_DELTA_INSERT, (save_name, sequence, True, time.time(),
+                                     marshal.dumps((scene_record, entity_records, ()), snapshot.MARSHAL_VERSION)))
+    return folded
+
+
+class AutoSaver:
+    """Writes incremental saves that only re-encode changed game objects.
+
+    The scene is stored as one small snapshot per game object plus a scene
+    record (the `SceneManager`, `Game` and `Scene` with external references
+    to the objects). The first save writes every object as a base snapshot;
+    later saves append a delta holding only objects whose `dirty` flag is
+    set, objects added since the last save and the ids of removed objects.
+    The scene record is only rewritten when its encoding has changed.
+    Every `compact_every` deltas the chain is folded back into one base with
+    `compact_save`.
+
+    Objects are identified across saves by ids held in a weak mapping, so an
+    `AutoSaver` must be kept for the life of a session (see `autosave`).
+
+    Attributes:
+        save_name (str): The slot the chain is written to.
+        compact_every (int): Deltas to write before compacting the chain.
+    """
+
+    def __init__(self, save_name: str, compact_every: int = 20):
+        self.save_name = save_name
+        self.compact_every = compact_every
+        self._ids: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+        self._next_id = 0
+        self._saved_ids: set = set()
+        self._sequence: Optional[int] = None
+        self._deltas_since_base = 0
+        self._scene_record: Optional[bytes] = None
+
+    def _entity_id(self, obj: Any) -> int:
+        """Returns the stable id of a game object, assigning one if needed."""
+        entity_id = self._ids.get(obj)
+        if entity_id is None:
+            entity_id = self._next_id
+            self._next_id += 1
+            self._ids[obj] = entity_id
+        return entity_id
+
+    def save(self, scene_manager: Any) -> Dict[str, Any]:
+        """Writes a base snapshot or a delta for the scene's current state.
+
+        Args:
+            scene_manager (Any): The `SceneManager` to save.
+
+        Returns:
+            Dict[str, Any]: `kind` (`"base"` or `"delta"`), the number of
+            `objects` written, the number of `removed` objects and the
+            `bytes` stored.
+        """
+        entities = list(scene_manager.scene.game_objects)
+        ids_by_object = {id(obj): self._entity_id(obj) for obj in entities}
+        current_ids = set(ids_by_object.values())
+        is_base = self._sequence is None
+
+        def external(obj: Any) -> Optional[int]:
+            return ids_by_object.get(id(obj))
+
+        changed = {}
+        for obj in entities:
+            entity_id = ids_by_object[id(obj)]
+            if is_base or entity_id not in self._saved_ids or getattr(obj, 'dirty', True):
+                changed[entity_id] = snapshot.encode_snapshot(obj, _is_snapshottable, external=external)
+        removed = () if is_base else tuple(self._saved_ids - current_ids)
+        scene_record = snapshot.encode_snapshot(scene_manager, _is_snapshottable, external=external)
+        stored_scene_record = None if scene_record == self._scene_record and not is_base else scene_record
+        data = marshal.dumps((stored_scene_record, changed, removed), snapshot.MARSHAL_VERSION)
+
+        with _save_connection() as conn:
+            if is_base:
+                conn.execute(_DELTAS_DELETE, (self.save_name,))
+                conn.execute(_SAVE_DELETE, (self.save_name,))
+                self._sequence = 0
+            else:
+                self._sequence += 1
+            conn.execute(_DELTA_INSERT, (self.save_name, self._sequence, is_base, time.time(), data))
+
+        for obj in entities:
+            if hasattr(obj, 'mark_clean'):
+                obj.mark_clean()
+        self._saved_ids = current_ids
+        self._scene_record = scene_record
+        if is_base:
+            self._deltas_since_base = 0
+        else:
+            self._deltas_since_base += 1
+            if self._deltas_since_base >= self.compact_every:
+                compact_save(self.save_name)
+                self._deltas_since_base = 0
+        return {"kind": "base" if is_base else "delta", "objects": len(changed),
+                "removed": len(removed), "bytes": len(data)}
+
+
+# Live autosavers, one per save slot, so object ids persist between turns.
+_autosavers: Dict[str, AutoSaver] = {}
+
+
+def autosave(save_name: str, scene_manager: Any) -> Dict[str, Any]:
+    """Incrementally saves a scene to a slot, typically once per turn.
+
+    Args:
+        save_name (str): The save slot.
+        scene_manager (Any): The `SceneManager` to save.
+
+    Returns:
+        Dict[str, Any]: See `AutoSaver.save`.
+    """
+    saver = _autosavers.get(save_name)
+    if saver is None:
+        saver = _autosavers[save_name] = AutoSaver(save_name)
+    return saver.save(scene_manager)
+
+
+def save_world_chunk(world: str, chunk: Tuple[int, int], objects: List[Any]) -> int:
+    """Stores the objects of one chunk of a streamed world.
+
+    The objects are encoded like a save (see `save_game`), replacing
+    whatever the chunk held before. This may run on any thread, as long as
+    no other thread changes the objects meanwhile.
+
+    Args:
+        world (str): The world's name.
+        chunk (Tuple[int, int]): The chunk's (column, row).
+        objects (List[Any]): The game objects in the chunk.
+
+    Returns:
+        int: The size of the stored snapshot in bytes.
+
+    Raises:
+        TypeError: If an object's class was not registered through
+            `set_class_loader`.
+    """
+    data = snapshot.encode_snapshot(list(objects), _is_snapshottable)
+    with _save_connection() as conn:
+        conn.execute(_CHUNK_UPSERT, (world, chunk[0], chunk[1], data))
+    return len(data)
+
+
+def load_world_chunk(world: str, chunk: Tuple[int, int]) -> Optional[List[Any]]:
+    """Loads the objects of one chunk of a streamed world.
+
+    Args:
+        world (str): The world's name.
+        chunk (Tuple[int, int]): The chunk's (column, row).
+
+    Returns:
+        Optional[List[Any]]: New instances of the chunk's objects, or `None`
+        if the chunk was never stored.
+    """
+    with _save_connection() as conn:
+        row = conn.execute(_CHUNK_SELECT, (world, chunk[0], chunk[1])).fetchone()
+    if row is None:
+        return None
+    return snapshot.decode_snapshot(row["data"], _resolve_class)
+
+
+def world_chunks(world: str) -> List[Tuple[int, int]]:
+    """Lists the stored chunks of a streamed world, row by row.
+
+    Args:
+        world (str): The world's name.
+
+    Returns:
+        List[Tuple[int, int]]: The (column, row) of every stored chunk.
+    """
+    with _save_connection() as conn:
+        return [(row["cx"], row["cy"]) for row in conn.execute(_CHUNKS_SELECT, (world,))]
+
+
+def _audited_queries() -> Iterator[Tuple[str, str]]:
+    """Yields a (label, SQL) pair for every query the module issues.
+
+    Queries with a variable-length `IN (...)` list are yielded with a single
+    placeholder; the plan does not depend on the list length.
+    """
+    yield "content version stamp", _STAMP_QUERY
+    for table, field in (("Characters", "name"), ("Items", "name"),
+                         ("Weapons", "weapon_id"), ("Armor", "armor_id")):
+        yield f"{table} by {field}", _single_row_query(table, field)
+    yield "items bulk", _ITEMS_BULK_QUERY.format(placeholders="?")
+    yield "characters bulk", _CHARACTERS_BULK_QUERY.format(placeholders="?")
+    for root_column in ("location_id", "name"):
+        yield f"location subtree by {root_column}", _LOCATION_SUBTREE_QUERY.format(root_column=root_column)
+    yield "dialogue chain", _DIALOGUE_CHAIN_QUERY
+    yield "save upsert", _SAVE_UPSERT
+    yield "save select", _SAVE_SELECT
+    yield "save delete", _SAVE_DELETE
+    yield "delta insert", _DELTA_INSERT
+    yield "deltas select", _DELTAS_SELECT
+    yield "deltas delete", _DELTAS_DELETE
+    yield "chunk upsert", _CHUNK_UPSERT
+    yield "chunk select", _CHUNK_SELECT
+    yield "chunks select", _CHUNKS_SELECT
+
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str) -> List[str]:
+    """Returns the `EXPLAIN QUERY PLAN` detail lines for a statement.
+
+    Placeholders are bound to `NULL`; the statement is planned, not run.
+
+    Args:
+        conn (sqlite3.Connection): A connection to a database with the schema.
+        sql (str): The statement to plan.
+
+    Returns:
+        List[str]: One line per plan step, e.g. ``"SEARCH Items USING INDEX
+        sqlite_autoindex_Items_1 (name=?)"``.
+    """
+    params = (None,) * sql.count("?")
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+
+def find_full_scans(plan: List[str]) -> List[str]:
+    """Picks the steps of a query plan that read a whole table or index.
+
+    Args:
+        plan (List[str]): Lines returned by `explain_query_plan`.
+
+    Returns:
+        List[str]: The ``SCAN`` steps (including covering-index scans),
+        which cost time proportional to the table size. Scans of virtual
+        tables such as `pragma_schema_version` and of a query's own
+        materialized subqueries or CTEs are not counted.
+    """
+    derived = {detail.split()[1] for detail in plan if detail.startswith(("MATERIALIZE ", "CO-ROUTINE "))}
+    return [detail for detail in plan
+            if detail.startswith("SCAN ") and "VIRTUAL TABLE" not in detail
+            and detail.split()[1] not in derived | {"CONSTANT"}]
+
+
+def audit_query_plans(conn: Optional[sqlite3.Connection] = None) -> List[Dict[str, Any]]:
+    """Runs `EXPLAIN QUERY PLAN` over every query the module issues.
+
+    Args:
+        conn (Optional[sqlite3.Connection]): A connection to a database with
+            the current schema. If not provided, a pooled connection to
+            `DB_FILE` is used.
+
+    Returns:
+        List[Dict[str, Any]]: One report per query with its `label`, `sql`,
+        `plan` lines and the `full_scans` among them. A query is fine when
+        `full_scans` is empty.
+    """
+    if conn is None:
+        with get_pool().connection() as pooled_conn:
+            return audit_query_plans(pooled_conn)
+    reports = []
+    for label, sql in _audited_queries():
+        plan = explain_query_plan(conn, sql)
+        reports.append({"label": label, "sql": " ".join(sql.split()), "plan": plan,
+                        "full_scans": find_full_scans(plan)})
+    return reports
 
 
 if __name__ == '__main__':
+    if sys.argv[1:2] == ["audit"]:
+        init_db()
+        reports = audit_query_plans()
+        for report in reports:
+            status = "SCAN" if report["full_scans"] else "ok"
+            print(f"[{status:>4}] {report['label']}: {'; '.join(report['plan']) or '(no table reads)'}")
+        sys.exit(1 if any(report["full_scans"] for report in reports) else 0)
     print("Initializing game content database...")
     init_db()
     print("Database initialized successfully.")
\ No newline at end of file
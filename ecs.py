@@ -0,0 +1,350 @@
+"""Struct-of-arrays storage for the hot fields of large numbers of objects.
+
+A `game.GameObject` keeps every field in its own instance dictionary and
+carries an `attributes` and a `status_effects` dictionary even when both are
+empty, which costs close to a kilobyte per object. That is fine for a
+hand-built scene, but not for hordes and simulations with tens of thousands
+of entities. `World` stores the same fields column by column instead:
+
+- `x`, `y`, `z`, `health`, `speed` and `defense` live in contiguous
+  `array('d')` columns, indexed by entity id.
+- `visible` and `solid` are `bytearray` flags; `name` and `symbol` are plain
+  lists.
+- `attributes` dictionaries and `effects.StatusEffects` mappings are only
+  created for the entities that use them.
+
+`Entity` is a `__slots__` handle over one row with the same field names as
+`GameObject`, so code that only reads and writes those fields works with
+either. Columns can also be read in bulk:
+
+    world = ecs.World()
+    for i in range(10000):
+        world.spawn(name=f"Goblin {i}", x=i % 100, y=i // 100)
+    total = sum(world.column("health"))
+    for eid, x, y in world.rows("x", "y"):
+        ...
+
+Ids of despawned entities are reused, so handles must not be kept after
+their entity is despawned. `headless.run_horde` uses a world to simulate a
+horde of enemies chasing the player.
+"""
+
+import math
+from array import array
+from itertools import compress
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import effects
+import events
+
+# The numeric fields kept in typed columns, in column order.
+FIELDS: Tuple[str, ...] = ("x", "y", "z", "health", "speed", "defense")
+
+# Type code of the numeric columns. Doubles hold every int the games use
+# exactly, as well as fractional positions.
+TYPECODE: str = "d"
+
+
+class World:
+    """Column storage for a set of entities.
+
+    Attributes:
+        names (List[Optional[str]]): The name of each entity id.
+        symbols (List[Optional[str]]): The map symbol of each entity id.
+        visible (bytearray): 1 for each entity id that is drawn on the map.
+        solid (bytearray): 1 for each entity id that blocks movement.
+    """
+
+    def __init__(self):
+        self._columns: Dict[str, array] = {field: array(TYPECODE) for field in FIELDS}
+        self._live = bytearray()
+        self._free: List[int] = []
+        self.names: List[Optional[str]] = []
+        self.symbols: List[Optional[str]] = []
+        self.visible = bytearray()
+        self.solid = bytearray()
+        # Sparse per-entity dictionaries, created on first use.
+        self._attributes: Dict[int, Dict[str, Any]] = {}
+        self._status_effects: Dict[int, effects.StatusEffects] = {}
+
+    def __len__(self) -> int:
+        return len(self._live) - len(self._free)
+
+    def __contains__(self, eid: int) -> bool:
+        return 0 <= eid < len(self._live) and bool(self._live[eid])
+
+    def __iter__(self) -> Iterator["Entity"]:
+        return (Entity(self, eid) for eid in self.ids())
+
+    @property
+    def capacity(self) -> int:
+        """int: The number of rows allocated, including free ones."""
+        return len(self._live)
+
+    def spawn(self, name: str = "Object", symbol: str = '?', x: float = 0, y: float = 0, z: float = 0,
+              health: float = 100, speed: float = 1, visible: bool = True, solid: bool = True,
+              defense: float = 0) -> "Entity":
+        """Creates an entity, reusing the id of a despawned one if possible.
+
+        The arguments mirror `game.GameObject`.
+
+        Returns:
+            Entity: A handle to the new entity.
+        """
+        values = (x, y, z, health, speed, defense)
+        if self._free:
+            eid = self._free.pop()
+            for field, value in zip(FIELDS, values):
+                self._columns[field][eid] = value
+            self.names[eid] = name
+            self.symbols[eid] = symbol
+            self.visible[eid] = bool(visible)
+            self.solid[eid] = bool(solid)
+            self._live[eid] = 1
+        else:
+            eid = len(self._live)
+            for field, value in zip(FIELDS, values):
+                self._columns[field].append(value)
+            self.names.append(name)
+            self.symbols.append(symbol)
+            self.visible.append(bool(visible))
+            self.solid.append(bool(solid))
+            self._live.append(1)
+        return Entity(self, eid)
+
+    def adopt(self, obj: Any) -> "Entity":
+        """Copies a `GameObject`'s fields into a new entity.
+
+        Status effects are copied into the entity's own `StatusEffects` with
+        their remaining durations, so they go on ticking and expiring.
+
+        Args:
+            obj (GameObject): The object to copy. It is not modified.
+
+        Returns:
+            Entity: A handle to the new entity.
+        """
+        entity = self.spawn(obj.name, obj.symbol, obj.x, obj.y, obj.z, obj.health, obj.speed,
+                            obj.visible, obj.solid, obj.defense)
+        if obj.attributes:
+            self._attributes[entity.id] = dict(obj.attributes)
+        if obj.status_effects:
+            sync = getattr(obj.status_effects, "sync", None)
+            if sync is not None:
+                sync()  # Copy the remaining durations, not the ones last written.
+            self._status_effects[entity.id] = effects.StatusEffects(
+                entity, {name: dict(record) for name, record in obj.status_effects.items()})
+        return entity
+
+    def despawn(self, entity: Any) -> None:
+        """Removes an entity; its id may be reused by the next `spawn`.
+
+        Args:
+            entity (Entity | int): The entity or its id.
+
+        Raises:
+            KeyError: If the entity does not exist.
+        """
+        eid = entity.id if isinstance(entity, Entity) else entity
+        if eid not in self:
+            raise KeyError(eid)
+        self._live[eid] = 0
+        self.names[eid] = None
+        self.symbols[eid] = None
+        self._attributes.pop(eid, None)
+        self._status_effects.pop(eid, None)
+        self._free.append(eid)
+
+    def advance_effects(self) -> None:
+        """Plays one turn of status effects for every entity that has any."""
+        for status_effects in list(self._status_effects.values()):
+            status_effects.advance()
+
+    def entity(self, eid: int) -> "Entity":
+        """Returns a handle to an existing entity.
+
+        Raises:
+            KeyError: If the entity does not exist.
+        """
+        if eid not in self:
+            raise KeyError(eid)
+        return Entity(self, eid)
+
+    def ids(self) -> Iterator[int]:
+        """Yields the id of every entity, in id order."""
+        return compress(range(len(self._live)), self._live)
+
+    def column(self, field: str) -> Iterator[float]:
+        """Yields one field of every entity, in id order.
+
+        Args:
+            field (str): One of `FIELDS`.
+        """
+        return compress(self._columns[field], self._live)
+
+    def rows(self, *fields: str) -> Iterator[Tuple[Any, ...]]:
+        """Yields `(id, *values)` for every entity, in id order.
+
+        Args:
+            *fields (str): The fields to read, each one of `FIELDS`.
+        """
+        columns = [self._columns[field] for field in fields]
+        return compress(zip(range(len(self._live)), *columns), self._live)
+
+    def raw_column(self, field: str) -> array:
+        """Returns the storage array of a field, indexed by entity id.
+
+        The array includes the rows of despawned entities (see `ids`) and is
+        written through by every handle, so bulk updates can be applied to
+        it directly.
+
+        Args:
+            field (str): One of `FIELDS`.
+        """
+        return self._columns[field]
+
+
+def _column_property(field: str) -> property:
+    """Creates an `Entity` property that reads and writes one column."""
+
+    def get(self):
+        return self.world._columns[field][self.id]
+
+    def set(self, value):
+        self.world._columns[field][self.id] = value
+
+    return property(get, set, doc=f"float: The entity's `{field}`, stored in the world's column.")
+
+
+class Entity:
+    """A handle to one entity of a `World`.
+
+    Handles are cheap to create and compare equal when they refer to the
+    same entity.
+
+    Attributes:
+        world (World): The world storing the entity.
+        id (int): The entity's row in the world's columns.
+    """
+
+    __slots__ = ("world", "id")
+
+    x = _column_property("x")
+    y = _column_property("y")
+    z = _column_property("z")
+    health = _column_property("health")
+    speed = _column_property("speed")
+    defense = _column_property("defense")
+
+    def __init__(self, world: World, eid: int):
+        self.world = world
+        self.id = eid
+
+    def __eq__(self, other):
+        return isinstance(other, Entity) and other.world is self.world and other.id == self.id
+
+    def __hash__(self):
+        return hash((id(self.world), self.id))
+
+    def __repr__(self):
+        return f"{self.name}(x={self.x}, y={self.y}, z={self.z}, health={self.health})"
+
+    @property
+    def name(self) -> str:
+        """str: The entity's name."""
+        return self.world.names[self.id]
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self.world.names[self.id] = value
+
+    @property
+    def symbol(self) -> str:
+        """str: The character used to represent the entity on the map."""
+        return self.world.symbols[self.id]
+
+    @symbol.setter
+    def symbol(self, value: str) -> None:
+        self.world.symbols[self.id] = value
+
+    @property
+    def visible(self) -> bool:
+        """bool: Whether the entity is visible on the map."""
+        return bool(self.world.visible[self.id])
+
+    @visible.setter
+    def visible(self, value: bool) -> None:
+        self.world.visible[self.id] = bool(value)
+
+    @property
+    def solid(self) -> bool:
+        """bool: Whether the entity blocks movement."""
+        return bool(self.world.solid[self.id])
+
+    @solid.setter
+    def solid(self, value: bool) -> None:
+        self.world.solid[self.id] = bool(value)
+
+    @property
+    def attributes(self) -> Dict[str, Any]:
+        """dict: Additional attributes, created on first access."""
+        return self.world._attributes.setdefault(self.id, {})
+
+    @property
+    def status_effects(self) -> effects.StatusEffects:
+        """StatusEffects: Active status effects, created on first access.
+
+        Effects tick and expire as they do on a `GameObject`, when the world's
+        `advance_effects` is called. Entities have no derived stats, so
+        stat-modifying effects are kept but change nothing.
+        """
+        status_effects = self.world._status_effects.get(self.id)
+        if status_effects is None:
+            status_effects = self.world._status_effects[self.id] = effects.StatusEffects(self)
+        return status_effects
+
+    def mark_dirty(self) -> None:
+        """Does nothing: worlds are not saved incrementally."""
+
+    def invalidate_stats(self) -> None:
+        """Does nothing: entities have no cached stats."""
+
+    def take_damage(self, damage: float) -> None:
+        """Reduces the entity's health by the damage its defense lets through.
+
+        Args:
+            damage (float): The amount of incoming damage.
+        """
+        actual_damage = max(0, damage - self.defense)
+        self.health -= actual_damage
+        if actual_damage > 0:
+            events.bus.emit(events.DAMAGE, target=self.name, amount=actual_damage)
+        else:
+            events.bus.emit(events.BLOCKED, target=self.name, amount=damage)
+
+    def distance_to(self, other: Any) -> float:
+        """Calculates the distance to another entity or `GameObject`.
+
+        Args:
+            other (Entity | GameObject): The other object.
+
+        Returns:
+            float: The distance between the two.
+        """
+        dx = self.x - other.x
+        dy = self.y - other.y
+        dz = self.z - other.z
+        return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+    def move(self, dx: float, dy: float, dz: float = 0) -> None:
+        """Moves the entity by the specified amount.
+
+        Args:
+            dx (float): The change in x-coordinate.
+            dy (float): The change in y-coordinate.
+            dz (float): The change in z-coordinate.
+        """
+        columns = self.world._columns
+        columns["x"][self.id] += dx
+        columns["y"][self.id] += dy
+        columns["z"][self.id] += dz
@@ -0,0 +1,319 @@
+"""Status effects: registered effect types, stacking rules and timer wheels.
+
+Every `game.GameObject` keeps its active effects in a `StatusEffects`
+mapping from effect name to a record such as `{'duration': 3, 'potency': 2}`.
+Instead of decrementing every record every turn, the mapping keeps:
+
+- a turn counter, advanced once per `advance` (the object's own turn),
+- a timer wheel: a dictionary from expiry turn to the effects expiring then,
+- the effects whose type ticks (e.g. poison), in application order,
+- the effects whose type modifies stats (e.g. armor_break), likewise.
+
+So `advance` only touches the effects that tick or expire this turn, and
+recomputing an object's stats only visits the effects that modify them. A
+record's `duration` is kept current for ticking effects; `remaining` gives
+the live value of any effect, and `sync` brings every record up to date
+(saves do this automatically).
+
+How an effect behaves is described by its registered `EffectType`:
+
+    effects.register("burn", tick=burn_tick)
+    target.status_effects.add("burn", 3, potency=4)
+
+Effects that were never registered replace any existing record and do not
+tick. Writing a record or a bare number of turns directly, as in
+`status_effects['sleep'] = 6`, stores `{'duration': 6}` and schedules it,
+replacing any existing record.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import events
+
+# Stacking rules: what `StatusEffects.add` does when the effect is active.
+REPLACE = "replace"  # The new record replaces the old one.
+REFRESH = "refresh"  # Keep the longer of the two durations; update parameters.
+EXTEND = "extend"    # Add the new duration to the remaining one; update parameters.
+STACKING_RULES = (REPLACE, REFRESH, EXTEND)
+
+# Called with the effect's owner and record each turn the effect is active.
+Tick = Callable[[Any, Dict[str, Any]], None]
+# Called with the owner's derived stats (see `modifiers`) and the record.
+Modifier = Callable[[Dict[str, Any], Dict[str, Any]], None]
+
+
+class EffectType:
+    """How one kind of status effect stacks, ticks and modifies stats.
+
+    Attributes:
+        name (str): The effect name used as the `status_effects` key.
+        stacking (str): One of `STACKING_RULES`.
+        tick (Optional[Tick]): Applied every turn before the effect counts
+            down, or None for effects that only last.
+        modifier (Optional[Modifier]): Adjusts the owner's derived stats
+            while the effect is active, or None.
+    """
+
+    __slots__ = ("name", "stacking", "tick", "modifier")
+
+    def __init__(self, name: str, stacking: str = REPLACE, tick: Optional[Tick] = None,
+                 modifier: Optional[Modifier] = None):
+        if stacking not in STACKING_RULES:
+            raise ValueError(f"Unknown stacking rule {stacking!r}; expected one of {STACKING_RULES}.")
+        self.name = name
+        self.stacking = stacking
+        self.tick = tick
+        self.modifier = modifier
+
+    def __repr__(self) -> str:
+        return f"EffectType({self.name!r}, stacking={self.stacking!r}, ticks={self.tick is not None})"
+
+
+_registry: Dict[str, EffectType] = {}
+
+
+def register(name: str, stacking: str = REPLACE, tick: Optional[Tick] = None,
+             modifier: Optional[Modifier] = None) -> EffectType:
+    """Registers (or redefines) an effect type.
+
+    Args:
+        name (str): The effect name.
+        stacking (str): One of `STACKING_RULES`.
+        tick (Optional[Tick]): Applied to the owner every turn.
+        modifier (Optional[Modifier]): Adjusts the owner's derived stats.
+
+    Returns:
+        EffectType: The registered type.
+
+    Raises:
+        ValueError: If `stacking` is not a known rule.
+    """
+    effect = _registry[name] = EffectType(name, stacking, tick, modifier)
+    return effect
+
+
+def effect_type(name: str) -> EffectType:
+    """Returns the registered type of an effect, registering a plain one if needed."""
+    effect = _registry.get(name)
+    if effect is None:
+        effect = register(name)
+    return effect
+
+
+def poison_tick(owner: Any, record: Dict[str, Any]) -> None:
+    """Deals the record's `potency` (default 1) as damage."""
+    potency = record.get('potency', 1)
+    owner.take_damage(potency)
+    events.bus.emit(events.EFFECT_TICK, target=owner.name, amount=potency, detail='poison')
+
+
+def armor_break_modifier(stats: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Ignores all of the owner's defense."""
+    stats['defense'] = 0
+
+
+def vulnerable_modifier(stats: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Multiplies the damage the owner takes by the record's `multiplier` (default 2)."""
+    stats['damage_taken'] = stats.get('damage_taken', 1) * record.get('multiplier', 2)
+
+
+def empowered_modifier(stats: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Adds the record's `power` (default 5) to the owner's attack damage."""
+    stats['damage'] = stats.get('damage', 0) + record.get('power', 5)
+
+
+register('poison', tick=poison_tick)
+register('vulnerable', EXTEND, modifier=vulnerable_modifier)
+register('armor_break', modifier=armor_break_modifier)
+register('empowered', modifier=empowered_modifier)
+for _name in ('stun', 'sleep', 'slow', 'psychic_damage', 'evasion', 'confusion'):
+    register(_name)
+
+
+class StatusEffects(dict):
+    """A status effect dictionary with a timer wheel, owned by one object.
+
+    Writes mark the owner dirty, because incremental saves only rewrite
+    objects that changed since the last save. Applying, changing or removing
+    an effect whose type has a stat modifier also drops the owner's cached
+    stats.
+
+    Attributes:
+        owner (GameObject): The object whose status effects these are.
+        turn (int): The number of times `advance` has been called.
+    """
+
+    __slots__ = ("owner", "turn", "_expiry", "_wheel", "_ticking", "_modifying")
+
+    def __init__(self, owner, *args, **kwargs):
+        super().__init__()
+        self.owner = owner
+        self.turn = 0
+        self._expiry: Dict[str, int] = {}
+        self._wheel: Dict[int, List[str]] = {}
+        self._ticking: Dict[str, None] = {}  # An ordered set.
+        self._modifying: Dict[str, None] = {}  # Likewise.
+        for name, value in dict(*args, **kwargs).items():
+            self._store(name, value)
+
+    def _store(self, name: str, value: Any) -> Dict[str, Any]:
+        """Stores a record (or a bare number of turns) and schedules its expiry."""
+        record = value if isinstance(value, dict) else {'duration': value}
+        super().__setitem__(name, record)
+        self._schedule(name, record.get('duration', 1))
+        effect = effect_type(name)
+        if effect.tick is not None:
+            self._ticking[name] = None
+        else:
+            self._ticking.pop(name, None)
+        if effect.modifier is not None:
+            self._modifying[name] = None
+            self.owner.invalidate_stats()
+        else:
+            self._modifying.pop(name, None)
+        return record
+
+    def _schedule(self, name: str, duration: int) -> None:
+        # An effect always lasts until at least the next turn, as it did when
+        # durations were decremented before being checked.
+        expiry = self.turn + max(1, duration)
+        self._expiry[name] = expiry
+        self._wheel.setdefault(expiry, []).append(name)
+
+    def _forget(self, name: str) -> None:
+        # Wheel entries are dropped lazily, when their turn comes.
+        self._expiry.pop(name, None)
+        self._ticking.pop(name, None)
+        if name in self._modifying:
+            del self._modifying[name]
+            self.owner.invalidate_stats()
+
+    def __setitem__(self, name, value):
+        self._store(name, value)
+        self.owner.mark_dirty()
+
+    def __delitem__(self, name):
+        super().__delitem__(name)
+        self._forget(name)
+        self.owner.mark_dirty()
+
+    def pop(self, name, *default):
+        self.owner.mark_dirty()
+        self._forget(name)
+        return super().pop(name, *default)
+
+    def popitem(self):
+        self.owner.mark_dirty()
+        name, record = super().popitem()
+        self._forget(name)
+        return name, record
+
+    def clear(self):
+        super().clear()
+        self._expiry.clear()
+        self._wheel.clear()
+        self._ticking.clear()
+        self._modifying.clear()
+        self.owner.invalidate_stats()
+        self.owner.mark_dirty()
+
+    def update(self, *args, **kwargs):
+        for name, value in dict(*args, **kwargs).items():
+            self._store(name, value)
+        self.owner.mark_dirty()
+
+    def setdefault(self, name, default=None):
+        self.owner.mark_dirty()
+        if name in self:
+            return self[name]
+        return self._store(name, default)
+
+    def add(self, name: str, duration: int, **params) -> Dict[str, Any]:
+        """Applies an effect following its type's stacking rule.
+
+        Args:
+            name (str): The effect name.
+            duration (int): The number of turns the effect lasts.
+            **params: Extra fields of the record, e.g. `potency`.
+
+        Returns:
+            dict: The effect's record.
+        """
+        effect = effect_type(name)
+        stacking = effect.stacking
+        if name not in self or stacking == REPLACE:
+            self[name] = record = {'duration': duration, **params}
+            return record
+        record = self[name]
+        record.update(params)
+        if params and effect.modifier is not None:
+            self.owner.invalidate_stats()
+        if stacking == EXTEND:
+            self.extend(name, duration)
+        elif duration > self.remaining(name):
+            record['duration'] = duration
+            self._schedule(name, duration)
+        self.owner.mark_dirty()
+        return record
+
+    def extend(self, name: str, turns: int) -> None:
+        """Lengthens an active effect by a number of turns.
+
+        Raises:
+            KeyError: If the effect is not active.
+        """
+        remaining = self.remaining(name) + turns
+        self[name]['duration'] = remaining
+        self._schedule(name, remaining)
+        self.owner.mark_dirty()
+
+    def remaining(self, name: str) -> int:
+        """Returns the number of turns an active effect has left.
+
+        Raises:
+            KeyError: If the effect is not active.
+        """
+        return self._expiry[name] - self.turn
+
+    def modifying(self) -> List[str]:
+        """Returns the names of the active effects whose type modifies stats, in application order."""
+        return list(self._modifying)
+
+    def sync(self) -> "StatusEffects":
+        """Sets every record's `duration` to its remaining number of turns."""
+        turn = self.turn
+        for name, expiry in self._expiry.items():
+            dict.__getitem__(self, name)['duration'] = expiry - turn
+        return self
+
+    def advance(self) -> List[str]:
+        """Plays one turn: ticks ticking effects, then expires due ones.
+
+        Returns:
+            List[str]: The names of the effects that expired.
+        """
+        self.turn = turn = self.turn + 1
+        if not self:
+            self._wheel.pop(turn, None)
+            return []
+        owner = self.owner
+        owner.mark_dirty()
+        for name in list(self._ticking):
+            record = self.get(name)
+            if record is None:
+                continue
+            effect_type(name).tick(owner, record)
+            expiry = self._expiry.get(name)
+            if expiry is not None:
+                record['duration'] = expiry - turn
+        due = self._wheel.pop(turn, None)
+        if not due:
+            return []
+        expired = []
+        expiry = self._expiry
+        for name in due:
+            if expiry.get(name) == turn and name in self:
+                expired.append(name)
+                del self[name]
+                events.bus.emit(events.EFFECT_EXPIRED, target=owner.name, detail=name)
+        return expired
@@ -0,0 +1,281 @@
+"""Structured combat and item events.
+
+Combat and inventory code in `game` used to `print` a formatted line for
+every hit, miss, status tick and item use, and under simulation building
+those strings dominated the profile. That code now reports what happened to
+an `EventBus` instead:
+
+    events.bus.emit(events.DAMAGE, target=self.name, amount=actual_damage)
+
+The bus records each event into a preallocated ring buffer, one column per
+field, so recording allocates nothing. An event is only turned into text
+when someone asks for it, using the template for its kind (or the `text`
+template it was emitted with):
+
+- `bus.echo` prints every event as it happens. It is on for the module-level
+  `bus`, so the interactive games read exactly as before; headless runs turn
+  it off.
+- `bus.subscribe` delivers events, or their text, to callbacks such as
+  `Game.log_message` or a `CombatLog`.
+- Iterating the bus yields the recorded events, oldest first.
+"""
+
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+# Number of events a bus keeps before overwriting the oldest.
+CAPACITY: int = 4096
+
+# Event kinds.
+ATTACK = "attack"
+CRIT = "crit"
+MISS = "miss"
+EVADED = "evaded"
+DAMAGE = "damage"
+BLOCKED = "blocked"
+ARMOR_BROKEN = "armor_broken"
+EFFECT_APPLIED = "effect_applied"
+EFFECT_TICK = "effect_tick"
+EFFECT_EXPIRED = "effect_expired"
+STUNNED = "stunned"
+HEAL = "heal"
+SPELL = "spell"
+NO_MANA = "no_mana"
+ABILITY = "ability"
+NOTICE = "notice"
+ITEM_PICKED_UP = "item_picked_up"
+ITEM_DROPPED = "item_dropped"
+ITEM_USED = "item_used"
+ITEM_CONSUMED = "item_consumed"
+ITEM_NOT_FOUND = "item_not_found"
+ITEM_REFUSED = "item_refused"
+EXPERIENCE = "experience"
+LEVEL_UP = "level_up"
+
+# How each kind reads. Templates are `str.format` strings over the event's
+# `source`, `target`, `amount` and `detail`.
+TEMPLATES: Dict[str, str] = {
+    ATTACK: "{source} attacks {target} for {amount} damage.",
+    CRIT: "CRITICAL HIT! {source} attacks {target} with {detail} for {amount} damage.",
+    MISS: "{source}'s attack missed {target}!",
+    EVADED: "{source}'s attack was evaded by {target}!",
+    DAMAGE: "{target} takes {amount} damage.",
+    BLOCKED: "{target}'s defense holds strong!",
+    ARMOR_BROKEN: "{target} is armor broken! Defense is negated.",
+    EFFECT_APPLIED: "{target} is now affected by {detail}.",
+    EFFECT_TICK: "{target} takes {amount} damage from {detail}.",
+    EFFECT_EXPIRED: "{target} is no longer {detail}.",
+    STUNNED: "{source} is stunned and cannot act.",
+    HEAL: "{target} restored {amount} {detail}.",
+    SPELL: "{source} casts {detail} on {target} for {amount} damage!",
+    NO_MANA: "{source} does not have enough mana to cast {detail}!",
+    ABILITY: "{source} uses {detail}.",
+    NOTICE: "{detail}",
+    ITEM_PICKED_UP: "{source} picked up {detail}.",
+    ITEM_DROPPED: "{source} dropped {detail}.",
+    ITEM_USED: "Using {detail} on {target}.",
+    ITEM_CONSUMED: "Used {detail}.",
+    ITEM_NOT_FOUND: "'{detail}' not found in inventory.",
+    ITEM_REFUSED: "{source} cannot use {detail}.",
+    EXPERIENCE: "{source} gained {amount} experience.",
+    LEVEL_UP: "{source} leveled up to level {amount}!",
+}
+
+COMBAT_EVENTS: FrozenSet[str] = frozenset({
+    ATTACK, CRIT, MISS, EVADED, DAMAGE, BLOCKED, ARMOR_BROKEN, EFFECT_APPLIED, EFFECT_TICK, EFFECT_EXPIRED,
+    STUNNED, HEAL, SPELL, NO_MANA, ABILITY, NOTICE,
+})
+ITEM_EVENTS: FrozenSet[str] = frozenset({
+    ITEM_PICKED_UP, ITEM_DROPPED, ITEM_USED, ITEM_CONSUMED, ITEM_NOT_FOUND, ITEM_REFUSED,
+})
+
+
+class Event(NamedTuple):
+    """One recorded event.
+
+    Attributes:
+        kind (str): What happened, one of the kinds above.
+        source (Optional[str]): The name of whoever acted.
+        target (Optional[str]): The name of whoever was affected.
+        amount (Any): The damage, healing, quantity, ... involved.
+        detail (Any): Kind-specific detail, e.g. an effect or item name.
+        text (Optional[str]): A template that replaces the kind's own.
+    """
+
+    kind: str
+    source: Optional[str] = None
+    target: Optional[str] = None
+    amount: Any = None
+    detail: Any = None
+    text: Optional[str] = None
+
+    @property
+    def message(self) -> str:
+        """str: The event as a line of text, formatted on access."""
+        template = self.text if self.text is not None else TEMPLATES[self.kind]
+        return template.format(source=self.source, target=self.target, amount=self.amount, detail=self.detail)
+
+
+# A subscriber: callback, the kinds it wants (None for all), whether it wants text.
+_Subscriber = Tuple[Callable[[Any], Any], Optional[FrozenSet[str]], bool]
+
+
+class EventBus:
+    """Records events into a ring buffer and fans them out to subscribers.
+
+    Attributes:
+        capacity (int): The number of events kept.
+        echo (bool): Whether every event is printed as it is emitted.
+        total (int): The number of events emitted so far.
+    """
+
+    def __init__(self, capacity: int = CAPACITY, echo: bool = False):
+        if capacity < 1:
+            raise ValueError("An event bus needs room for at least one event.")
+        self.capacity = capacity
+        self.echo = echo
+        self.total = 0
+        self._kinds: List[Optional[str]] = [None] * capacity
+        self._sources: List[Optional[str]] = [None] * capacity
+        self._targets: List[Optional[str]] = [None] * capacity
+        self._amounts: List[Any] = [None] * capacity
+        self._details: List[Any] = [None] * capacity
+        self._texts: List[Optional[str]] = [None] * capacity
+        self._subscribers: List[_Subscriber] = []
+
+    def emit(self, kind: str, source: Optional[str] = None, target: Optional[str] = None, amount: Any = None,
+             detail: Any = None, text: Optional[str] = None) -> None:
+        """Records an event and delivers it to the echo and subscribers.
+
+        Args:
+            kind (str): What happened.
+            source (Optional[str]): The name of whoever acted.
+            target (Optional[str]): The name of whoever was affected.
+            amount (Any): The amount involved.
+            detail (Any): Kind-specific detail.
+            text (Optional[str]): A template to use instead of the kind's.
+        """
+        slot = self.total % self.capacity
+        self._kinds[slot] = kind
+        self._sources[slot] = source
+        self._targets[slot] = target
+        self._amounts[slot] = amount
+        self._details[slot] = detail
+        self._texts[slot] = text
+        self.total += 1
+        if not self.echo and not self._subscribers:
+            return
+        event = Event(kind, source, target, amount, detail, text)
+        message = None
+        if self.echo:
+            message = event.message
+            print(message)
+        for callback, kinds, as_text in self._subscribers:
+            if kinds is None or kind in kinds:
+                if not as_text:
+                    callback(event)
+                    continue
+                if message is None:
+                    message = event.message
+                callback(message)
+
+    def subscribe(self, callback: Callable[[Any], Any], kinds: Optional[Iterable[str]] = None,
+                  text: bool = False) -> Callable[[Any], Any]:
+        """Delivers future events to a callback.
+
+        Args:
+            callback (Callable): Called with each matching `Event`, or with
+                its text if `text` is set.
+            kinds (Optional[Iterable[str]]): The kinds to deliver; all if None.
+            text (bool): Deliver `event.message` instead of the event.
+
+        Returns:
+            Callable: `callback`, for use with `unsubscribe`.
+        """
+        self._subscribers.append((callback, frozenset(kinds) if kinds is not None else None, text))
+        return callback
+
+    def unsubscribe(self, callback: Callable[[Any], Any]) -> None:
+        """Stops delivering events to a callback. Unknown callbacks are ignored."""
+        self._subscribers = [subscriber for subscriber in self._subscribers if subscriber[0] != callback]
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    @property
+    def dropped(self) -> int:
+        """int: The number of events overwritten by newer ones."""
+        return max(0, self.total - self.capacity)
+
+    def __iter__(self) -> Iterator[Event]:
+        start = self.total - len(self)
+        for position in range(start, self.total):
+            slot = position % self.capacity
+            yield Event(self._kinds[slot], self._sources[slot], self._targets[slot], self._amounts[slot],
+                        self._details[slot], self._texts[slot])
+
+    def recent(self, count: int) -> List[Event]:
+        """Returns up to the `count` newest events, oldest first."""
+        events = list(self)
+        return events[-count:] if count > 0 else []
+
+    def messages(self) -> List[str]:
+        """Returns the text of every recorded event, oldest first."""
+        return [event.message for event in self]
+
+    def clear(self) -> None:
+        """Forgets every recorded event. Subscribers are kept."""
+        self.total = 0
+        for column in (self._kinds, self._sources, self._targets, self._amounts, self._details, self._texts):
+            column[:] = [None] * self.capacity
+
+
+class CombatLog:
+    """Tallies combat events per combatant.
+
+    Subscribe it to a bus with `attach`. Damage dealt counts attack and spell
+    damage before defense; damage taken counts what got through.
+
+    Attributes:
+        attacks (Dict[str, int]): Attacks and spells that landed, by source.
+        crits (Dict[str, int]): Critical hits, by source.
+        misses (Dict[str, int]): Attacks that missed or were evaded, by source.
+        damage_dealt (Dict[str, int]): Attack and spell damage, by source.
+        damage_taken (Dict[str, int]): Damage received, by target.
+    """
+
+    def __init__(self):
+        self.attacks: Dict[str, int] = {}
+        self.crits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self.damage_dealt: Dict[str, int] = {}
+        self.damage_taken: Dict[str, int] = {}
+        self._bus: Optional[EventBus] = None
+
+    def attach(self, event_bus: Optional[EventBus] = None) -> "CombatLog":
+        """Subscribes the log to a bus (the module-level `bus` by default)."""
+        self.detach()
+        self._bus = event_bus if event_bus is not None else bus
+        self._bus.subscribe(self, COMBAT_EVENTS)
+        return self
+
+    def detach(self) -> None:
+        """Unsubscribes the log from its bus, if any."""
+        if self._bus is not None:
+            self._bus.unsubscribe(self)
+            self._bus = None
+
+    def __call__(self, event: Event) -> None:
+        kind = event.kind
+        if kind == ATTACK or kind == CRIT or kind == SPELL:
+            self.attacks[event.source] = self.attacks.get(event.source, 0) + 1
+            self.damage_dealt[event.source] = self.damage_dealt.get(event.source, 0) + event.amount
+            if kind == CRIT:
+                self.crits[event.source] = self.crits.get(event.source, 0) + 1
+        elif kind == MISS or kind == EVADED:
+            self.misses[event.source] = self.misses.get(event.source, 0) + 1
+        elif kind == DAMAGE:
+            self.damage_taken[event.target] = self.damage_taken.get(event.target, 0) + event.amount
+
+
+# The bus the games report to. It echoes, so interactive play prints as before.
+bus = EventBus(echo=True)
@@ -6,13 +6,20 @@ serves as a testing ground for game mechanics before they are implemented in
 the main C# Unity project.
 """
 
+import contextlib
 import json
 import math
-import random
 import sys
 import time
 
 import database  # Import the new database module
+import effects
+import events
+import modifiers
+import pathfinding
+import render
+import rng
+import scene_index
 
 
 # --- Helper to provide class definitions to the database module ---
@@ -29,7 +36,7 @@ def get_class_by_name(class_name):
 
 
 # Inject this function into the database module
-database.set_class_loader(get_class_by_name)
+database.set_class_loader(get_class_by_name, module=__name__)
 
 
 class GameObject:
@@ -48,6 +55,8 @@ class GameObject:
         defense (int): The base defense value of the object.
         attributes (dict): A dictionary for storing additional attributes.
         status_effects (dict): A dictionary for storing active status effects.
+        stats (dict): The derived combat stats; see `modifiers`.
+        dirty (bool): Whether the object changed since it was last saved.
     """
 
     def __init__(self, name="Object", symbol='?', x=0, y=0, z=0, state=None, health=100, speed=1, visible=True,
@@ -63,7 +72,91 @@ class GameObject:
         self.solid = solid
         self.defense = defense
         self.attributes = {}  # Dictionary for storing additional attributes.
-        self.status_effects = {}  # e.g., {'sleep': 6, 'slow': 8}
+        self.status_effects = {}  # e.g., {'sleep': {'duration': 6}}; see `effects`.
+
+    def __setattr__(self, name, value):
+        """Sets an attribute and marks the object as changed.
+
+        Every attribute assignment (position, health, mana, AI state, ...)
+        flags the object for the next incremental save and is reported to
+        the index of the scene holding the object. A plain dict assigned to
+        `status_effects` is wrapped so in-place changes are tracked as well.
+        Assigning one of `modifiers.INPUTS` drops the cached `stats`.
+
+        Args:
+            name (str): The attribute name.
+            value: The new value.
+        """
+        if name == 'status_effects' and type(value) is dict:
+            value = effects.StatusEffects(self, value)
+        object.__setattr__(self, name, value)
+        if name in modifiers.INPUTS:
+            self.__dict__.pop('_stats', None)
+        self.__dict__['_dirty'] = True
+        index = self.__dict__.get('_scene_index')
+        if index is not None:
+            index.attribute_changed(self, name)
+
+    def __getstate__(self):
+        """Returns the state to save, without the dirty flag, scene index or cached stats.
+
+        Returns:
+            dict: The object's attributes.
+        """
+        state = self.__dict__.copy()
+        state.pop('_dirty', None)
+        state.pop('_scene_index', None)
+        state.pop('_stats', None)
+        if isinstance(state.get('status_effects'), effects.StatusEffects):
+            state['status_effects'].sync()
+        return state
+
+    def __setstate__(self, state):
+        """Restores saved state. Restored objects start out dirty.
+
+        Args:
+            state (dict): The attributes returned by `__getstate__`.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def dirty(self):
+        """bool: Whether the object changed since it was last saved."""
+        return self.__dict__.get('_dirty', True)
+
+    def mark_dirty(self):
+        """Flags the object for the next incremental save.
+
+        Attribute assignments and `status_effects` writes do this
+        automatically; call it after mutating other containers in place
+        (e.g. an inventory list).
+        """
+        self.__dict__['_dirty'] = True
+
+    def mark_clean(self):
+        """Clears the dirty flag once the object's state has been saved."""
+        self.__dict__['_dirty'] = False
+
+    @property
+    def stats(self):
+        """dict: The derived combat stats, computed by `modifiers.compute` on first use after a change.
+
+        Treat the dictionary as read-only; it is shared until the next change.
+        """
+        stats = self.__dict__.get('_stats')
+        if stats is None:
+            stats = self.__dict__['_stats'] = modifiers.compute(self)
+        return stats
+
+    def invalidate_stats(self):
+        """Drops the cached `stats`, so they are recomputed on next use.
+
+        Attribute assignments, equipment changes and stat-modifying status
+        effects do this automatically; call it after changing a stat source
+        any other way (e.g. writing `equipment.slots` directly).
+        """
+        self.__dict__.pop('_stats', None)
 
     def __repr__(self):
         """Returns a string representation of the GameObject, useful for debugging.
@@ -102,29 +195,26 @@ class GameObject:
     def take_damage(self, damage):
         """Reduces the object's health after factoring in defense.
 
-        This method calculates the actual damage taken by subtracting the
-        object's defense from the incoming damage. It also checks for status
-        effects like 'armor_break' that may modify defense.
+        The incoming damage is scaled by the object's `damage_taken` stat
+        (raised by 'vulnerable') and reduced by its `defense` stat, which
+        includes equipment and drops to zero under 'armor_break'.
 
         Args:
             damage (int): The amount of incoming damage.
         """
-        total_defense = self.defense
-        # Check if the object has an equipment manager
-        if hasattr(self, 'equipment'):
-            equipped_stats = self.equipment.get_total_stats()
-            total_defense += equipped_stats["defense"]
-
+        stats = self.stats
         if 'armor_break' in self.status_effects:
-            print(f"{self.name} is armor broken! Defense is negated.")
-            total_defense = 0
+            events.bus.emit(events.ARMOR_BROKEN, target=self.name)
 
-        actual_damage = max(0, damage - total_defense)
+        taken = stats['damage_taken']
+        if taken != 1:
+            damage = int(damage * taken)
+        actual_damage = max(0, damage - stats['defense'])
         self.health -= actual_damage
         if actual_damage > 0:
-            print(f"{self.name} takes {actual_damage} damage.")
+            events.bus.emit(events.DAMAGE, target=self.name, amount=actual_damage)
         else:
-            print(f"{self.name}'s defense holds strong!")
+            events.bus.emit(events.BLOCKED, target=self.name, amount=damage)
 
     def update(self, scene_manager):
         """Placeholder for object-specific logic that runs each turn.
@@ -135,34 +225,23 @@ class GameObject:
         self.update_status_effects()
 
     def apply_status_effect(self, effect_name, duration, **kwargs):
-        """Applies a status effect to the object.
+        """Applies a status effect to the object, following its stacking rule.
 
         Args:
-            effect_name (str): The name of the status effect.
+            effect_name (str): The name of the status effect (see `effects`).
             duration (int): The duration of the status effect in turns.
             **kwargs: Additional keyword arguments for the status effect.
         """
-        self.status_effects[effect_name] = {'duration': duration, **kwargs}
-        print(f"{self.name} is now affected by {effect_name}.")
+        self.status_effects.add(effect_name, duration, **kwargs)
+        events.bus.emit(events.EFFECT_APPLIED, target=self.name, amount=duration, detail=effect_name)
 
     def update_status_effects(self):
-        """Updates status effects each turn, applying their effects and decrementing their duration."""
-        effects_to_remove = []
-        for effect, data in list(self.status_effects.items()): # Iterate over a copy
-            if effect == 'poison':
-                potency = data.get('potency', 1)
-                self.take_damage(potency)
-                print(f"{self.name} takes {potency} damage from poison.")
-
-            data['duration'] -= 1
-            if data['duration'] <= 0:
-                effects_to_remove.append(effect)
-
-        for effect in effects_to_remove:
-            if effect in self.status_effects:
-                del self.status_effects[effect]
-                print(f"{self.name} is no longer {effect}.")
+        """Advances the object's status effects by one turn.
 
+        Only the effects that tick (such as poison) or expire this turn are
+        touched; see `effects.StatusEffects.advance`.
+        """
+        self.status_effects.advance()
 
 
 class Item(GameObject):
@@ -170,11 +249,25 @@ class Item(GameObject):
 
     This class serves as a base for all items in the game, including weapons,
     armor, and consumables.
+
+    Attributes:
+        slot (str): The equipment slot the item goes in, or None if it
+            cannot be equipped.
     """
 
+    slot = None
+
     def __init__(self, name="Item", symbol='*', x=0, y=0):
         super().__init__(name, symbol, x, y)
 
+    def stat_bonuses(self):
+        """Returns the stat bonuses the item gives while equipped.
+
+        Returns:
+            dict: Bonuses keyed by stat name (see `modifiers`), e.g. {'damage': 8}.
+        """
+        return {}
+
 
 class Interactable(GameObject):
     """Represents objects that can be examined for a description.
@@ -242,14 +335,15 @@ class Player(GameObject):
         for i, item in enumerate(self.inventory):
             if item.name.lower() == item_name.lower():
                 dropped_item = self.inventory.pop(i)
+                self.mark_dirty()
                 dropped_item.x = self.x
                 dropped_item.y = self.y
                 dropped_item.visible = True
                 dropped_item.solid = False
                 scene.add_object(dropped_item)
-                print(f"{self.name} dropped {dropped_item.name}.")
+                events.bus.emit(events.ITEM_DROPPED, source=self.name, detail=dropped_item.name)
                 return
-        print(f"'{item_name}' not found in inventory.")
+        events.bus.emit(events.ITEM_NOT_FOUND, source=self.name, detail=item_name)
 
     def attack(self, target):
         """Attacks another GameObject.
@@ -260,34 +354,33 @@ class Player(GameObject):
         Args:
             target (GameObject): The target to attack.
         """
+        rolls = rng.stream_for(self)
+
         # --- Evasion Check ---
         if 'evasion' in target.status_effects:
-            if random.uniform(0, 100) < 50:  # 50% chance to miss against evasion
-                print(f"{self.name}'s attack was evaded by {target.name}!")
+            if rolls.uniform(0, 100) < 50:  # 50% chance to miss against evasion
+                events.bus.emit(events.EVADED, source=self.name, target=target.name)
                 return
 
         # --- Critical Hit/Miss Logic (based on dexterity) ---
-        miss_chance = max(0, 5 - self.dexterity / 4)
-        if random.uniform(0, 100) < miss_chance:
-            print(f"{self.name}'s attack missed {target.name}!")
+        stats = self.stats
+        if rolls.uniform(0, 100) < stats['miss_chance']:
+            events.bus.emit(events.MISS, source=self.name, target=target.name)
             return
 
-        crit_chance = 5 + self.dexterity / 2
-        is_critical = random.uniform(0, 100) < crit_chance
+        is_critical = rolls.uniform(0, 100) < stats['crit_chance']
 
-        # --- Damage Calculation (based on strength and equipment) ---
-        equipped_stats = self.equipment.get_total_stats()
-        weapon_damage = equipped_stats["damage"]
-        strength_bonus = self.strength // 2
-        total_damage = weapon_damage + strength_bonus
+        # --- Damage Calculation (strength, equipment and effects; see `modifiers`) ---
+        total_damage = stats['damage']
 
         attack_source = self.equipment.slots["weapon"].name if self.equipment.slots["weapon"] else "bare hands"
 
         if is_critical:
             total_damage *= 2  # Double damage on a critical hit
-            print(f"CRITICAL HIT! {self.name} attacks {target.name} with {attack_source} for {total_damage} damage.")
+            events.bus.emit(events.CRIT, source=self.name, target=target.name, amount=total_damage, detail=attack_source)
         else:
-            print(f"{self.name} attacks {target.name} with {attack_source} for {total_damage} damage.")
+            events.bus.emit(events.ATTACK, source=self.name, target=target.name, amount=total_damage, detail=attack_source,
+                            text="{source} attacks {target} with {detail} for {amount} damage.")
 
         target.take_damage(total_damage)
 
@@ -306,7 +399,7 @@ class Player(GameObject):
         if item_to_equip:
             self.equipment.equip(item_to_equip)
         else:
-            print(f"'{item_name}' not found in inventory.")
+            events.bus.emit(events.ITEM_NOT_FOUND, source=self.name, detail=item_name)
 
     def update(self, scene_manager):
         """Updates the player's state, including mana regeneration.
@@ -331,22 +424,26 @@ class Player(GameObject):
             scene (Scene): The scene the item is being picked up from.
         """
         if len(self.inventory) >= self.inventory_capacity:
-            print("Inventory is full. Cannot pick up.")
+            events.bus.emit(events.ITEM_REFUSED, source=self.name, detail=item.name,
+                            text="Inventory is full. Cannot pick up.")
             return
 
         if isinstance(item, Consumable):
             for inventory_item in self.inventory:
                 if inventory_item.name == item.name and isinstance(inventory_item, Consumable):
                     inventory_item.quantity += 1
-                    print(f"{self.name} picked up another {item.name}. Quantity: {inventory_item.quantity}")
+                    self.mark_dirty()
+                    events.bus.emit(events.ITEM_PICKED_UP, source=self.name, amount=inventory_item.quantity, detail=item.name,
+                                    text="{source} picked up another {detail}. Quantity: {amount}")
                     # Remove the picked-up object from the world
                     scene.game_objects.remove(item)
                     return  # Exit after stacking
 
         # If no stack was found, or it's not a consumable, add as a new item
         self.inventory.append(item)
+        self.mark_dirty()
         scene.game_objects.remove(item)
-        print(f"{self.name} picked up {item.name}.")
+        events.bus.emit(events.ITEM_PICKED_UP, source=self.name, amount=1, detail=item.name)
 
     def use_item(self, item_name, target):
         """
@@ -362,27 +459,31 @@ class Player(GameObject):
                 break
 
         if not item_to_use:
-            # Using print here since the Player doesn't have a direct link to the game log
-            print(f"'{item_name}' not found in inventory.")
+            # Item lookups report through the event bus; see `Game.follow_events`.
+            events.bus.emit(events.ITEM_NOT_FOUND, source=self.name, detail=item_name)
             return False
 
         if isinstance(item_to_use, Consumable):
             item_to_use.use(target)
+            self.mark_dirty()
             # If the item is stackable, decrement quantity and remove if empty.
             if hasattr(item_to_use, 'quantity'):
                 item_to_use.quantity -= 1
                 if item_to_use.quantity <= 0:
                     self.inventory.pop(item_index)
-                    print(f"Used the last {item_to_use.name}.")
+                    events.bus.emit(events.ITEM_CONSUMED, source=self.name, amount=0, detail=item_to_use.name,
+                                    text="Used the last {detail}.")
                 else:
-                    print(f"Used {item_to_use.name}. {item_to_use.quantity} remaining.")
+                    events.bus.emit(events.ITEM_CONSUMED, source=self.name, amount=item_to_use.quantity, detail=item_to_use.name,
+                                    text="Used {detail}. {amount} remaining.")
             else:
                 # If not stackable (no quantity attribute), just remove it.
                 self.inventory.pop(item_index)
-                print(f"Used {item_to_use.name}.")
+                events.bus.emit(events.ITEM_CONSUMED, source=self.name, amount=0, detail=item_to_use.name)
             return True
         else:
-            print(f"You can't 'use' a {item_to_use.name} in that way.")
+            events.bus.emit(events.ITEM_REFUSED, source=self.name, detail=item_to_use.name,
+                            text="You can't 'use' a {detail} in that way.")
             return False
 
     def gain_experience(self, amount):
@@ -392,14 +493,15 @@ class Player(GameObject):
             amount (int): The amount of experience to gain.
         """
         self.experience += amount
-        print(f"{self.name} gained {amount} experience.")
+        events.bus.emit(events.EXPERIENCE, source=self.name, amount=amount)
         self.check_level_up()
 
     def check_level_up(self):
         """Checks if the player has enough experience to level up.
 
         If the player has enough experience, their level is increased, stats
-        are improved, and their health is fully restored.
+        are improved, and their health is fully restored. Raising the level
+        drops the cached `stats`.
         """
         # Example leveling curve: 100 * level * level
         required_experience = 100 * self.level * self.level
@@ -408,7 +510,7 @@ class Player(GameObject):
             self.max_health += 10
             self.health = self.max_health  # Fully heal on level up.
             self.speed *= 1.1  # Increase speed by 10%
-            print(f"{self.name} leveled up to level {self.level}!")
+            events.bus.emit(events.LEVEL_UP, source=self.name, amount=self.level)
 
     def cast_spell(self, spell_name, target):
         """Casts a spell on a target.
@@ -424,21 +526,22 @@ class Player(GameObject):
             if self.mana >= mana_cost:
                 self.mana -= mana_cost
                 spell_damage = 15 + int(self.intelligence * 1.5)
-                print(f"{self.name} casts Fireball on {target.name} for {spell_damage} damage!")
+                events.bus.emit(events.SPELL, source=self.name, target=target.name, amount=spell_damage, detail="Fireball")
                 target.take_damage(spell_damage)
             else:
-                print(f"{self.name} does not have enough mana to cast Fireball!")
+                events.bus.emit(events.NO_MANA, source=self.name, detail="Fireball")
         elif spell_name == "heal":
             mana_cost = 10
             if self.mana >= mana_cost:
                 self.mana -= mana_cost
                 heal_amount = 10 + self.intelligence
                 self.heal(heal_amount)
-                print(f"{self.name} casts Heal and recovers {heal_amount} HP.")
+                events.bus.emit(events.HEAL, source=self.name, target=self.name, amount=heal_amount, detail="Heal",
+                                text="{source} casts {detail} and recovers {amount} HP.")
             else:
-                print(f"{self.name} does not have enough mana to cast Heal!")
+                events.bus.emit(events.NO_MANA, source=self.name, detail="Heal")
         else:
-            print(f"{self.name} does not know the spell {spell_name}.")
+            events.bus.emit(events.NOTICE, source=self.name, detail=spell_name, text="{source} does not know the spell {detail}.")
 
     def heal(self, amount):
         """Restores the player's health.
@@ -493,7 +596,8 @@ class Anastasia(Player):
             if self.lucid_dream_timer <= 0:
                 self.is_lucid_dream_active = False
                 self.lucid_dream_timer = 0
-                print("\n-- Anastasia's Lucid Dream fades. The world returns to normal. --\n")
+                events.bus.emit(events.EFFECT_EXPIRED, target=self.name, detail="Lucid Dream",
+                                text="\n-- Anastasia's Lucid Dream fades. The world returns to normal. --\n")
 
     def build_dream_weave(self, amount):
         """Increases the Dream Weave meter.
@@ -513,13 +617,14 @@ class Anastasia(Player):
             bool: True if Lucid Dream was activated, False otherwise.
         """
         if self.dream_weave >= self.max_dream_weave:
-            print("\n** Anastasia activates LUCID DREAM! The battlefield warps! **\n")
+            events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=self.name, detail="Lucid Dream",
+                            text="\n** Anastasia activates LUCID DREAM! The battlefield warps! **\n")
             self.is_lucid_dream_active = True
             self.lucid_dream_timer = self.lucid_dream_duration
             self.dream_weave = 0
             return True
         else:
-            print("Dream Weave is not full yet!")
+            events.bus.emit(events.NO_MANA, source=self.name, detail="Lucid Dream", text="Dream Weave is not full yet!")
             return False
 
     def lulling_whisper(self, targets):
@@ -532,22 +637,24 @@ class Anastasia(Player):
         """
         cost = 20
         if self.mana < cost:
-            print("Not enough mana!")
+            events.bus.emit(events.NO_MANA, source=self.name, detail="Lulling Whisper", text="Not enough mana!")
             return
 
         self.mana -= cost
-        print(f"{self.name} uses Lulling Whisper.")
+        events.bus.emit(events.ABILITY, source=self.name, detail="Lulling Whisper")
 
         if self.is_lucid_dream_active:
-            print("The whisper becomes a wave, affecting all targets!")
+            events.bus.emit(events.NOTICE, source=self.name, text="The whisper becomes a wave, affecting all targets!")
             for target in targets:
-                target.status_effects['sleep'] = 6
-                print(f"{target.name} has fallen asleep.")
+                target.status_effects.add('sleep', 6)
+                events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=target.name, amount=6, detail="sleep",
+                                text="{target} has fallen asleep.")
         else:
             if targets:
                 target = targets[0]  # Affect only the first target
-                target.status_effects['sleep'] = 6
-                print(f"{target.name} has fallen asleep.")
+                target.status_effects.add('sleep', 6)
+                events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=target.name, amount=6, detail="sleep",
+                                text="{target} has fallen asleep.")
 
         self.build_dream_weave(15)
 
@@ -561,20 +668,22 @@ class Anastasia(Player):
         """
         cost = 25
         if self.mana < cost:
-            print("Not enough mana!")
+            events.bus.emit(events.NO_MANA, source=self.name, detail="Phantasmal Grasp", text="Not enough mana!")
             return
 
         self.mana -= cost
-        print(f"{self.name} uses Phantasmal Grasp on {target.name}.")
+        events.bus.emit(events.ABILITY, source=self.name, target=target.name, detail="Phantasmal Grasp",
+                        text="{source} uses {detail} on {target}.")
 
-        target.status_effects['slow'] = 8
-        target.status_effects['psychic_damage'] = 8  # Represents the DoT effect
-        print(f"{target.name} is slowed by shadowy tendrils.")
+        target.status_effects.add('slow', 8)
+        target.status_effects.add('psychic_damage', 8)  # Represents the DoT effect
+        events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=target.name, detail="slow",
+                        text="{target} is slowed by shadowy tendrils.")
 
         if self.is_lucid_dream_active:
-            print("The grasp erupts from the target, slowing nearby enemies!")
+            events.bus.emit(events.NOTICE, source=self.name, text="The grasp erupts from the target, slowing nearby enemies!")
             # In a real game, you'd find nearby enemies. Here we just simulate it.
-            target.status_effects['slow'] += 4
+            target.status_effects.extend('slow', 4)
 
         self.build_dream_weave(15)
 
@@ -588,22 +697,24 @@ class Anastasia(Player):
         """
         cost = 30
         if self.mana < cost:
-            print("Not enough mana!")
+            events.bus.emit(events.NO_MANA, source=self.name, detail="Fleeting Vision", text="Not enough mana!")
             return
 
         self.mana -= cost
-        print(f"{self.name} uses Fleeting Vision.")
+        events.bus.emit(events.ABILITY, source=self.name, detail="Fleeting Vision")
 
         if self.is_lucid_dream_active:
-            print("The vision is shared with the entire party!")
+            events.bus.emit(events.NOTICE, source=self.name, text="The vision is shared with the entire party!")
             for ally in allies:
-                ally.status_effects['evasion'] = 5
-                print(f"{ally.name} is granted enhanced evasion!")
+                ally.status_effects.add('evasion', 5)
+                events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=ally.name, amount=5, detail="evasion",
+                                text="{target} is granted enhanced evasion!")
         else:
             if allies:
                 ally = allies[0]  # Affect only the first ally
-                ally.status_effects['evasion'] = 5
-                print(f"{ally.name} is granted enhanced evasion!")
+                ally.status_effects.add('evasion', 5)
+                events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=ally.name, amount=5, detail="evasion",
+                                text="{target} is granted enhanced evasion!")
 
     def oneiric_collapse(self, enemies, allies):
         """Ultimate Ability: Pulls the battlefield into the Dreamscape.
@@ -616,20 +727,24 @@ class Anastasia(Player):
             allies (list of GameObject): All allies on the battlefield.
         """
         if not self.is_lucid_dream_active:
-            print("Must be in Lucid Dream to use Oneiric Collapse!")
+            events.bus.emit(events.NOTICE, source=self.name, detail="Oneiric Collapse",
+                            text="Must be in Lucid Dream to use Oneiric Collapse!")
             return
 
-        print(f"\n!!! {self.name} unleashes her ultimate: ONEIRIC COLLAPSE !!!")
-        print("The area is pulled into the Dreamscape!")
+        events.bus.emit(events.ABILITY, source=self.name, detail="Oneiric Collapse",
+                        text="\n!!! {source} unleashes her ultimate: ONEIRIC COLLAPSE !!!")
+        events.bus.emit(events.NOTICE, source=self.name, text="The area is pulled into the Dreamscape!")
 
         for enemy in enemies:
-            enemy.status_effects['confusion'] = 10
-            enemy.status_effects['armor_break'] = 10
-            print(f"{enemy.name} is confused and vulnerable!")
+            enemy.status_effects.add('confusion', 10)
+            enemy.status_effects.add('armor_break', 10)
+            events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=enemy.name, detail="confusion",
+                            text="{target} is confused and vulnerable!")
 
         for ally in allies:
-            ally.status_effects['empowered'] = 10  # Simulate faster cooldowns
-            print(f"{ally.name} feels empowered by the dream!")
+            ally.status_effects.add('empowered', 10)  # +5 attack damage while it lasts
+            events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=ally.name, detail="empowered",
+                            text="{target} feels empowered by the dream!")
 
         self.is_lucid_dream_active = False
         self.lucid_dream_timer = 0
@@ -683,11 +798,14 @@ class Reverie(Player):
                 enigma_gain = spell["cost"] // 2
                 self.enigma = min(self.max_enigma, self.enigma + enigma_gain)
 
-                print(f"{self.name} casts {spell_name} on {target.name}, dealing {spell['damage']} damage.")
-                print(f"{self.name} gains {enigma_gain} Enigma. (Total: {self.enigma}/{self.max_enigma})")
+                events.bus.emit(events.SPELL, source=self.name, target=target.name, amount=spell["damage"], detail=spell_name,
+                                text="{source} casts {detail} on {target}, dealing {amount} damage.")
+                events.bus.emit(events.NOTICE, source=self.name, amount=enigma_gain, detail=(self.enigma, self.max_enigma),
+                                text="{source} gains {amount} Enigma. (Total: {detail[0]}/{detail[1]})")
                 return True
             else:
-                print(f"{self.name} does not have enough mana for {spell_name}.")
+                events.bus.emit(events.NO_MANA, source=self.name, detail=spell_name,
+                                text="{source} does not have enough mana for {detail}.")
                 return False
         else:
             # This is a bit of a hack to reuse the parent's cast_spell method.
@@ -707,7 +825,7 @@ class Reverie(Player):
             bool: True if the ultimate was used, False otherwise.
         """
         if self.enigma >= self.max_enigma:
-            print(f"{self.name} unleashes CHAOS UNLEASHED!")
+            events.bus.emit(events.ABILITY, source=self.name, detail="Chaos Unleashed", text="{source} unleashes CHAOS UNLEASHED!")
             self.enigma = 0  # Reset Enigma after use
 
             # Determine the random, powerful effect
@@ -717,42 +835,52 @@ class Reverie(Player):
                 "double_damage_debuff",
                 "mana_drain"
             ]
-            effect = random.choice(possible_effects)
+            rolls = rng.stream_for(self)
+            effect = rolls.choice(possible_effects)
 
             if effect == "massive_damage":
-                damage = random.randint(100, 200)
-                print(f"A torrent of pure chaotic energy strikes {target.name} for {damage} damage!")
+                damage = rolls.randint(100, 200)
+                events.bus.emit(events.SPELL, source=self.name, target=target.name, amount=damage, detail="Chaos Unleashed",
+                                text="A torrent of pure chaotic energy strikes {target} for {amount} damage!")
                 target.take_damage(damage)
             elif effect == "full_heal_and_mana":
-                print(f"The chaotic energy surges inward, restoring {self.name} to full power!")
+                events.bus.emit(events.HEAL, source=self.name, target=self.name, amount=self.max_health - self.health,
+                                detail="Chaos Unleashed",
+                                text="The chaotic energy surges inward, restoring {target} to full power!")
                 self.health = self.max_health
                 self.mana = self.max_mana
             elif effect == "double_damage_debuff":
-                print(f"The chaotic energy latches onto {target.name}, making them vulnerable.")
-                # The take_damage method already checks for and applies this effect
-                if "vulnerable" in target.status_effects:
-                    target.status_effects["vulnerable"]["duration"] += 2
-                else:
-                    target.status_effects["vulnerable"] = {"duration": 2}
+                events.bus.emit(events.EFFECT_APPLIED, source=self.name, target=target.name, detail="vulnerable",
+                                text="The chaotic energy latches onto {target}, making them vulnerable.")
+                # Vulnerability stacks: a second application adds two more turns.
+                target.status_effects.add("vulnerable", 2)
             elif effect == "mana_drain":
                 drained_mana = 0
                 if hasattr(target, 'mana'):
                     drained_mana = target.mana
                     target.mana = 0
-                print(f"{self.name} drains all of {target.name}'s {drained_mana} mana!")
+                events.bus.emit(events.ABILITY, source=self.name, target=target.name, amount=drained_mana, detail="Chaos Unleashed",
+                                text="{source} drains all of {target}'s {amount} mana!")
                 self.mana = min(self.max_mana, self.mana + drained_mana)
 
             return True
         else:
-            print(f"{self.name} needs more Enigma to use Chaos Unleashed. ({self.enigma}/{self.max_enigma})")
+            events.bus.emit(events.NO_MANA, source=self.name, detail=(self.enigma, self.max_enigma),
+                            text="{source} needs more Enigma to use Chaos Unleashed. ({detail[0]}/{detail[1]})")
             return False
 
 
+# `Enemy.plan_turns` decisions that do not depend on the enemy.
+_NO_ACTION = (None, 0, 0, False)
+_ATTACK = (None, 0, 0, True)
+
+
 class Enemy(GameObject):
     """Represents an enemy character.
 
     Enemies have simple AI that causes them to attack the player when they
-    are within their aggro range.
+    are within their aggro range, chasing them along a shortest path around
+    the scene's terrain (see `step_towards`).
 
     Attributes:
         type (str): The type of the enemy (e.g., "Goblin", "Orc").
@@ -775,21 +903,149 @@ class Enemy(GameObject):
         Args:
             target (GameObject): The target to attack.
         """
-        print(f"{self.name} attacks {target.name} for {self.attack_damage} damage.")
+        events.bus.emit(events.ATTACK, source=self.name, target=target.name, amount=self.attack_damage)
         target.take_damage(self.attack_damage)
 
+    @staticmethod
+    def blocks_path(obj):
+        """Returns whether an object is terrain that enemies walk around.
+
+        Solid objects block, except enemies and players: they move during
+        the turn, and enemies already share tiles with each other.
+        """
+        return getattr(obj, 'solid', False) and not isinstance(obj, (Enemy, Player))
+
+    def step_towards(self, target, scene=None):
+        """Works out the enemy's next step towards a target.
+
+        The enemy steps along the axis it is farther on, which is a shortest
+        way when no terrain (see `blocks_path`) lies in the rectangle between
+        them, or when there is no scene or either of them is off its map.
+        Otherwise the step is read from the scene's flow field towards the
+        target (see `pathfinding.FlowField`), which every enemy chasing the
+        same target shares; an enemy with no way through stays put.
+
+        Args:
+            target (GameObject): The object to approach, usually the player.
+            scene (Scene, optional): The scene whose terrain is in the way.
+
+        Returns:
+            tuple: The (dx, dy) of the step, one tile along one axis, or
+            (0, 0) if there is none.
+        """
+        width, height = (scene.width, scene.height) if scene is not None else (0, 0)
+        if 0 <= self.x < width and 0 <= self.y < height and 0 <= target.x < width and 0 <= target.y < height:
+            start, goal = (int(self.x), int(self.y)), (int(target.x), int(target.y))
+            terrain = pathfinding.terrain(scene, Enemy.blocks_path)
+            if not terrain.clear_between(start, goal):
+                tile = terrain.flow_field(goal).next_tile(*start)
+                if tile is None:
+                    return (0, 0)
+                return (tile[0] - start[0], tile[1] - start[1])
+        dx = target.x - self.x
+        dy = target.y - self.y
+        if abs(dx) > abs(dy):
+            return (1 if dx > 0 else -1, 0)
+        return (0, 1 if dy > 0 else -1)
+
+    @staticmethod
+    def plan_turns(objects, player, scene=None):
+        """Works out the AI decision of many enemies in one pass.
+
+        Reads each enemy's position and state once and computes its distance
+        to the player, its state transition and its step direction exactly
+        as `update` would, without applying any of them. Only enemies that
+        use the stock `update` and `move` are planned.
+
+        Args:
+            objects (list): The objects to plan for, e.g. a scene's
+                `game_objects`.
+            player (Player): The player the enemies react to.
+            scene (Scene, optional): The scene the enemies path through;
+                see `step_towards`.
+
+        Returns:
+            list: One entry per object: a `(new_state, dx, dy, attack)`
+            tuple for planned enemies, where `new_state` is None when the
+            state does not change, and None for every other object.
+        """
+        px, py, pz = player.x, player.y, player.z
+        sqrt = math.sqrt
+        stock = {}  # Maps class -> whether it runs the stock AI.
+        plans = []
+        append = plans.append
+        for obj in objects:
+            cls = type(obj)
+            planned = stock.get(cls)
+            if planned is None:
+                planned = stock[cls] = (issubclass(cls, Enemy) and cls.update is Enemy.update
+                                        and cls.move is GameObject.move)
+            if not planned:
+                append(None)
+                continue
+            dx = px - obj.x
+            dy = py - obj.y
+            dz = pz - obj.z
+            distance = sqrt(dx * dx + dy * dy + dz * dz)
+            state = obj.state
+            if state == 'idle':
+                append(('chasing', 0, 0, False) if distance < obj.aggro_range else _NO_ACTION)
+            elif state == 'chasing':
+                if distance < 1.5:
+                    append(('attacking', 0, 0, False))
+                else:
+                    step_x, step_y = obj.step_towards(player, scene)
+                    append((None, step_x, step_y, False) if step_x or step_y else _NO_ACTION)
+            elif state == 'attacking':
+                append(_ATTACK if distance < 1.5 else ('chasing', 0, 0, False))
+            else:
+                append(_NO_ACTION)
+        return plans
+
+    def take_planned_turn(self, plan, player):
+        """Runs the enemy's turn using its decision from `plan_turns`.
+
+        Equivalent to `update`, provided neither the enemy nor the player
+        moved since the plan was made. A step only assigns the coordinate
+        that changes.
+
+        Args:
+            plan (tuple): This enemy's entry from `plan_turns`.
+            player (Player): The player the plan was made against.
+        """
+        status_effects = self.status_effects
+        if 'stun' in status_effects or 'sleep' in status_effects:
+            events.bus.emit(events.STUNNED, source=self.name)
+            self.update_status_effects()
+            return
+
+        if player.health > 0:
+            new_state, dx, dy, attack = plan
+            if new_state is not None:
+                self.state = new_state
+            elif attack:
+                self.attack(player)
+            elif dx:
+                self.x += dx
+            elif dy:
+                self.y += dy
+
+        if status_effects:
+            self.update_status_effects()
+
     def update(self, scene_manager):
         """AI logic for the enemy's turn."""
         # --- Start of Turn ---
         # Check for effects that prevent action BEFORE doing anything else.
         if 'stun' in self.status_effects or 'sleep' in self.status_effects:
-            print(f"{self.name} is stunned and cannot act.")
+            events.bus.emit(events.STUNNED, source=self.name)
             # Still need to update status effects so stun wears off.
             self.update_status_effects()
             return
 
         # --- Action Phase ---
-        player = scene_manager.scene.player_character
+        scene = scene_manager.scene
+        player = scene.player_character
         if player and player.health > 0:
             distance_to_player = self.distance_to(player)
 
@@ -800,14 +1056,10 @@ class Enemy(GameObject):
                 if distance_to_player < 1.5:  # Attack range
                     self.state = 'attacking'
                 else:
-                    # Move towards player
-                    dx = player.x - self.x
-                    dy = player.y - self.y
-                    # Move one step in the direction of the player
-                    if abs(dx) > abs(dy):
-                        self.move(1 if dx > 0 else -1, 0)
-                    else:
-                        self.move(0, 1 if dy > 0 else -1)
+                    # Move one step along a path to the player
+                    dx, dy = self.step_towards(player, scene)
+                    if dx or dy:
+                        self.move(dx, dy)
 
             elif self.state == 'attacking':
                 if distance_to_player < 1.5:
@@ -828,11 +1080,17 @@ class Weapon(Item):
         weapon_type (str): The type of the weapon (e.g., "Melee", "Ranged").
     """
 
+    slot = "weapon"
+
     def __init__(self, name, description, damage, weapon_type="Melee"):
         super().__init__(name, description)
         self.damage = damage
         self.weapon_type = weapon_type
 
+    def stat_bonuses(self):
+        """Returns the weapon's damage bonus."""
+        return {"damage": self.damage}
+
     def __str__(self):
         return f"{self.name} (Weapon, {self.damage} DMG): {self.description}"
 
@@ -856,7 +1114,7 @@ class Consumable(Item):
         Args:
             target (GameObject): The target of the consumable.
         """
-        print(f"Using {self.name} on {target.name}.")
+        events.bus.emit(events.ITEM_USED, target=target.name, detail=self.name)
 
 
 class HealthPotion(Consumable):
@@ -878,7 +1136,7 @@ class HealthPotion(Consumable):
         """
         super().use(target)
         target.heal(self.amount)
-        print(f"{target.name} restored {self.amount} HP.")
+        events.bus.emit(events.HEAL, target=target.name, amount=self.amount, detail="HP")
 
 
 class ManaPotion(Consumable):
@@ -901,9 +1159,9 @@ class ManaPotion(Consumable):
         super().use(target)
         if hasattr(target, 'mana'):
             target.mana = min(target.max_mana, target.mana + self.amount)
-            print(f"{target.name} restored {self.amount} Mana.")
+            events.bus.emit(events.HEAL, target=target.name, amount=self.amount, detail="Mana")
         else:
-            print(f"{target.name} has no mana to restore.")
+            events.bus.emit(events.ITEM_REFUSED, target=target.name, detail=self.name, text="{target} has no mana to restore.")
 
 
 class PoisonDart(Consumable):
@@ -929,10 +1187,16 @@ class Armor(Item):
         defense (int): The amount of defense the armor provides.
     """
 
+    slot = "armor"
+
     def __init__(self, name, description, defense):
         super().__init__(name, description)
         self.defense = defense
 
+    def stat_bonuses(self):
+        """Returns the armor's defense bonus."""
+        return {"defense": self.defense}
+
     def __str__(self):
         return f"{self.name} (Armor, +{self.defense} DEF): {self.description}"
 
@@ -940,44 +1204,67 @@ class Armor(Item):
 class Equipment:
     """Manages a character's equipped items in different slots.
 
+    An item goes in the slot named by its `slot` attribute, so new kinds of
+    equipment (rings, boots, ...) only need an `Item` subclass with a `slot`
+    and `stat_bonuses`; unknown slots are added on first use.
+
     Attributes:
         owner (GameObject): The character who owns the equipment.
         slots (dict): A dictionary representing the equipment slots.
     """
 
-    def __init__(self, owner):
+    def __init__(self, owner, slots=("weapon", "shield", "armor")):
         self.owner = owner
-        self.slots = {
-            "weapon": None,
-            "shield": None,
-            "armor": None
-        }
+        self.slots = dict.fromkeys(slots)
 
     def equip(self, item):
-        """Equips an item into the appropriate slot.
+        """Equips an item into its slot, replacing any item already there.
 
         Args:
             item (Item): The item to equip.
         """
-        if isinstance(item, Weapon):
-            self.slots["weapon"] = item
-            print(f"{self.owner.name} equips the {item.name}.")
-        elif isinstance(item, Armor):
-            # For simplicity, we'll assume any armor goes in the 'armor' slot.
-            self.slots["armor"] = item
-            print(f"{self.owner.name} equips the {item.name}.")
-        else:
+        slot = getattr(item, "slot", None)
+        if slot is None:
             print(f"'{item.name}' is not an equippable item.")
+            return
+        self.slots[slot] = item
+        self._changed()
+        print(f"{self.owner.name} equips the {item.name}.")
+
+    def unequip(self, slot):
+        """Empties a slot.
+
+        Args:
+            slot (str): The slot to empty.
+
+        Returns:
+            Item: The item that was in the slot, or None.
+        """
+        item = self.slots.get(slot)
+        if item is not None:
+            self.slots[slot] = None
+            self._changed()
+        return item
+
+    def _changed(self):
+        self.owner.mark_dirty()
+        self.owner.invalidate_stats()
 
     def get_total_stats(self):
         """Calculates the total stat bonuses from all equipped items.
 
+        This walks every slot; use the owner's cached `stats` in hot paths.
+
         Returns:
-            dict: A dictionary of total stat bonuses.
+            dict: A dictionary of total stat bonuses, always including
+                'damage' and 'defense'.
         """
-        total_damage = self.slots["weapon"].damage if self.slots["weapon"] else 0
-        total_defense = self.slots["armor"].defense if self.slots["armor"] else 0
-        return {"damage": total_damage, "defense": total_defense}
+        totals = {"damage": 0, "defense": 0}
+        for item in self.slots.values():
+            if item is not None:
+                for stat, bonus in item.stat_bonuses().items():
+                    totals[stat] = totals.get(stat, 0) + bonus
+        return totals
 
     def display(self):
         """Prints the character's currently equipped items."""
@@ -1103,6 +1390,35 @@ class DialogueManager:
             manager.add_node(key, DialogueNode.from_dict(node_data))
         return manager
 
+    @classmethod
+    def from_database(cls, dialogue_id, character_name="Narrator", conn=None):
+        """Builds a conversation from a `Dialogues` chain in one query.
+
+        Each dialogue becomes a node keyed by its id. A dialogue with a
+        `next_dialogue_id` gets a single option, labelled with its
+        `response_text` (or "Continue"), leading to the next node.
+
+        Args:
+            dialogue_id (int): The first dialogue of the chain.
+            character_name (str): The speaker of every node.
+            conn (sqlite3.Connection, optional): An existing database
+                connection. If not provided, a pooled connection is used.
+
+        Returns:
+            DialogueManager: The conversation, starting at `dialogue_id`, or
+            None if that dialogue does not exist.
+        """
+        rows = database.load_dialogue_chain(dialogue_id, conn=conn)
+        if not rows:
+            return None
+        manager = cls(start_node_key=str(dialogue_id))
+        for row in rows:
+            options = {}
+            if row["next_dialogue_id"] is not None:
+                options[row["response_text"] or "Continue"] = str(row["next_dialogue_id"])
+            manager.add_node(str(row["dialogue_id"]), DialogueNode(row["text"], character_name, options))
+        return manager
+
 
 class Character(GameObject):
     """A base class for all characters, both player and non-player.
@@ -1134,17 +1450,25 @@ class ReverieCharacter(Character):
         self.symbol = 'R'
 
 
-class Scene:
+class Scene(scene_index.IndexedScene):
     """Holds all the data for a single game area.
 
+    Position queries (`get_object_at`, `get_objects_in_radius`,
+    `get_objects_in_rect`) are answered from a spatial hash that is kept in
+    sync as objects are added, removed and moved (see `scene_index`).
+
     Attributes:
         name (str): The name of the scene.
         width (int): The width of the scene's map.
         height (int): The height of the scene's map.
         game_objects (list): A list of all GameObjects in the scene.
         player_character (Player): The player character in the scene.
+        streamer (streaming.ChunkStreamer): If set, streams the parts of a
+            large world around the player in and out; not saved.
     """
 
+    streamer = None
+
     def __init__(self, name, width=40, height=10):
         self.name = name
         self.width = width
@@ -1152,6 +1476,21 @@ class Scene:
         self.game_objects = []
         self.player_character = None
 
+    def __getstate__(self):
+        """Returns the state to save, without the index or the chunk streamer.
+
+        Returns:
+            dict: The scene's attributes.
+        """
+        state = super().__getstate__()
+        state.pop('streamer', None)
+        return state
+
+    def stream(self):
+        """Streams world chunks in and out around the player, if a streamer is attached."""
+        if self.streamer is not None and self.player_character is not None:
+            self.streamer.update(self.player_character)
+
     def add_object(self, obj):
         """Adds a GameObject to the scene.
 
@@ -1169,35 +1508,37 @@ class Scene:
         self.player_character = player
         self.add_object(player)
 
-    def get_object_at(self, x, y):
-        """Gets the object at a specific coordinate.
-
-        Args:
-            x (int): The x-coordinate.
-            y (int): The y-coordinate.
-
-        Returns:
-            GameObject: The object at the given coordinates, or None if not found.
-        """
-        for obj in self.game_objects:
-            if obj.x == x and obj.y == y:
-                return obj
-        return None
-
 
 class Game:
     """The main game engine, responsible for the game loop and input handling.
 
     Attributes:
-        width (int): The width of the game map.
-        height (int): The height of the game map.
+        width (int): The width of the map viewport drawn each turn.
+        height (int): The height of the map viewport drawn each turn.
         message_log (list): A list of recent game messages.
         turn_taken (bool): Whether the player has taken their turn.
         game_over (bool): Whether the game has ended.
         in_conversation (bool): Whether the player is in a conversation.
         dialogue_manager (DialogueManager): The active dialogue manager.
+        headless (bool): Whether `draw` skips rendering (see `headless`).
+        command_source (callable): If set, called with each prompt instead
+            of `input` to read the player's commands.
+        turn_count (int): The number of turns drawn so far.
+        renderer (render.TerminalRenderer): Draws the frames, created on the
+            first one; a game loaded in its place keeps it.
+        camera (render.Camera): The `width` x `height` viewport following
+            the player, created on the first frame.
     """
 
+    # Session settings: class defaults, so games restored from a save have
+    # them too, and left out of saves by `__getstate__`.
+    SESSION_ATTRIBUTES = ('headless', 'command_source', 'turn_count', 'renderer', 'camera')
+    headless = False
+    command_source = None
+    turn_count = 0
+    renderer = None
+    camera = None
+
     def __init__(self, width=40, height=10):
         self.width = width
         self.height = height
@@ -1207,6 +1548,60 @@ class Game:
         self.in_conversation = False
         self.dialogue_manager = None
 
+    def __getstate__(self):
+        """Returns the state to save, without the session settings.
+
+        Returns:
+            dict: The game's attributes.
+        """
+        state = self.__dict__.copy()
+        for name in self.SESSION_ATTRIBUTES:
+            state.pop(name, None)
+        return state
+
+    def continue_session(self, other):
+        """Carries the session settings over to a game that replaces this one.
+
+        Args:
+            other (Game): The game taking over, e.g. one loaded from a save.
+        """
+        for name in self.SESSION_ATTRIBUTES:
+            if name in self.__dict__:
+                setattr(other, name, self.__dict__[name])
+
+    def read_input(self, prompt=""):
+        """Reads one line of player input.
+
+        Args:
+            prompt (str): The prompt to show the player.
+
+        Returns:
+            str: The line read from `command_source` if one is set, otherwise
+            from the terminal.
+        """
+        if self.command_source is None:
+            line = input(prompt)
+            if self.renderer is not None:
+                # The terminal echoes the line typed, and `input` may write
+                # the prompt without going through `sys.stdout`.
+                self.renderer.note_output(prompt + line + "\n")
+            return line
+        return self.command_source(prompt)
+
+    def tracking_output(self):
+        """Returns a context in which printed text is reported to the renderer.
+
+        The scene loops run inside it, so a frame that prompts and messages
+        printed since have scrolled off the screen is redrawn in full (see
+        `render.TerminalRenderer.note_output`). Headless games draw nothing,
+        so for them it does nothing.
+        """
+        if self.headless:
+            return contextlib.nullcontext()
+        if self.renderer is None:
+            self.renderer = render.TerminalRenderer()
+        return self.renderer.tracking()
+
     def log_message(self, message):
         """Adds a message to the game's message log.
 
@@ -1217,6 +1612,19 @@ class Game:
         if len(self.message_log) > 5:
             self.message_log.pop(0)
 
+    def follow_events(self, kinds=events.COMBAT_EVENTS | events.ITEM_EVENTS, event_bus=None):
+        """Logs the text of combat and item events to the message log.
+
+        Args:
+            kinds (Iterable[str]): The event kinds to log.
+            event_bus (EventBus): The bus to follow; `events.bus` by default.
+        """
+        (event_bus or events.bus).subscribe(self.log_message, kinds, text=True)
+
+    def unfollow_events(self, event_bus=None):
+        """Stops logging events subscribed to with `follow_events`."""
+        (event_bus or events.bus).unsubscribe(self.log_message)
+
     def handle_input(self, scene_manager):
         """Handles player input and game commands.
 
@@ -1225,7 +1633,7 @@ class Game:
         """
         player = scene_manager.scene.player_character
         if self.in_conversation:
-            choice = input("Choose an option (number): ")
+            choice = self.read_input("Choose an option (number): ")
             if choice.isdigit() and self.dialogue_manager.select_option(int(choice) - 1):
                 pass
             else:
@@ -1233,7 +1641,7 @@ class Game:
             self.turn_taken = True
             return
 
-        command = input("Action: ").lower().strip()
+        command = self.read_input("Action: ").lower().strip()
         parts = command.split()
         action = parts[0] if parts else ""
 
@@ -1251,8 +1659,9 @@ class Game:
 
             new_x, new_y = player.x + dx, player.y + dy
 
-            if 0 <= new_x < self.width and 0 <= new_y < self.height:
-                target = scene_manager.scene.get_object_at(new_x, new_y)
+            scene = scene_manager.scene
+            if 0 <= new_x < scene.width and 0 <= new_y < scene.height:
+                target = scene.get_object_at(new_x, new_y)
                 if not target or not getattr(target, 'solid', False):
                     player.x = new_x
                     player.y = new_y
@@ -1267,8 +1676,7 @@ class Game:
             found_something = False
             if target_name:
                 # Examine a specific object by name
-                target = next((obj for obj in scene_manager.scene.game_objects if
-                               isinstance(obj, Interactable) and obj.name.lower() == target_name.lower()), None)
+                target = scene_manager.scene.find_object(target_name, Interactable)
                 if target:
                     self.log_message(f"{target.name}: {target.on_examine()}")
                     found_something = True
@@ -1276,7 +1684,7 @@ class Game:
                     self.log_message(f"There is no '{target_name}' to examine.")
             else:
                 # Examine nearby objects
-                for obj in scene_manager.scene.game_objects:
+                for obj in scene_manager.scene.get_objects_in_radius(player.x, player.y, 1.5):
                     if isinstance(obj, Interactable) and player.distance_to(obj) < 1.5:
                         self.log_message(f"{obj.name}: {obj.on_examine()}")
                         found_something = True
@@ -1287,8 +1695,7 @@ class Game:
 
         elif action == "talk" and len(parts) > 1:
             target_name = " ".join(parts[1:])
-            target = next(
-                (obj for obj in scene_manager.scene.game_objects if obj.name.lower() == target_name.lower()), None)
+            target = scene_manager.scene.find_object(target_name)
             if target and isinstance(target, Character) and target.dialogue:
                 if player.distance_to(target) <= 2:
                     self.start_conversation(target.dialogue)
@@ -1300,9 +1707,7 @@ class Game:
 
         elif action == "attack" and len(parts) > 1:
             target_name = " ".join(parts[1:])
-            target = next((obj for obj in scene_manager.scene.game_objects if
-                           isinstance(obj, Enemy) and obj.name.lower() == target_name.lower() and obj.health > 0),
-                          None)
+            target = scene_manager.scene.find_object(target_name, Enemy, alive=True)
             if target:
                 player.attack(target)
             else:
@@ -1317,7 +1722,7 @@ class Game:
         elif action == "use" and len(parts) > 2:
             item_name = parts[1]
             target_name = " ".join(parts[2:])
-            target = next((obj for obj in scene_manager.scene.game_objects if obj.name.lower() == target_name.lower()), None)
+            target = scene_manager.scene.find_object(target_name)
             if target:
                 player.use_item(item_name, target)
                 self.turn_taken = True
@@ -1331,9 +1736,8 @@ class Game:
 
         elif action == "status":
             self.log_message(f"{player.name} - HP: {player.health}/{player.max_health}, Mana: {int(player.mana)}/{player.max_mana}")
-            for obj in scene_manager.scene.game_objects:
-                if isinstance(obj, Enemy) and obj.health > 0:
-                    self.log_message(f"{obj.name} - HP: {obj.health}")
+            for obj in scene_manager.scene.get_objects_of_type(Enemy, alive=True):
+                self.log_message(f"{obj.name} - HP: {obj.health}")
             self.turn_taken = False  # Does not consume a turn
 
         elif action == "save":
@@ -1346,6 +1750,7 @@ class Game:
             save_name = parts[1] if len(parts) > 1 else "quicksave"
             new_manager = database.load_game(save_name)
             if new_manager:
+                self.continue_session(new_manager.game)
                 scene_manager.game = new_manager.game
                 scene_manager.scene = new_manager.scene
                 self.log_message(f"Game loaded from slot: {save_name}")
@@ -1358,7 +1763,7 @@ class Game:
         elif action == "pause":
             self.log_message("Game paused. Press Enter to continue...")
             self.draw(scene_manager.scene)
-            input()
+            self.read_input()
             self.turn_taken = False
         else:
             self.log_message(
@@ -1380,51 +1785,69 @@ class Game:
         self.dialogue_manager = None
         self.log_message("The conversation ends.")
 
+    def conversation_node(self):
+        """Advances the conversation state for a new turn.
+
+        Called by `draw`, so it runs every turn even when nothing is drawn.
+        A conversation without a current node ends, and so does one whose
+        node has no options; that node is still shown this turn.
+
+        Returns:
+            DialogueNode: The node to show, or None if the player is not in a
+            conversation.
+        """
+        if not self.in_conversation:
+            return None
+        node = self.dialogue_manager.get_current_node()
+        if not node:
+            # The map is drawn on the turn the conversation ends.
+            self.end_conversation()
+        elif not node.options:
+            # The conversation ends on the next player input.
+            self.end_conversation()
+        return node
+
     def draw(self, scene):
         """Draws the game state to the console.
 
+        The map shows the `width` x `height` part of the scene around the
+        player, and only what changed since the last turn is redrawn; see
+        `render`. Every pass of a scene's main loop draws once, so this also counts
+        turns and streams the scene's world chunks (see `Scene.stream`). In
+        headless mode nothing is rendered.
+
         Args:
             scene (Scene): The scene to draw.
         """
-        # Clear screen
-        print("\033c", end="")
-
-        print(f"--- {scene.name} ---")
-
-        if self.in_conversation:
-            node = self.dialogue_manager.get_current_node()
-            if not node:
-                self.end_conversation()
-                # Fall through to draw the map on the turn the conversation ends
-            else:
-                print(f"\n--- Conversation with {node.character_name} ---")
-                print(f"> \"{node.text}\"")
-                if node.options:
-                    for i, option_text in enumerate(node.options.keys()):
-                        print(f"  {i + 1}. {option_text}")
-                else:
-                    # If there are no options, the conversation ends on the next player input
-                    self.end_conversation()
-                # Don't draw map while in conversation
-                return
-
-        # --- Draw Map ---
-        grid = [['.' for _ in range(self.width)] for _ in range(self.height)]
-        for obj in sorted(scene.game_objects, key=lambda o: 0 if isinstance(o, Character) else -1):
-            if 0 <= obj.x < self.width and 0 <= obj.y < self.height:
-                grid[obj.y][obj.x] = obj.symbol
+        self.turn_count += 1
+        scene.stream()
+        node = self.conversation_node()
+        if self.headless:
+            return
+        renderer = self.renderer
+        if renderer is None:
+            renderer = self.renderer = render.TerminalRenderer()
+        if self.camera is None:
+            self.camera = render.Camera(self.width, self.height)
+
+        header = [f"--- {scene.name} ---"]
+        if node:
+            header += ["", f"--- Conversation with {node.character_name} ---", f"> \"{node.text}\""]
+            header += [f"  {i + 1}. {option_text}" for i, option_text in enumerate(node.options.keys())]
+            # Don't draw map while in conversation
+            renderer.render(header, [], [])
+            return
 
-        for row in grid:
-            print(" ".join(row))
+        # --- Draw Map (the viewport around the player, characters on top) ---
+        player = scene.player_character
+        grid = self.camera.follow(player, scene.width, scene.height).paint(scene, Character)
 
         # --- Draw Player Status and Message Log ---
-        player = scene.player_character
-        print("-" * (self.width * 2 - 1))
-        print(f"{player.name} | Health: {player.health}/{player.max_health}")
-        print("-- Messages --")
-        for msg in self.message_log:
-            print(f"- {msg}")
-        print("-" * (self.width * 2 - 1))
+        rule = "-" * (self.width * 2 - 1)
+        footer = [rule, f"{player.name} | Health: {player.health}/{player.max_health}", "-- Messages --"]
+        footer += [f"- {msg}" for msg in self.message_log]
+        footer.append(rule)
+        renderer.render(header, grid, footer)
 
 
 class SceneManager:
@@ -1434,12 +1857,15 @@ class SceneManager:
         scene (Scene): The scene being managed.
         game (Game): The main game engine.
         is_running (bool): Whether the scene is currently running.
+        autosave_slot (str): If set, the save slot the scene is incrementally
+            saved to after every world turn.
     """
 
     def __init__(self, scene, game, setup_scene=True):
         self.scene = scene
         self.game = game
         self.is_running = True
+        self.autosave_slot = None
         if setup_scene:
             self.setup()
 
@@ -1451,15 +1877,45 @@ class SceneManager:
         """Runs every game loop, checking for win/loss conditions, etc."""
         pass
 
+    def update_objects(self):
+        """Runs the world turn: every object's `update`, in `game_objects` order.
+
+        Enemies running the stock `Enemy` AI are planned together with
+        `Enemy.plan_turns` before any object acts, and each plan is applied
+        when that enemy's turn comes up. Planned enemies never move the
+        player or the terrain they path around, so the result is the same
+        as calling `update` on every object; should another object's update
+        move the player, the remaining enemies fall back to `update`.
+        """
+        objects = list(self.scene.game_objects)
+        player = self.scene.player_character
+        if not player or len({id(obj) for obj in objects}) != len(objects):
+            # Without a player there is nothing to plan, and an object listed
+            # twice acts twice, so it must see its own first turn.
+            for obj in objects:
+                obj.update(self)
+            return
+
+        plans = Enemy.plan_turns(objects, player, self.scene)
+        planned_at = (player.x, player.y, player.z)
+        stale = False
+        for obj, plan in zip(objects, plans):
+            if plan is not None and not stale:
+                obj.take_planned_turn(plan, player)
+            else:
+                obj.update(self)
+                stale = stale or (player.x, player.y, player.z) != planned_at
+
     def run(self):
         """Main game loop for this scene."""
-        while not self.game.game_over and self.is_running:
-            self.game.draw(self.scene)
-            if self.game.game_over: break
+        with self.game.tracking_output():
+            while not self.game.game_over and self.is_running:
+                self.game.draw(self.scene)
+                if self.game.game_over: break
 
-            self.game.turn_taken = False
-            while not self.game.turn_taken and not self.game.game_over:
-                self.game.handle_input(self)
+                self.game.turn_taken = False
+                while not self.game.turn_taken and not self.game.game_over:
+                    self.game.handle_input(self)
 
 
 class Aeron(Player):
@@ -1528,19 +1984,21 @@ class AethelgardBattle(SceneManager):
 
     def run(self):
         """Main game loop for this scene."""
-        while not self.game.game_over and self.is_running:
-            self.game.draw(self.scene)
-            if self.game.game_over: break
-
-            self.game.turn_taken = False
-            while not self.game.turn_taken and not self.game.game_over:
-                self.game.handle_input(self)
-
-            # --- AI and World Turn ---
-            if self.game.turn_taken and not self.game.game_over:
-                # Update all other objects in the scene
-                for obj in self.scene.game_objects:
-                    obj.update(self)
+        with self.game.tracking_output():
+            while not self.game.game_over and self.is_running:
+                self.game.draw(self.scene)
+                if self.game.game_over: break
+
+                self.game.turn_taken = False
+                while not self.game.turn_taken and not self.game.game_over:
+                    self.game.handle_input(self)
+
+                # --- AI and World Turn ---
+                if self.game.turn_taken and not self.game.game_over:
+                    # Update all other objects in the scene
+                    self.update_objects()
+                    if self.autosave_slot:
+                        database.autosave(self.autosave_slot, self)
 
         self.update()  # Check for scene-specific win/loss conditions
 
@@ -1607,8 +2065,8 @@ def main():
     with open("game_data.json", "r") as f:
         game_data = json.load(f)
 
-    # Initialize the database first
-    database.init_db()
+    # Load game content, from the prebuilt content pack if there is one
+    database.open_content()
 
     # --- Game Start ---
     # Check for a command-line argument to load a game
@@ -1628,6 +2086,7 @@ def main():
         game_engine = Game()
         battle_scene = Scene("Aethelgard Battle")
         scene_manager = AethelgardBattle(battle_scene, game_engine)
+        scene_manager.autosave_slot = "autosave"
 
     if scene_manager:
         scene_manager.run()
@@ -0,0 +1,343 @@
+"""Headless simulation of `game` and `rpg` scene managers.
+
+A scene manager's `run` loop normally blocks on `input()` and redraws the
+terminal every turn. `run_headless` runs the same loop, unchanged, for
+balance simulations and tests:
+
+- Commands come from a script (a list of lines) or a policy, a function of
+  the scene manager and the prompt, instead of the terminal.
+- `Game.draw` renders nothing. Unless asked otherwise, `events.bus` stops
+  echoing and everything else the engines `print` is discarded.
+- The run stops when the game ends, the script or policy runs out of
+  commands, or `max_turns` turns have been played, and reports how many
+  turns it played per second.
+
+    manager = game.AethelgardBattle(game.Scene("Aethelgard Battle"), game.Game())
+    report = headless.run_headless(manager, policy=headless.attack_nearest, max_turns=500)
+    print(report.turns_per_second)
+
+Hordes too large for `game.Enemy` objects are simulated by `run_horde`
+instead: `spawn_horde` keeps the enemies in an `ecs.World`, and each turn
+they all step towards the player in one pass over the world's columns.
+
+    scene = game.Scene("Horde", 200, 200)
+    scene.set_player(game.Player(x=100, y=100))
+    report = headless.run_horde(scene, headless.spawn_horde(scene, 10000), max_turns=100)
+
+Usage:
+    python headless.py [game|rpg|horde] [--turns N] [--script FILE] [--enemies N]
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from typing import Any, Callable, Iterable, Optional
+
+import database
+import ecs
+import events
+import game
+import pathfinding
+import rng
+import rpg
+
+# A policy returns the next line of input for a prompt, or None to stop.
+Policy = Callable[[Any, str], Optional[str]]
+
+
+class SimulationEnded(Exception):
+    """Raised by a command source to stop a headless run."""
+
+
+class _Discard:
+    """A text stream that drops everything written to it."""
+
+    def write(self, text: str) -> int:
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+class CommandSource:
+    """Feeds scripted or policy-driven input to a `Game`.
+
+    Used as a game's `command_source`: each call returns the next line of
+    input, or raises `SimulationEnded`.
+
+    Attributes:
+        scene_manager: The scene manager whose game reads the commands.
+        max_turns (Optional[int]): The turn limit, if any.
+        commands (int): The number of lines returned so far.
+    """
+
+    def __init__(self, scene_manager: Any, script: Optional[Iterable[str]] = None,
+                 policy: Optional[Policy] = None, max_turns: Optional[int] = None):
+        if (script is None) == (policy is None):
+            raise ValueError("Pass exactly one of a script or a policy.")
+        self.scene_manager = scene_manager
+        self.max_turns = max_turns
+        self.commands = 0
+        self._script = iter(script) if script is not None else None
+        self._policy = policy
+
+    def __call__(self, prompt: str = "") -> str:
+        if self.max_turns is not None and self.scene_manager.game.turn_count > self.max_turns:
+            raise SimulationEnded("turn limit reached")
+        if self._script is not None:
+            command = next(self._script, None)
+        else:
+            command = self._policy(self.scene_manager, prompt)
+        if command is None:
+            raise SimulationEnded("out of commands")
+        self.commands += 1
+        return command
+
+
+class SimulationReport:
+    """The outcome of a headless run.
+
+    Attributes:
+        turns (int): The number of turns played to completion.
+        commands (int): The number of input lines consumed.
+        seconds (float): The wall-clock duration of the run.
+        game_over (bool): Whether the game itself ended the run.
+    """
+
+    def __init__(self, turns: int, commands: int, seconds: float, game_over: bool):
+        self.turns = turns
+        self.commands = commands
+        self.seconds = seconds
+        self.game_over = game_over
+
+    @property
+    def turns_per_second(self) -> float:
+        """float: The number of turns played per second of wall-clock time."""
+        return self.turns / self.seconds if self.seconds > 0 else float("inf")
+
+    def __repr__(self) -> str:
+        return (f"SimulationReport(turns={self.turns}, commands={self.commands}, "
+                f"seconds={self.seconds:.3f}, game_over={self.game_over})")
+
+
+def run_headless(scene_manager: Any, script: Optional[Iterable[str]] = None, policy: Optional[Policy] = None,
+                 max_turns: Optional[int] = None, quiet: bool = True) -> SimulationReport:
+    """Runs a scene manager's game loop without a terminal.
+
+    Args:
+        scene_manager (SceneManager): A `game` or `rpg` scene manager that
+            has been set up.
+        script (Iterable[str]): The lines of input to feed, in order.
+        policy (Policy): Called with the scene manager and the prompt for
+            each line of input; returning None stops the run. Exactly one of
+            `script` and `policy` must be given.
+        max_turns (Optional[int]): Stop after this many turns.
+        quiet (bool): Discard everything printed during the run.
+
+    Returns:
+        SimulationReport: What the run did and how fast.
+
+    Raises:
+        ValueError: If both or neither of `script` and `policy` are given.
+    """
+    source = CommandSource(scene_manager, script, policy, max_turns)
+    game_engine = scene_manager.game
+    game_engine.headless = True
+    game_engine.command_source = source
+    game_engine.turn_count = 0
+    ended_early = False
+    echo = events.bus.echo
+    events.bus.echo = echo and not quiet
+    output = contextlib.redirect_stdout(_Discard()) if quiet else contextlib.nullcontext()
+    start = time.perf_counter()
+    try:
+        with output:
+            scene_manager.run()
+    except SimulationEnded:
+        ended_early = True
+    finally:
+        seconds = time.perf_counter() - start
+        events.bus.echo = echo
+        # A load may have replaced the game; it carries the session over.
+        original, game_engine = game_engine, scene_manager.game
+        turns = game_engine.turn_count
+        for session_game in (original, game_engine):
+            for name in session_game.SESSION_ATTRIBUTES:
+                session_game.__dict__.pop(name, None)
+    # A run stopped by its command source stops inside a turn it just drew.
+    return SimulationReport(turns - 1 if ended_early else turns, source.commands, seconds,
+                            bool(game_engine.game_over))
+
+
+def attack_nearest(scene_manager: Any, prompt: str) -> Optional[str]:
+    """A policy that attacks the nearest living enemy until none are left.
+
+    Works with both engines: top-level prompts get `attack <name>`, and the
+    `rpg` engine's follow-up prompt gets the name.
+
+    Args:
+        scene_manager (SceneManager): The scene manager being simulated.
+        prompt (str): The prompt being answered.
+
+    Returns:
+        Optional[str]: The next line of input, or "quit" once every enemy is
+        defeated.
+    """
+    scene = scene_manager.scene
+    engine = sys.modules[type(scene).__module__]
+    player = scene.player_character
+    enemies = scene.get_objects_of_type(engine.Enemy, alive=True)
+    if not enemies:
+        return "quit"
+    target = min(enemies, key=player.distance_to)
+    if prompt.startswith("Attack who?"):
+        return target.name
+    if prompt.startswith("What do you want to do?"):
+        return "attack"
+    return f"attack {target.name}"
+
+
+def spawn_horde(scene: Any, count: int, name: str = "Goblin", symbol: str = 'g', health: float = 50,
+                speed: float = 2) -> ecs.World:
+    """Spawns a horde of enemies on random open tiles of a scene.
+
+    The enemies are rows of an `ecs.World`, not objects of the scene, so
+    tens of thousands of them fit in the memory of a few thousand
+    `game.Enemy` objects. Tiles are rolled from the "horde" stream of `rng`.
+
+    Args:
+        scene (Scene): The scene the horde roams; its terrain is avoided.
+        count (int): The number of enemies.
+        name (str): The name of every enemy, numbered from 1.
+        symbol (str): The map symbol of every enemy.
+        health (float): The starting health of every enemy.
+        speed (float): The speed of every enemy.
+
+    Returns:
+        World: The world holding the horde.
+    """
+    grid = pathfinding.terrain(scene, game.Enemy.blocks_path).grid
+    rolls = rng.stream("horde")
+    world = ecs.World()
+    while len(world) < count:
+        x, y = rolls.randrange(scene.width), rolls.randrange(scene.height)
+        if not grid.blocked(x, y):
+            world.spawn(name=f"{name} {len(world) + 1}", symbol=symbol, x=x, y=y, health=health, speed=speed)
+    return world
+
+
+def step_horde(world: ecs.World, scene: Any, target: Any) -> int:
+    """Moves every enemy of a horde one tile towards a target.
+
+    Positions are read in one pass with `world.rows("x", "y")` and steps are
+    written straight into the world's columns. Enemies step as
+    `game.Enemy.step_towards` does: straight at the target when no terrain
+    lies between them, otherwise along the scene's shared flow field.
+    Enemies within reach of the target stay where they are.
+
+    Args:
+        world (World): The horde.
+        scene (Scene): The scene the horde roams.
+        target (GameObject): The object to approach, usually the player.
+
+    Returns:
+        int: The number of enemies within reach of the target.
+    """
+    terrain = pathfinding.terrain(scene, game.Enemy.blocks_path)
+    xs, ys = world.raw_column("x"), world.raw_column("y")
+    goal = (int(target.x), int(target.y))
+    field = None
+    in_reach = 0
+    for eid, x, y in world.rows("x", "y"):
+        dx, dy = target.x - x, target.y - y
+        if dx * dx + dy * dy < 2.25:  # The reach of `game.Enemy`.
+            in_reach += 1
+            continue
+        start = (int(x), int(y))
+        if not terrain.clear_between(start, goal):
+            if field is None:
+                field = terrain.flow_field(goal)
+            tile = field.next_tile(*start)
+            if tile is not None:
+                xs[eid], ys[eid] = tile
+        elif abs(dx) > abs(dy):
+            xs[eid] = x + (1 if dx > 0 else -1)
+        else:
+            ys[eid] = y + (1 if dy > 0 else -1)
+    return in_reach
+
+
+def run_horde(scene: Any, world: ecs.World, max_turns: Optional[int] = None, attack_damage: float = 10,
+              quiet: bool = True) -> SimulationReport:
+    """Runs a horde chasing a scene's player until the player falls.
+
+    Each turn every enemy steps towards the player (see `step_horde`), each
+    one within reach then hits the player for `attack_damage`, and the
+    enemies' status effects advance.
+
+    Args:
+        scene (Scene): The scene the horde roams; it must have a player.
+        world (World): The horde, e.g. from `spawn_horde`.
+        max_turns (Optional[int]): Stop after this many turns.
+        attack_damage (float): The damage of each enemy's hit.
+        quiet (bool): Stop `events.bus` from echoing during the run.
+
+    Returns:
+        SimulationReport: What the run did and how fast; it consumes no
+        commands.
+    """
+    player = scene.player_character
+    echo = events.bus.echo
+    events.bus.echo = echo and not quiet
+    turns = 0
+    start = time.perf_counter()
+    try:
+        while player.health > 0 and (max_turns is None or turns < max_turns):
+            for _ in range(step_horde(world, scene, player)):
+                player.take_damage(attack_damage)
+            world.advance_effects()
+            turns += 1
+    finally:
+        seconds = time.perf_counter() - start
+        events.bus.echo = echo
+    return SimulationReport(turns, 0, seconds, player.health <= 0)
+
+
+def main(argv=None) -> SimulationReport:
+    """Runs a headless simulation from the command line and prints a report."""
+    parser = argparse.ArgumentParser(description="Run a scene without a terminal.")
+    parser.add_argument("engine", nargs="?", choices=("game", "rpg", "horde"), default="game")
+    parser.add_argument("--turns", type=int, default=1000, help="stop after this many turns")
+    parser.add_argument("--script", help="a file of commands, one per line (default: attack the nearest enemy)")
+    parser.add_argument("--enemies", type=int, default=1000, help="the size of the horde (horde only)")
+    args = parser.parse_args(argv)
+
+    if args.engine == "horde":
+        scene = game.Scene("Horde", 200, 200)
+        scene.set_player(game.Player(name="Aeron", x=100, y=100))
+        report = run_horde(scene, spawn_horde(scene, args.enemies), max_turns=args.turns)
+        print(f"{report.turns} turns with {args.enemies} enemies in {report.seconds:.3f}s "
+              f"({report.turns_per_second:.0f} turns/s), game over: {report.game_over}")
+        return report
+
+    database.open_content()
+    if args.engine == "game":
+        scene_manager = game.AethelgardBattle(game.Scene("Aethelgard Battle"), game.Game())
+    else:
+        scene_manager = rpg.TrollCaveScene(rpg.Game())
+        scene_manager.load_scene(rpg.Scene("Troll Cave"))
+
+    if args.script:
+        with open(args.script, encoding="utf-8") as script_file:
+            script = [line.rstrip("\n") for line in script_file]
+        report = run_headless(scene_manager, script=script, max_turns=args.turns)
+    else:
+        report = run_headless(scene_manager, policy=attack_nearest, max_turns=args.turns)
+    print(f"{report.turns} turns, {report.commands} commands in {report.seconds:.3f}s "
+          f"({report.turns_per_second:.0f} turns/s), game over: {report.game_over}")
+    return report
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""Derived combat stats, built by a pipeline of modifier stages.
+
+`GameObject.stats` used to be worked out on every hit and swing: each call
+of `Equipment.get_total_stats` rebuilt a dictionary from the slots, and
+`take_damage` and `Player.attack` special-cased status effects. Derived stats
+are now computed by `compute`, which runs `STAGES` in order over a fresh
+dictionary, and cached on the object until something they depend on
+changes:
+
+1. `base_stage`: the object's own `defense`, `strength` and `dexterity`
+   (which level-ups may raise).
+2. `equipment_stage`: the bonuses of every equipped item, whatever its slot.
+3. `effect_stage`: the stat modifier of each active status effect type
+   registered in `effects`, such as `armor_break` or `vulnerable`.
+
+The cache is dropped when one of `INPUTS` is assigned, when
+`Equipment.equip` or `unequip` changes a slot, when an effect with a stat
+modifier is applied or expires, and on a level-up. Code that changes a stat
+source any other way (e.g. by writing `equipment.slots` directly) should call
+`GameObject.invalidate_stats`.
+
+Stats:
+    damage (int): Damage dealt by an attack: strength // 2 plus bonuses.
+    defense (int): Damage subtracted from each hit.
+    damage_taken (int): Multiplier applied to incoming damage before defense.
+    miss_chance (float): Percent chance that an attack misses.
+    crit_chance (float): Percent chance that an attack is a critical hit.
+"""
+
+from typing import Any, Callable, Dict, List, Optional
+
+import effects
+
+# Attributes whose assignment invalidates an object's cached stats.
+INPUTS = frozenset(("defense", "strength", "dexterity", "level", "equipment", "status_effects"))
+
+Stage = Callable[[Any, Dict[str, Any]], None]
+
+
+def base_stage(owner: Any, stats: Dict[str, Any]) -> None:
+    """Derives stats from the object's own attributes."""
+    strength = getattr(owner, "strength", 0)
+    stats["damage"] = strength // 2
+    stats["defense"] = owner.defense
+    stats["damage_taken"] = 1
+    dexterity = getattr(owner, "dexterity", None)
+    if dexterity is not None:
+        stats["miss_chance"] = max(0, 5 - dexterity / 4)
+        stats["crit_chance"] = 5 + dexterity / 2
+
+
+def equipment_stage(owner: Any, stats: Dict[str, Any]) -> None:
+    """Adds the bonuses of every equipped item."""
+    equipment = getattr(owner, "equipment", None)
+    if equipment is None:
+        return
+    for stat, bonus in equipment.get_total_stats().items():
+        stats[stat] = stats.get(stat, 0) + bonus
+
+
+def effect_stage(owner: Any, stats: Dict[str, Any]) -> None:
+    """Applies the stat modifiers of the object's active status effects."""
+    status_effects = owner.status_effects
+    for name in status_effects.modifying():
+        effects.effect_type(name).modifier(stats, status_effects[name])
+
+
+STAGES: List[Stage] = [base_stage, equipment_stage, effect_stage]
+
+
+def register_stage(stage: Stage, before: Optional[Stage] = None) -> None:
+    """Adds a stage to the pipeline.
+
+    Args:
+        stage (Stage): Called with the object and the stats computed so far.
+        before (Optional[Stage]): Run the new stage just before this one;
+            at the end if None.
+    """
+    STAGES.insert(STAGES.index(before) if before is not None else len(STAGES), stage)
+
+
+def compute(owner: Any) -> Dict[str, Any]:
+    """Runs the pipeline for an object.
+
+    Returns:
+        dict: The object's derived stats.
+    """
+    stats: Dict[str, Any] = {}
+    for stage in STAGES:
+        stage(owner, stats)
+    return stats
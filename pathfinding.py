@@ -0,0 +1,599 @@
+"""Finds walking paths across the tile grid of a scene.
+
+Walkers in `game` move one tile at a time along either axis, and solid
+objects block the tile they stand on. This module searches such grids:
+
+- `Grid` records which tiles of a rectangle of the map are blocked, one
+  byte per tile, surrounded by a border of blocked tiles so searches never
+  need bounds checks.
+- `Pathfinder` runs A* over a grid with a binary heap as the open set. Its
+  per-tile buffers (cost so far, parent, open and closed marks) are kept
+  between searches and invalidated by bumping a search number, so a search
+  costs what it visits rather than the size of the grid.
+- With `jump=True` (the default) the search uses Jump Point Search for
+  4-connected grids: it only stops at tiles where an optimal path may have
+  to turn, and scans the straight runs between them with `bytearray.find`,
+  so open areas cost a few scans instead of one heap entry per tile. Paths
+  have the same length as plain A*'s, though they may take a different one
+  of several equally short routes.
+- `Terrain` keeps the grid of a scene's blocking objects up to date as
+  objects are added, removed, moved or change, by listening to the scene's
+  index (see `scene_index.SceneIndex.add_listener`). `terrain` returns the
+  one for a scene, built on first use; `find_scene_path` searches it.
+- `FlowField` serves many walkers heading for the same tile, such as a
+  horde chasing the player: one breadth-first search from the goal gives
+  every tile its next step, read in constant time. The search only runs as
+  far out as the tiles asked about, and when terrain changes only the
+  tiles at least as far from the goal as the change are searched again.
+  `Terrain.flow_field` keeps the fields of the last few goals.
+"""
+
+import heapq
+from array import array
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Point = Tuple[int, int]
+
+# How many goals `Terrain.flow_field` keeps fields for.
+FIELDS_KEPT: int = 2
+
+_FREE = 0
+_BLOCKED = 1
+# A blocked tile followed by a free one, and the reverse: where a tile next
+# to a horizontal run opens up, going right and going left respectively.
+_OPENS_RIGHT = bytes((_BLOCKED, _FREE))
+_OPENS_LEFT = bytes((_FREE, _BLOCKED))
+
+
+def is_solid(obj: Any) -> bool:
+    """The default test for whether an object blocks its tile."""
+    return bool(getattr(obj, 'solid', False))
+
+
+class Grid:
+    """Which tiles of a rectangle of the map are blocked.
+
+    Attributes:
+        width (int): The number of tiles across.
+        height (int): The number of tiles down.
+        origin (Point): The map position of the grid's top-left tile.
+        stride (int): The length of a row of `cells`, border included.
+        cells (bytearray): One byte per tile, row by row, non-zero where
+            blocked, with a blocked border one tile wide around the grid.
+    """
+
+    def __init__(self, width: int, height: int, origin: Point = (0, 0)):
+        self.width = width
+        self.height = height
+        self.origin = origin
+        self.stride = width + 2
+        self.cells = bytearray([_BLOCKED]) * (self.stride * (height + 2))
+        row = bytes(width)
+        for y in range(1, height + 1):
+            start = y * self.stride + 1
+            self.cells[start:start + width] = row
+
+    def _index(self, x: int, y: int) -> int:
+        return (y - self.origin[1] + 1) * self.stride + x - self.origin[0] + 1
+
+    def _point(self, index: int) -> Point:
+        y, x = divmod(index, self.stride)
+        return (x - 1 + self.origin[0], y - 1 + self.origin[1])
+
+    def contains(self, x: int, y: int) -> bool:
+        """Returns whether a map position is one of the grid's tiles."""
+        x, y = x - self.origin[0], y - self.origin[1]
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def blocked(self, x: int, y: int) -> bool:
+        """Returns whether a tile is blocked. Tiles outside the grid are."""
+        return not self.contains(x, y) or self.cells[self._index(x, y)] != _FREE
+
+    def set_blocked(self, x: int, y: int, blocked: bool = True) -> None:
+        """Blocks or frees a tile. Positions outside the grid are ignored."""
+        if self.contains(x, y):
+            self.cells[self._index(x, y)] = _BLOCKED if blocked else _FREE
+
+
+class Pathfinder:
+    """Searches grids for shortest 4-connected paths, reusing its buffers.
+
+    A pathfinder is not thread-safe; give each thread its own.
+
+    Attributes:
+        expanded (int): The tiles the last search took off the open set.
+    """
+
+    def __init__(self):
+        self._g = array('l')
+        self._parent = array('l')
+        self._opened = array('L')
+        self._closed = array('L')
+        self._search = 0
+        self.expanded = 0
+
+    def _prepare(self, size: int) -> None:
+        """Grows the buffers to `size` tiles and starts a new search number."""
+        if len(self._g) < size:
+            grow = size - len(self._g)
+            for buffer in (self._g, self._parent, self._opened, self._closed):
+                buffer.frombytes(bytes(grow * buffer.itemsize))
+        self._search += 1
+        if self._search >= 1 << 32:
+            self._opened = array('L', bytes(len(self._opened) * self._opened.itemsize))
+            self._closed = array('L', bytes(len(self._closed) * self._closed.itemsize))
+            self._search = 1
+
+    def find_path(self, grid: Grid, start: Point, goal: Point, jump: bool = True) -> Optional[List[Point]]:
+        """Finds a shortest path between two tiles.
+
+        The start tile may be blocked (the walker stands on it); the goal
+        may not.
+
+        Args:
+            grid (Grid): The grid to search.
+            start (Point): The tile the path starts from.
+            goal (Point): The tile the path leads to.
+            jump (bool): Use Jump Point Search rather than plain A*.
+
+        Returns:
+            Optional[List[Point]]: Every tile stepped on after `start`, up to
+            and including `goal`; empty if they are the same tile. None if
+            the goal cannot be reached or either tile is outside the grid.
+        """
+        self.expanded = 0
+        if not grid.contains(*start) or grid.blocked(*goal):
+            return None
+        if start == goal:
+            return []
+        cells, stride = grid.cells, grid.stride
+        source, target = grid._index(*start), grid._index(*goal)
+        self._prepare(len(cells))
+        g, parent, opened, closed, search = self._g, self._parent, self._opened, self._closed, self._search
+        target_y, target_x = divmod(target, stride)
+        successors = self._jump_successors if jump else self._neighbours
+
+        g[source] = 0
+        parent[source] = -1
+        opened[source] = search
+        heuristic = abs(source % stride - target_x) + abs(source // stride - target_y)
+        open_set = [(heuristic, heuristic, source)]
+        push, pop = heapq.heappush, heapq.heappop
+        while open_set:
+            _, _, node = pop(open_set)
+            if closed[node] == search:
+                continue  # A stale entry for a tile reached more cheaply since.
+            closed[node] = search
+            self.expanded += 1
+            if node == target:
+                return self._walk_back(grid, source, target)
+            cost = g[node]
+            for successor, distance in successors(cells, stride, node, target):
+                if closed[successor] == search:
+                    continue
+                new_cost = cost + distance
+                if opened[successor] != search or new_cost < g[successor]:
+                    opened[successor] = search
+                    g[successor] = new_cost
+                    parent[successor] = node
+                    y, x = divmod(successor, stride)
+                    heuristic = abs(x - target_x) + abs(y - target_y)
+                    # Ties go to the tile nearer the goal.
+                    push(open_set, (new_cost + heuristic, heuristic, successor))
+        return None
+
+    def _walk_back(self, grid: Grid, source: int, target: int) -> List[Point]:
+        """Follows parents from the goal and fills in the tiles between jump points."""
+        stride, parent = grid.stride, self._parent
+        path = []
+        node = target
+        while node != source:
+            previous = parent[node]
+            step = 1 if abs(node - previous) < stride else stride
+            if node < previous:
+                step = -step
+            while node != previous:
+                path.append(grid._point(node))
+                node -= step
+        path.reverse()
+        return path
+
+    @staticmethod
+    def _neighbours(cells: bytearray, stride: int, node: int, target: int):
+        """Plain A*: the free tiles next to `node`."""
+        for step in (1, -1, stride, -stride):
+            if not cells[node + step]:
+                yield node + step, 1
+
+    def _jump_successors(self, cells: bytearray, stride: int, node: int, target: int):
+        """Jump Point Search: the next jump point in each direction worth exploring.
+
+        Optimal paths can be reordered to move vertically as early as walls
+        allow, so a horizontal run only turns where the tile beside it opens
+        up (a forced neighbour), while a vertical run may turn anywhere and
+        so stops on any row whose horizontal runs reach a jump point.
+        """
+        previous = self._parent[node]
+        if previous < 0:
+            directions = (1, -1, stride, -stride)
+        elif abs(node - previous) < stride:
+            # Arrived horizontally: carry on, or turn where a side opens up.
+            step = 1 if node > previous else -1
+            directions = [step]
+            for side in (stride, -stride):
+                if not cells[node + side] and cells[node - step + side]:
+                    directions.append(side)
+        else:
+            step = stride if node > previous else -stride
+            directions = (step, 1, -1)
+        for step in directions:
+            if step in (1, -1):
+                found = _jump_horizontal(cells, stride, node, step, target)
+                if found >= 0:
+                    yield found, abs(found - node)
+            else:
+                found = _jump_vertical(cells, stride, node, step, target)
+                if found >= 0:
+                    yield found, abs(found - node) // stride
+
+
+def _jump_horizontal(cells: bytearray, stride: int, node: int, step: int, target: int) -> int:
+    """Runs from `node` along its row to the first jump point, or returns -1.
+
+    A tile is a jump point if it is the goal or if the tile above or below
+    it is free while the one before that was blocked. Each of the three is
+    found with one C-level scan of a row.
+    """
+    if step > 0:
+        wall = cells.find(_BLOCKED, node + 1)
+        found = target if node < target < wall else wall
+        for side in (-stride, stride):
+            opening = cells.find(_OPENS_RIGHT, node + side, wall + side)
+            if opening >= 0 and opening + 1 - side < found:
+                found = opening + 1 - side
+        return found if found < wall else -1
+    wall = cells.rfind(_BLOCKED, 0, node)
+    found = target if wall < target < node else wall
+    for side in (-stride, stride):
+        opening = cells.rfind(_OPENS_LEFT, wall + 1 + side, node + side + 1)
+        if opening >= 0 and opening - side > found:
+            found = opening - side
+    return found if found > wall else -1
+
+
+def _jump_vertical(cells: bytearray, stride: int, node: int, step: int, target: int) -> int:
+    """Runs from `node` along its column to the first jump point, or returns -1.
+
+    A tile is a jump point if it is the goal or if a horizontal run from it
+    reaches one.
+    """
+    node += step
+    while not cells[node]:
+        if (node == target or _jump_horizontal(cells, stride, node, 1, target) >= 0
+                or _jump_horizontal(cells, stride, node, -1, target) >= 0):
+            return node
+        node += step
+    return -1
+
+
+_shared = Pathfinder()
+
+
+def find_path(grid: Grid, start: Point, goal: Point, jump: bool = True) -> Optional[List[Point]]:
+    """Finds a shortest path with a pathfinder shared by the game loop.
+
+    See `Pathfinder.find_path`.
+    """
+    return _shared.find_path(grid, start, goal, jump)
+
+
+class FlowField:
+    """Shortest-path distances and next steps from every tile to one goal.
+
+    Tiles are reached breadth-first from the goal, one distance level after
+    another, and each tile records the neighbour it was reached from: the
+    next step of a shortest path from it. The search is lazy; asking about a
+    tile runs it until that tile is reached (or everything reachable is).
+
+    When a tile of the grid is blocked or freed, no tile nearer the goal
+    than its nearest reached neighbour can be affected, so those levels are
+    kept and the search resumes from the last of them. The result is the
+    same as a field built from scratch on the new grid.
+
+    Attributes:
+        grid (Grid): The grid the field is laid over.
+        goal (Point): The tile every step leads towards.
+    """
+
+    def __init__(self, grid: Grid, goal: Point):
+        self.grid = grid
+        size = len(grid.cells)
+        self._level = array('i', bytes(size * array('i').itemsize))
+        self._next = array('i', bytes(size * array('i').itemsize))
+        self._seen = array('I', bytes(size * array('I').itemsize))
+        self._search = 0
+        self.reset(goal)
+
+    def reset(self, goal: Point) -> None:
+        """Starts over towards a new goal, reusing the field's buffers."""
+        self.goal = goal
+        self._search += 1
+        if self._search >= 1 << 32:
+            self._seen = array('I', bytes(len(self._seen) * self._seen.itemsize))
+            self._search = 1
+        # Tiles in the order they were reached, where each level starts in
+        # it, and the position of the next tile to expand.
+        self._order: List[int] = []
+        self._starts: List[int] = []
+        self._cursor = 0
+        if self.grid.contains(*goal):
+            self._reach(self.grid._index(*goal), 0, -1)
+
+    @property
+    def reached(self) -> int:
+        """int: How many tiles the search has reached so far."""
+        return len(self._order)
+
+    def _reach(self, index: int, level: int, next_index: int) -> None:
+        self._seen[index] = self._search
+        self._level[index] = level
+        self._next[index] = next_index
+        if level == len(self._starts):
+            self._starts.append(len(self._order))
+        self._order.append(index)
+
+    def _settle(self, index: int) -> bool:
+        """Runs the search until a tile is reached; returns whether it was."""
+        seen, search, order, cells = self._seen, self._search, self._order, self.grid.cells
+        steps = (1, -1, self.grid.stride, -self.grid.stride)
+        level, reach = self._level, self._reach
+        while seen[index] != search and self._cursor < len(order):
+            node = order[self._cursor]
+            self._cursor += 1
+            farther = level[node] + 1
+            for step in steps:
+                neighbour = node + step
+                if seen[neighbour] != search and not cells[neighbour]:
+                    reach(neighbour, farther, node)
+        return seen[index] == search
+
+    def tile_changed(self, index: int) -> None:
+        """Drops the part of the search a tile that was blocked or freed may change.
+
+        Args:
+            index (int): The grid index of the tile.
+        """
+        seen, search, level = self._seen, self._search, self._level
+        stride = self.grid.stride
+        levels = [level[n] for n in (index + 1, index - 1, index + stride, index - stride) if seen[n] == search]
+        if not levels or self._order[0] == index:
+            return  # Not near anything reached yet, or the goal itself.
+        keep = min(levels)  # Levels up to this one cannot change.
+        if keep + 1 < len(self._starts):
+            cut = self._starts[keep + 1]
+            for dropped in self._order[cut:]:
+                seen[dropped] = 0
+            del self._order[cut:]
+            del self._starts[keep + 1:]
+        self._cursor = min(self._cursor, self._starts[keep])
+
+    def _free(self, index: int) -> bool:
+        """Whether the search can ever reach a tile: it is free, or the goal."""
+        return not self.grid.cells[index] or (bool(self._order) and self._order[0] == index)
+
+    def distance(self, x: int, y: int) -> Optional[int]:
+        """Returns the number of steps from a tile to the goal, or None if it cannot get there."""
+        if not self.grid.contains(x, y):
+            return None
+        index = self.grid._index(x, y)
+        return self._level[index] if self._free(index) and self._settle(index) else None
+
+    def next_tile(self, x: int, y: int) -> Optional[Point]:
+        """Returns the tile to step to from a tile on a shortest way to the goal.
+
+        A walker standing on a blocked tile steps to its neighbour nearest
+        the goal.
+
+        Returns:
+            Optional[Point]: The next tile; None at the goal, off the grid,
+            or when the goal cannot be reached.
+        """
+        grid = self.grid
+        if not grid.contains(x, y):
+            return None
+        index = grid._index(x, y)
+        if self._free(index):
+            if self._settle(index) and self._next[index] >= 0:
+                return grid._point(self._next[index])
+            return None
+        best = None
+        for neighbour in (index + 1, index - 1, index + grid.stride, index - grid.stride):
+            if self._free(neighbour) and self._settle(neighbour) and (
+                    best is None or self._level[neighbour] < self._level[best]):
+                best = neighbour
+        return grid._point(best) if best is not None else None
+
+
+class Terrain:
+    """The grid of a scene's blocking objects, kept up to date.
+
+    Listens to the scene's index: objects that block are placed on their
+    tile when they join the scene and lifted when they leave or move, and
+    whether an object blocks is checked again whenever one of its
+    attributes is assigned. Tiles with several blocking objects stay blocked
+    until the last one leaves. The flow fields it keeps are told about every
+    tile that is blocked or freed.
+
+    Attributes:
+        scene: The scene, with `width`, `height` and an `index`.
+        blocks (callable): Whether an object blocks its tile.
+        grid (Grid): The blocked tiles of the whole scene.
+    """
+
+    def __init__(self, scene: Any, blocks: Callable[[Any], bool] = is_solid):
+        self.scene = scene
+        self.blocks = blocks
+        self.grid = Grid(scene.width, scene.height)
+        # Maps id(obj) -> the grid index it blocks, or None when off the grid.
+        self._placed: Dict[int, Optional[int]] = {}
+        # Maps a grid index -> how many objects block it.
+        self._counts: Dict[int, int] = {}
+        self._fields: "OrderedDict[Point, FlowField]" = OrderedDict()
+        for obj in scene.game_objects:
+            self.added(obj)
+        scene.index.add_listener(self)
+
+    def _place(self, obj: Any) -> None:
+        x, y = int(obj.x), int(obj.y)
+        index = self.grid._index(x, y) if self.grid.contains(x, y) else None
+        self._placed[id(obj)] = index
+        if index is not None:
+            count = self._counts.get(index, 0)
+            self._counts[index] = count + 1
+            if not count:
+                self.grid.cells[index] = _BLOCKED
+                for field in self._fields.values():
+                    field.tile_changed(index)
+
+    def _lift(self, obj: Any) -> None:
+        index = self._placed.pop(id(obj))
+        if index is not None:
+            count = self._counts.pop(index) - 1
+            if count:
+                self._counts[index] = count
+            else:
+                self.grid.cells[index] = _FREE
+                for field in self._fields.values():
+                    field.tile_changed(index)
+
+    def added(self, obj: Any) -> None:
+        """Places an object that joined the scene, if it blocks."""
+        if id(obj) not in self._placed and self.blocks(obj):
+            self._place(obj)
+
+    def removed(self, obj: Any) -> None:
+        """Lifts an object that left the scene."""
+        if id(obj) in self._placed:
+            self._lift(obj)
+
+    def changed(self, obj: Any, name: str) -> None:
+        """Moves an object that moved, and places or lifts one that started or stopped blocking."""
+        placed = id(obj) in self._placed
+        if self.blocks(obj):
+            if placed and name != 'x' and name != 'y':
+                return
+            if placed:
+                self._lift(obj)
+            self._place(obj)
+        elif placed:
+            self._lift(obj)
+
+    def clear_between(self, start: Point, goal: Point) -> bool:
+        """Returns whether no tile in the rectangle two tiles span is blocked.
+
+        The two corner tiles themselves are not checked. When the rectangle
+        is clear, every path that only moves towards the goal is shortest.
+        """
+        grid, cells = self.grid, self.grid.cells
+        if not self._counts:
+            return grid.contains(*start) and grid.contains(*goal)
+        if not (grid.contains(*start) and grid.contains(*goal)):
+            return False
+        ends = (grid._index(*start), grid._index(*goal))
+        min_x, max_x = sorted((start[0], goal[0]))
+        min_y, max_y = sorted((start[1], goal[1]))
+        if len(self._counts) <= max_y - min_y:
+            # Fewer blocked tiles than rows: look at each of them instead.
+            for index in self._counts:
+                x, y = grid._point(index)
+                if min_x <= x <= max_x and min_y <= y <= max_y and index not in ends:
+                    return False
+            return True
+        for y in range(min_y, max_y + 1):
+            first, last = grid._index(min_x, y), grid._index(max_x, y) + 1
+            blocked = cells.find(_BLOCKED, first, last)
+            while blocked >= 0:
+                if blocked not in ends:
+                    return False
+                blocked = cells.find(_BLOCKED, blocked + 1, last)
+        return True
+
+    def flow_field(self, goal: Point) -> FlowField:
+        """Returns the flow field towards a tile.
+
+        Fields are kept for the last `FIELDS_KEPT` goals asked for; the
+        oldest one is reused for a new goal.
+
+        Args:
+            goal (Point): The tile the field leads to.
+
+        Returns:
+            FlowField: The field, kept up to date with the terrain.
+        """
+        field = self._fields.get(goal)
+        if field is not None:
+            self._fields.move_to_end(goal)
+            return field
+        if len(self._fields) >= FIELDS_KEPT:
+            field = self._fields.popitem(last=False)[1]
+            field.reset(goal)
+        else:
+            field = FlowField(self.grid, goal)
+        self._fields[goal] = field
+        return field
+
+    def find_path(self, start: Point, goal: Point, jump: bool = True) -> Optional[List[Point]]:
+        """Finds a shortest path around the blocking objects; objects on the goal never block.
+
+        See `Pathfinder.find_path`.
+        """
+        grid = self.grid
+        if not grid.contains(*goal):
+            return None
+        index = grid._index(*goal)
+        saved, grid.cells[index] = grid.cells[index], _FREE
+        try:
+            return find_path(grid, start, goal, jump)
+        finally:
+            grid.cells[index] = saved
+
+
+def terrain(scene: Any, blocks: Callable[[Any], bool] = is_solid) -> Terrain:
+    """Returns the scene's `Terrain` for a blocking test, building it on first use.
+
+    The terrain is kept in the index's `terrains`, so it lives as long as
+    the scene's index and is rebuilt when `game_objects` is replaced or the
+    scene is resized.
+
+    Args:
+        scene: A `scene_index.IndexedScene`.
+        blocks (callable): Whether an object blocks its tile.
+
+    Returns:
+        Terrain: The scene's terrain.
+    """
+    terrains = scene.index.terrains
+    kept = terrains.get(blocks)
+    if kept is not None and (kept.grid.width, kept.grid.height) != (scene.width, scene.height):
+        scene.index.remove_listener(kept)
+        kept = None
+    if kept is None:
+        kept = terrains[blocks] = Terrain(scene, blocks)
+    return kept
+
+
+def find_scene_path(scene: Any, start: Point, goal: Point,
+                    blocks: Callable[[Any], bool] = is_solid) -> Optional[List[Point]]:
+    """Finds a shortest path between two tiles of a scene around its blocking objects.
+
+    Args:
+        scene: A `scene_index.IndexedScene`.
+        start (Point): The tile the path starts from.
+        goal (Point): The tile the path leads to. Objects on it never block.
+        blocks (callable): Whether an object blocks its tile.
+
+    Returns:
+        Optional[List[Point]]: As for `Pathfinder.find_path`.
+    """
+    return terrain(scene, blocks).find_path((int(start[0]), int(start[1])), (int(goal[0]), int(goal[1])))
@@ -0,0 +1,266 @@
+"""A terminal renderer that only redraws what changed between frames.
+
+`Game.draw` used to reset the terminal with `\\033c` and print the whole map
+every turn, which flickers and, over a slow link such as SSH, spends most of
+each turn resending an unchanged map. A `TerminalRenderer` keeps the last
+frame it drew and writes only the difference, using ANSI cursor moves, in a
+single write:
+
+- map cells that changed are rewritten in place (runs of neighbouring
+  changed cells share one cursor move);
+- text lines above and below the map that changed are rewritten and
+  cleared to the end of the line;
+- the first frame, and any frame whose layout differs from the last one
+  (a different number of text lines above the map or different map size),
+  is drawn in full.
+
+After every frame the cursor is left below it and the rest of the screen is
+cleared, as the full reset did, so prompts and messages printed between
+frames land below the map. Output that scrolls the terminal invalidates the
+last frame, so the renderer counts the screen rows written below it (see
+`note_output`) and draws the next frame in full once the frame and those
+rows no longer fit on the screen. `tracking` counts everything printed
+while it is active; the game loops run inside it.
+
+Map cells are painted with `paint`, which lays objects out in scene order
+and then the scene's `top` objects (such as characters), so the draw order
+is kept by the scene index rather than by sorting every object each frame.
+
+Scenes may be far larger than the terminal. A `Camera` is a viewport that
+follows the player, clamped to the scene's edges; it asks the scene's
+spatial index for the objects inside the viewport only, so the cost of a
+frame depends on the size of the screen, not of the world.
+"""
+
+import contextlib
+import shutil
+import sys
+from typing import Any, Iterable, List, Optional, Sequence, TextIO, Tuple
+
+CLEAR_SCREEN = "\033[H\033[2J"
+CLEAR_LINE = "\033[K"
+CLEAR_BELOW = "\033[J"
+
+Grid = List[List[str]]
+
+
+def move_to(row: int, column: int) -> str:
+    """Returns the ANSI sequence moving the cursor to a 0-based row and column."""
+    return f"\033[{row + 1};{column + 1}H"
+
+
+def paint(width: int, height: int, objects: Iterable[Any], top: Iterable[Any] = (), empty: str = '.',
+          origin: Tuple[int, int] = (0, 0)) -> Grid:
+    """Lays out the visible objects on a map grid.
+
+    Objects are painted in order, so later objects cover earlier ones on the
+    same cell, and `top` objects are painted last.
+
+    Args:
+        width (int): The map width in cells.
+        height (int): The map height in cells.
+        objects (Iterable): Objects with `x`, `y` and `symbol`, in scene order.
+        top (Iterable): Objects drawn over all others, e.g. characters.
+        empty (str): The symbol of an empty cell.
+        origin (Tuple[int, int]): The map position of the grid's top-left cell.
+
+    Returns:
+        Grid: `height` rows of `width` symbols.
+    """
+    grid = [[empty] * width for _ in range(height)]
+    left, top_row = origin
+    for group in (objects, top):
+        for obj in group:
+            x, y = obj.x - left, obj.y - top_row
+            if 0 <= x < width and 0 <= y < height:
+                grid[y][x] = obj.symbol
+    return grid
+
+
+class Camera:
+    """A viewport onto a scene, following a target.
+
+    Attributes:
+        width (int): The viewport width in cells.
+        height (int): The viewport height in cells.
+        x (int): The map x-coordinate of the viewport's left column.
+        y (int): The map y-coordinate of the viewport's top row.
+    """
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+        self.x = 0
+        self.y = 0
+
+    def follow(self, target: Any, world_width: int, world_height: int) -> "Camera":
+        """Centers the viewport on a target, without showing past the world's edges.
+
+        A world smaller than the viewport is drawn from its top-left corner.
+
+        Args:
+            target: An object with `x` and `y`, e.g. the player.
+            world_width (int): The width of the scene.
+            world_height (int): The height of the scene.
+
+        Returns:
+            Camera: The camera itself.
+        """
+        self.x = max(0, min(int(target.x) - self.width // 2, world_width - self.width))
+        self.y = max(0, min(int(target.y) - self.height // 2, world_height - self.height))
+        return self
+
+    def visible(self, scene: Any) -> List[Any]:
+        """Returns the scene's objects inside the viewport, in `game_objects` order.
+
+        Args:
+            scene (IndexedScene): The scene to look at.
+        """
+        return scene.get_objects_in_rect(self.x, self.y, self.x + self.width - 1, self.y + self.height - 1)
+
+    def paint(self, scene: Any, top_type: type = object) -> Grid:
+        """Lays out the objects inside the viewport, with instances of `top_type` on top.
+
+        Args:
+            scene (IndexedScene): The scene to draw.
+            top_type (type): The class of the objects drawn over all others,
+                e.g. the scene's character class.
+
+        Returns:
+            Grid: The viewport's rows of symbols.
+        """
+        objects = self.visible(scene)
+        top = [obj for obj in objects if isinstance(obj, top_type)]
+        return paint(self.width, self.height, objects, top, origin=(self.x, self.y))
+
+
+class TerminalRenderer:
+    """Draws frames of text lines around a map grid, redrawing only changes.
+
+    A frame is some lines of text (`header`), the map grid, with cells
+    separated by spaces, and more lines of text (`footer`).
+
+    Attributes:
+        stream (Optional[TextIO]): Where frames are written; the current
+            `sys.stdout` if None.
+        size (Optional[Tuple[int, int]]): The screen's (columns, rows); asked
+            of the terminal when needed if None.
+        frames (int): The number of frames rendered.
+        full_redraws (int): How many of them were drawn in full.
+    """
+
+    def __init__(self, stream: Optional[TextIO] = None, size: Optional[Tuple[int, int]] = None):
+        self.stream = stream
+        self.size = size
+        self.frames = 0
+        self.full_redraws = 0
+        self._header: Optional[List[str]] = None
+        self._grid: Grid = []
+        self._footer: List[str] = []
+        # Screen rows written below the last frame since it was drawn.
+        self._below = 0
+
+    def _screen(self) -> Tuple[int, int]:
+        return self.size if self.size is not None else tuple(shutil.get_terminal_size())
+
+    def invalidate(self) -> None:
+        """Forgets the last frame, so the next one is drawn in full."""
+        self._header = None
+
+    def note_output(self, text: str) -> None:
+        """Records text written to the screen since the last frame.
+
+        Every line ends a screen row, and lines wider than the screen wrap
+        onto more. Once the last frame and the rows below it no longer fit
+        on the screen, the terminal has scrolled and the next frame is drawn
+        in full.
+
+        Args:
+            text (str): The text written, e.g. a prompt and the line typed.
+        """
+        columns = self._screen()[0]
+        lines = text.split("\n")
+        self._below += len(lines) - 1 + sum((len(line) - 1) // columns for line in lines if line)
+
+    def tracking(self) -> contextlib.AbstractContextManager:
+        """Returns a context in which everything printed is passed to `note_output`.
+
+        Text still goes to the current `sys.stdout`.
+        """
+        return contextlib.redirect_stdout(_TrackedOutput(sys.stdout, self))
+
+    def render(self, header: Sequence[str], grid: Grid, footer: Sequence[str]) -> str:
+        """Draws a frame, writing only what changed since the last one.
+
+        Args:
+            header (Sequence[str]): The lines above the map.
+            grid (Grid): The map cells, e.g. from `paint`; may be empty.
+            footer (Sequence[str]): The lines below the map.
+
+        Returns:
+            str: The text written.
+        """
+        header, footer = list(header), list(footer)
+        previous = self._header
+        if previous is not None:
+            height = len(previous) + len(self._grid) + len(self._footer)
+            if height + self._below >= self._screen()[1]:
+                previous = None  # Output below the frame scrolled it off its rows.
+        if (previous is None or len(previous) != len(header) or len(grid) != len(self._grid)
+                or (grid and len(grid[0]) != len(self._grid[0]))):
+            text = self._full(header, grid, footer)
+        else:
+            text = self._diff(header, grid, footer)
+        self._header, self._grid, self._footer = header, [row[:] for row in grid], footer
+        self.frames += 1
+        stream = self.stream if self.stream is not None else sys.stdout
+        stream.write(text)
+        stream.flush()
+        self._below = 0
+        return text
+
+    def _full(self, header: List[str], grid: Grid, footer: List[str]) -> str:
+        self.full_redraws += 1
+        lines = header + [" ".join(row) for row in grid] + footer
+        return CLEAR_SCREEN + "".join(line + "\n" for line in lines)
+
+    def _diff(self, header: List[str], grid: Grid, footer: List[str]) -> str:
+        parts: List[str] = []
+        self._diff_lines(parts, 0, self._header, header)
+        top = len(header)
+        for y, (row, old) in enumerate(zip(grid, self._grid)):
+            if row == old:
+                continue
+            last = -2
+            for x, (cell, old_cell) in enumerate(zip(row, old)):
+                if cell != old_cell:
+                    if x == last + 1:
+                        parts.append(" " + cell)  # Continue the run: the cursor is on the separator.
+                    else:
+                        parts.append(move_to(top + y, 2 * x) + cell)
+                    last = x
+        bottom = top + len(grid)
+        self._diff_lines(parts, bottom, self._footer, footer)
+        parts.append(move_to(bottom + len(footer), 0) + CLEAR_BELOW)
+        return "".join(parts)
+
+    @staticmethod
+    def _diff_lines(parts: List[str], row: int, old: List[str], new: List[str]) -> None:
+        for i, line in enumerate(new):
+            if i >= len(old) or line != old[i]:
+                parts.append(move_to(row + i, 0) + line + CLEAR_LINE)
+
+
+class _TrackedOutput:
+    """A text stream that passes writes on and reports them to a renderer."""
+
+    def __init__(self, stream: TextIO, renderer: TerminalRenderer):
+        self.stream = stream
+        self.renderer = renderer
+
+    def write(self, text: str) -> int:
+        self.renderer.note_output(text)
+        return self.stream.write(text)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.stream, name)
@@ -0,0 +1,229 @@
+"""Seeded, counter-based random streams for reproducible simulation.
+
+Every roll in the games used to go through the global `random` module, so
+one extra roll anywhere shifted every later result, and fights played in
+parallel could not be reproduced one by one. Rolls now come from
+independent streams handed out by a `RandomService`:
+
+    rng.reset(1234)                          # one seed for the session
+    rng.stream_for(player).uniform(0, 100)   # the player's own stream
+    rng.stream("loot").choice(table)         # a per-system stream
+
+A stream is a `random.Random`, so it has the usual `uniform`, `randint`,
+`choice`, ... methods. Its numbers are a keyed BLAKE2b hash of their
+position, computed in blocks of eight, where the key is derived from the
+session seed and the stream name. Streams therefore never affect each other and can be jumped to any
+position with `seek`. Every roll uses exactly one number, so a batch drawn
+with `randoms`, `uniforms` or `randints` matches drawing the same rolls one
+at a time.
+
+Entity streams are named after the entity's class and name, numbered in
+the order entities first roll, so the same session replays the same way.
+"""
+
+import hashlib
+import os
+import random
+import struct
+import weakref
+from typing import Any, Dict, List, Optional, Tuple
+
+_MASK = (1 << 64) - 1
+_TO_FLOAT = 2.0 ** -53
+
+# A stream's numbers are generated eight at a time: block b is the keyed
+# BLAKE2b hash of b, read as eight little-endian 64-bit integers.
+_LANES = 8  # `next64` indexes blocks with `counter >> 3` and `counter & 7`.
+_unpack_block = struct.Struct(f"<{_LANES}Q").unpack
+
+
+def derive_key(seed: int, name: str) -> int:
+    """Derives the 64-bit key of the stream `name` in a session.
+
+    The derivation is the same in every process and Python version, unlike
+    the built-in `hash` of a string.
+    """
+    digest = hashlib.blake2b(f"{seed}/{name}".encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+class RandomStream(random.Random):
+    """An independent random stream addressed by a counter.
+
+    Attributes:
+        key (int): The 64-bit key selecting the stream.
+        counter (int): The number of 64-bit values drawn so far.
+    """
+
+    def __init__(self, key: int = 0):
+        self.key = key
+        self.counter = 0
+        super().__init__(key)
+
+    def seed(self, key: Any = 0, version: int = 2) -> None:
+        """Selects the stream `key` (an int, or hashed like a stream name) and rewinds it."""
+        if not isinstance(key, int):
+            key = derive_key(0, str(key))
+        self.key = key & _MASK
+        self._hasher = hashlib.blake2b(digest_size=_LANES * 8, key=self.key.to_bytes(8, "little"))
+        self.seek(0)
+
+    def getstate(self) -> Tuple[int, int]:
+        return self.key, self.counter
+
+    def setstate(self, state: Tuple[int, int]) -> None:
+        key, counter = state
+        self.seed(key)
+        self.seek(counter)
+
+    def seek(self, counter: int) -> None:
+        """Moves the stream to its `counter`-th value."""
+        self.counter = counter
+        self.gauss_next = None
+        self._block_number = -1
+        self._block: Tuple[int, ...] = ()
+
+    def _hash_block(self, number: int) -> Tuple[int, ...]:
+        hasher = self._hasher.copy()
+        hasher.update(number.to_bytes(8, "little"))
+        return _unpack_block(hasher.digest())
+
+    def next64(self) -> int:
+        """Returns the next 64-bit value of the stream."""
+        counter = self.counter
+        self.counter = counter + 1
+        number = counter >> 3
+        if number != self._block_number:
+            self._block = self._hash_block(number)
+            self._block_number = number
+        return self._block[counter & 7]
+
+    def random(self) -> float:
+        """Returns the next float in [0, 1)."""
+        counter = self.counter
+        self.counter = counter + 1
+        number = counter >> 3
+        if number != self._block_number:
+            self._block = self._hash_block(number)
+            self._block_number = number
+        return (self._block[counter & 7] >> 11) * _TO_FLOAT
+
+    def getrandbits(self, k: int) -> int:
+        """Returns an int with `k` random bits, using one value per 64 bits."""
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        bits = 0
+        filled = 0
+        while filled < k:
+            bits |= self.next64() << filled
+            filled += 64
+        return bits & ((1 << k) - 1)
+
+    def _randbelow(self, n: int) -> int:
+        """Maps one 64-bit value onto [0, n), so every `randint` and `choice` uses exactly one value.
+
+        The bias is below n / 2**64, far under anything the games can notice.
+        """
+        return (self.next64() * n) >> 64
+
+    def _values(self, count: int) -> List[int]:
+        """Draws the next `count` 64-bit values at once."""
+        start = self.counter
+        stop = start + count
+        first, last = start // _LANES, (stop - 1) // _LANES
+        values: List[int] = []
+        if count <= 0:
+            return values
+        if first == self._block_number:
+            values.extend(self._block)
+            first += 1
+        hash_block = self._hash_block
+        for number in range(first, last + 1):
+            values.extend(hash_block(number))
+        self._block = values[-_LANES:]
+        self._block_number = last
+        self.counter = stop
+        offset = start - start // _LANES * _LANES
+        return values[offset:offset + count]
+
+    def randoms(self, count: int) -> List[float]:
+        """Draws `count` floats in [0, 1) at once; the same as calling `random`."""
+        return [(value >> 11) * _TO_FLOAT for value in self._values(count)]
+
+    def uniforms(self, count: int, a: float, b: float) -> List[float]:
+        """Draws `count` floats at once; the same as calling `uniform(a, b)`."""
+        width = b - a
+        return [a + width * ((value >> 11) * _TO_FLOAT) for value in self._values(count)]
+
+    def randints(self, count: int, a: int, b: int) -> List[int]:
+        """Draws `count` integers at once; the same as calling `randint(a, b)`."""
+        span = b - a + 1
+        return [a + ((value * span) >> 64) for value in self._values(count)]
+
+
+class RandomService:
+    """Hands out the random streams of one session.
+
+    Attributes:
+        seed (int): The session seed every stream is derived from.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed if seed is not None else int.from_bytes(os.urandom(8), "little")
+        self._streams: Dict[str, RandomStream] = {}
+        self._entities: "weakref.WeakKeyDictionary[Any, RandomStream]" = weakref.WeakKeyDictionary()
+        self._entity_names: Dict[str, int] = {}
+
+    def stream(self, name: str) -> RandomStream:
+        """Returns the stream `name`, creating it on first use.
+
+        Args:
+            name (str): The stream's name, e.g. a system such as "loot".
+        """
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = RandomStream(derive_key(self.seed, name))
+        return stream
+
+    def stream_for(self, entity: Any) -> RandomStream:
+        """Returns an entity's own stream, creating it on its first roll.
+
+        Args:
+            entity: Any weakly referenceable object with a `name`, such as a
+                `GameObject`.
+        """
+        stream = self._entities.get(entity)
+        if stream is None:
+            base = f"{type(entity).__name__}:{getattr(entity, 'name', '')}"
+            number = self._entity_names.get(base, 0)
+            self._entity_names[base] = number + 1
+            stream = self._entities[entity] = self.stream(f"{base}#{number}")
+        return stream
+
+
+# The session's service. `reset` replaces it.
+service = RandomService()
+
+
+def reset(seed: Optional[int] = None) -> RandomService:
+    """Starts a new session: every stream is derived afresh from `seed`.
+
+    Args:
+        seed (Optional[int]): The session seed; random if None.
+
+    Returns:
+        RandomService: The new service.
+    """
+    global service
+    service = RandomService(seed)
+    return service
+
+
+def stream(name: str) -> RandomStream:
+    """Returns the session's stream `name`; see `RandomService.stream`."""
+    return service.stream(name)
+
+
+def stream_for(entity: Any) -> RandomStream:
+    """Returns the session's stream for `entity`; see `RandomService.stream_for`."""
+    return service.stream_for(entity)
@@ -21,11 +21,32 @@ Key Features:
       hierarchy for game objects, characters, and items.
 """
 
+import contextlib
 import json
 import math
 import random
 import sys
 import database
+import render
+import scene_index
+
+
+def get_class_by_name(class_name):
+    """Returns a class object from the global scope by its string name.
+
+    This is registered with the `database` module so saved games can be
+    restored into this module's classes.
+
+    Args:
+        class_name (str): The name of the class to retrieve.
+
+    Returns:
+        type: The class object corresponding to the given name, or None if not found.
+    """
+    return globals().get(class_name)
+
+
+database.set_class_loader(get_class_by_name, module=__name__)
 
 class GameObject:
     """The base class for all entities in the game world.
@@ -71,6 +92,36 @@ class GameObject:
         self.defense = defense
         self.status_effects = {}
 
+    def __setattr__(self, name, value):
+        """Sets an attribute and reports it to the index of the object's scene.
+
+        Args:
+            name (str): The attribute name.
+            value: The new value.
+        """
+        object.__setattr__(self, name, value)
+        index = self.__dict__.get('_scene_index')
+        if index is not None:
+            index.attribute_changed(self, name)
+
+    def __getstate__(self):
+        """Returns the state to save, without the scene index.
+
+        Returns:
+            dict: The object's attributes.
+        """
+        state = self.__dict__.copy()
+        state.pop('_scene_index', None)
+        return state
+
+    def __setstate__(self, state):
+        """Restores saved state.
+
+        Args:
+            state (dict): The attributes returned by `__getstate__`.
+        """
+        self.__dict__.update(state)
+
     def __repr__(self):
         """Provides a developer-friendly string representation of the object.
 
@@ -450,6 +501,11 @@ class Player(Character):
         self.intelligence += 2
         print(f"Leveled up to level {self.level}!")
 
+# `Enemy.plan_turns` decisions that do not depend on the enemy.
+_NO_ACTION = (False, 0, 0)
+_ATTACK = (True, 0, 0)
+
+
 class Enemy(Character):
     """Represents a non-player character that is hostile to the player.
 
@@ -487,6 +543,68 @@ class Enemy(Character):
         """
         super().attack(target, self.attack_damage)
 
+    @staticmethod
+    def plan_turns(objects, player):
+        """Works out the AI decision of many enemies in one pass.
+
+        Computes each enemy's distance to the player and, unless it is in
+        attack range, its step towards the player exactly as `update` would,
+        without applying either. Only enemies that use the stock `update`
+        and `move` are planned.
+
+        Args:
+            objects (list): The objects to plan for, e.g. a scene's
+                `game_objects`.
+            player (Player): The player the enemies react to.
+
+        Returns:
+            list: One entry per object: an `(attack, dx, dy)` tuple for
+            planned enemies and None for every other object.
+        """
+        px, py = player.x, player.y
+        sqrt = math.sqrt
+        stock = {}  # Maps class -> whether it runs the stock AI.
+        plans = []
+        append = plans.append
+        for obj in objects:
+            cls = type(obj)
+            planned = stock.get(cls)
+            if planned is None:
+                planned = stock[cls] = (issubclass(cls, Enemy) and cls.update is Enemy.update
+                                        and cls.move is GameObject.move)
+            if not planned:
+                append(None)
+                continue
+            dx = px - obj.x
+            dy = py - obj.y
+            dist = sqrt(dx * dx + dy * dy)
+            if dist < 1.5:
+                append(_ATTACK)
+            elif dist > 0:
+                append((False, round(dx / dist), round(dy / dist)))
+            else:
+                append(_NO_ACTION)
+        return plans
+
+    def take_planned_turn(self, plan, player):
+        """Runs the enemy's turn using its decision from `plan_turns`.
+
+        Equivalent to `update`, provided neither the enemy nor the player
+        moved since the plan was made.
+
+        Args:
+            plan (tuple): This enemy's entry from `plan_turns`.
+            player (Player): The player the plan was made against.
+        """
+        attack, dx, dy = plan
+        if attack:
+            self.attack(player)
+            return
+        if dx:
+            self.x += dx
+        if dy:
+            self.y += dy
+
     def update(self, scene_manager):
         """Defines the enemy's behavior for a single game turn.
 
@@ -508,11 +626,13 @@ class Enemy(Character):
             if dist > 0:
                 self.move(round(dx / dist), round(dy / dist))
 
-class Scene:
+class Scene(scene_index.IndexedScene):
     """Manages all the game objects and data for a specific game area.
 
     This class acts as a container for all the `GameObject` instances that
-    exist in a particular level, room, or zone.
+    exist in a particular level, room, or zone. Position queries are
+    answered from a spatial hash kept in sync with the objects (see
+    `scene_index`).
 
     Attributes:
         name (str): The name of the scene (e.g., "Troll Cave").
@@ -555,22 +675,6 @@ class Scene:
         self.player_character = player
         self.add_object(player)
 
-    def get_object_at(self, x, y):
-        """Retrieves the game object at a specific map coordinate.
-
-        Args:
-            x (int): The x-coordinate to check.
-            y (int): The y-coordinate to check.
-
-        Returns:
-            Optional[GameObject]: The `GameObject` at the specified
-            coordinates, or `None` if no object is found there.
-        """
-        for obj in self.game_objects:
-            if obj.x == x and obj.y == y:
-                return obj
-        return None
-
 class Game:
     """The core game engine, responsible for the main loop and rendering.
 
@@ -585,7 +689,8 @@ class Game:
         in_conversation (bool): Whether the player is in a conversation.
         dialogue_manager (DialogueManager): The active dialogue manager.
         db_conn: The connection to the SQLite database.
-        width (int): The width of the console display area for the map.
+        width (int): The width of the console display area for the map;
+            larger scenes scroll with the player.
         height (int): The height of the console display area for the map.
         message_log (list): A list of recent messages to be displayed to the
             player.
@@ -595,7 +700,24 @@ class Game:
         dialogue_manager (DialogueManager): The active dialogue manager, if
             `in_conversation` is True.
         db_conn (sqlite3.Connection): A connection to the game's database.
+        headless (bool): Whether `draw` skips rendering (see `headless`).
+        command_source (callable): If set, called with each prompt instead
+            of `input` to read the player's commands.
+        turn_count (int): The number of turns drawn so far.
+        renderer (render.TerminalRenderer): Draws the frames, created on the
+            first one; a game loaded in its place keeps it.
+        camera (render.Camera): The `width` x `height` viewport following
+            the player, created on the first frame.
     """
+    # Session settings: class defaults, so games restored from a save have
+    # them too, and left out of saves by `__getstate__`.
+    SESSION_ATTRIBUTES = ('headless', 'command_source', 'turn_count', 'renderer', 'camera')
+    headless = False
+    command_source = None
+    turn_count = 0
+    renderer = None
+    camera = None
+
     def __init__(self, width=40, height=10):
         """Initializes the Game engine.
 
@@ -611,6 +733,71 @@ class Game:
         self.dialogue_manager = None
         self.db_conn = database.get_db_connection()
 
+    def __getstate__(self):
+        """Returns the state to save, excluding the database connection.
+
+        Returns:
+            dict: The game's attributes without `db_conn` or the session
+            settings.
+        """
+        state = self.__dict__.copy()
+        state.pop('db_conn', None)
+        for name in self.SESSION_ATTRIBUTES:
+            state.pop(name, None)
+        return state
+
+    def __setstate__(self, state):
+        """Restores saved state and reopens the database connection.
+
+        Args:
+            state (dict): The attributes returned by `__getstate__`.
+        """
+        self.__dict__.update(state)
+        self.db_conn = database.get_db_connection()
+
+    def continue_session(self, other):
+        """Carries the session settings over to a game that replaces this one.
+
+        Args:
+            other (Game): The game taking over, e.g. one loaded from a save.
+        """
+        for name in self.SESSION_ATTRIBUTES:
+            if name in self.__dict__:
+                setattr(other, name, self.__dict__[name])
+
+    def read_input(self, prompt=""):
+        """Reads one line of player input.
+
+        Args:
+            prompt (str): The prompt to show the player.
+
+        Returns:
+            str: The line read from `command_source` if one is set, otherwise
+            from the terminal.
+        """
+        if self.command_source is None:
+            line = input(prompt)
+            if self.renderer is not None:
+                # The terminal echoes the line typed, and `input` may write
+                # the prompt without going through `sys.stdout`.
+                self.renderer.note_output(prompt + line + "\n")
+            return line
+        return self.command_source(prompt)
+
+    def tracking_output(self):
+        """Returns a context in which printed text is reported to the renderer.
+
+        The scene loops run inside it, so a frame that prompts and messages
+        printed since have scrolled off the screen is redrawn in full (see
+        `render.TerminalRenderer.note_output`). Headless games draw nothing,
+        so for them it does nothing.
+        """
+        if self.headless:
+            return contextlib.nullcontext()
+        if self.renderer is None:
+            self.renderer = render.TerminalRenderer()
+        return self.renderer.tracking()
+
     def log_message(self, message):
         """Adds a message to the game's message log.
 
@@ -645,7 +832,7 @@ class Game:
 
             # Display dialogue and prompt for choice
             try:
-                choice = int(input("Choose an option (number): ")) - 1
+                choice = int(self.read_input("Choose an option (number): ")) - 1
                 if self.dialogue_manager.select_option(choice):
                     self.turn_taken = True
                 else:
@@ -655,14 +842,14 @@ class Game:
             return
 
         # Main command loop
-        command = input("What do you want to do? (move, attack, use, talk, quit) > ").lower().strip()
+        command = self.read_input("What do you want to do? (move, attack, use, talk, quit) > ").lower().strip()
 
         if command == "quit":
             self.game_over = True
             self.turn_taken = True
 
         elif command == "move":
-            direction = input("Move where? (w/a/s/d) > ").lower().strip()
+            direction = self.read_input("Move where? (w/a/s/d) > ").lower().strip()
             dx, dy = 0, 0
             if direction == 'w': dy = -1
             elif direction == 's': dy = 1
@@ -676,7 +863,7 @@ class Game:
             new_x, new_y = player.x + dx, player.y + dy
 
             # Boundary and collision check
-            if not (0 <= new_x < self.width and 0 <= new_y < self.height):
+            if not (0 <= new_x < scene.width and 0 <= new_y < scene.height):
                 self.log_message("You can't move off the map.")
             else:
                 target_object = scene.get_object_at(new_x, new_y)
@@ -688,9 +875,9 @@ class Game:
                     self.turn_taken = True
 
         elif command == "attack":
-            target_name = input("Attack who? > ").lower().strip()
+            target_name = self.read_input("Attack who? > ").lower().strip()
             # Find the target in the current scene
-            target = next((obj for obj in scene.game_objects if obj.name.lower() == target_name and isinstance(obj, Enemy)), None)
+            target = scene.find_object(target_name, Enemy)
 
             if target:
                 if target.health > 0:
@@ -702,15 +889,15 @@ class Game:
                 self.log_message(f"There is no one here named '{target_name}'.")
 
         elif command == "use":
-            item_name = input("Use what? > ").lower().strip()
+            item_name = self.read_input("Use what? > ").lower().strip()
             if player.use_item(item_name):
                 self.turn_taken = True
             # The use_item method prints its own messages, so no need for else here.
 
         elif command == "talk":
-            target_name = input("Talk to who? > ").lower().strip()
+            target_name = self.read_input("Talk to who? > ").lower().strip()
             # Find any character (NPC or otherwise) with dialogue
-            target = next((obj for obj in scene.game_objects if obj.name.lower() == target_name), None)
+            target = scene.find_object(target_name)
 
             if target and hasattr(target, 'dialogue') and target.dialogue:
                 if player.distance_to(target) < 3: # A bit more lenient for talking
@@ -722,16 +909,16 @@ class Game:
                 self.log_message(f"'{target_name}' has nothing to say, or isn't here.")
 
         elif command == "examine":
-            target_name = input("Examine what? (or leave blank for nearby) > ").lower().strip()
+            target_name = self.read_input("Examine what? (or leave blank for nearby) > ").lower().strip()
             if target_name:
-                target = next((obj for obj in scene.game_objects if obj.name.lower() == target_name and isinstance(obj, Interactable)), None)
+                target = scene.find_object(target_name, Interactable)
                 if target:
                     self.log_message(f"{target.name}: {target.on_examine()}")
                 else:
                     self.log_message(f"There is no '{target_name}' to examine.")
             else:
                 found_something = False
-                for obj in scene.game_objects:
+                for obj in scene.get_objects_in_radius(player.x, player.y, 1.5):
                     if isinstance(obj, Interactable) and player.distance_to(obj) < 1.5:
                         self.log_message(f"{obj.name}: {obj.on_examine()}")
                         found_something = True
@@ -741,27 +928,27 @@ class Game:
             self.turn_taken = True
 
         elif command == "equip":
-            item_name = input("Equip what? > ").lower().strip()
+            item_name = self.read_input("Equip what? > ").lower().strip()
             player.equip_item(item_name)
             self.turn_taken = True
 
         elif command == "status":
             self.log_message(f"{player.name} - HP: {player.health}/{player.max_health}, Mana: {int(player.mana)}/{player.max_mana}")
-            for obj in scene.game_objects:
-                if isinstance(obj, Enemy) and obj.health > 0:
-                    self.log_message(f"{obj.name} - HP: {obj.health}")
+            for obj in scene.get_objects_of_type(Enemy, alive=True):
+                self.log_message(f"{obj.name} - HP: {obj.health}")
             self.turn_taken = False
 
         elif command == "save":
-            save_name = input("Save name? (default: quicksave) > ").lower().strip() or "quicksave"
+            save_name = self.read_input("Save name? (default: quicksave) > ").lower().strip() or "quicksave"
             database.save_game(save_name, scene_manager)
             self.log_message(f"Game saved to slot: {save_name}")
             self.turn_taken = False
 
         elif command == "load":
-            save_name = input("Load from what save? (default: quicksave) > ").lower().strip() or "quicksave"
+            save_name = self.read_input("Load from what save? (default: quicksave) > ").lower().strip() or "quicksave"
             new_manager = database.load_game(save_name)
             if new_manager:
+                self.continue_session(new_manager.game)
                 scene_manager.game = new_manager.game
                 scene_manager.scene = new_manager.scene
                 self.log_message(f"Game loaded from slot: {save_name}")
@@ -782,24 +969,28 @@ class Game:
     def draw(self, scene):
         """Renders the current game state to the console.
 
-        This method clears the console and draws the scene's map, character
-        symbols, player stats, and the message log.
+        This method draws the part of the scene's map around the player,
+        character symbols, player stats, and the message log, redrawing only
+        what changed since the last turn (see `render`).
+
+        Every pass of a scene's main loop draws once, so this also counts
+        turns. In headless mode nothing is rendered.
 
         Args:
             scene (Scene): The `Scene` object to be rendered.
         """
-        print("\033c", end="")
-        print(f"--- {scene.name} ---")
-        grid = [['.' for _ in range(self.width)] for _ in range(self.height)]
-        for obj in sorted(scene.game_objects, key=lambda o: 0 if isinstance(o, Character) else -1):
-            if 0 <= obj.x < self.width and 0 <= obj.y < self.height:
-                grid[obj.y][obj.x] = obj.symbol
-        for row in grid:
-            print(" ".join(row))
+        self.turn_count += 1
+        if self.headless:
+            return
+        if self.renderer is None:
+            self.renderer = render.TerminalRenderer()
+        if self.camera is None:
+            self.camera = render.Camera(self.width, self.height)
         player = scene.player_character
-        print(f"{player.name} | HP: {player.health}/{player.max_health} | Level: {player.level}")
-        for msg in self.message_log:
-            print(f"- {msg}")
+        grid = self.camera.follow(player, scene.width, scene.height).paint(scene, Character)
+        footer = [f"{player.name} | HP: {player.health}/{player.max_health} | Level: {player.level}"]
+        footer += [f"- {msg}" for msg in self.message_log]
+        self.renderer.render([f"--- {scene.name} ---"], grid, footer)
 
 class SceneManager:
     """An abstract base class for controlling scene logic, events, and flow.
@@ -847,14 +1038,15 @@ class SceneManager:
         This loop continuously draws the scene, handles player input, and
         updates the game state until the game is over or the scene ends.
         """
-        while not self.game.game_over and self.is_running:
-            self.game.draw(self.scene)
-            if self.game.game_over: break
+        with self.game.tracking_output():
+            while not self.game.game_over and self.is_running:
+                self.game.draw(self.scene)
+                if self.game.game_over: break
 
-            self.handle_input()
+                self.handle_input()
 
-            if not self.game.game_over:
-                self.update()
+                if not self.game.game_over:
+                    self.update()
 
     def handle_input(self):
         """Handles player input for the scene.
@@ -873,6 +1065,34 @@ class SceneManager:
         """
         raise NotImplementedError
 
+    def update_enemies(self):
+        """Runs the AI turn: `update` on every `Enemy`, in `game_objects` order.
+
+        Enemies running the stock AI are planned together with
+        `Enemy.plan_turns` first, and each plan is applied when that enemy's
+        turn comes up. Planned enemies never move the player, so the result
+        is the same as calling `update` on every enemy; should another
+        enemy's update move the player, the remaining enemies fall back to
+        `update`.
+        """
+        enemies = [obj for obj in self.scene.game_objects if isinstance(obj, Enemy)]
+        player = self.scene.player_character
+        if not player or len({id(obj) for obj in enemies}) != len(enemies):
+            # An enemy listed twice acts twice, so it must see its own first turn.
+            for enemy in enemies:
+                enemy.update(self)
+            return
+
+        plans = Enemy.plan_turns(enemies, player)
+        planned_at = (player.x, player.y)
+        stale = False
+        for enemy, plan in zip(enemies, plans):
+            if plan is not None and not stale:
+                enemy.take_planned_turn(plan, player)
+            else:
+                enemy.update(self)
+                stale = stale or (player.x, player.y) != planned_at
+
 class TrollCaveScene(SceneManager):
     """A concrete `SceneManager` for the Troll Cave encounter.
 
@@ -886,22 +1106,22 @@ class TrollCaveScene(SceneManager):
         This method demonstrates the data-driven approach by creating the
         player character (`Aeron`) and loading their items from the database.
         """
+        # Load all of the scene's content in one round-trip
+        content = database.load_scene_content(
+            item_names=["Valiant Sword", "Aethelgard Plate"],
+            character_names=["Aeron"],
+        )
+
         # Create characters
-        player = Aeron(name="Aeron", x=5, y=5, db_conn=self.game.db_conn)
+        player = Aeron(name="Aeron", x=5, y=5, data=content["characters"].get("Aeron"))
         enemy = Enemy(name="Troll", x=10, y=5, health=150, damage=25, xp_value=200)
 
         # Give player items from the database
-        item_data = database.get_item_data("Valiant Sword", conn=self.game.db_conn)
-        if item_data:
-            weapon_data = database.get_weapon_data(item_data['item_id'], conn=self.game.db_conn)
-            if weapon_data:
-                player.pickup_item(Weapon(item_data['name'], item_data['description'], weapon_data['damage']))
-
-        item_data = database.get_item_data("Aethelgard Plate", conn=self.game.db_conn)
-        if item_data:
-            armor_data = database.get_armor_data(item_data['item_id'], conn=self.game.db_conn)
-            if armor_data:
-                player.pickup_item(Armor(item_data['name'], item_data['description'], armor_data['defense']))
+        for item_data in content["items"].values():
+            if item_data['damage'] is not None:
+                player.pickup_item(Weapon(item_data['name'], item_data['description'], item_data['damage']))
+            elif item_data['defense'] is not None:
+                player.pickup_item(Armor(item_data['name'], item_data['description'], item_data['defense']))
 
         # Add an interactable object
         ancient_statue = Interactable(
@@ -925,11 +1145,7 @@ class TrollCaveScene(SceneManager):
         equipping items, and quitting the game.
         """
         player = self.scene.player_character
-        # In a test environment, we don't want to block on input()
-        if "pytest" in sys.modules:
-            command = "attack troll"
-        else:
-            command = input("Action: ").lower().strip()
+        command = self.game.read_input("Action: ").lower().strip()
         parts = command.split()
         action = parts[0] if parts else ""
 
@@ -941,7 +1157,7 @@ class TrollCaveScene(SceneManager):
             elif direction in ["a", "left"]: dx = -1
             elif direction in ["d", "right"]: dx = 1
             new_x, new_y = player.x + dx, player.y + dy
-            if 0 <= new_x < self.game.width and 0 <= new_y < self.game.height:
+            if 0 <= new_x < self.scene.width and 0 <= new_y < self.scene.height:
                 target = self.scene.get_object_at(new_x, new_y)
                 if not target:
                     player.move(dx, dy)
@@ -951,7 +1167,7 @@ class TrollCaveScene(SceneManager):
                 self.game.log_message("You can't move off the map.")
         elif action == "attack" and len(parts) > 1:
             target_name = " ".join(parts[1:])
-            target = next((obj for obj in self.scene.game_objects if isinstance(obj, Enemy) and obj.name.lower() == target_name.lower() and obj.health > 0), None)
+            target = self.scene.find_object(target_name, Enemy, alive=True)
             if target:
                 player.attack(target)
             else:
@@ -974,10 +1190,7 @@ class TrollCaveScene(SceneManager):
         This method handles the AI's turn, removes any defeated enemies from
         the scene, and checks for win or loss conditions.
         """
-        # AI turn
-        for obj in self.scene.game_objects:
-            if isinstance(obj, Enemy):
-                obj.update(self)
+        self.update_enemies()
 
         # Remove dead objects
         self.scene.game_objects = [obj for obj in self.scene.game_objects if not (hasattr(obj, 'health') and obj.health <= 0)]
@@ -986,7 +1199,7 @@ class TrollCaveScene(SceneManager):
         if self.scene.player_character.health <= 0:
             self.game.game_over = True
             self.game.log_message("You have been defeated.")
-        elif not any(isinstance(obj, Enemy) for obj in self.scene.game_objects):
+        elif not self.scene.get_objects_of_type(Enemy):
             self.game.log_message("You are victorious!")
             self.is_running = False
 
@@ -997,18 +1210,22 @@ class Aeron(Player):
     `Player` class. Upon initialization, it fetches Aeron's specific stats
     from the database, making the character data-driven.
     """
-    def __init__(self, name="Aeron", x=0, y=0, db_conn=None):
+    def __init__(self, name="Aeron", x=0, y=0, db_conn=None, data=None):
         """Initializes a new Aeron character.
 
         Args:
             name (str, optional): The name of the character. Defaults to "Aeron".
             x (int, optional): The x-coordinate. Defaults to 0.
             y (int, optional): The y-coordinate. Defaults to 0.
-            db_conn: The database connection object. Defaults to None.
+            db_conn: An explicit database connection. Defaults to None,
+                which serves the stats from the cached content lookups.
+            data: A pre-loaded `Characters` row, e.g. from
+                `database.load_scene_content`. Skips the lookup when given.
         """
         super().__init__(name, x, y)
         self.symbol = '@'
-        data = database.get_character_data(name, conn=db_conn)
+        if data is None:
+            data = database.get_character_data(name, conn=db_conn)
         if data:
             self.health = data['health']
             self.max_health = data['health']
@@ -1032,7 +1249,8 @@ class Kane(Enemy):
             x (int, optional): The x-coordinate. Defaults to 0.
             y (int, optional): The y-coordinate. Defaults to 0.
             type (str, optional): The type of enemy. Defaults to "Boss".
-            db_conn: The database connection object. Defaults to None.
+            db_conn: An explicit database connection. Defaults to None,
+                which serves the stats from the cached content lookups.
         """
         super().__init__(name, x, y)
         self.symbol = 'K'
@@ -1046,8 +1264,9 @@ class Kane(Enemy):
 def main(argv):
     """The main entry point for the game.
 
-    This function initializes the database, sets up the game engine, and
-    starts the main game loop. It also includes logic for loading a saved
+    This function loads the game content (from the content pack if one has
+    been built, otherwise by initializing the database), sets up the game
+    engine, and starts the main game loop. It also includes logic for loading a saved
     game from the command line.
 
     Args:
@@ -1057,7 +1276,7 @@ def main(argv):
         SceneManager: The scene manager instance after the game loop has
         concluded, which can be useful for testing.
     """
-    database.init_db()
+    database.open_content()
     game_engine = Game()
 
     # Check for 'load' command, expecting 'rpg.py load <save_name>'
@@ -0,0 +1,574 @@
+"""Maintained indexes over the game objects of a scene.
+
+`game.Scene` and `rpg.Scene` keep their objects in a plain `game_objects`
+list, so answering "what is at (x, y)?" used to mean scanning every object.
+This module provides the pieces both scenes share to answer such queries in
+time proportional to the answer rather than to the scene:
+
+- `SpatialHash` buckets objects into square cells of the map.
+- `SceneIndex` owns the spatial hash and the name, class and alive-object
+  indexes for one scene, and is told about every object that is added,
+  removed, moved, renamed or damaged.
+- `SceneObjects` is the list type of `Scene.game_objects`; it reports
+  additions and removals to the scene's index.
+- `IndexedScene` is the mixin that wires these into a scene class.
+
+Objects report their own changes: a `GameObject` whose `x`, `y`, `name` or
+`health` is assigned calls `attribute_changed` on the index stored in its
+`_scene_index` attribute. An object is indexed by at most one scene at a time.
+Other structures kept in step with a scene (such as `pathfinding.Terrain`)
+register with `SceneIndex.add_listener` to hear about the same changes.
+"""
+
+import heapq
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Side length, in map units, of a spatial hash cell.
+CELL_SIZE: int = 8
+
+Cell = Tuple[int, int]
+
+
+class SpatialHash:
+    """A uniform grid of buckets mapping map cells to the objects in them.
+
+    Point queries look at a single bucket; radius and rectangle queries look
+    at the buckets their area overlaps. Results are returned in the order
+    objects were inserted, which for a scene is the order of
+    `game_objects`.
+
+    Attributes:
+        cell_size (int): The side length of a cell, in map units.
+    """
+
+    def __init__(self, cell_size: int = CELL_SIZE):
+        self.cell_size = cell_size
+        self._cells: Dict[Cell, Dict[int, Any]] = {}
+        # Maps id(obj) -> (cell, insertion sequence number).
+        self._entries: Dict[int, Tuple[Cell, int]] = {}
+        self._next_sequence = 0
+
+    def _cell(self, x: float, y: float) -> Cell:
+        """Returns the cell containing a point."""
+        return (int(x // self.cell_size), int(y // self.cell_size))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, obj: Any) -> bool:
+        return id(obj) in self._entries
+
+    def insert(self, obj: Any) -> None:
+        """Adds an object at its current position. Re-inserting is a no-op."""
+        if id(obj) in self._entries:
+            return
+        cell = self._cell(obj.x, obj.y)
+        self._cells.setdefault(cell, {})[id(obj)] = obj
+        self._entries[id(obj)] = (cell, self._next_sequence)
+        self._next_sequence += 1
+
+    def remove(self, obj: Any) -> None:
+        """Removes an object. Removing an unknown object is a no-op."""
+        entry = self._entries.pop(id(obj), None)
+        if entry is None:
+            return
+        bucket = self._cells[entry[0]]
+        del bucket[id(obj)]
+        if not bucket:
+            del self._cells[entry[0]]
+
+    def update(self, obj: Any) -> None:
+        """Moves an object to the bucket of its current position."""
+        entry = self._entries.get(id(obj))
+        if entry is None:
+            return
+        cell = self._cell(obj.x, obj.y)
+        if cell == entry[0]:
+            return
+        bucket = self._cells[entry[0]]
+        del bucket[id(obj)]
+        if not bucket:
+            del self._cells[entry[0]]
+        self._cells.setdefault(cell, {})[id(obj)] = obj
+        self._entries[id(obj)] = (cell, entry[1])
+
+    def _ordered(self, objects: Iterable[Any]) -> List[Any]:
+        """Sorts query results into insertion order."""
+        entries = self._entries
+        return sorted(objects, key=lambda obj: entries[id(obj)][1])
+
+    def at(self, x: float, y: float) -> List[Any]:
+        """Returns the objects positioned exactly at (x, y)."""
+        bucket = self._cells.get(self._cell(x, y))
+        if not bucket:
+            return []
+        return self._ordered(obj for obj in bucket.values() if obj.x == x and obj.y == y)
+
+    def _in_cells(self, min_x: float, min_y: float, max_x: float, max_y: float) -> Iterator[Any]:
+        """Yields every object in the cells overlapping a rectangle."""
+        min_cx, min_cy = self._cell(min_x, min_y)
+        max_cx, max_cy = self._cell(max_x, max_y)
+        if (max_cx - min_cx + 1) * (max_cy - min_cy + 1) > len(self._cells):
+            # A huge area: walking the occupied cells is cheaper.
+            for (cx, cy), bucket in self._cells.items():
+                if min_cx <= cx <= max_cx and min_cy <= cy <= max_cy:
+                    yield from bucket.values()
+            return
+        for cx in range(min_cx, max_cx + 1):
+            for cy in range(min_cy, max_cy + 1):
+                bucket = self._cells.get((cx, cy))
+                if bucket:
+                    yield from bucket.values()
+
+    def in_rect(self, min_x: float, min_y: float, max_x: float, max_y: float) -> List[Any]:
+        """Returns the objects inside a rectangle, bounds included."""
+        return self._ordered(obj for obj in self._in_cells(min_x, min_y, max_x, max_y)
+                             if min_x <= obj.x <= max_x and min_y <= obj.y <= max_y)
+
+    def in_radius(self, x: float, y: float, radius: float) -> List[Any]:
+        """Returns the objects within `radius` of (x, y) on the map plane."""
+        limit = radius * radius
+        return self._ordered(obj for obj in self._in_cells(x - radius, y - radius, x + radius, y + radius)
+                             if (obj.x - x) ** 2 + (obj.y - y) ** 2 <= limit)
+
+    def clear(self) -> None:
+        """Removes every object."""
+        self._cells.clear()
+        self._entries.clear()
+
+
+def _name_key(obj: Any) -> Optional[str]:
+    """Returns the case-insensitive name an object is indexed under."""
+    name = getattr(obj, 'name', None)
+    return name.lower() if isinstance(name, str) else None
+
+
+def _is_alive(obj: Any) -> bool:
+    """Returns whether an object has positive health."""
+    health = getattr(obj, 'health', None)
+    return health is not None and health > 0
+
+
+def _unlink(buckets: Dict[Any, Dict[int, Any]], key: Any, obj: Any) -> None:
+    """Removes an object from the bucket stored under `key`, dropping it once empty."""
+    bucket = buckets.get(key)
+    if bucket is None:
+        return
+    bucket.pop(id(obj), None)
+    if not bucket:
+        del buckets[key]
+
+
+class SceneIndex:
+    """The maintained indexes of one scene's game objects.
+
+    Besides positions, objects are indexed by lowercased name, by class and,
+    for objects with positive `health`, by class among the living. Class
+    queries match subclasses too, like `isinstance`. Every bucket is kept in
+    the order objects were added to the scene, so queries return results in
+    that order without sorting them.
+
+    Attributes:
+        spatial (SpatialHash): Objects bucketed by map position.
+        terrains (dict): The `pathfinding.Terrain` kept for this index by
+            each blocking test, so they are dropped along with it.
+    """
+
+    def __init__(self, objects: Iterable[Any] = (), cell_size: int = CELL_SIZE):
+        self.spatial = SpatialHash(cell_size)
+        # Maps id(obj) -> [obj, number of times it appears in the scene,
+        # insertion sequence number, indexed name, indexed as alive].
+        self._members: Dict[int, List[Any]] = {}
+        self._next_sequence = 0
+        self._names: Dict[str, Dict[int, Any]] = {}
+        self._types: Dict[type, Dict[int, Any]] = {}
+        self._alive: Dict[type, Dict[int, Any]] = {}
+        # Maps a queried class -> the indexed classes that are subclasses of it.
+        self._subclasses: Dict[type, List[type]] = {}
+        self._listeners: List[Any] = []
+        self.terrains: Dict[Any, Any] = {}
+        for obj in objects:
+            self.add(obj)
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def add_listener(self, listener: Any) -> None:
+        """Reports every later change to the indexed objects to a listener.
+
+        The listener's `added(obj)` and `removed(obj)` are called when an
+        object joins or leaves the scene, and `changed(obj, name)` after any
+        attribute of an indexed object is assigned.
+
+        Args:
+            listener (Any): The object to notify.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Any) -> None:
+        """Stops reporting changes to a listener added with `add_listener`."""
+        self._listeners.remove(listener)
+
+    def _link(self, buckets: Dict[Any, Dict[int, Any]], key: Any, obj: Any) -> None:
+        """Adds an object to the bucket stored under `key`, keeping it in scene order."""
+        bucket = buckets.setdefault(key, {})
+        last = next(reversed(bucket), None)
+        bucket[id(obj)] = obj
+        members = self._members
+        if last is not None and members[last][2] > members[id(obj)][2]:
+            # Only renames and revivals re-link an older object; re-sort.
+            ordered = sorted(bucket.values(), key=lambda o: members[id(o)][2])
+            bucket.clear()
+            bucket.update((id(o), o) for o in ordered)
+
+    def add(self, obj: Any) -> None:
+        """Indexes an object that was added to the scene."""
+        member = self._members.get(id(obj))
+        if member is not None:
+            member[1] += 1
+            return
+        name, alive = _name_key(obj), _is_alive(obj)
+        self._members[id(obj)] = [obj, 1, self._next_sequence, name, alive]
+        self._next_sequence += 1
+        self.spatial.insert(obj)
+        if name is not None:
+            self._link(self._names, name, obj)
+        cls = type(obj)
+        if cls not in self._types:
+            self._subclasses.clear()
+        self._link(self._types, cls, obj)
+        if alive:
+            self._link(self._alive, cls, obj)
+        obj.__dict__['_scene_index'] = self
+        for listener in self._listeners:
+            listener.added(obj)
+
+    def remove(self, obj: Any) -> None:
+        """Drops an object that was removed from the scene."""
+        member = self._members.get(id(obj))
+        if member is None:
+            return
+        member[1] -= 1
+        if member[1]:
+            return
+        del self._members[id(obj)]
+        self.spatial.remove(obj)
+        if member[3] is not None:
+            _unlink(self._names, member[3], obj)
+        _unlink(self._types, type(obj), obj)
+        if member[4]:
+            _unlink(self._alive, type(obj), obj)
+        if obj.__dict__.get('_scene_index') is self:
+            del obj.__dict__['_scene_index']
+        for listener in self._listeners:
+            listener.removed(obj)
+
+    def attribute_changed(self, obj: Any, name: str) -> None:
+        """Updates the indexes after an attribute of an object was assigned.
+
+        Args:
+            obj (Any): The object that changed.
+            name (str): The attribute that was assigned.
+        """
+        if self._listeners:
+            for listener in self._listeners:
+                listener.changed(obj, name)
+        if name == 'x' or name == 'y':
+            self.spatial.update(obj)
+            return
+        if name != 'name' and name != 'health':
+            return
+        member = self._members.get(id(obj))
+        if member is None:
+            return
+        if name == 'name':
+            key = _name_key(obj)
+            if key != member[3]:
+                if member[3] is not None:
+                    _unlink(self._names, member[3], obj)
+                member[3] = key
+                if key is not None:
+                    self._link(self._names, key, obj)
+        else:
+            alive = _is_alive(obj)
+            if alive != member[4]:
+                member[4] = alive
+                if alive:
+                    self._link(self._alive, type(obj), obj)
+                else:
+                    _unlink(self._alive, type(obj), obj)
+
+    def _classes(self, cls: type) -> List[type]:
+        """Returns the indexed classes that `isinstance(obj, cls)` accepts."""
+        classes = self._subclasses.get(cls)
+        if classes is None:
+            classes = self._subclasses[cls] = [t for t in self._types if issubclass(t, cls)]
+        return classes
+
+    def named(self, name: str, cls: type = object, alive: bool = False) -> List[Any]:
+        """Returns the objects with a name, ignoring case.
+
+        Args:
+            name (str): The name to look up.
+            cls (type): Only return instances of this class.
+            alive (bool): Only return objects with positive health.
+
+        Returns:
+            List[Any]: The matching objects.
+        """
+        bucket = self._names.get(name.lower())
+        if not bucket:
+            return []
+        members = self._members
+        return [obj for obj in bucket.values() if isinstance(obj, cls) and (not alive or members[id(obj)][4])]
+
+    def of_type(self, cls: type, alive: bool = False) -> List[Any]:
+        """Returns the instances of a class, subclasses included.
+
+        Args:
+            cls (type): The class to look up.
+            alive (bool): Only return objects with positive health.
+
+        Returns:
+            List[Any]: The matching objects.
+        """
+        buckets = self._alive if alive else self._types
+        matches = [buckets[t] for t in self._classes(cls) if t in buckets]
+        if len(matches) == 1:
+            return list(matches[0].values())
+        members = self._members
+        return list(heapq.merge(*(bucket.values() for bucket in matches), key=lambda obj: members[id(obj)][2]))
+
+    def clear(self) -> None:
+        """Drops every object, listener and terrain, e.g. before the scene's list is replaced."""
+        for member in self._members.values():
+            obj = member[0]
+            if obj.__dict__.get('_scene_index') is self:
+                del obj.__dict__['_scene_index']
+        self._members.clear()
+        self.spatial.clear()
+        self._names.clear()
+        self._types.clear()
+        self._alive.clear()
+        self._subclasses.clear()
+        self._listeners.clear()
+        self.terrains.clear()
+
+
+class SceneObjects(list):
+    """The `game_objects` list of an `IndexedScene`.
+
+    Behaves exactly like a list, but reports every addition and removal to
+    the scene's index (if it has been built).
+
+    Attributes:
+        scene (IndexedScene): The scene the objects belong to.
+    """
+
+    __slots__ = ("scene",)
+
+    def __init__(self, scene: "IndexedScene", *args: Any):
+        super().__init__(*args)
+        self.scene = scene
+
+    def _index(self) -> Optional[SceneIndex]:
+        return self.scene.__dict__.get('_index')
+
+    def _added(self, objects: Iterable[Any]) -> None:
+        index = self._index()
+        if index is not None:
+            for obj in objects:
+                index.add(obj)
+
+    def _removed(self, objects: Iterable[Any]) -> None:
+        index = self._index()
+        if index is not None:
+            for obj in objects:
+                index.remove(obj)
+
+    def append(self, obj):
+        super().append(obj)
+        self._added((obj,))
+
+    def extend(self, objects):
+        objects = list(objects)
+        super().extend(objects)
+        self._added(objects)
+
+    def __iadd__(self, objects):
+        self.extend(objects)
+        return self
+
+    def insert(self, position, obj):
+        super().insert(position, obj)
+        self._added((obj,))
+
+    def remove(self, obj):
+        super().remove(obj)
+        self._removed((obj,))
+
+    def pop(self, *args):
+        obj = super().pop(*args)
+        self._removed((obj,))
+        return obj
+
+    def clear(self):
+        removed = list(self)
+        super().clear()
+        self._removed(removed)
+
+    def __setitem__(self, key, value):
+        removed = self[key] if isinstance(key, slice) else [self[key]]
+        super().__setitem__(key, value)
+        self._removed(removed)
+        self._added(self[key] if isinstance(key, slice) else [value])
+
+    def __delitem__(self, key):
+        removed = self[key] if isinstance(key, slice) else [self[key]]
+        super().__delitem__(key)
+        self._removed(removed)
+
+    def __imul__(self, count):
+        added = list(self) * (count - 1) if count > 0 else []
+        removed = list(self) if count <= 0 else []
+        super().__imul__(count)
+        self._removed(removed)
+        self._added(added)
+        return self
+
+
+class IndexedScene:
+    """Mixin that gives a scene maintained indexes over its game objects.
+
+    The index is built the first time it is needed, so scenes that are
+    never queried (or have just been loaded from a save) pay nothing for it.
+    Assigning a new list to `game_objects` keeps indexing working.
+    """
+
+    def __setattr__(self, name, value):
+        if name == 'game_objects':
+            index = self.__dict__.pop('_index', None)
+            if index is not None:
+                index.clear()
+            if not isinstance(value, SceneObjects) or value.scene is not self:
+                value = SceneObjects(self, value)
+        object.__setattr__(self, name, value)
+
+    def __getstate__(self):
+        """Returns the state to save, without the index.
+
+        Returns:
+            dict: The scene's attributes.
+        """
+        state = self.__dict__.copy()
+        state.pop('_index', None)
+        return state
+
+    def __setstate__(self, state):
+        """Restores saved state; the index is rebuilt on first use.
+
+        Args:
+            state (dict): The attributes returned by `__getstate__`.
+        """
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    @property
+    def index(self):
+        """SceneIndex: The scene's indexes, built on first access."""
+        index = self.__dict__.get('_index')
+        if index is None:
+            index = self.__dict__['_index'] = SceneIndex(self.game_objects)
+        return index
+
+    def get_objects_at(self, x, y):
+        """Gets every object at a specific coordinate.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+
+        Returns:
+            list: The objects there, in `game_objects` order.
+        """
+        return self.index.spatial.at(x, y)
+
+    def get_object_at(self, x, y):
+        """Gets the object at a specific coordinate.
+
+        Args:
+            x (int): The x-coordinate.
+            y (int): The y-coordinate.
+
+        Returns:
+            GameObject: The first object at the given coordinates, or None if
+            not found.
+        """
+        objects = self.index.spatial.at(x, y)
+        return objects[0] if objects else None
+
+    def get_objects_in_radius(self, x, y, radius):
+        """Gets every object within a distance of a point on the map.
+
+        Args:
+            x (float): The x-coordinate of the center.
+            y (float): The y-coordinate of the center.
+            radius (float): The maximum distance, inclusive.
+
+        Returns:
+            list: The objects in range, in `game_objects` order.
+        """
+        return self.index.spatial.in_radius(x, y, radius)
+
+    def get_objects_in_rect(self, min_x, min_y, max_x, max_y):
+        """Gets every object inside a rectangle of the map.
+
+        Args:
+            min_x (float): The left edge, inclusive.
+            min_y (float): The top edge, inclusive.
+            max_x (float): The right edge, inclusive.
+            max_y (float): The bottom edge, inclusive.
+
+        Returns:
+            list: The objects inside, in `game_objects` order.
+        """
+        return self.index.spatial.in_rect(min_x, min_y, max_x, max_y)
+
+    def find_object(self, name, cls=object, alive=False):
+        """Finds an object by name, ignoring case.
+
+        Args:
+            name (str): The name to look for.
+            cls (type): Only match instances of this class.
+            alive (bool): Only match objects with positive health.
+
+        Returns:
+            GameObject: The first match in `game_objects` order, or None.
+        """
+        objects = self.index.named(name, cls, alive)
+        return objects[0] if objects else None
+
+    def get_objects_named(self, name, cls=object, alive=False):
+        """Gets every object with a name, ignoring case.
+
+        Args:
+            name (str): The name to look for.
+            cls (type): Only match instances of this class.
+            alive (bool): Only match objects with positive health.
+
+        Returns:
+            list: The matches, in `game_objects` order.
+        """
+        return self.index.named(name, cls, alive)
+
+    def get_objects_of_type(self, cls, alive=False):
+        """Gets every instance of a class, e.g. all living enemies.
+
+        Args:
+            cls (type): The class to match, subclasses included.
+            alive (bool): Only match objects with positive health.
+
+        Returns:
+            list: The matches, in `game_objects` order.
+        """
+        return self.index.of_type(cls, alive)
@@ -0,0 +1,410 @@
+"""A compact, versioned binary format for game state snapshots.
+
+This module turns an arbitrary graph of game objects (a `SceneManager`, its
+`Scene`, every `GameObject`, inventories, equipment, status effects and
+dialogue state) into bytes and back. It knows nothing about the game's
+classes: the caller supplies a resolver that maps a class key back to a class
+object, which keeps the format usable from both `game.py` and `rpg.py` via
+the `database` module's class loader hook.
+
+Format:
+    A snapshot is a fixed header followed by a payload::
+
+        magic (4 bytes, b"MHSV") | format version (uint16) | flags (uint8)
+
+    The payload is a `marshal` (version 4) encoding of a tuple
+    ``(shapes, objects, root)``:
+
+    - ``shapes`` lists ``(class_key, attribute_names)`` pairs. Objects of the
+      same class with the same attributes share a shape, so attribute names
+      are stored once per class rather than once per object.
+    - ``objects`` lists ``(shape_index, attribute_values)`` pairs, one per
+      distinct object, so shared references and cycles (e.g.
+      `Equipment.owner`) survive the round trip.
+    - ``root`` is the encoded root value.
+
+    Primitive values (None, bool, int, float, str, bytes) are stored as-is.
+    Everything else is a tagged tuple: ``(TAG_LIST, items)``,
+    ``(TAG_TUPLE, items)``, ``(TAG_DICT, keys, values)``,
+    ``(TAG_SET, items)``, ``(TAG_REF, object_index)`` or
+    ``(TAG_EXTERNAL, external_id)``.
+
+    External references point at objects stored in *other* snapshots. They
+    let a scene be saved as one small snapshot per game object, so an
+    incremental save only re-encodes the objects that changed (see
+    `decode_linked`).
+
+    If the `FLAG_ZLIB` bit is set, the payload is zlib-compressed. Payloads
+    larger than `COMPRESS_THRESHOLD` bytes are compressed automatically.
+
+Note:
+    Snapshots are meant to be read back by the game that wrote them; like
+    `marshal` itself, the decoder is not hardened against maliciously
+    crafted input.
+"""
+
+import marshal
+import struct
+import zlib
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Identifies a snapshot blob.
+MAGIC = b"MHSV"
+# Bumped whenever the payload layout changes incompatibly.
+FORMAT_VERSION = 1
+# The marshal version is pinned so snapshots don't change with the interpreter.
+MARSHAL_VERSION = 4
+# Payload flag: the marshal data is zlib-compressed.
+FLAG_ZLIB = 0x01
+# Uncompressed payloads larger than this are compressed automatically.
+COMPRESS_THRESHOLD = 4096
+
+TAG_LIST = 0
+TAG_TUPLE = 1
+TAG_DICT = 2
+TAG_SET = 3
+TAG_REF = 4
+TAG_EXTERNAL = 5
+
+_HEADER = struct.Struct(">4sHB")
+_PRIMITIVES = frozenset((type(None), bool, int, float, str, bytes))
+# `object.__getstate__` only exists on Python 3.11+.
+_DEFAULT_GETSTATE = getattr(object, "__getstate__", None)
+
+
+def class_key(cls: type) -> str:
+    """Returns the key under which a class is recorded in a snapshot.
+
+    Args:
+        cls (type): The class of a snapshotted object.
+
+    Returns:
+        str: The class's module and name, as ``"module:Name"``.
+    """
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _slot_names(cls: type) -> Tuple[str, ...]:
+    """Returns the data slots declared anywhere in a class's MRO."""
+    names = []
+    for klass in cls.__mro__:
+        slots = getattr(klass, "__slots__", ())
+        if isinstance(slots, str):
+            slots = (slots,)
+        names.extend(slot for slot in slots if slot not in ("__dict__", "__weakref__"))
+    return tuple(names)
+
+
+def _has_custom_getstate(cls: type) -> bool:
+    """Checks whether a class overrides the default `__getstate__`."""
+    getstate = getattr(cls, "__getstate__", None)
+    return getstate is not None and getstate is not _DEFAULT_GETSTATE
+
+
+def _capture(obj: Any, custom_getstate: bool, slots: Tuple[str, ...]) -> Dict[str, Any]:
+    """Captures an object's state given its class's precomputed traits."""
+    if custom_getstate:
+        state = obj.__getstate__()
+        if not isinstance(state, dict):
+            raise TypeError(f"{type(obj).__name__}.__getstate__ must return a dict to be snapshotted")
+        return state
+    state = dict(getattr(obj, "__dict__", ()))
+    for slot in slots:
+        if hasattr(obj, slot):
+            state[slot] = getattr(obj, slot)
+    return state
+
+
+def get_state(obj: Any) -> Dict[str, Any]:
+    """Returns the attributes of an object that should be snapshotted.
+
+    Classes can exclude transient attributes (such as open database
+    connections) by defining `__getstate__`, following the same protocol as
+    `pickle`. Otherwise the instance `__dict__` and any `__slots__` are used.
+
+    Args:
+        obj (Any): The object to capture.
+
+    Returns:
+        Dict[str, Any]: The attribute names and values to store.
+    """
+    cls = type(obj)
+    return _capture(obj, _has_custom_getstate(cls), _slot_names(cls))
+
+
+def set_state(obj: Any, state: Dict[str, Any]) -> None:
+    """Restores the attributes captured by `get_state` onto a bare instance.
+
+    Args:
+        obj (Any): An instance created with `cls.__new__(cls)`.
+        state (Dict[str, Any]): The attribute names and values to restore.
+    """
+    setstate = getattr(type(obj), "__setstate__", None)
+    if setstate is not None:
+        setstate(obj, state)
+        return
+    for name, value in state.items():
+        object.__setattr__(obj, name, value)
+
+
+class _Encoder:
+    """Flattens an object graph into shape, object and value tables."""
+
+    def __init__(self, is_snapshottable: Callable[[type], bool],
+                 external: Optional[Callable[[Any], Optional[int]]] = None, root: Any = None):
+        self.is_snapshottable = is_snapshottable
+        self.external = external
+        self.root = root
+        self.shapes: List[Tuple[str, Tuple[str, ...]]] = []
+        self.shape_index: Dict[Tuple[str, Tuple[str, ...]], int] = {}
+        self.objects: List[Optional[Tuple[int, tuple]]] = []
+        self.object_index: Dict[int, int] = {}
+        # Per-class (key, custom __getstate__, slot names), computed once.
+        self._class_traits: Dict[type, Tuple[str, bool, Tuple[str, ...]]] = {}
+        # Keeps encoded objects alive so their ids are not reused mid-walk.
+        self._keepalive: List[Any] = []
+
+    def encode(self, value: Any) -> Any:
+        """Encodes a single value, registering any objects it references."""
+        value_type = type(value)
+        if value_type in _PRIMITIVES:
+            return value
+        if value_type is list:
+            encode = self.encode
+            return (TAG_LIST, tuple([encode(v) for v in value]))
+        if value_type is dict:
+            encode = self.encode
+            return (TAG_DICT, tuple([encode(k) for k in value]), tuple([encode(v) for v in value.values()]))
+        if value_type is tuple:
+            encode = self.encode
+            return (TAG_TUPLE, tuple([encode(v) for v in value]))
+        if value_type is set or value_type is frozenset:
+            encode = self.encode
+            return (TAG_SET, tuple([encode(v) for v in value]))
+        index = self.object_index.get(id(value))
+        if index is None:
+            if self.external is not None and value is not self.root:
+                external_id = self.external(value)
+                if external_id is not None:
+                    return (TAG_EXTERNAL, external_id)
+            # Container subclasses (e.g. OrderedDict) are stored as their base type.
+            for base in (dict, list, tuple, set, frozenset):
+                if isinstance(value, base):
+                    return self.encode(base(value))
+            index = self._encode_object(value)
+        return (TAG_REF, index)
+
+    def _traits(self, cls: type) -> Tuple[str, bool, Tuple[str, ...]]:
+        """Returns (and caches) how objects of a class are captured."""
+        traits = self._class_traits.get(cls)
+        if traits is None:
+            if not self.is_snapshottable(cls):
+                raise TypeError(f"Cannot snapshot object of type {cls.__qualname__!r}")
+            traits = (class_key(cls), _has_custom_getstate(cls), _slot_names(cls))
+            self._class_traits[cls] = traits
+        return traits
+
+    def _encode_object(self, obj: Any) -> int:
+        """Registers an object in the object table and returns its index."""
+        key, custom_getstate, slots = self._traits(type(obj))
+        index = len(self.objects)
+        self.object_index[id(obj)] = index
+        self.objects.append(None)
+        self._keepalive.append(obj)
+
+        state = _capture(obj, custom_getstate, slots)
+        shape = (key, tuple(state))
+        shape_id = self.shape_index.get(shape)
+        if shape_id is None:
+            shape_id = len(self.shapes)
+            self.shape_index[shape] = shape_id
+            self.shapes.append(shape)
+        encode = self.encode
+        self.objects[index] = (shape_id, tuple([encode(v) for v in state.values()]))
+        return index
+
+
+def encode_snapshot(root: Any, is_snapshottable: Callable[[type], bool],
+                    compress: Optional[bool] = None,
+                    external: Optional[Callable[[Any], Optional[int]]] = None) -> bytes:
+    """Serializes an object graph into a snapshot blob.
+
+    Args:
+        root (Any): The object to snapshot, typically a `SceneManager`.
+        is_snapshottable (Callable[[type], bool]): Returns True for classes
+            that can be restored on load. Objects of any other class raise a
+            `TypeError`, so unrestorable state is caught at save time.
+        compress (Optional[bool]): Forces zlib compression on or off. By
+            default, payloads over `COMPRESS_THRESHOLD` bytes are compressed.
+        external (Optional[Callable[[Any], Optional[int]]]): Returns an id
+            for objects that are stored in separate snapshots; those are
+            written as external references instead of being encoded. It is
+            never consulted for `root` itself.
+
+    Returns:
+        bytes: The encoded snapshot.
+
+    Raises:
+        TypeError: If the graph contains an object that cannot be restored.
+    """
+    encoder = _Encoder(is_snapshottable, external, root)
+    encoded_root = encoder.encode(root)
+    payload = marshal.dumps((tuple(encoder.shapes), tuple(encoder.objects), encoded_root),
+                            MARSHAL_VERSION)
+    flags = 0
+    if compress or (compress is None and len(payload) > COMPRESS_THRESHOLD):
+        payload = zlib.compress(payload, 1)
+        flags |= FLAG_ZLIB
+    return _HEADER.pack(MAGIC, FORMAT_VERSION, flags) + payload
+
+
+def read_header(data: bytes) -> Tuple[int, int]:
+    """Validates a snapshot header.
+
+    Args:
+        data (bytes): A snapshot blob.
+
+    Returns:
+        Tuple[int, int]: The format version and flags.
+
+    Raises:
+        ValueError: If the blob is not a snapshot or was written by a newer
+            format version.
+    """
+    if len(data) < _HEADER.size:
+        raise ValueError("Snapshot is truncated")
+    magic, version, flags = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Data is not a game snapshot")
+    if version > FORMAT_VERSION:
+        raise ValueError(f"Snapshot format version {version} is newer than supported ({FORMAT_VERSION})")
+    return version, flags
+
+
+class _Decoder:
+    """Restores one snapshot blob in two phases: instantiate, then fill."""
+
+    def __init__(self, data: bytes, resolve_class: Callable[[str], Optional[type]]):
+        _, flags = read_header(data)
+        payload = data[_HEADER.size:]
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        self.shapes, self.objects, self.encoded_root = marshal.loads(payload)
+        self.classes = []
+        for key, _ in self.shapes:
+            cls = resolve_class(key)
+            if cls is None:
+                raise ValueError(f"Snapshot references unknown class {key!r}")
+            self.classes.append(cls)
+        self.instances: List[Any] = []
+        self.external: Callable[[int], Any] = self._no_external
+
+    @staticmethod
+    def _no_external(external_id: int) -> Any:
+        raise ValueError(f"Snapshot references external object {external_id} but none were supplied")
+
+    def root_class(self) -> type:
+        """Returns the class of the root object, which must be an object."""
+        if type(self.encoded_root) is not tuple or self.encoded_root[0] != TAG_REF:
+            raise ValueError("Snapshot root is not an object")
+        return self.classes[self.objects[self.encoded_root[1]][0]]
+
+    def instantiate(self, root_instance: Any = None) -> None:
+        """Creates bare instances for every object, optionally reusing one for the root."""
+        self.instances = [self.classes[shape_id].__new__(self.classes[shape_id])
+                          for shape_id, _ in self.objects]
+        if root_instance is not None:
+            self.instances[self.encoded_root[1]] = root_instance
+
+    def decode(self, value: Any) -> Any:
+        """Decodes a single encoded value."""
+        if type(value) is not tuple:
+            return value
+        tag = value[0]
+        decode = self.decode
+        if tag == TAG_REF:
+            return self.instances[value[1]]
+        if tag == TAG_LIST:
+            return [decode(v) for v in value[1]]
+        if tag == TAG_DICT:
+            return {decode(k): decode(v) for k, v in zip(value[1], value[2])}
+        if tag == TAG_TUPLE:
+            return tuple([decode(v) for v in value[1]])
+        if tag == TAG_SET:
+            return {decode(v) for v in value[1]}
+        if tag == TAG_EXTERNAL:
+            return self.external(value[1])
+        raise ValueError(f"Unknown snapshot value tag {tag!r}")
+
+    def fill(self, external: Optional[Callable[[int], Any]] = None) -> Any:
+        """Restores every object's attributes and returns the root value."""
+        if external is not None:
+            self.external = external
+        decode = self.decode
+        for instance, (shape_id, values) in zip(self.instances, self.objects):
+            names = self.shapes[shape_id][1]
+            set_state(instance, {name: decode(v) for name, v in zip(names, values)})
+        return decode(self.encoded_root)
+
+
+def decode_snapshot(data: bytes, resolve_class: Callable[[str], Optional[type]]) -> Any:
+    """Restores an object graph from a snapshot blob.
+
+    Objects are created with `cls.__new__` (their `__init__` is not run) and
+    then have their attributes restored, so constructors with side effects,
+    such as database lookups, are skipped.
+
+    Args:
+        data (bytes): A blob produced by `encode_snapshot`.
+        resolve_class (Callable[[str], Optional[type]]): Maps a class key
+            (see `class_key`) back to the class to instantiate.
+
+    Returns:
+        Any: The restored root object.
+
+    Raises:
+        ValueError: If the blob is invalid or references an unknown class.
+    """
+    decoder = _Decoder(data, resolve_class)
+    decoder.instantiate()
+    return decoder.fill()
+
+
+def decode_linked(root_data: bytes, linked: Dict[int, bytes],
+                  resolve_class: Callable[[str], Optional[type]]) -> Any:
+    """Restores a snapshot whose external references point at other snapshots.
+
+    `linked` maps each external id to a snapshot whose root is the object
+    with that id. Bare instances for all linked roots are created first, so
+    linked objects may reference each other (and the main root) freely.
+
+    Args:
+        root_data (bytes): The snapshot holding the main root.
+        linked (Dict[int, bytes]): Snapshots for every external id used.
+        resolve_class (Callable[[str], Optional[type]]): Maps class keys back
+            to classes, as for `decode_snapshot`.
+
+    Returns:
+        Any: The restored main root.
+
+    Raises:
+        ValueError: If a blob is invalid or an external id is missing.
+    """
+    decoders = {external_id: _Decoder(blob, resolve_class) for external_id, blob in linked.items()}
+    roots = {}
+    for external_id, decoder in decoders.items():
+        cls = decoder.root_class()
+        roots[external_id] = cls.__new__(cls)
+        decoder.instantiate(roots[external_id])
+
+    def external(external_id: int) -> Any:
+        try:
+            return roots[external_id]
+        except KeyError:
+            raise ValueError(f"Snapshot references missing external object {external_id}") from None
+
+    for decoder in decoders.values():
+        decoder.fill(external)
+    root_decoder = _Decoder(root_data, resolve_class)
+    root_decoder.instantiate()
+    return root_decoder.fill(external)
@@ -0,0 +1,273 @@
+"""Streams the objects of large worlds in and out of a scene by chunks.
+
+A `game.Scene` keeps every object it holds in memory. For worlds of
+thousands by thousands of tiles, a `ChunkStreamer` keeps only the part
+around the player resident:
+
+- The world is split into square chunks of `CHUNK_SIZE` tiles. An object
+  belongs to the chunk its position falls in, so objects that wander are
+  stored with whichever chunk they are in when it is unloaded.
+- Chunks are stored as snapshots in the `WorldChunks` table (see
+  `database.save_world_chunk`).
+- Each `update` requests the chunks within `radius` chunks of the player.
+  They are read and decoded on a background thread and added to the scene
+  by a later `update` (or `poll`), so the game loop never waits on SQLite.
+  Loads that have not started by the time the player has moved away are
+  cancelled.
+- When more than `max_chunks` chunks are resident or loading, the resident
+  chunks farthest from the player are evicted: their objects leave the
+  scene and are written back on the same background thread, in order, so a
+  chunk that is evicted and then requested again is read after it was
+  written.
+
+Attaching a streamer to a scene makes `game.Game.draw` stream every turn:
+
+    streamer = streaming.ChunkStreamer(scene, "overworld")
+    ...
+    streamer.close()  # Writes back every resident chunk.
+
+Objects already in the scene when the streamer is attached count as
+resident chunks, so a scene can be built in memory and streamed out, or
+restored from a save and streamed on. The player is never evicted.
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import database
+
+# Side length, in tiles, of a world chunk.
+CHUNK_SIZE: int = 32
+
+Chunk = Tuple[int, int]
+
+
+def chunk_of(x: float, y: float, chunk_size: int = CHUNK_SIZE) -> Chunk:
+    """Returns the (column, row) of the chunk containing a position."""
+    return (int(x // chunk_size), int(y // chunk_size))
+
+
+class ChunkStreamer:
+    """Keeps the chunks of a world around the player resident in a scene.
+
+    Attributes:
+        scene (game.Scene): The scene objects are streamed into.
+        world (str): The name the world's chunks are stored under.
+        radius (int): Chunks this many chunks away from the player's chunk,
+            or closer, are kept loaded.
+        max_chunks (int): The memory budget: the most chunks resident or
+            loading at once. At least the (2 * radius + 1) ** 2 chunks
+            around the player.
+        chunk_size (int): The side length of a chunk, in tiles.
+        resident (Dict[Chunk, int]): The chunks whose objects are in the
+            scene, with the last update that needed each.
+    """
+
+    def __init__(self, scene: Any, world: str, radius: int = 1, max_chunks: int = 25,
+                 chunk_size: int = CHUNK_SIZE):
+        if max_chunks < (2 * radius + 1) ** 2:
+            raise ValueError(f"max_chunks={max_chunks} cannot hold the {(2 * radius + 1) ** 2} chunks "
+                             f"within radius {radius} of the player.")
+        self.scene = scene
+        self.world = world
+        self.radius = radius
+        self.max_chunks = max_chunks
+        self.chunk_size = chunk_size
+        self.resident: Dict[Chunk, int] = {}
+        self._pending: Dict[Chunk, "Future[Optional[List[Any]]]"] = {}
+        self._stored: Set[Chunk] = set(database.world_chunks(world))
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chunk-streamer")
+        self._turn = 0
+        self._stats = {"requested": 0, "cancelled": 0, "loaded": 0, "evicted": 0, "written": 0}
+        for chunk in self._objects_by_chunk():
+            self.resident[chunk] = 0
+        scene.streamer = self
+
+    def _chunk_bounds(self, chunk: Chunk) -> Tuple[int, int, int, int]:
+        """Returns the inclusive (min_x, min_y, max_x, max_y) tiles of a chunk."""
+        size = self.chunk_size
+        return chunk[0] * size, chunk[1] * size, chunk[0] * size + size - 1, chunk[1] * size + size - 1
+
+    def _chunks_around(self, center: Chunk) -> Iterable[Chunk]:
+        """Yields the chunks within `radius` of a chunk that lie inside the scene."""
+        columns = -(-self.scene.width // self.chunk_size)
+        rows = -(-self.scene.height // self.chunk_size)
+        cx, cy = center
+        for y in range(max(0, cy - self.radius), min(rows, cy + self.radius + 1)):
+            for x in range(max(0, cx - self.radius), min(columns, cx + self.radius + 1)):
+                yield (x, y)
+
+    def request(self, chunk: Chunk) -> bool:
+        """Starts loading a chunk in the background, unless it is resident or loading.
+
+        Returns:
+            bool: True if a load was started.
+        """
+        if chunk in self.resident or chunk in self._pending:
+            return False
+        if chunk in self._stored:
+            self._pending[chunk] = self._executor.submit(database.load_world_chunk, self.world, chunk)
+        else:
+            # Never stored: nothing to read, so it is resident (and empty) at once.
+            self._pending[chunk] = done = Future()
+            done.set_result(None)
+        self._count("requested")
+        return True
+
+    def update(self, center: Any) -> None:
+        """Streams around an object, normally the player, once per turn.
+
+        Adds the chunks that finished loading to the scene, requests the
+        chunks within `radius` of `center` and evicts the farthest chunks
+        beyond the budget.
+
+        Args:
+            center: An object with `x` and `y`.
+        """
+        self._turn += 1
+        self.poll()
+        center_chunk = chunk_of(center.x, center.y, self.chunk_size)
+        self._cancel_beyond(center_chunk)
+        for chunk in self._chunks_around(center_chunk):
+            if chunk in self.resident:
+                self.resident[chunk] = self._turn
+            else:
+                self.request(chunk)
+        self._evict_beyond_budget(center_chunk)
+
+    def _cancel_beyond(self, center: Chunk) -> None:
+        """Drops the loads of chunks the player has moved away from, if they have not started."""
+        cx, cy = center
+        for chunk, future in list(self._pending.items()):
+            if max(abs(chunk[0] - cx), abs(chunk[1] - cy)) > self.radius and future.cancel():
+                del self._pending[chunk]
+                self._count("cancelled")
+
+    def poll(self, wait: bool = False) -> int:
+        """Adds the objects of chunks that finished loading to the scene.
+
+        Args:
+            wait (bool): Wait for every queued load and write first.
+
+        Returns:
+            int: The number of chunks that became resident.
+        """
+        if wait:
+            self._executor.submit(lambda: None).result()  # The single worker runs tasks in order.
+        finished = [chunk for chunk, future in self._pending.items() if wait or future.done()]
+        for chunk in finished:
+            objects = self._pending.pop(chunk).result()
+            self.resident[chunk] = self._turn
+            if objects:
+                self.scene.game_objects.extend(objects)
+            self._count("loaded")
+        return len(finished)
+
+    def _objects_by_chunk(self) -> Dict[Chunk, List[Any]]:
+        """Groups the scene's objects, except the player, by the chunk they are in."""
+        size = self.chunk_size
+        player = self.scene.player_character
+        chunks: Dict[Chunk, List[Any]] = {}
+        for obj in self.scene.game_objects:
+            if obj is not player:
+                chunks.setdefault(chunk_of(obj.x, obj.y, size), []).append(obj)
+        return chunks
+
+    def _evict_beyond_budget(self, center: Chunk) -> None:
+        if len(self.resident) + len(self._pending) <= self.max_chunks:
+            return
+        by_chunk = self._objects_by_chunk()
+        for chunk in by_chunk:
+            # Objects that moved into a chunk that is not loaded: load it, so
+            # its stored objects join them before it can be written back.
+            self.request(chunk)
+        excess = len(self.resident) + len(self._pending) - self.max_chunks
+        cx, cy = center
+
+        def distance(chunk: Chunk) -> int:
+            return max(abs(chunk[0] - cx), abs(chunk[1] - cy))
+
+        candidates = [chunk for chunk in self.resident if distance(chunk) > self.radius]
+        # Farthest first; among equally far chunks, the longest unused first.
+        candidates.sort(key=lambda chunk: (-distance(chunk), self.resident[chunk]))
+        leaving: List[Any] = []
+        for chunk in candidates[:max(0, excess)]:
+            objects = by_chunk.get(chunk, [])
+            del self.resident[chunk]
+            self._write(chunk, objects)
+            self._count("evicted")
+            leaving.extend(objects)
+        self._remove(leaving)
+
+    def _remove(self, objects: List[Any]) -> None:
+        """Takes objects out of the scene in one pass."""
+        if objects:
+            leaving = {id(obj) for obj in objects}
+            self.scene.game_objects[:] = [obj for obj in self.scene.game_objects if id(obj) not in leaving]
+
+    def _objects_in(self, chunk: Chunk) -> List[Any]:
+        player = self.scene.player_character
+        return [obj for obj in self.scene.get_objects_in_rect(*self._chunk_bounds(chunk)) if obj is not player]
+
+    def evict(self, chunk: Chunk) -> int:
+        """Removes a resident chunk's objects from the scene and writes them back.
+
+        Args:
+            chunk (Chunk): The chunk to evict.
+
+        Returns:
+            int: The number of objects evicted.
+
+        Raises:
+            KeyError: If the chunk is not resident.
+        """
+        del self.resident[chunk]
+        objects = self._objects_in(chunk)
+        self._remove(objects)
+        self._write(chunk, objects)
+        self._count("evicted")
+        return len(objects)
+
+    def _write(self, chunk: Chunk, objects: List[Any]) -> None:
+        if not objects and chunk not in self._stored:
+            return  # Nothing to store, and nothing stale to overwrite.
+        self._stored.add(chunk)
+        self._executor.submit(database.save_world_chunk, self.world, chunk, objects)
+        self._count("written")
+
+    def flush(self) -> None:
+        """Writes every resident chunk back without evicting it, and waits for every write.
+
+        The objects stay in the scene, so this blocks until they are encoded.
+        """
+        for chunk in self.resident:
+            self._write(chunk, self._objects_in(chunk))
+        self.poll(wait=True)
+
+    def close(self) -> None:
+        """Finishes pending loads, writes every resident chunk back and stops the background thread.
+
+        The scene keeps its resident objects and no longer streams.
+        """
+        self.poll(wait=True)
+        self.flush()
+        self._executor.shutdown(wait=True)
+        if getattr(self.scene, "streamer", None) is self:
+            self.scene.streamer = None
+
+    def _count(self, name: str) -> None:
+        self._stats[name] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns the streamer's counters.
+
+        Returns:
+            Dict[str, int]: Counts of chunks `requested`, `cancelled` before
+            their load started, `loaded` into the scene, `evicted` and
+            `written` back, plus the chunks currently `resident` and
+            `pending`.
+        """
+        stats = dict(self._stats)
+        stats["resident"] = len(self.resident)
+        stats["pending"] = len(self._pending)
+        return stats
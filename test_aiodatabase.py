@@ -0,0 +1,94 @@
+"""Unit tests for the asyncio database facade."""
+
+import asyncio
+import os
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import aiodatabase
+import database
+import game
+
+
+class TestAsyncDatabase(unittest.IsolatedAsyncioTestCase):
+    """Tests for `aiodatabase.AsyncDatabase`."""
+
+    def setUp(self):
+        """Creates a fresh content database and a two-worker facade."""
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+        database.init_db()
+        self.db = aiodatabase.AsyncDatabase(max_workers=2)
+
+    def tearDown(self):
+        """Shuts down the facade and removes the database."""
+        self.db.close()
+        database.close_pools()
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+
+    async def test_lookups_run_off_the_event_loop(self):
+        """Awaitable lookups return the same rows on a worker thread."""
+        threads = []
+        real_lookup = database.get_item_data
+
+        def lookup(name):
+            threads.append(threading.current_thread().name)
+            return real_lookup(name)
+
+        with patch('database.get_item_data', side_effect=lookup):
+            row = await self.db.get_item_data("Valiant Sword")
+        self.assertEqual(row["item_type"], "Weapon")
+        self.assertTrue(threads[0].startswith("aiodatabase"))
+        self.assertEqual((await self.db.get_character_data("Kane"))["health"], 250)
+        content = await self.db.load_scene_content(["Aethelgard Plate"], ["Aeron"])
+        self.assertEqual(content["items"]["Aethelgard Plate"]["defense"], 15)
+
+    async def test_identical_lookups_are_coalesced(self):
+        """Concurrent lookups of the same key share a single call."""
+        calls = []
+
+        def slow_lookup(name):
+            calls.append(name)
+            time.sleep(0.05)
+            return name.upper()
+
+        with patch('database.get_item_data', side_effect=slow_lookup):
+            results = await asyncio.gather(*(self.db.get_item_data("sword") for _ in range(10)),
+                                           self.db.get_item_data("plate"))
+        self.assertEqual(results, ["SWORD"] * 10 + ["PLATE"])
+        self.assertEqual(sorted(calls), ["plate", "sword"])
+        self.assertEqual(self.db.stats(), {"calls": 2, "coalesced": 9})
+
+    async def test_concurrency_is_bounded(self):
+        """No more than `max_workers` calls run at the same time."""
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def slow_load(names):
+            with lock:
+                running[0] += 1
+                running[1] = max(running[1], running[0])
+            time.sleep(0.02)
+            with lock:
+                running[0] -= 1
+            return {}
+
+        with patch('database.load_items_bulk', side_effect=slow_load):
+            await asyncio.gather(*(self.db.load_items_bulk(["x"]) for _ in range(8)))
+        self.assertEqual(running[1], 2)
+
+    async def test_save_and_load(self):
+        """Games can be saved and loaded without blocking the loop."""
+        scene_manager = game.AethelgardBattle(game.Scene("Aethelgard Battle"), game.Game())
+        scene_manager.scene.player_character.health = 33
+        self.assertGreater(await self.db.save_game("async", scene_manager), 0)
+        loaded = await self.db.load_game("async")
+        self.assertEqual(loaded.scene.player_character.health, 33)
+        self.assertIsNone(await self.db.load_game("missing"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+"""Unit tests for the Monte Carlo combat balance simulator."""
+
+import unittest
+
+import balance
+import events
+import rng
+
+
+class TestBalanceReport(unittest.TestCase):
+    """Tests for `balance.BalanceReport` aggregation."""
+
+    def setUp(self):
+        """Builds a report from hand-made results."""
+        results = [(balance.PLAYERS, rounds) for rounds in (3, 4, 4, 5, 5, 5, 9)]
+        results += [(balance.ENEMIES, 2), (balance.DRAW, balance.MAX_ROUNDS)]
+        self.report = balance.BalanceReport("test", results)
+
+    def test_outcomes_and_percentiles(self):
+        """Win rates and nearest-rank percentiles of time to kill."""
+        self.assertEqual(self.report.fights, 9)
+        self.assertAlmostEqual(self.report.win_rate, 7 / 9)
+        self.assertEqual(self.report.percentile(0), 3)
+        self.assertEqual(self.report.percentile(50), 5)
+        self.assertEqual(self.report.percentile(100), 9)
+        self.assertEqual(self.report.percentile(10, wins_only=False), 2)
+        self.assertIsNone(balance.BalanceReport("empty", []).percentile(50))
+
+    def test_histogram_bins(self):
+        """Bins cover every round from the shortest to the longest win."""
+        self.assertEqual(self.report.histogram(), [(3, 1), (4, 2), (5, 3), (6, 0), (7, 0), (8, 0), (9, 1)])
+        self.assertEqual(self.report.histogram(bin_width=4), [(0, 1), (4, 5), (8, 1)])
+        self.assertIn("rounds to kill: p10 3, p50 5", self.report.format())
+
+
+class TestSimulate(unittest.TestCase):
+    """Tests for `balance.fight` and `balance.simulate`."""
+
+    def test_fights_are_reproducible(self):
+        """A seed fixes a fight's outcome and leaves the caller's session alone."""
+        service = rng.service
+        report = balance.simulate("party_vs_kane", fights=30, seed=5, workers=1)
+        self.assertIs(rng.service, service)
+        again = balance.simulate("party_vs_kane", fights=30, seed=5, workers=1)
+        self.assertEqual(report.rounds, again.rounds)
+        self.assertEqual(report.outcomes, again.outcomes)
+        self.assertTrue(events.bus.echo)
+
+    def test_matchups_finish(self):
+        """Every built-in matchup plays out without errors."""
+        for name in balance.MATCHUPS:
+            report = balance.simulate(name, fights=5, workers=1)
+            self.assertEqual(sum(report.outcomes.values()), 5, name)
+
+    def test_process_pool_matches_in_process(self):
+        """Results do not depend on the number of processes or chunk size."""
+        serial = balance.simulate("anastasia_vs_goblins", fights=40, seed=3, workers=1)
+        pooled = balance.simulate("anastasia_vs_goblins", fights=40, seed=3, workers=2, chunk_size=7)
+        self.assertEqual(serial.rounds, pooled.rounds)
+        self.assertEqual(serial.outcomes, pooled.outcomes)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+"""Unit tests for the memory-mapped content pack."""
+
+import os
+import unittest
+
+import content_pack
+import database
+
+
+class TestContentPack(unittest.TestCase):
+    """Tests for building, reading and serving content from a pack."""
+
+    DB_FILE = "test_content_pack.db"
+    PACK_FILE = "test_content_pack.pack"
+
+    def setUp(self):
+        """Builds a pack from a fresh content database."""
+        database.init_db(self.DB_FILE)
+        self.row_count = content_pack.build_content_pack(self.DB_FILE, self.PACK_FILE)
+        self.pack = content_pack.ContentPack(self.PACK_FILE)
+
+    def tearDown(self):
+        """Stops serving from the pack and removes the generated files."""
+        database.use_content_pack(None)
+        self.pack.close()
+        database.close_pools()
+        for path in (self.DB_FILE, self.PACK_FILE):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def test_rows_match_sqlite(self):
+        """Packed rows hold the same columns and values as the database."""
+        self.assertEqual(self.row_count, 6)
+        conn = database.get_db_connection(self.DB_FILE)
+        try:
+            expected = database.get_item_data("Valiant Sword", conn=conn)
+            weapon = database.get_weapon_data(expected["item_id"], conn=conn)
+        finally:
+            conn.close()
+        row = self.pack.get("Items", "name", "Valiant Sword")
+        self.assertEqual(row.keys(), expected.keys())
+        self.assertEqual(dict(row), dict(expected))
+        self.assertEqual(row["value"], 100)
+        self.assertEqual(row[1], "Valiant Sword")
+        self.assertEqual(dict(self.pack.get("Weapons", "weapon_id", expected["item_id"])), dict(weapon))
+        self.assertIsNone(self.pack.get("Items", "name", "Nothing"))
+        self.assertEqual([row["name"] for row in self.pack.rows("Characters")], ["Aeron", "Kane"])
+
+    def test_unindexed_column_is_rejected(self):
+        """Lookups on columns without a packed index raise ValueError."""
+        with self.assertRaises(ValueError):
+            self.pack.get("Items", "value", 100)
+
+    def test_accessors_serve_from_pack(self):
+        """With a pack in use, lookups and bulk loads never touch SQLite."""
+        database.use_content_pack(self.pack)
+        os.remove(self.DB_FILE)
+        database.close_pools()
+        self.assertEqual(database.get_character_data("Kane")["health"], 250)
+        content = database.load_scene_content(["Aethelgard Plate", "Nothing"], ["Aeron"])
+        self.assertEqual(content["items"]["Aethelgard Plate"]["defense"], 15)
+        self.assertIsNone(content["items"]["Aethelgard Plate"]["damage"])
+        self.assertEqual(list(content["items"]), ["Aethelgard Plate"])
+        self.assertEqual(content["characters"]["Aeron"]["title"], "The Brave")
+        self.assertFalse(os.path.exists(self.DB_FILE))
+
+    def test_location_subtree_from_pack(self):
+        """Location subtrees are walked in the pack like in SQLite."""
+        conn = database.get_db_connection(self.DB_FILE)
+        conn.executemany("INSERT INTO Locations (location_id, name, parent_location_id) VALUES (?, ?, ?)",
+                         [(1, "Aethelgard", None), (2, "Market", 1), (3, "Castle", 1), (4, "Keep", 3)])
+        conn.commit()
+        expected = database.load_location_subtree("Aethelgard", conn=conn)
+        conn.close()
+        self.pack.close()
+        content_pack.build_content_pack(self.DB_FILE, self.PACK_FILE)
+        self.pack = content_pack.ContentPack(self.PACK_FILE)
+        database.use_content_pack(self.pack)
+        self.assertEqual(database.load_location_subtree("Aethelgard"), expected)
+
+    def test_open_content_prefers_pack(self):
+        """Startup maps the pack without creating the content schema."""
+        os.remove(self.DB_FILE)
+        database.close_pools()
+        self.assertTrue(database.open_content(self.DB_FILE, self.PACK_FILE))
+        self.assertFalse(os.path.exists(self.DB_FILE))
+        self.assertEqual(database.get_item_data("Valiant Sword")["item_type"], "Weapon")
+        database._content_pack.close()
+
+    def test_open_content_falls_back_to_database(self):
+        """Without a usable pack, startup initializes the database."""
+        with open(self.PACK_FILE, "wb") as f:
+            f.write(b"not a pack")
+        os.remove(self.DB_FILE)
+        database.close_pools()
+        self.assertFalse(database.open_content(self.DB_FILE, self.PACK_FILE))
+        self.assertIsNone(database._content_pack)
+        conn = database.get_db_connection(self.DB_FILE)
+        try:
+            self.assertEqual(database.get_item_data("Valiant Sword", conn=conn)["item_type"], "Weapon")
+        finally:
+            conn.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,380 @@
+"""Unit tests for the database module's connection pool and content cache."""
+
+import os
+import threading
+import unittest
+
+import database
+import game
+
+
+class TestConnectionPool(unittest.TestCase):
+    """Tests for `ConnectionPool` and the pooled content accessors."""
+
+    DB_FILE = "test_database.db"
+
+    def setUp(self):
+        """Creates a fresh content database for each test."""
+        database.init_db(self.DB_FILE)
+        self.pool = database.ConnectionPool(self.DB_FILE, max_size=2)
+
+    def tearDown(self):
+        """Closes pooled connections and removes the temporary database."""
+        self.pool.close_all()
+        database.close_pools()
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+    def test_connection_is_reused_within_a_thread(self):
+        """A second checkout on the same thread reuses the first connection."""
+        with self.pool.connection() as first:
+            pass
+        with self.pool.connection() as second:
+            pass
+        self.assertIs(first, second)
+        stats = self.pool.stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["size"], 1)
+
+    def test_threads_get_their_own_connections(self):
+        """Each thread is given a distinct pooled connection."""
+        seen = []
+
+        def worker():
+            with self.pool.connection() as conn:
+                seen.append(conn)
+
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+        with self.pool.connection() as conn:
+            seen.append(conn)
+        self.assertIsNot(seen[0], seen[1])
+
+    def test_pool_size_is_bounded(self):
+        """Threads beyond `max_size` receive temporary overflow connections."""
+        barrier = threading.Barrier(3)
+
+        def worker():
+            with self.pool.connection():
+                barrier.wait()
+
+        threads = [threading.Thread(target=worker) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = self.pool.stats()
+        self.assertLessEqual(stats["size"], 2)
+        self.assertEqual(stats["overflows"], 1)
+
+    def test_recreated_file_fails_health_check(self):
+        """A connection to a deleted database file is replaced on checkout."""
+        with self.pool.connection() as stale:
+            pass
+        os.remove(self.DB_FILE)
+        database.init_db(self.DB_FILE)
+        with self.pool.connection() as fresh:
+            row = fresh.execute("SELECT name FROM Characters WHERE name = 'Aeron'").fetchone()
+        self.assertIsNot(stale, fresh)
+        self.assertEqual(row["name"], "Aeron")
+        self.assertEqual(self.pool.stats()["discarded"], 1)
+
+    def test_exception_rolls_back(self):
+        """Writes inside a failing `with` block are not committed."""
+        with self.assertRaises(RuntimeError):
+            with self.pool.connection() as conn:
+                conn.execute("INSERT INTO Items (name) VALUES ('Ghost Item')")
+                raise RuntimeError("boom")
+        with self.pool.connection() as conn:
+            row = conn.execute("SELECT * FROM Items WHERE name = 'Ghost Item'").fetchone()
+        self.assertIsNone(row)
+
+    def test_accessors_use_shared_pool(self):
+        """Repeated lookups without a connection hit the shared pool."""
+        original = database.DB_FILE
+        database.init_db()
+        try:
+            database.close_pools()
+            self.assertEqual(database.get_character_data("Aeron")["health"], 100)
+            self.assertEqual(database.get_item_data("Valiant Sword")["item_type"], "Weapon")
+            stats = database.pool_stats()
+            self.assertEqual(stats["misses"], 1)
+            self.assertGreaterEqual(stats["hits"], 1)
+        finally:
+            database.close_pools()
+            if os.path.exists(original):
+                os.remove(original)
+
+
+class TestConnectionProfiles(unittest.TestCase):
+    """Tests for the named PRAGMA profiles applied to new connections."""
+
+    DB_FILE = "test_profiles.db"
+
+    def tearDown(self):
+        """Closes pooled connections and removes the database and WAL files."""
+        database.close_pools()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(self.DB_FILE + suffix):
+                os.remove(self.DB_FILE + suffix)
+
+    def pragma(self, conn, name):
+        """Returns the current value of a PRAGMA on a connection."""
+        return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_default_profile_keeps_sqlite_defaults(self):
+        """The default profile leaves the rollback journal in place."""
+        conn = database.get_db_connection(self.DB_FILE)
+        self.assertEqual(self.pragma(conn, "journal_mode"), "delete")
+        self.assertEqual(self.pragma(conn, "synchronous"), 2)
+        conn.close()
+
+    def test_throughput_profile_enables_wal(self):
+        """The throughput profile switches to WAL and tunes the caches."""
+        conn = database.get_db_connection(self.DB_FILE, profile="throughput")
+        self.assertEqual(self.pragma(conn, "journal_mode"), "wal")
+        self.assertEqual(self.pragma(conn, "synchronous"), 1)
+        self.assertEqual(self.pragma(conn, "cache_size"), -32768)
+        self.assertEqual(self.pragma(conn, "temp_store"), 2)
+        conn.close()
+
+    def test_pool_applies_profile(self):
+        """Pooled connections are opened with the pool's profile."""
+        pool = database.ConnectionPool(self.DB_FILE, profile="throughput")
+        with pool.connection() as conn:
+            database.create_schema(conn.cursor())
+            database.populate_initial_data(conn.cursor())
+        with pool.connection() as conn:
+            self.assertEqual(self.pragma(conn, "journal_mode"), "wal")
+            self.assertEqual(database.get_item_data("Valiant Sword", conn=conn)["item_type"], "Weapon")
+        pool.close_all()
+
+    def test_unknown_profile_is_rejected(self):
+        """Misspelled profile names fail loudly rather than falling back."""
+        with self.assertRaises(ValueError):
+            database.get_db_connection(self.DB_FILE, profile="fast")
+        with self.assertRaises(ValueError):
+            database.ConnectionPool(self.DB_FILE, profile="fast")
+
+
+class TestContentCache(unittest.TestCase):
+    """Tests for the LRU `ContentCache` in front of the content accessors."""
+
+    def setUp(self):
+        """Initializes the default content database with an empty cache."""
+        database.init_db()
+
+    def tearDown(self):
+        """Closes pooled connections and removes the content database."""
+        database.close_pools()
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+
+    def test_repeated_lookup_is_a_cache_hit(self):
+        """The second lookup of the same character does not query the database."""
+        before = database.content_cache_stats()
+        first = database.get_character_data("Kane")
+        second = database.get_character_data("Kane")
+        after = database.content_cache_stats()
+        self.assertIs(first, second)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+        self.assertEqual(after["hits"] - before["hits"], 1)
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted once the cache is full."""
+        cache = database.ContentCache(max_size=2)
+        loads = []
+
+        def loader(value):
+            return lambda: loads.append(value) or value
+
+        cache.get("Items", "a", loader("a"))
+        cache.get("Items", "b", loader("b"))
+        cache.get("Items", "a", loader("a"))
+        cache.get("Items", "c", loader("c"))
+        cache.get("Items", "a", loader("a"))
+        cache.get("Items", "b", loader("b"))
+        self.assertEqual(loads, ["a", "b", "c", "b"])
+        self.assertEqual(cache.stats()["evictions"], 2)
+
+    def test_invalidate_by_table_and_key(self):
+        """Explicit invalidation drops only the targeted entries."""
+        cache = database.ContentCache()
+        cache.get("Items", "sword", lambda: 1)
+        cache.get("Items", "plate", lambda: 2)
+        cache.get("Characters", "Aeron", lambda: 3)
+        cache.invalidate("Items", "sword")
+        self.assertEqual(cache.get("Items", "sword", lambda: 10), 10)
+        self.assertEqual(cache.get("Items", "plate", lambda: 20), 2)
+        cache.invalidate("Characters")
+        self.assertEqual(cache.get("Characters", "Aeron", lambda: 30), 30)
+        self.assertEqual(cache.get("Items", "plate", lambda: 20), 2)
+
+    def test_content_change_bumps_version_stamp(self):
+        """A write to a cached table is noticed through the version stamp."""
+        cache = database.ContentCache(stamp_interval=0)
+        load = lambda: database._query_single_row("Characters", "name", "Aeron", conn)
+        with database.get_pool().connection() as conn:
+            self.assertEqual(cache.get("Characters", "Aeron", load)["health"], 100)
+            conn.execute("UPDATE Characters SET health = 120 WHERE name = 'Aeron'")
+        with database.get_pool().connection() as conn:
+            self.assertEqual(cache.get("Characters", "Aeron", load)["health"], 120)
+
+
+class TestBulkLoader(unittest.TestCase):
+    """Tests for the bulk scene content loader."""
+
+    DB_FILE = "test_database_bulk.db"
+
+    def setUp(self):
+        """Creates a fresh content database for each test."""
+        database.init_db(self.DB_FILE)
+        self.conn = database.get_db_connection(self.DB_FILE)
+
+    def tearDown(self):
+        """Closes the connection and removes the temporary database."""
+        self.conn.close()
+        database.close_pools()
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+    def test_items_are_joined_with_weapon_and_armor_stats(self):
+        """Each item record carries its weapon or armor stats."""
+        items = database.load_items_bulk(["Valiant Sword", "Aethelgard Plate", "Missing"], self.conn)
+        self.assertEqual(set(items), {"Valiant Sword", "Aethelgard Plate"})
+        self.assertEqual(items["Valiant Sword"]["damage"], 25)
+        self.assertIsNone(items["Valiant Sword"]["defense"])
+        self.assertEqual(items["Aethelgard Plate"]["defense"], 15)
+        self.assertIsNone(items["Aethelgard Plate"]["damage"])
+
+    def test_scene_content_uses_constant_queries(self):
+        """Loading a scene's content costs one query per table, not per object."""
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        content = database.load_scene_content(
+            ["Valiant Sword", "Aethelgard Plate"] * 300, ["Aeron", "Kane"], self.conn)
+        self.conn.set_trace_callback(None)
+        self.assertEqual(len(statements), 2)
+        self.assertEqual(content["characters"]["Kane"]["health"], 250)
+
+    def test_large_name_lists_are_batched(self):
+        """Name lists longer than the parameter limit are split into batches."""
+        self.conn.executemany("INSERT INTO Items (name, item_type) VALUES (?, 'Junk')",
+                              [(f"Junk {i}",) for i in range(1200)])
+        items = database.load_items_bulk([f"Junk {i}" for i in range(1200)], self.conn)
+        self.assertEqual(len(items), 1200)
+
+
+
+class TestRecursiveLoaders(unittest.TestCase):
+    """Tests for the recursive location subtree and dialogue chain loaders."""
+
+    DB_FILE = "test_recursive.db"
+
+    def setUp(self):
+        """Creates a small region hierarchy and a looping dialogue chain."""
+        database.init_db(self.DB_FILE)
+        self.conn = database.get_db_connection(self.DB_FILE)
+        self.conn.executemany(
+            "INSERT INTO Locations (location_id, name, parent_location_id) VALUES (?, ?, ?)",
+            [(1, "Aethelgard", None), (2, "Castle", 1), (3, "Throne Room", 2),
+             (4, "Market", 1), (5, "Void", None)])
+        self.conn.executemany(
+            "INSERT INTO Dialogues (dialogue_id, text, next_dialogue_id, response_text) VALUES (?, ?, ?, ?)",
+            [(10, "Halt!", 11, "Who goes there?"), (11, "State your name.", 12, None),
+             (12, "Pass, then.", None, None), (20, "Again?", 21, None), (21, "Again.", 20, None)])
+        self.conn.commit()
+
+    def tearDown(self):
+        """Closes connections and removes the temporary database."""
+        self.conn.close()
+        database.close_pools()
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+    def test_location_subtree(self):
+        """A subtree comes back breadth-first with depths, by id or name."""
+        subtree = database.load_location_subtree(1, conn=self.conn)
+        self.assertEqual([(row["name"], row["depth"]) for row in subtree],
+                         [("Aethelgard", 0), ("Castle", 1), ("Market", 1), ("Throne Room", 2)])
+        by_name = database.load_location_subtree("Castle", conn=self.conn)
+        self.assertEqual([row["location_id"] for row in by_name], [2, 3])
+        self.assertEqual(database.load_location_subtree(99, conn=self.conn), [])
+
+    def test_location_subtree_is_one_query(self):
+        """Walking the tree costs a single statement."""
+        statements = []
+        self.conn.set_trace_callback(statements.append)
+        database.load_location_subtree(1, conn=self.conn)
+        self.assertEqual(len(statements), 1)
+
+    def test_location_cycle_terminates(self):
+        """A cycle in hand-edited content does not loop forever."""
+        self.conn.execute("UPDATE Locations SET parent_location_id = 3 WHERE location_id = 1")
+        subtree = database.load_location_subtree(1, conn=self.conn)
+        self.assertEqual(sorted(row["location_id"] for row in subtree), [1, 2, 3, 4])
+
+    def test_dialogue_chain_builds_manager(self):
+        """A dialogue chain becomes a `DialogueManager` that can be walked."""
+        manager = game.DialogueManager.from_database(10, "Guard", conn=self.conn)
+        node = manager.get_current_node()
+        self.assertEqual((node.text, node.character_name), ("Halt!", "Guard"))
+        self.assertEqual(node.options, {"Who goes there?": "11"})
+        self.assertTrue(manager.select_option(0))
+        self.assertTrue(manager.select_option(0))
+        self.assertEqual(manager.get_current_node().text, "Pass, then.")
+        self.assertFalse(manager.select_option(0))
+        self.assertIsNone(game.DialogueManager.from_database(99, conn=self.conn))
+
+    def test_looping_dialogue_chain(self):
+        """A chain that loops back keeps its link to the first repeated node."""
+        rows = database.load_dialogue_chain(20, conn=self.conn)
+        self.assertEqual([row["dialogue_id"] for row in rows], [20, 21])
+        manager = game.DialogueManager.from_database(20, conn=self.conn)
+        self.assertEqual(manager.nodes["21"].options, {"Continue": "20"})
+
+
+class TestQueryPlanAudit(unittest.TestCase):
+    """Tests for the schema's indexes and the `EXPLAIN QUERY PLAN` audit."""
+
+    DB_FILE = "test_query_plans.db"
+
+    def setUp(self):
+        """Creates a fresh content database."""
+        database.init_db(self.DB_FILE)
+        self.conn = database.get_db_connection(self.DB_FILE)
+
+    def tearDown(self):
+        """Closes connections and removes the temporary database."""
+        self.conn.close()
+        database.close_pools()
+        if os.path.exists(self.DB_FILE):
+            os.remove(self.DB_FILE)
+
+    def test_module_queries_use_indexes(self):
+        """No query issued by the module scans a whole table."""
+        reports = database.audit_query_plans(self.conn)
+        labels = [report["label"] for report in reports]
+        self.assertIn("items bulk", labels)
+        self.assertIn("deltas select", labels)
+        self.assertEqual([report for report in reports if report["full_scans"]], [])
+
+    def test_foreign_key_lookups_use_indexes(self):
+        """Reverse lookups on foreign keys are served by secondary indexes."""
+        for sql in ("SELECT * FROM Locations WHERE parent_location_id = ?",
+                    "SELECT * FROM Quests WHERE start_location_id = ?",
+                    "SELECT * FROM Dialogues WHERE next_dialogue_id = ?",
+                    "SELECT * FROM CharacterInventory WHERE item_id = ?"):
+            plan = database.explain_query_plan(self.conn, sql)
+            self.assertEqual(database.find_full_scans(plan), [], plan)
+
+    def test_full_scans_are_flagged(self):
+        """Filtering on an unindexed column is reported as a full scan."""
+        plan = database.explain_query_plan(self.conn, "SELECT * FROM Items WHERE value > ?")
+        self.assertEqual(database.find_full_scans(plan), ["SCAN Items"])
+
+
+if __name__ == '__main__':
+    unittest.main()
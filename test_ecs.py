@@ -0,0 +1,97 @@
+"""Unit tests for the struct-of-arrays entity store."""
+
+import tracemalloc
+import unittest
+
+import ecs
+import effects
+import game
+
+
+class TestWorld(unittest.TestCase):
+    """Tests for `ecs.World` and its `Entity` handles."""
+
+    def setUp(self):
+        """Spawns a row of goblins."""
+        self.world = ecs.World()
+        self.goblins = [self.world.spawn(name=f"Goblin {i}", symbol='g', x=i, y=2 * i, health=10 + i)
+                        for i in range(5)]
+
+    def test_handles_read_and_write_columns(self):
+        """Handle fields are views of the world's columns."""
+        goblin = self.goblins[3]
+        self.assertEqual((goblin.name, goblin.x, goblin.y, goblin.health), ("Goblin 3", 3, 6, 13))
+        goblin.health -= 5
+        goblin.move(1, -1)
+        self.assertEqual(self.world.raw_column("health")[goblin.id], 8)
+        self.assertEqual((goblin.x, goblin.y), (4, 5))
+        self.assertEqual(self.world.entity(goblin.id), goblin)
+        self.assertEqual(goblin.distance_to(self.goblins[0]), 41 ** 0.5)
+        self.assertFalse(hasattr(goblin, '__dict__'))
+
+    def test_bulk_iteration_skips_despawned_entities(self):
+        """Despawned rows are skipped and their ids reused."""
+        self.world.despawn(self.goblins[1])
+        self.assertEqual(len(self.world), 4)
+        self.assertNotIn(1, self.world)
+        self.assertEqual(list(self.world.column("health")), [10, 12, 13, 14])
+        self.assertEqual(list(self.world.rows("x", "y"))[:2], [(0, 0, 0), (2, 2, 4)])
+        reused = self.world.spawn(name="Troll", health=50)
+        self.assertEqual(reused.id, 1)
+        self.assertEqual((reused.name, reused.x, reused.health), ("Troll", 0, 50))
+        self.assertEqual(self.world.capacity, 5)
+        with self.assertRaises(KeyError):
+            self.world.despawn(99)
+
+    def test_adopt_copies_a_game_object(self):
+        """`adopt` copies fields and non-empty dictionaries only."""
+        enemy = game.Enemy(name="Kane", x=4, y=7, health=250)
+        enemy.defense = 3
+        enemy.status_effects['slow'] = {'duration': 2}
+        entity = self.world.adopt(enemy)
+        self.assertEqual((entity.name, entity.symbol, entity.x, entity.y, entity.health, entity.defense),
+                         ("Kane", enemy.symbol, 4, 7, 250, 3))
+        self.assertEqual(entity.status_effects, {'slow': {'duration': 2}})
+        self.assertNotIn(entity.id, self.world._attributes)
+
+    def test_status_effects_tick_and_expire(self):
+        """Entities keep `StatusEffects`, adopted ones with their remaining turns."""
+        enemy = game.Enemy(name="Kane", health=250)
+        enemy.status_effects.add('poison', 3, potency=4)
+        enemy.update_status_effects()
+        entity = self.world.adopt(enemy)
+        self.assertIsInstance(entity.status_effects, effects.StatusEffects)
+        self.assertIsNot(entity.status_effects['poison'], enemy.status_effects['poison'])
+        self.world.advance_effects()
+        self.assertEqual((entity.health, entity.status_effects.remaining('poison')), (242, 1))
+        self.world.advance_effects()
+        self.assertNotIn('poison', entity.status_effects)
+        self.assertEqual((entity.health, enemy.health), (238, 246))
+        self.goblins[0].status_effects['sleep'] = 1
+        self.world.advance_effects()
+        self.assertEqual(self.goblins[0].status_effects, {})
+
+    def test_memory_per_entity_is_much_smaller(self):
+        """Ten thousand entities take a fraction of the memory of GameObjects."""
+        def allocated(build):
+            tracemalloc.start()
+            try:
+                kept = build()
+                return tracemalloc.get_traced_memory()[0], kept
+            finally:
+                tracemalloc.stop()
+
+        objects, _ = allocated(lambda: [game.GameObject(name="Goblin", x=i, y=i) for i in range(10000)])
+
+        def build_world():
+            world = ecs.World()
+            for i in range(10000):
+                world.spawn(name="Goblin", x=i, y=i)
+            return world
+
+        entities, _ = allocated(build_world)
+        self.assertLess(entities * 5, objects)
+
+
+if __name__ == '__main__':
+    unittest.main()
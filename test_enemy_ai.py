@@ -0,0 +1,106 @@
+"""Unit tests for the batched enemy AI turns of both engines."""
+
+import contextlib
+import io
+import random
+import unittest
+
+import game
+import rpg
+
+
+def build_game_horde(seed):
+    """Creates a `game` scene with enemies in every AI state around a player."""
+    rng = random.Random(seed)
+    scene = game.Scene("Horde", width=60, height=60)
+    manager = game.SceneManager(scene, game.Game(), setup_scene=False)
+    scene.set_player(game.Player(name="Aeron", x=30, y=30))
+    scene.player_character.health = 5000
+    for i in range(200):
+        enemy = game.Kane(name=f"Goblin {i}", x=rng.randrange(60), y=rng.randrange(60)) if i % 50 == 0 else \
+            game.Enemy(name=f"Goblin {i}", x=rng.randrange(60), y=rng.randrange(60))
+        enemy.state = rng.choice(['idle', 'chasing', 'attacking'])
+        if i % 17 == 0:
+            enemy.status_effects['stun'] = {'duration': 2}
+        if i % 23 == 0:
+            enemy.status_effects['poison'] = {'duration': 3, 'potency': 4}
+        scene.add_object(enemy)
+    scene.add_object(game.Weapon("Sword", "A plain blade.", 10))
+    return manager
+
+
+def build_rpg_horde(seed):
+    """Creates an `rpg` scene with enemies scattered around a player."""
+    rng = random.Random(seed)
+    scene = rpg.Scene("Cave", width=60, height=60)
+    manager = rpg.TrollCaveScene(rpg.Game())
+    manager.scene = scene
+    scene.set_player(rpg.Player(name="Aeron", x=30, y=30))
+    scene.player_character.health = 5000
+    for i in range(200):
+        scene.add_object(rpg.Enemy(f"Troll {i}", x=rng.randrange(60), y=rng.randrange(60)))
+    scene.add_object(rpg.Enemy("Twin", x=30, y=30))
+    return manager
+
+
+def snapshot(scene):
+    """Returns the AI-relevant state of every object in a scene."""
+    return [(obj.name, obj.x, obj.y, obj.health, getattr(obj, 'state', None), dict(obj.status_effects)
+             if hasattr(obj, 'status_effects') else None) for obj in scene.game_objects]
+
+
+def run(turn, manager, turns):
+    """Runs `turns` AI turns and returns everything they printed."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        for _ in range(turns):
+            turn(manager)
+    return output.getvalue()
+
+
+class TestBatchedEnemyTurns(unittest.TestCase):
+    """The batched turns behave exactly like updating enemies one by one."""
+
+    def test_game_world_turn_matches_sequential_updates(self):
+        """`SceneManager.update_objects` equals calling `update` on every object."""
+        def sequential(manager):
+            for obj in manager.scene.game_objects:
+                obj.update(manager)
+
+        expected, actual = build_game_horde(5), build_game_horde(5)
+        expected_log = run(sequential, expected, 12)
+        actual_log = run(game.SceneManager.update_objects, actual, 12)
+        self.assertEqual(snapshot(actual.scene), snapshot(expected.scene))
+        self.assertEqual(actual_log, expected_log)
+        self.assertIn("attacks Aeron", actual_log)
+
+    def test_game_player_death_stops_later_enemies(self):
+        """Enemies after the one that kills the player no longer act."""
+        def sequential(manager):
+            for obj in manager.scene.game_objects:
+                obj.update(manager)
+
+        expected, actual = build_game_horde(9), build_game_horde(9)
+        for manager in (expected, actual):
+            manager.scene.player_character.health = 15
+        run(sequential, expected, 6)
+        run(game.SceneManager.update_objects, actual, 6)
+        self.assertLessEqual(actual.scene.player_character.health, 0)
+        self.assertEqual(snapshot(actual.scene), snapshot(expected.scene))
+
+    def test_rpg_enemy_turn_matches_sequential_updates(self):
+        """`rpg.SceneManager.update_enemies` equals calling `update` on every enemy."""
+        def sequential(manager):
+            for obj in manager.scene.game_objects:
+                if isinstance(obj, rpg.Enemy):
+                    obj.update(manager)
+
+        expected, actual = build_rpg_horde(3), build_rpg_horde(3)
+        expected_log = run(sequential, expected, 10)
+        actual_log = run(rpg.SceneManager.update_enemies, actual, 10)
+        self.assertEqual(snapshot(actual.scene), snapshot(expected.scene))
+        self.assertEqual(actual_log, expected_log)
+
+
+if __name__ == '__main__':
+    unittest.main()
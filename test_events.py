@@ -0,0 +1,121 @@
+"""Unit tests for the combat and item event bus."""
+
+import io
+import unittest
+from contextlib import redirect_stdout
+from unittest.mock import patch
+
+import events
+import game
+
+
+class TestEventBus(unittest.TestCase):
+    """Tests for `events.EventBus` recording and delivery."""
+
+    def test_ring_buffer_keeps_the_newest_events(self):
+        """Once full, the bus overwrites its oldest events and counts them."""
+        bus = events.EventBus(capacity=3)
+        for amount in range(5):
+            bus.emit(events.DAMAGE, target="Goblin", amount=amount)
+        self.assertEqual(len(bus), 3)
+        self.assertEqual(bus.total, 5)
+        self.assertEqual(bus.dropped, 2)
+        self.assertEqual([event.amount for event in bus], [2, 3, 4])
+        self.assertEqual([event.amount for event in bus.recent(2)], [3, 4])
+        bus.clear()
+        self.assertEqual(list(bus), [])
+
+    def test_text_is_formatted_on_demand(self):
+        """Events are stored as fields and read through their template."""
+        bus = events.EventBus()
+        bus.emit(events.CRIT, source="Aeron", target="Goblin", amount=30, detail="Sword")
+        bus.emit(events.NOTICE, source="Reverie", amount=5, detail=(15, 100),
+                 text="{source} gains {amount} Enigma. (Total: {detail[0]}/{detail[1]})")
+        self.assertEqual(bus.messages(), ["CRITICAL HIT! Aeron attacks Goblin with Sword for 30 damage.",
+                                          "Reverie gains 5 Enigma. (Total: 15/100)"])
+        with patch.object(events.Event, 'message') as message:
+            bus.emit(events.MISS, source="Aeron", target="Goblin")
+        self.assertFalse(message.mock_calls)
+
+    def test_subscribers_filter_by_kind(self):
+        """Subscribers get events or text of the kinds they asked for."""
+        bus = events.EventBus()
+        received, texts = [], []
+        bus.subscribe(received.append)
+        bus.subscribe(texts.append, kinds=events.ITEM_EVENTS, text=True)
+        bus.emit(events.ITEM_DROPPED, source="Aeron", detail="Sword")
+        bus.emit(events.DAMAGE, target="Aeron", amount=4)
+        self.assertEqual([event.kind for event in received], [events.ITEM_DROPPED, events.DAMAGE])
+        self.assertEqual(texts, ["Aeron dropped Sword."])
+        bus.unsubscribe(texts.append)
+        bus.emit(events.ITEM_DROPPED, source="Aeron", detail="Shield")
+        self.assertEqual(len(texts), 1)
+
+    def test_combat_log_tallies(self):
+        """`CombatLog` counts attacks, crits, misses and damage per name."""
+        bus = events.EventBus()
+        log = events.CombatLog().attach(bus)
+        bus.emit(events.ATTACK, source="Aeron", target="Goblin", amount=10)
+        bus.emit(events.CRIT, source="Aeron", target="Goblin", amount=20, detail="Sword")
+        bus.emit(events.MISS, source="Goblin", target="Aeron")
+        bus.emit(events.DAMAGE, target="Goblin", amount=25)
+        log.detach()
+        bus.emit(events.ATTACK, source="Aeron", target="Goblin", amount=10)
+        self.assertEqual(log.attacks, {"Aeron": 2})
+        self.assertEqual(log.crits, {"Aeron": 1})
+        self.assertEqual(log.misses, {"Goblin": 1})
+        self.assertEqual(log.damage_dealt, {"Aeron": 30})
+        self.assertEqual(log.damage_taken, {"Goblin": 25})
+
+
+class TestGameEvents(unittest.TestCase):
+    """Tests that `game` reports combat and items through `events.bus`."""
+
+    def setUp(self):
+        """Creates a player and an enemy and clears the bus."""
+        events.bus.clear()
+        self.player = game.Player(name="Aeron")
+        self.enemy = game.Enemy(name="Goblin")
+
+    def test_echo_matches_the_old_output(self):
+        """The echoed text reads exactly as the old `print` calls did."""
+        self.player.inventory.append(game.HealthPotion())
+        with redirect_stdout(io.StringIO()) as output:
+            self.enemy.apply_status_effect("poison", 1, potency=3)
+            self.enemy.update_status_effects()
+            self.player.use_item("Health Potion", self.player)
+        self.assertEqual(output.getvalue().splitlines(), [
+            "Goblin is now affected by poison.",
+            "Goblin takes 3 damage.",
+            "Goblin takes 3 damage from poison.",
+            "Goblin is no longer poison.",
+            "Using Health Potion on Aeron.",
+            "Aeron restored 20 HP.",
+            "Used the last Health Potion.",
+        ])
+        self.assertEqual([event.kind for event in events.bus][-3:],
+                         [events.ITEM_USED, events.HEAL, events.ITEM_CONSUMED])
+
+    def test_silent_bus_still_records(self):
+        """With echo off nothing is printed, but every event is kept."""
+        with patch.object(events.bus, 'echo', False), redirect_stdout(io.StringIO()) as output:
+            self.enemy.take_damage(15)
+        self.assertEqual(output.getvalue(), "")
+        self.assertEqual(events.bus.recent(1), [events.Event(events.DAMAGE, target="Goblin", amount=15)])
+
+    def test_game_follows_events(self):
+        """`Game.follow_events` mirrors event text into the message log."""
+        game_engine = game.Game()
+        game_engine.follow_events(kinds=[events.DAMAGE])
+        try:
+            with patch.object(events.bus, 'echo', False):
+                self.enemy.take_damage(15)
+                self.player.gain_experience(5)
+        finally:
+            game_engine.unfollow_events()
+        self.enemy.take_damage(1)
+        self.assertEqual(game_engine.message_log, ["Goblin takes 15 damage."])
+
+
+if __name__ == '__main__':
+    unittest.main()
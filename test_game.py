@@ -51,7 +51,7 @@ class TestCharacterAndPlayer(unittest.TestCase):
         self.player.equip_item(sword.name)
         self.assertIs(self.player.equipment.slots['weapon'], sword)
 
-    @patch('random.uniform', return_value=20) # Ensures a hit
+    @patch('rng.RandomStream.uniform', return_value=20) # Ensures a hit
     def test_player_attack_regular_hit(self, mock_uniform):
         """Test a player's regular attack on an enemy."""
         sword = Weapon(name="Test Sword", description="A sword.", damage=10)
@@ -62,7 +62,7 @@ class TestCharacterAndPlayer(unittest.TestCase):
         # Damage = weapon_damage + strength_bonus (10 // 2 = 5)
         self.assertEqual(self.enemy.health, initial_enemy_health - 15)
 
-    @patch('random.uniform', return_value=5) # Ensures a critical hit (miss < 5 < crit)
+    @patch('rng.RandomStream.uniform', return_value=5) # Ensures a critical hit (miss < 5 < crit)
     def test_player_attack_critical_hit(self, mock_uniform):
         """Test a player's critical hit attack on an enemy."""
         sword = Weapon(name="Test Sword", description="A sword.", damage=10)
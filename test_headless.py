@@ -0,0 +1,140 @@
+"""Unit tests for headless simulation of both engines."""
+
+import contextlib
+import io
+import os
+import unittest
+from unittest.mock import patch
+
+import database
+import ecs
+import game
+import headless
+import pathfinding
+import rpg
+
+
+class TestHeadless(unittest.TestCase):
+    """Tests for `headless.run_headless`."""
+
+    def setUp(self):
+        """Creates a fresh content database and the two stock scenes."""
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+        database.init_db()
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.battle = game.AethelgardBattle(game.Scene("Aethelgard Battle"), game.Game())
+            self.cave = rpg.TrollCaveScene(rpg.Game())
+            self.cave.load_scene(rpg.Scene("Troll Cave"))
+
+    def tearDown(self):
+        """Closes pooled connections and removes the database."""
+        self.cave.game.db_conn.close()
+        database.close_pools()
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+
+    def run_silently(self, scene_manager, **kwargs):
+        """Runs headless, failing on terminal input, and returns the report and output."""
+        output = io.StringIO()
+        with patch('builtins.input', side_effect=AssertionError("read from the terminal")), \
+                contextlib.redirect_stdout(output):
+            report = headless.run_headless(scene_manager, **kwargs)
+        return report, output.getvalue()
+
+    def test_script_drives_the_game(self):
+        """Scripted commands are played without reading input or printing."""
+        report, output = self.run_silently(self.battle, script=["equip Aethelgard Plate", "status", "move d"])
+        self.assertEqual(output, "")
+        self.assertEqual((report.turns, report.commands, report.game_over), (2, 3, False))
+        self.assertEqual(self.battle.scene.player_character.x, 6)
+        self.assertIsNone(self.battle.game.command_source)
+        self.assertFalse(self.battle.game.headless)
+
+    def test_policy_plays_both_engines_to_the_end(self):
+        """`attack_nearest` wins both stock fights and reports a turn rate."""
+        for scene_manager in (self.battle, self.cave):
+            report, output = self.run_silently(scene_manager, policy=headless.attack_nearest, max_turns=500)
+            self.assertEqual(output, "")
+            self.assertTrue(report.game_over)
+            self.assertGreater(report.turns, 1)
+            self.assertGreater(report.turns_per_second, 0)
+
+    def test_turn_limit(self):
+        """The run stops once `max_turns` turns have been played."""
+        report, _ = self.run_silently(self.cave, script=["move up", "move down"] * 50, max_turns=7)
+        self.assertEqual(report.turns, 7)
+        self.assertFalse(report.game_over)
+
+    def test_loading_keeps_the_session(self):
+        """A game loaded mid-run keeps reading from the script, and saves hold no session."""
+        report, _ = self.run_silently(self.battle, script=["move d", "save headless", "move d", "load headless",
+                                                           "move s"])
+        self.assertEqual(report.commands, 5)
+        self.assertEqual((self.battle.scene.player_character.x, self.battle.scene.player_character.y), (6, 6))
+        loaded = database.load_game("headless")
+        self.assertNotIn('command_source', loaded.game.__dict__)
+        self.assertNotIn('turn_count', loaded.game.__dict__)
+
+    def test_requires_exactly_one_command_stream(self):
+        """Passing both or neither of `script` and `policy` is an error."""
+        with self.assertRaises(ValueError):
+            headless.run_headless(self.battle)
+        with self.assertRaises(ValueError):
+            headless.run_headless(self.battle, script=[], policy=headless.attack_nearest)
+
+
+
+class TestHorde(unittest.TestCase):
+    """Tests for hordes kept in an `ecs.World`."""
+
+    def setUp(self):
+        """Builds a scene split by a wall with one gap, the player on the right."""
+        self.scene = game.Scene("Horde", 20, 9)
+        self.player = game.Player(name="Aeron", x=15, y=4)
+        self.scene.set_player(self.player)
+        for y in range(9):
+            if y != 7:
+                self.scene.add_object(game.Item("Wall", '#', 10, y))
+
+    def test_spawn_horde_avoids_terrain(self):
+        """Enemies are spawned on open tiles only, as world rows."""
+        objects = len(self.scene.game_objects)
+        world = headless.spawn_horde(self.scene, 50)
+        grid = pathfinding.terrain(self.scene, game.Enemy.blocks_path).grid
+        self.assertEqual(len(world), 50)
+        self.assertEqual(world.entity(0).name, "Goblin 1")
+        self.assertFalse(any(grid.blocked(int(x), int(y)) for _, x, y in world.rows("x", "y")))
+        self.assertEqual(len(self.scene.game_objects), objects)
+
+    def test_step_horde_goes_around_walls(self):
+        """Enemies behind the wall take the gap, as `Enemy.step_towards` would."""
+        world = ecs.World()
+        goblin = world.spawn(name="Goblin", x=2, y=4)
+        enemy = game.Enemy(name="Goblin", x=2, y=4)
+        while headless.step_horde(world, self.scene, self.player) == 0:
+            enemy.move(*enemy.step_towards(self.player, self.scene))
+            self.assertEqual((goblin.x, goblin.y), (enemy.x, enemy.y))
+        self.assertLess(goblin.distance_to(self.player), 1.5)
+
+    def test_run_horde_ends_when_the_player_falls(self):
+        """Enemies in reach hit the player each turn, and status effects advance."""
+        world = ecs.World()
+        for y in (3, 5):
+            world.spawn(name="Goblin", x=15, y=y)
+        far = world.spawn(name="Troll", x=0, y=0)
+        far.status_effects.add('slow', 2)
+        report = headless.run_horde(self.scene, world, attack_damage=25)
+        self.assertTrue(report.game_over)
+        self.assertEqual(report.turns, 2)
+        self.assertLessEqual(self.player.health, 0)
+        self.assertNotIn('slow', far.status_effects)
+
+    def test_run_horde_stops_at_the_turn_limit(self):
+        """A horde that never reaches the player runs for `max_turns` turns."""
+        report = headless.run_horde(self.scene, ecs.World(), max_turns=3)
+        self.assertEqual((report.turns, report.commands, report.game_over), (3, 0, False))
+
+
+if __name__ == '__main__':
+    unittest.main()
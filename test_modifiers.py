@@ -0,0 +1,115 @@
+"""Unit tests for the cached stat-modifier pipeline."""
+
+import unittest
+from unittest.mock import patch
+
+import database
+import effects
+import game
+import modifiers
+import snapshot
+
+
+class Ring(game.Item):
+    """An item for a slot `Equipment` does not start with."""
+
+    slot = "ring"
+
+    def stat_bonuses(self):
+        return {"damage": 3, "defense": 1}
+
+
+class TestStats(unittest.TestCase):
+    """Tests for `GameObject.stats` and its invalidation."""
+
+    def setUp(self):
+        """Silences combat events and creates a player."""
+        echo = patch.object(game.events.bus, 'echo', False)
+        echo.start()
+        self.addCleanup(echo.stop)
+        self.player = game.Player(name="Aeron")
+
+    def test_base_and_equipment_stats(self):
+        """Stats combine strength, dexterity and every equipped item."""
+        self.player.strength, self.player.dexterity = 12, 8
+        self.assertEqual(self.player.stats['damage'], 6)
+        self.assertEqual(self.player.stats['miss_chance'], 3)
+        self.assertEqual(self.player.stats['crit_chance'], 9)
+        with patch('builtins.print'):
+            self.player.equipment.equip(game.Weapon("Sword", "Sharp", 8))
+            self.player.equipment.equip(game.Armor("Mail", "Heavy", 4))
+            self.player.equipment.equip(Ring("Ring"))
+        self.assertEqual(self.player.stats['damage'], 6 + 8 + 3)
+        self.assertEqual(self.player.stats['defense'], 4 + 1)
+        self.assertIn("ring", self.player.equipment.slots)
+        self.assertEqual(self.player.equipment.unequip("weapon").name, "Sword")
+        self.assertEqual(self.player.stats['damage'], 6 + 3)
+
+    def test_stats_are_cached_until_an_input_changes(self):
+        """The pipeline runs once per object and change, not once per hit or swing."""
+        enemy = game.Enemy(name="Goblin", health=10 ** 6)
+        with patch.object(modifiers, 'compute', wraps=modifiers.compute) as compute:
+            for _ in range(10):
+                self.player.attack(enemy)
+                self.player.take_damage(1)
+            self.assertEqual(compute.call_count, 2)
+            self.player.experience = 1000
+            self.player.check_level_up()
+            self.player.stats
+            self.assertEqual(compute.call_count, 3)
+            self.player.status_effects.add('slow', 3)
+            self.player.stats
+            self.assertEqual(compute.call_count, 3)
+
+    def test_effects_modify_stats_while_active(self):
+        """armor_break, vulnerable and empowered apply until they expire."""
+        self.player.defense = 5
+        self.player.take_damage(10)
+        self.assertEqual(self.player.health, 95)
+        self.player.status_effects.add('armor_break', 1)
+        self.player.status_effects.add('vulnerable', 1, multiplier=2)
+        self.player.take_damage(10)
+        self.assertEqual(self.player.health, 75)
+        base = self.player.stats['damage']
+        self.player.status_effects.add('empowered', 1, power=4)
+        self.assertEqual(self.player.stats['damage'], base + 4)
+        self.player.update_status_effects()
+        self.assertEqual(self.player.stats['defense'], 5)
+        self.assertEqual(self.player.stats['damage'], base)
+        self.assertEqual(self.player.stats['damage_taken'], 1)
+
+    def test_vulnerable_doubles_damage_by_default(self):
+        """Reverie's double damage debuff applies 'vulnerable' with no multiplier."""
+        self.player.status_effects.add('vulnerable', 1)
+        self.assertEqual(self.player.stats['damage_taken'], 2)
+        self.player.take_damage(10)
+        self.assertEqual(self.player.health, 80)
+
+    def test_custom_stages_and_modifiers(self):
+        """New stages and effect modifiers join the pipeline."""
+        def focus(stats, record):
+            stats['crit_chance'] += record['bonus']
+
+        def blessed(owner, stats):
+            stats['defense'] += 2
+
+        effects.register('focus', modifier=focus)
+        self.addCleanup(effects._registry.pop, 'focus')
+        modifiers.register_stage(blessed, before=modifiers.effect_stage)
+        self.addCleanup(modifiers.STAGES.remove, blessed)
+        self.player.status_effects.add('focus', 2, bonus=10)
+        self.assertEqual(self.player.stats['crit_chance'], 5 + self.player.dexterity / 2 + 10)
+        self.assertEqual(self.player.stats['defense'], 2)
+
+    def test_cached_stats_are_not_saved(self):
+        """Saves leave out the cache; restored objects recompute it."""
+        self.player.status_effects.add('empowered', 3)
+        damage = self.player.stats['damage']
+        data = snapshot.encode_snapshot(self.player, database._is_snapshottable)
+        self.assertNotIn('_stats', self.player.__getstate__())
+        restored = snapshot.decode_snapshot(data, database._resolve_class)
+        self.assertEqual(restored.stats['damage'], damage)
+
+
+if __name__ == '__main__':
+    unittest.main()
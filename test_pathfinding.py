@@ -0,0 +1,350 @@
+"""Unit tests for grid pathfinding and the enemies that use it."""
+
+import collections
+import contextlib
+import gc
+import io
+import random
+import unittest
+import weakref
+
+import architecture
+import game
+import pathfinding
+
+
+def shortest_length(grid, start, goal):
+    """Returns the length of a shortest path by breadth-first search, or None."""
+    if grid.blocked(*goal):
+        return None
+    lengths = {start: 0}
+    queue = collections.deque([start])
+    while queue:
+        x, y = queue.popleft()
+        if (x, y) == goal:
+            return lengths[goal]
+        for step in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if step not in lengths and not grid.blocked(*step):
+                lengths[step] = lengths[(x, y)] + 1
+                queue.append(step)
+    return None
+
+
+def wall(grid, x, gap):
+    """Blocks column `x` of a grid except for the tile at row `gap`."""
+    for y in range(grid.height):
+        if y != gap:
+            grid.set_blocked(x, y)
+
+
+class TestPathfinder(unittest.TestCase):
+    """Tests for `pathfinding.Grid` and `pathfinding.Pathfinder`."""
+
+    def assertWalkable(self, grid, start, path, goal):
+        """Checks that a path steps one free tile at a time from start to goal."""
+        previous = start
+        for tile in path:
+            self.assertEqual(abs(tile[0] - previous[0]) + abs(tile[1] - previous[1]), 1)
+            self.assertFalse(grid.blocked(*tile))
+            previous = tile
+        self.assertEqual(previous, goal)
+
+    def test_paths_go_around_walls(self):
+        """Both searches thread the gap in a wall by a shortest route."""
+        grid = pathfinding.Grid(10, 10)
+        wall(grid, 5, gap=8)
+        for jump in (True, False):
+            path = pathfinding.find_path(grid, (0, 0), (9, 0), jump=jump)
+            self.assertEqual(len(path), 9 + 2 * 8)
+            self.assertWalkable(grid, (0, 0), path, (9, 0))
+            self.assertIn((5, 8), path)
+
+    def test_jump_point_search_matches_breadth_first_search(self):
+        """On random grids, both searches find shortest paths, or report there are none."""
+        rolls = random.Random(7)
+        finder = pathfinding.Pathfinder()
+        for _ in range(300):
+            width, height = rolls.randint(1, 12), rolls.randint(1, 12)
+            grid = pathfinding.Grid(width, height, origin=(rolls.randint(-3, 3), rolls.randint(-3, 3)))
+            density = rolls.random() / 2
+            tiles = [(grid.origin[0] + x, grid.origin[1] + y) for y in range(height) for x in range(width)]
+            for tile in tiles:
+                if rolls.random() < density:
+                    grid.set_blocked(*tile)
+            start, goal = rolls.choice(tiles), rolls.choice(tiles)
+            expected = shortest_length(grid, start, goal)
+            for jump in (True, False):
+                path = finder.find_path(grid, start, goal, jump=jump)
+                if expected is None:
+                    self.assertIsNone(path)
+                else:
+                    self.assertEqual(len(path), expected)
+                    self.assertWalkable(grid, start, path, goal)
+
+    def test_jump_point_search_expands_fewer_tiles(self):
+        """Jump points skip the straight runs plain A* steps through."""
+        grid = pathfinding.Grid(60, 60)
+        for x in range(10, 60, 10):
+            wall(grid, x, gap=(x * 7) % 60)
+        finder = pathfinding.Pathfinder()
+        jps = finder.find_path(grid, (0, 30), (59, 30))
+        jps_expanded = finder.expanded
+        astar = finder.find_path(grid, (0, 30), (59, 30), jump=False)
+        self.assertEqual(len(jps), len(astar))
+        self.assertLess(jps_expanded * 10, finder.expanded)
+
+    def test_unreachable_and_trivial_goals(self):
+        """Walled-off or blocked goals give None; the start itself gives an empty path."""
+        grid = pathfinding.Grid(5, 5)
+        wall(grid, 2, gap=-1)
+        self.assertIsNone(pathfinding.find_path(grid, (0, 0), (4, 4)))
+        self.assertIsNone(pathfinding.find_path(grid, (0, 0), (2, 2)))
+        self.assertIsNone(pathfinding.find_path(grid, (0, 0), (9, 9)))
+        self.assertEqual(pathfinding.find_path(grid, (1, 1), (1, 1)), [])
+        self.assertEqual(pathfinding.find_path(grid, (2, 0), (3, 0)), [(3, 0)])  # Starting on a blocked tile.
+
+    def test_buffers_are_reused_across_grids(self):
+        """One pathfinder serves grids of different sizes without stale marks."""
+        finder = pathfinding.Pathfinder()
+        big = pathfinding.Grid(30, 30)
+        self.assertEqual(len(finder.find_path(big, (0, 0), (29, 29))), 58)
+        small = pathfinding.Grid(4, 4)
+        wall(small, 2, gap=3)
+        self.assertEqual(len(finder.find_path(small, (0, 0), (3, 0))), 3 + 2 * 3)
+        self.assertEqual(len(finder.find_path(big, (29, 29), (0, 0))), 58)
+
+
+
+class TestTerrain(unittest.TestCase):
+    """Tests for `pathfinding.Terrain`."""
+
+    def setUp(self):
+        """Creates a scene with a rock and its terrain."""
+        self.scene = game.Scene("Field", 20, 20)
+        self.rock = game.Item("Rock", '*', 3, 4)
+        self.scene.add_object(self.rock)
+        self.terrain = pathfinding.terrain(self.scene)
+
+    def test_terrain_follows_scene_changes(self):
+        """Tiles are blocked and freed as solid objects come, go, move and change."""
+        grid = self.terrain.grid
+        self.assertTrue(grid.blocked(3, 4))
+        self.rock.x = 5
+        self.assertFalse(grid.blocked(3, 4))
+        self.assertTrue(grid.blocked(5, 4))
+        pebble = game.Item("Pebble", '.', 5, 4)
+        self.scene.add_object(pebble)
+        self.scene.game_objects.remove(self.rock)
+        self.assertTrue(grid.blocked(5, 4))  # The pebble still blocks.
+        pebble.solid = False
+        self.assertFalse(grid.blocked(5, 4))
+        pebble.solid = True
+        self.rock.x = 6  # No longer in the scene.
+        self.assertTrue(grid.blocked(5, 4))
+        self.assertFalse(grid.blocked(6, 4))
+        self.assertIs(pathfinding.terrain(self.scene), self.terrain)
+
+    def test_terrain_is_rebuilt_with_the_scene_list(self):
+        """Replacing `game_objects` starts a new terrain from the new objects."""
+        self.scene.game_objects = [game.Item("Boulder", '*', 1, 1)]
+        grid = pathfinding.terrain(self.scene).grid
+        self.assertTrue(grid.blocked(1, 1))
+        self.assertFalse(grid.blocked(3, 4))
+
+    def test_scenes_are_collected_after_pathing(self):
+        """Terrains and their flow fields do not keep dropped scenes alive."""
+        scenes = []
+        for _ in range(5):
+            scene = game.Scene("Passing", 20, 20)
+            scene.add_object(game.Item("Rock", '*', 3, 4))
+            pathfinding.find_scene_path(scene, (0, 0), (10, 10))
+            pathfinding.terrain(scene).flow_field((10, 10)).next_tile(0, 0)
+            scenes.append(weakref.ref(scene))
+        del scene
+        gc.collect()
+        self.assertEqual([ref() for ref in scenes], [None] * 5)
+
+    def test_scene_paths_route_around_walls(self):
+        """`find_scene_path` walks around a long wall; `clear_between` sees it."""
+        scene = game.Scene("Field", 40, 40)
+        for y in range(0, 38):
+            scene.add_object(game.Item(f"Wall {y}", '#', 20, y))
+        scene.add_object(game.Item("Goal Rock", '*', 22, 2))
+        path = pathfinding.find_scene_path(scene, (18, 2), (22, 2))
+        self.assertEqual(len(path), 4 + 2 * 36)
+        terrain = pathfinding.terrain(scene)
+        self.assertFalse(terrain.clear_between((18, 2), (22, 2)))
+        self.assertTrue(terrain.clear_between((19, 2), (19, 39)))
+        self.assertTrue(terrain.clear_between((20, 37), (21, 38)))  # Corner tiles are not checked.
+
+
+class TestFlowField(unittest.TestCase):
+    """Tests for `pathfinding.FlowField`."""
+
+    def setUp(self):
+        """Creates a scene with a wall that has one gap, and its terrain."""
+        self.scene = game.Scene("Yard", 16, 12)
+        for y in range(12):
+            if y != 9:
+                self.scene.add_object(game.Item(f"Wall {y}", '#', 8, y))
+        self.terrain = pathfinding.terrain(self.scene)
+        self.goal = (12, 2)
+
+    def assertMatchesFreshField(self, field):
+        """Checks every distance and step against a field built from scratch."""
+        grid = self.terrain.grid
+        fresh = pathfinding.FlowField(grid, field.goal)
+        for y in range(grid.height):
+            for x in range(grid.width):
+                self.assertEqual(field.distance(x, y), fresh.distance(x, y), (x, y))
+                self.assertEqual(field.next_tile(x, y), fresh.next_tile(x, y), (x, y))
+                if fresh.distance(x, y) is not None and (x, y) != field.goal:
+                    self.assertEqual(fresh.distance(x, y), shortest_length(grid, (x, y), field.goal))
+
+    def test_steps_follow_shortest_paths(self):
+        """Each step is one tile nearer the goal, through the gap."""
+        field = self.terrain.flow_field(self.goal)
+        tile, steps = (2, 2), 0
+        while tile != self.goal:
+            nearer = field.next_tile(*tile)
+            self.assertEqual(field.distance(*nearer), field.distance(*tile) - 1)
+            tile, steps = nearer, steps + 1
+        self.assertEqual(steps, shortest_length(self.terrain.grid, (2, 2), self.goal))
+        self.assertIsNone(field.next_tile(*self.goal))
+        self.assertEqual(field.next_tile(8, 2), (9, 2))  # Standing on the wall: step off it.
+        self.assertIsNone(field.next_tile(40, 40))
+
+    def test_search_only_runs_as_far_as_asked(self):
+        """Reading a tile near the goal leaves the far side of the wall unsearched."""
+        field = self.terrain.flow_field(self.goal)
+        self.assertEqual(field.distance(12, 4), 2)
+        self.assertLess(field.reached, 30)
+        self.assertIsNone(field.distance(8, 0))  # Blocked.
+
+    def test_terrain_changes_repair_the_field(self):
+        """Blocking and reopening tiles gives the same field as starting over."""
+        field = self.terrain.flow_field(self.goal)
+        field.distance(0, 0)
+        self.scene.add_object(game.Item("Boulder", '*', 8, 9))  # Closes the gap.
+        self.assertIsNone(field.distance(0, 0))
+        self.assertMatchesFreshField(field)
+        self.scene.find_object("Wall 3").x = 3  # Opens a nearer gap.
+        self.assertEqual(field.next_tile(7, 3), (8, 3))
+        self.assertMatchesFreshField(field)
+
+    def test_changes_keep_the_levels_nearer_the_goal(self):
+        """Only tiles at least as far from the goal as the change are searched again."""
+        field = self.terrain.flow_field(self.goal)
+        field.distance(0, 0)
+        near = [(x, y) for y in range(12) for x in range(9, 16) if (field.distance(x, y) or 99) < 4]
+        self.scene.add_object(game.Item("Boulder", '*', 8, 9))
+        self.assertGreaterEqual(field.reached, len(near))
+        self.assertLess(field.reached, 7 * 12)
+
+    def test_terrain_reuses_the_oldest_field(self):
+        """Fields are kept for the last goals and recycled for new ones."""
+        first = self.terrain.flow_field((12, 2))
+        self.assertIs(self.terrain.flow_field((12, 2)), first)
+        second = self.terrain.flow_field((13, 2))
+        third = self.terrain.flow_field((14, 2))
+        self.assertIs(third, first)
+        self.assertEqual(third.goal, (14, 2))
+        self.assertIs(self.terrain.flow_field((13, 2)), second)
+
+    def test_enemies_chasing_the_player_share_a_field(self):
+        """A horde reads its steps from one field, searched once."""
+        player = game.Player(name="Aeron", x=12, y=2)
+        self.scene.set_player(player)
+        enemies = [game.Enemy(name=f"Goblin {y}", x=2, y=y) for y in range(0, 12, 2)]
+        for enemy in enemies:
+            self.scene.add_object(enemy)
+        steps = [enemy.step_towards(player, self.scene) for enemy in enemies]
+        field = pathfinding.terrain(self.scene, game.Enemy.blocks_path).flow_field((12, 2))
+        reached = field.reached
+        self.assertEqual([enemy.step_towards(player, self.scene) for enemy in enemies], steps)
+        self.assertEqual(field.reached, reached)
+        for enemy, (dx, dy) in zip(enemies, steps):
+            self.assertEqual(field.distance(enemy.x + dx, enemy.y + dy), field.distance(enemy.x, enemy.y) - 1)
+
+
+class TestEnemyPathing(unittest.TestCase):
+    """Enemies and the navigation system walk around terrain."""
+
+    def setUp(self):
+        """Creates a scene where a wall with one gap stands between an enemy and the player."""
+        self.scene = game.Scene("Ruins", 20, 12)
+        self.manager = game.SceneManager(self.scene, game.Game(), setup_scene=False)
+        self.player = game.Player(name="Aeron", x=14, y=2)
+        self.player.health = 1000
+        self.scene.set_player(self.player)
+        for y in range(12):
+            if y != 9:
+                self.scene.add_object(game.Item(f"Wall {y}", '#', 10, y))
+        self.enemy = game.Enemy(name="Goblin", x=7, y=2)
+        self.enemy.state = 'chasing'
+        self.scene.add_object(self.enemy)
+
+    def test_enemy_walks_through_the_gap(self):
+        """The enemy never steps onto the wall and reaches the player."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(30):
+                self.enemy.update(self.manager)
+                self.assertFalse(self.enemy.x == 10 and self.enemy.y != 9)
+                if self.enemy.state == 'attacking':
+                    break
+        self.assertEqual(self.enemy.state, 'attacking')
+        self.assertLess(self.enemy.distance_to(self.player), 1.5)
+
+    def test_enemy_with_no_way_through_stays_put(self):
+        """Closing the gap leaves the enemy where it is."""
+        self.scene.add_object(game.Item("Boulder", '*', 10, 9))
+        self.enemy.update(self.manager)
+        self.assertEqual((self.enemy.x, self.enemy.y), (7, 2))
+        self.assertEqual(game.Enemy.plan_turns([self.enemy], self.player, self.scene), [(None, 0, 0, False)])
+
+    def test_other_enemies_do_not_block(self):
+        """Enemies path through each other's tiles, as they always shared them."""
+        step = self.enemy.step_towards(self.player, self.scene)
+        self.scene.add_object(game.Enemy(name="Guard", x=10, y=9))
+        self.assertEqual(self.enemy.step_towards(self.player, self.scene), step)
+        self.assertNotEqual(step, (0, 0))
+
+    def test_batched_turns_match_updates_around_terrain(self):
+        """`SceneManager.update_objects` follows the same paths as `update`."""
+        def build():
+            manager = game.SceneManager(game.Scene("Maze", 40, 40), game.Game(), setup_scene=False)
+            rolls = random.Random(11)
+            manager.scene.set_player(game.Player(name="Aeron", x=20, y=20))
+            manager.scene.player_character.health = 5000
+            for i in range(150):
+                manager.scene.add_object(game.Item(f"Rock {i}", '*', rolls.randrange(40), rolls.randrange(40)))
+            for i in range(40):
+                enemy = game.Enemy(name=f"Goblin {i}", x=rolls.randrange(40), y=rolls.randrange(40))
+                enemy.state = 'chasing'
+                manager.scene.add_object(enemy)
+            return manager
+
+        expected, actual = build(), build()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(8):
+                for obj in list(expected.scene.game_objects):
+                    obj.update(expected)
+                actual.update_objects()
+        positions = [(obj.name, obj.x, obj.y, obj.state) for obj in expected.scene.get_objects_of_type(game.Enemy)]
+        self.assertEqual([(obj.name, obj.x, obj.y, obj.state) for obj in actual.scene.get_objects_of_type(game.Enemy)],
+                         positions)
+        self.assertGreater(sum(state == 'attacking' for *_, state in positions), 0)
+
+    def test_navigation_system_finds_scene_paths(self):
+        """`MapNavigationSystem.find_path` returns the tiles of a real path."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            navigation = architecture.MapNavigationSystem(self.scene)
+            path = navigation.find_path((7, 2), (14, 2))
+            self.assertIsNone(architecture.MapNavigationSystem().find_path((7, 2), (14, 2)))
+        self.assertEqual(path[-1], (14, 2))
+        self.assertEqual(len(path), 7 + 2 * 7)
+        self.assertIn((10, 9), path)
+
+
+if __name__ == '__main__':
+    unittest.main()
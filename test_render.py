@@ -0,0 +1,152 @@
+"""Unit tests for the diff-based terminal renderer."""
+
+import contextlib
+import io
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import events
+import game
+import render
+import rpg
+
+
+def token(symbol, x, y):
+    """Returns a minimal drawable object."""
+    return SimpleNamespace(symbol=symbol, x=x, y=y)
+
+
+class TestTerminalRenderer(unittest.TestCase):
+    """Tests for `render.TerminalRenderer` and `render.paint`."""
+
+    def setUp(self):
+        """Creates a renderer writing to a buffer."""
+        self.stream = io.StringIO()
+        self.renderer = render.TerminalRenderer(self.stream)
+
+    def test_paint_draws_top_objects_last(self):
+        """Top objects cover others on the same cell; off-map objects are skipped."""
+        grid = render.paint(3, 2, [token('*', 1, 0), token('#', 1, 0), token('!', 5, 5)], [token('@', 0, 1)])
+        self.assertEqual(grid, [['.', '#', '.'], ['@', '.', '.']])
+        grid = render.paint(3, 2, [token('*', 1, 0)], [token('@', 1, 0)])
+        self.assertEqual(grid[0][1], '@')
+
+    def test_first_frame_is_drawn_in_full(self):
+        """The first frame clears the screen and draws every line."""
+        text = self.renderer.render(["Title"], [['.', '@'], ['.', '.']], ["HP 10"])
+        self.assertEqual(text, render.CLEAR_SCREEN + "Title\n. @\n. .\nHP 10\n")
+        self.assertEqual(self.stream.getvalue(), text)
+
+    def test_later_frames_only_write_changes(self):
+        """Only changed cells and lines are rewritten, at their positions."""
+        self.renderer.render(["Title"], [['.', '@', '.'], ['.', '.', '.']], ["HP 10", "- hit"])
+        text = self.renderer.render(["Title"], [['.', '.', '@'], ['.', '.', '.']], ["HP 9"])
+        self.assertEqual(text, render.move_to(1, 2) + ". @"  # A run of two cells, one cursor move.
+                         + render.move_to(3, 0) + "HP 9" + render.CLEAR_LINE
+                         + render.move_to(4, 0) + render.CLEAR_BELOW)
+        unchanged = self.renderer.render(["Title"], [['.', '.', '@'], ['.', '.', '.']], ["HP 9"])
+        self.assertEqual(unchanged, render.move_to(4, 0) + render.CLEAR_BELOW)
+        self.assertEqual(self.renderer.full_redraws, 1)
+
+    def test_layout_changes_and_invalidate_redraw_in_full(self):
+        """A different layout, or an invalidated frame, is drawn in full."""
+        self.renderer.render(["Title"], [['.']], [])
+        self.renderer.render(["Title", "Conversation"], [], [])
+        self.renderer.invalidate()
+        self.renderer.render(["Title", "Conversation"], [], [])
+        self.assertEqual(self.renderer.full_redraws, 3)
+
+    def test_output_that_scrolls_the_frame_redraws_in_full(self):
+        """Rows written below a frame are counted, wrapped lines included."""
+        self.renderer.size = (20, 10)
+        frame = (["Title"], [['.', '@'], ['.', '.']], ["HP 10"])
+        self.renderer.render(*frame)
+        self.renderer.note_output("You hit the troll.\n> ")
+        self.renderer.note_output("attack\n")
+        self.renderer.render(*frame)
+        self.assertEqual(self.renderer.full_redraws, 1)
+        self.renderer.note_output("x" * 45 + "\n\n")  # Three rows, then an empty one.
+        self.renderer.note_output("\n" * 2)
+        self.renderer.render(*frame)
+        self.assertEqual(self.renderer.full_redraws, 2)
+
+
+class TestCamera(unittest.TestCase):
+    """Tests for `render.Camera`."""
+
+    def test_follow_centers_and_clamps(self):
+        """The viewport centers on its target but stays inside the world."""
+        camera = render.Camera(10, 4)
+        self.assertEqual((camera.follow(token('@', 500, 300), 1000, 1000).x, camera.y), (495, 298))
+        self.assertEqual((camera.follow(token('@', 2, 1), 1000, 1000).x, camera.y), (0, 0))
+        self.assertEqual((camera.follow(token('@', 999, 999), 1000, 1000).x, camera.y), (990, 996))
+        self.assertEqual((camera.follow(token('@', 3, 3), 5, 2).x, camera.y), (0, 0))
+
+    def test_paint_only_looks_inside_the_viewport(self):
+        """Only objects inside the viewport are queried and drawn, offset to it."""
+        scene = game.Scene("World", 2000, 2000)
+        scene.set_player(game.Player(name="Aeron", x=1000, y=1000))
+        scene.add_object(game.Item("Rock", '*', 1001, 1000))
+        scene.add_object(game.Item("Far Rock", '*', 10, 10))
+        camera = render.Camera(5, 3).follow(scene.player_character, scene.width, scene.height)
+        self.assertEqual([obj.name for obj in camera.visible(scene)], ["Aeron", "Rock"])
+        self.assertEqual(camera.paint(scene, game.Character)[1], ['.', '.', scene.player_character.symbol, '*', '.'])
+
+
+class TestGameDraw(unittest.TestCase):
+    """Tests that both engines draw through the renderer."""
+
+    def test_game_draw_redraws_moved_player_only(self):
+        """`game.Game.draw` keeps characters on top and only rewrites the cells a move changed."""
+        engine = game.Game(width=5, height=3)
+        engine.renderer = render.TerminalRenderer(io.StringIO())
+        scene = game.Scene("Field", 5, 3)
+        scene.set_player(game.Player(name="Aeron", x=4, y=2))
+        sage = game.Character(name="Sage", x=0, y=0)
+        scene.add_object(sage)
+        scene.add_object(game.Item("Rock", '*', 0, 0))
+        engine.draw(scene)
+        self.assertIn("--- Field ---\nC . . . .\n", engine.renderer.stream.getvalue())
+        sage.x = 1
+        mark = len(engine.renderer.stream.getvalue())
+        engine.draw(scene)
+        text = engine.renderer.stream.getvalue()[mark:]
+        self.assertEqual(engine.renderer.full_redraws, 1)
+        self.assertEqual(text, render.move_to(1, 0) + "* C" + render.move_to(8, 0) + render.CLEAR_BELOW)
+        self.assertEqual(engine.turn_count, 2)
+
+    def test_text_printed_between_frames_redraws_in_full(self):
+        """Prompts, echoed events and prints in a scene loop are counted towards a scroll."""
+        engine = game.Game(width=5, height=3)
+        engine.renderer = render.TerminalRenderer(io.StringIO(), size=(80, 24))
+        scene = game.Scene("Field", 5, 3)
+        scene.set_player(game.Player(name="Aeron", x=4, y=2))
+        with contextlib.redirect_stdout(io.StringIO()) as printed, patch.object(events.bus, 'echo', True), \
+                engine.tracking_output():
+            engine.draw(scene)
+            with patch('builtins.input', return_value="wait"):
+                self.assertEqual(engine.read_input("> "), "wait")
+            engine.draw(scene)
+            self.assertEqual(engine.renderer.full_redraws, 1)
+            for _ in range(8):
+                events.bus.emit(events.DAMAGE, target="Aeron", amount=1)
+            print("Aeron equips the Sword.\n" * 8, end="")
+            engine.draw(scene)
+        self.assertEqual(engine.renderer.full_redraws, 2)
+        self.assertIn("Aeron equips the Sword.", printed.getvalue())
+
+    def test_rpg_draw_uses_the_renderer(self):
+        """`rpg.Game.draw` renders the map and status through the renderer."""
+        engine = rpg.Game(width=4, height=2)
+        engine.renderer = render.TerminalRenderer(io.StringIO())
+        scene = rpg.Scene("Cave", 4, 2)
+        scene.set_player(rpg.Player(name="Reverie", x=2, y=1))
+        engine.draw(scene)
+        self.assertEqual(engine.renderer.frames, 1)
+        self.assertIn("--- Cave ---\n. . . .\n", engine.renderer.stream.getvalue())
+        self.assertNotIn('renderer', engine.__getstate__())
+
+
+if __name__ == '__main__':
+    unittest.main()
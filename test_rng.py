@@ -0,0 +1,95 @@
+"""Unit tests for the seeded, counter-based random streams."""
+
+import pickle
+import unittest
+from unittest.mock import patch
+
+import architecture
+import game
+import rng
+
+
+class TestRandomStream(unittest.TestCase):
+    """Tests for `rng.RandomStream`."""
+
+    def test_streams_are_reproducible_and_independent(self):
+        """A stream depends only on its session seed and name."""
+        first = rng.RandomService(42).stream("loot")
+        second = rng.RandomService(42).stream("loot")
+        other = rng.RandomService(42).stream("weather")
+        values = [first.random() for _ in range(5)]
+        self.assertEqual(values, [second.random() for _ in range(5)])
+        self.assertNotEqual(values, [other.random() for _ in range(5)])
+        self.assertTrue(all(0 <= value < 1 for value in values))
+        self.assertNotEqual(values, [rng.RandomService(43).stream("loot").random() for _ in range(5)])
+
+    def test_bulk_draws_match_single_draws(self):
+        """`randoms`, `uniforms` and `randints` continue the same sequence."""
+        single = rng.RandomStream(7)
+        bulk = rng.RandomStream(7)
+        expected = [single.random() for _ in range(10)]
+        self.assertEqual(bulk.randoms(4) + bulk.randoms(6), expected)
+        self.assertEqual(bulk.counter, 10)
+        self.assertEqual(rng.RandomStream(7).uniforms(3, 10, 20), [10 + 10 * value for value in expected[:3]])
+        dice = rng.RandomStream(7)
+        rolls = dice.randints(1000, 1, 6)
+        self.assertEqual(set(rolls), {1, 2, 3, 4, 5, 6})
+        dice.seek(0)
+        self.assertEqual([dice.randint(1, 6) for _ in range(1000)], rolls)
+
+    def test_seek_and_pickle(self):
+        """A stream can jump to any position and survives pickling."""
+        stream = rng.RandomStream(99)
+        values = stream.randoms(20)
+        stream.seek(15)
+        self.assertEqual(stream.random(), values[15])
+        restored = pickle.loads(pickle.dumps(stream))
+        self.assertEqual(restored.randoms(4), values[16:20])
+        self.assertIn(rng.RandomStream(3).randint(100, 200), range(100, 201))
+        self.assertIn(rng.RandomStream(3).choice("abc"), "abc")
+
+
+class TestSessionStreams(unittest.TestCase):
+    """Tests that the games draw from the session's streams."""
+
+    def tearDown(self):
+        """Starts an unseeded session again."""
+        rng.reset()
+
+    def test_entities_get_their_own_streams(self):
+        """Entities sharing a name get distinct, reproducible streams."""
+        rng.reset(5)
+        first, second = game.Enemy(name="Goblin"), game.Enemy(name="Goblin")
+        rolls = (rng.stream_for(first).random(), rng.stream_for(second).random())
+        self.assertIs(rng.stream_for(first), rng.stream_for(first))
+        self.assertNotEqual(*rolls)
+        rng.reset(5)
+        again = (rng.stream_for(game.Enemy(name="Goblin")).random(), rng.stream_for(game.Enemy(name="Goblin")).random())
+        self.assertEqual(rolls, again)
+
+    def test_attacks_replay_under_the_same_seed(self):
+        """An attacker's rolls do not depend on other entities' rolls."""
+        def fight(extra_rolls):
+            rng.reset(11)
+            player, enemy = game.Player(name="Aeron"), game.Enemy(name="Kane", health=10000)
+            rng.stream_for(game.Player(name="Bystander")).randoms(extra_rolls)
+            with patch.object(game.events.bus, 'echo', False):
+                for _ in range(50):
+                    player.attack(enemy)
+            return enemy.health
+
+        self.assertEqual(fight(0), fight(17))
+
+    def test_combat_ai_uses_its_stream(self):
+        """`AICombatBehavior` picks caster abilities from its stream."""
+        stream = rng.RandomStream(1)
+        with patch('builtins.print'):
+            behavior = architecture.AICombatBehavior(movement_system=None, random_stream=stream)
+            choices = [behavior.determine_action({"type": "caster", "abilities": ["fireball", "frost"]}, {}, {})
+                       for _ in range(20)]
+        self.assertEqual(stream.counter, 20)
+        self.assertEqual(set(choices), {"fireball", "frost"})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+"""Unit tests for saving and loading games through binary snapshots."""
+
+import json
+import os
+import threading
+import unittest
+from unittest.mock import patch
+
+import database
+import game
+import rpg
+import snapshot
+
+
+class TestSaveLoad(unittest.TestCase):
+    """Tests for `database.save_game`/`load_game` and the snapshot format."""
+
+    def setUp(self):
+        """Creates a fresh database and a set-up Aethelgard battle."""
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+        database.init_db()
+        self.game = game.Game()
+        self.scene = game.Scene("Aethelgard Battle")
+        self.scene_manager = game.AethelgardBattle(self.scene, self.game)
+        self.player = self.scene.player_character
+        self.kane = next(obj for obj in self.scene.game_objects if obj.name == "Kane")
+
+    def tearDown(self):
+        """Closes pooled connections and removes the database."""
+        database.close_pools()
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+
+    def test_round_trip_restores_scene(self):
+        """Equipment, inventory, status effects and dialogue survive a save."""
+        self.player.equip_item("Valiant Sword")
+        self.player.move(1, 0)
+        self.kane.apply_status_effect('poison', 3, potency=2)
+        dialogue = game.DialogueManager()
+        dialogue.add_node("start", game.DialogueNode("Brother.", "Kane", {"Fight": "end"}))
+        self.game.start_conversation(dialogue)
+
+        database.save_game("slot1", self.scene_manager)
+        loaded = database.load_game("slot1")
+
+        self.assertIsInstance(loaded, game.AethelgardBattle)
+        player = loaded.scene.player_character
+        self.assertIn(player, loaded.scene.game_objects)
+        self.assertEqual((player.x, player.y), (6, 5))
+        self.assertEqual([item.name for item in player.inventory],
+                         ["Valiant Sword", "Aethelgard Plate", "Poison Dart"])
+        self.assertIs(player.equipment.slots["weapon"], player.inventory[0])
+        self.assertIs(player.equipment.owner, player)
+        kane = next(obj for obj in loaded.scene.game_objects if obj.name == "Kane")
+        self.assertEqual(kane.status_effects, {'poison': {'duration': 3, 'potency': 2}})
+        self.assertTrue(loaded.game.in_conversation)
+        self.assertEqual(loaded.game.dialogue_manager.get_current_node().text, "Brother.")
+
+    def test_missing_slot_returns_none(self):
+        """Loading an unknown slot returns None so callers can start a new game."""
+        self.assertIsNone(database.load_game("nothing-here"))
+
+    def test_save_overwrites_slot(self):
+        """Saving to an existing slot replaces the previous snapshot."""
+        database.save_game("slot1", self.scene_manager)
+        self.player.health = 42
+        database.save_game("slot1", self.scene_manager)
+        self.assertEqual(database.load_game("slot1").scene.player_character.health, 42)
+
+    def test_save_and_load_commands(self):
+        """The in-game 'save' and 'load' commands round-trip the scene."""
+        with patch('builtins.input', return_value='save mysave'):
+            self.game.handle_input(self.scene_manager)
+        self.player.health = 1
+        with patch('builtins.input', return_value='load mysave'):
+            self.game.handle_input(self.scene_manager)
+        self.assertEqual(self.scene_manager.scene.player_character.health, 100)
+
+    def test_rpg_game_reopens_connection(self):
+        """An rpg.py save drops the live connection and reopens it on load."""
+        rpg_game = rpg.Game()
+        manager = rpg.TrollCaveScene(rpg_game)
+        manager.load_scene(rpg.Scene("Troll Cave"))
+        database.save_game("rpg", manager)
+        rpg_game.db_conn.close()
+
+        loaded = database.load_game("rpg")
+        self.assertIsInstance(loaded, rpg.TrollCaveScene)
+        self.assertIsInstance(loaded.scene.player_character, rpg.Aeron)
+        self.assertEqual(loaded.game.db_conn.execute("SELECT 1").fetchone()[0], 1)
+        loaded.game.db_conn.close()
+
+    def test_unregistered_class_is_rejected(self):
+        """State that could not be restored on load fails at save time."""
+        self.player.attributes["lock"] = threading.Lock()
+        with self.assertRaises(TypeError):
+            database.save_game("bad", self.scene_manager)
+
+    def test_snapshot_is_smaller_than_json(self):
+        """The binary format beats JSON on size for a crowded scene."""
+        for i in range(200):
+            self.scene.add_object(game.Enemy(name=f"Goblin {i}", x=i % 40, y=i % 10))
+        enemies = [obj for obj in self.scene.game_objects if type(obj) is game.Enemy]
+        as_json = json.dumps([snapshot.get_state(enemy) for enemy in enemies])
+        as_binary = snapshot.encode_snapshot(enemies, database._is_snapshottable)
+        self.assertLess(len(as_binary), len(as_json) // 2)
+
+    def test_invalid_snapshot_is_rejected(self):
+        """Blobs with the wrong magic or a newer version raise ValueError."""
+        data = snapshot.encode_snapshot([1, 2, 3], database._is_snapshottable)
+        self.assertEqual(snapshot.decode_snapshot(data, database._resolve_class), [1, 2, 3])
+        with self.assertRaises(ValueError):
+            snapshot.decode_snapshot(b"JUNK" + data[4:], database._resolve_class)
+        newer = data[:4] + (snapshot.FORMAT_VERSION + 1).to_bytes(2, "big") + data[6:]
+        with self.assertRaises(ValueError):
+            snapshot.decode_snapshot(newer, database._resolve_class)
+
+
+class TestIncrementalSave(unittest.TestCase):
+    """Tests for dirty-tracking and `database.autosave` delta chains."""
+
+    def setUp(self):
+        """Creates a fresh database and a battle crowded with goblins."""
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+        database.init_db()
+        self.game = game.Game()
+        self.scene = game.Scene("Aethelgard Battle")
+        self.scene_manager = game.AethelgardBattle(self.scene, self.game)
+        for i in range(50):
+            self.scene.add_object(game.Enemy(name=f"Goblin {i}", x=i % 40, y=9))
+        self.player = self.scene.player_character
+        self.saver = database.AutoSaver("auto", compact_every=100)
+
+    def tearDown(self):
+        """Closes pooled connections and removes the database."""
+        database.close_pools()
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+
+    def test_dirty_tracking(self):
+        """Moves, damage, healing and status effect writes mark objects dirty."""
+        goblin = game.Enemy(name="Goblin")
+        for change in (lambda: goblin.move(1, 0),
+                       lambda: goblin.take_damage(5),
+                       lambda: self.player.heal(5),
+                       lambda: goblin.apply_status_effect('poison', 2),
+                       lambda: goblin.status_effects.__setitem__('sleep', {'duration': 1}),
+                       lambda: goblin.update_status_effects()):
+            goblin.mark_clean()
+            self.player.mark_clean()
+            change()
+            self.assertTrue(goblin.dirty or self.player.dirty)
+
+    def test_delta_only_writes_changed_objects(self):
+        """After the base, a turn that touches one object writes one object."""
+        base = self.saver.save(self.scene_manager)
+        self.assertEqual(base["kind"], "base")
+        self.assertEqual(base["objects"], len(self.scene.game_objects))
+
+        self.player.move(1, 0)
+        delta = self.saver.save(self.scene_manager)
+        self.assertEqual(delta["kind"], "delta")
+        self.assertEqual(delta["objects"], 1)
+        self.assertLess(delta["bytes"] * 10, base["bytes"])
+
+    def test_chain_restores_latest_state(self):
+        """Loading a slot replays the base and every delta in order."""
+        self.saver.save(self.scene_manager)
+        self.player.move(1, 0)
+        kane = next(obj for obj in self.scene.game_objects if obj.name == "Kane")
+        kane.apply_status_effect('poison', 3, potency=4)
+        self.saver.save(self.scene_manager)
+        goblin = self.scene.game_objects[-1]
+        self.scene.game_objects.remove(goblin)
+        self.player.take_damage(30)
+        delta = self.saver.save(self.scene_manager)
+        self.assertEqual(delta["removed"], 1)
+
+        loaded = database.load_game("auto")
+        player = loaded.scene.player_character
+        self.assertEqual((player.x, player.health), (6, 70))
+        self.assertIs(player.equipment.owner, player)
+        self.assertIn(player, loaded.scene.game_objects)
+        self.assertEqual(len(loaded.scene.game_objects), len(self.scene.game_objects))
+        kane = next(obj for obj in loaded.scene.game_objects if obj.name == "Kane")
+        self.assertEqual(kane.status_effects['poison']['potency'], 4)
+        self.assertNotIn("Goblin 49", [obj.name for obj in loaded.scene.game_objects])
+
+    def test_compaction_folds_chain(self):
+        """Compaction leaves a single base row that loads the same state."""
+        self.saver.save(self.scene_manager)
+        for _ in range(3):
+            self.player.move(0, 1)
+            self.saver.save(self.scene_manager)
+        self.assertEqual(database.compact_save("auto"), 4)
+        with database.get_pool().connection() as conn:
+            rows = conn.execute("SELECT is_base FROM SaveGameDeltas WHERE save_name = 'auto'").fetchall()
+        self.assertEqual([row["is_base"] for row in rows], [1])
+        self.assertEqual(database.load_game("auto").scene.player_character.y, 8)
+
+        self.player.move(0, 1)
+        self.saver.save(self.scene_manager)
+        self.assertEqual(database.load_game("auto").scene.player_character.y, 9)
+
+    def test_full_save_replaces_chain(self):
+        """A full save to the same slot supersedes its incremental chain."""
+        self.saver.save(self.scene_manager)
+        self.player.health = 7
+        database.save_game("auto", self.scene_manager)
+        self.assertEqual(database.load_game("auto").scene.player_character.health, 7)
+
+
+if __name__ == '__main__':
+    unittest.main()
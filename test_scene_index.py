@@ -0,0 +1,167 @@
+"""Unit tests for the spatial, name and type indexes maintained by `Scene`."""
+
+import os
+import random
+import unittest
+from unittest.mock import patch
+
+import database
+import game
+import rpg
+import scene_index
+
+
+class TestSpatialHash(unittest.TestCase):
+    """Tests for `scene_index.SpatialHash` queries."""
+
+    def setUp(self):
+        """Scatters objects over a large map and indexes them."""
+        rng = random.Random(7)
+        self.objects = [game.GameObject(name=f"Rock {i}", x=rng.randrange(200), y=rng.randrange(200))
+                        for i in range(500)]
+        self.grid = scene_index.SpatialHash(cell_size=8)
+        for obj in self.objects:
+            self.grid.insert(obj)
+
+    def test_queries_match_brute_force(self):
+        """Point, radius and rectangle queries agree with a linear scan."""
+        for x, y in ((0, 0), (57, 103), (199, 199), (-5, 40)):
+            self.assertEqual(self.grid.at(x, y), [o for o in self.objects if o.x == x and o.y == y])
+            self.assertEqual(self.grid.in_radius(x, y, 12.5),
+                             [o for o in self.objects if (o.x - x) ** 2 + (o.y - y) ** 2 <= 12.5 ** 2])
+            self.assertEqual(self.grid.in_rect(x - 9, y - 3, x + 20, y + 31),
+                             [o for o in self.objects if x - 9 <= o.x <= x + 20 and y - 3 <= o.y <= y + 31])
+        self.assertEqual(len(self.grid.in_rect(-1000, -1000, 1000, 1000)), len(self.objects))
+
+    def test_update_and_remove(self):
+        """Moved objects are found at their new position only."""
+        obj = self.objects[0]
+        obj.x, obj.y = 500, 500
+        self.grid.update(obj)
+        self.assertEqual(self.grid.at(500, 500), [obj])
+        self.grid.remove(obj)
+        self.assertEqual(self.grid.at(500, 500), [])
+        self.assertNotIn(obj, self.grid)
+
+
+class TestSceneIndex(unittest.TestCase):
+    """Tests that `game.Scene` and `rpg.Scene` keep their index in sync."""
+
+    def setUp(self):
+        """Creates a scene with a player, an item and a wall of enemies."""
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+        database.init_db()
+        self.scene = game.Scene("Field", width=100, height=100)
+        self.player = game.Player(name="Aeron", x=5, y=5)
+        self.scene.set_player(self.player)
+        self.sword = game.Weapon("Sword", "A plain blade.", 10)
+        self.sword.x, self.sword.y = 6, 5
+        self.scene.add_object(self.sword)
+        self.enemies = [game.Enemy(name=f"Goblin {i}", x=i, y=20) for i in range(50)]
+        for enemy in self.enemies:
+            self.scene.add_object(enemy)
+
+    def tearDown(self):
+        """Closes pooled connections and removes the database."""
+        database.close_pools()
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+
+    def test_moves_are_tracked(self):
+        """`move` and direct coordinate writes both update the index."""
+        self.assertIs(self.scene.get_object_at(3, 20), self.enemies[3])
+        self.enemies[3].move(0, 10)
+        self.assertIsNone(self.scene.get_object_at(3, 20))
+        self.assertIs(self.scene.get_object_at(3, 30), self.enemies[3])
+        self.player.x = 60
+        self.assertIs(self.scene.get_object_at(60, 5), self.player)
+
+    def test_pickup_and_drop_are_tracked(self):
+        """Picked-up items leave the index and dropped ones rejoin it."""
+        self.assertIs(self.scene.get_object_at(6, 5), self.sword)
+        self.player.pickup_item(self.sword, self.scene)
+        self.assertIsNone(self.scene.get_object_at(6, 5))
+        self.sword.x = 7  # Moving an item that is no longer in the scene is ignored.
+        self.player.drop_item("Sword", self.scene)
+        self.assertIs(self.scene.get_object_at(5, 5), self.player)
+        self.assertEqual(self.scene.get_objects_at(5, 5), [self.player, self.sword])
+
+    def test_radius_and_rect_queries(self):
+        """Area queries return objects in scene order."""
+        self.assertEqual(self.scene.get_objects_in_radius(5, 5, 1), [self.player, self.sword])
+        self.assertEqual(self.scene.get_objects_in_rect(10, 0, 12, 99), self.enemies[10:13])
+
+    def test_replacing_the_list_reindexes(self):
+        """Assigning a new `game_objects` list keeps queries correct."""
+        self.scene.get_object_at(0, 0)
+        self.scene.game_objects = [obj for obj in self.scene.game_objects if obj.x % 2 == 0]
+        self.assertIsNone(self.scene.get_object_at(1, 20))
+        self.assertIs(self.scene.get_object_at(2, 20), self.enemies[2])
+        self.enemies[2].move(0, 1)
+        self.assertIs(self.scene.get_object_at(2, 21), self.enemies[2])
+
+    def test_index_survives_save_and_load(self):
+        """A loaded scene rebuilds its index from the restored objects."""
+        manager = game.SceneManager(self.scene, game.Game(), setup_scene=False)
+        self.scene.get_object_at(0, 0)
+        database.save_game("index", manager)
+        loaded = database.load_game("index").scene
+        enemy = loaded.get_object_at(4, 20)
+        self.assertEqual(enemy.name, "Goblin 4")
+        enemy.move(1, 1)
+        self.assertIs(loaded.get_object_at(5, 21), enemy)
+
+    def test_name_and_type_lookups(self):
+        """Name, class and alive queries agree with a scan and track changes."""
+        self.assertIs(self.scene.find_object("goblin 7"), self.enemies[7])
+        self.assertIs(self.scene.find_object("SWORD", game.Item), self.sword)
+        self.assertIsNone(self.scene.find_object("Sword", game.Enemy))
+        self.assertEqual(self.scene.get_objects_of_type(game.GameObject), self.scene.game_objects)
+        self.assertEqual(self.scene.get_objects_of_type(game.Item), [self.sword])
+        self.enemies[7].name = "Boss"
+        self.assertIsNone(self.scene.find_object("Goblin 7"))
+        self.assertIs(self.scene.find_object("boss", game.Enemy), self.enemies[7])
+        self.enemies[3].take_damage(10000)
+        self.assertIsNone(self.scene.find_object("Goblin 3", game.Enemy, alive=True))
+        alive = self.scene.get_objects_of_type(game.Enemy, alive=True)
+        self.assertEqual(alive, [obj for obj in self.scene.game_objects
+                                 if isinstance(obj, game.Enemy) and obj.health > 0])
+        self.enemies[3].health = 1  # Revived objects rejoin in scene order.
+        self.assertEqual(self.scene.get_objects_of_type(game.Enemy, alive=True), self.enemies)
+        self.scene.game_objects.remove(self.enemies[0])
+        self.assertIsNone(self.scene.find_object("Goblin 0"))
+        self.assertNotIn(self.enemies[0], self.scene.get_objects_of_type(game.Enemy, alive=True))
+
+    def test_commands_use_the_indexes(self):
+        """`attack` and `status` resolve targets through the scene's indexes."""
+        manager = game.SceneManager(self.scene, game.Game(), setup_scene=False)
+        self.enemies[12].health = 0
+        with patch('builtins.input', side_effect=["attack goblin 13", "attack goblin 12", "status"]), \
+                patch.object(self.player, 'attack') as attack:
+            manager.game.handle_input(manager)
+            manager.game.handle_input(manager)
+            self.assertEqual(manager.game.message_log[-1], "There is no one to attack named 'goblin 12'.")
+            manager.game.handle_input(manager)
+        attack.assert_called_once_with(self.enemies[13])
+        self.assertEqual(manager.game.message_log[-1], f"Goblin 49 - HP: {self.enemies[49].health}")
+
+    def test_rpg_scene_is_indexed(self):
+        """`rpg.Scene` keeps the same index, including list replacement."""
+        scene = rpg.Scene("Cave")
+        troll = rpg.Enemy("Troll", x=3, y=3, health=0)
+        scene.add_object(troll)
+        self.assertIs(scene.get_object_at(3, 3), troll)
+        troll.move(1, 0)
+        self.assertIs(scene.get_object_at(4, 3), troll)
+        self.assertEqual(scene.get_objects_of_type(rpg.Enemy), [troll])
+        self.assertEqual(scene.get_objects_of_type(rpg.Enemy, alive=True), [])
+        troll.health = 5
+        self.assertIs(scene.find_object("troll", rpg.Enemy, alive=True), troll)
+        scene.game_objects = [obj for obj in scene.game_objects if obj.health <= 0]
+        self.assertIsNone(scene.get_object_at(4, 3))
+        self.assertIsNone(scene.find_object("Troll"))
+
+
+if __name__ == '__main__':
+    unittest.main()
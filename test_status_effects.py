@@ -1,6 +1,8 @@
 import unittest
+import unittest.mock
 from unittest.mock import MagicMock
 import os
+import effects
 from game import Player, Enemy, PoisonDart, Game, Scene, AethelgardBattle
 from database import init_db
 
@@ -86,5 +88,46 @@ class TestStatusEffects(unittest.TestCase):
         # Check that the dart was consumed from the player's inventory
         self.assertNotIn(dart, self.player.inventory)
 
+    def test_bare_turn_count_effects_expire(self):
+        """Tests that effects stored as a number of turns become records and expire."""
+        self.enemy.status_effects['sleep'] = 2
+        self.assertEqual(self.enemy.status_effects['sleep'], {'duration': 2})
+        self.enemy.update_status_effects()
+        self.assertEqual(self.enemy.status_effects.remaining('sleep'), 1)
+        self.enemy.update_status_effects()
+        self.assertNotIn('sleep', self.enemy.status_effects)
+
+    def test_stacking_rules(self):
+        """Tests that re-applied effects follow their registered stacking rule."""
+        self.enemy.apply_status_effect('poison', 2, potency=3)
+        self.enemy.apply_status_effect('poison', 5, potency=1)
+        self.assertEqual(self.enemy.status_effects['poison'], {'duration': 5, 'potency': 1})
+        self.enemy.status_effects.add('vulnerable', 2)
+        self.enemy.update_status_effects()
+        self.enemy.status_effects.add('vulnerable', 2)
+        self.assertEqual(self.enemy.status_effects.remaining('vulnerable'), 3)
+        self.assertEqual(self.enemy.status_effects.sync()['vulnerable'], {'duration': 3})
+
+    def test_saved_durations_are_current(self):
+        """Tests that saved records carry the remaining duration of every effect."""
+        self.enemy.status_effects.add('slow', 4)
+        self.enemy.update_status_effects()
+        self.assertEqual(self.enemy.__getstate__()['status_effects']['slow'], {'duration': 3})
+        restored = Enemy(name="Copy")
+        restored.__setstate__(self.enemy.__getstate__())
+        restored.update_status_effects()
+        restored.update_status_effects()
+        self.assertEqual(restored.status_effects.remaining('slow'), 1)
+
+    def test_only_ticking_and_expiring_effects_are_visited(self):
+        """Tests that a turn does not walk lasting effects that neither tick nor expire."""
+        for i in range(100):
+            self.enemy.status_effects.add(f'ward_{i}', 50)
+        self.enemy.apply_status_effect('poison', 2, potency=1)
+        with unittest.mock.patch.object(effects, 'effect_type', wraps=effects.effect_type) as lookup:
+            self.enemy.update_status_effects()
+        self.assertEqual([call.args[0] for call in lookup.call_args_list], ['poison'])
+        self.assertEqual(len(self.enemy.status_effects), 101)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,128 @@
+"""Unit tests for chunked world streaming."""
+
+import os
+import unittest
+from unittest.mock import patch
+
+import architecture
+import database
+import game
+import streaming
+
+
+class TestChunkStreamer(unittest.TestCase):
+    """Tests for `streaming.ChunkStreamer`."""
+
+    def setUp(self):
+        """Creates a fresh database and a 256x256 world with a rock in every 16x16 block."""
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+        database.init_db()
+        self.scene = game.Scene("Overworld", 256, 256)
+        self.player = game.Player(name="Aeron", x=8, y=8)
+        self.scene.set_player(self.player)
+        for y in range(4, 256, 16):
+            for x in range(4, 256, 16):
+                self.scene.add_object(game.Item(f"Rock {x},{y}", '*', x, y))
+
+    def tearDown(self):
+        """Stops the streamer, closes pooled connections and removes the database."""
+        streamer = self.scene.streamer
+        if streamer is not None:
+            streamer.close()
+        database.close_pools()
+        if os.path.exists(database.DB_FILE):
+            os.remove(database.DB_FILE)
+
+    def walk_to(self, x, y):
+        """Moves the player and streams until every requested chunk is in."""
+        self.player.x, self.player.y = x, y
+        self.scene.stream()
+        self.scene.streamer.poll(wait=True)
+
+    def test_distant_chunks_are_evicted_and_streamed_back(self):
+        """Only chunks near the player stay resident; evicted objects come back from the store."""
+        streamer = streaming.ChunkStreamer(self.scene, "overworld", radius=1, max_chunks=9)
+        self.assertEqual(len(streamer.resident), 64)  # Built in memory: every chunk is resident.
+        self.walk_to(8, 8)
+        self.assertEqual(len(streamer.resident), 9)
+        self.assertEqual(len(self.scene.game_objects), 1 + 9 * 4)
+        self.assertEqual(len(database.world_chunks("overworld")), 64 - 9)
+
+        moved = self.scene.find_object("Rock 36,36")
+        moved.x, moved.health = 100, 7  # Wanders into chunk (3, 1), which is not loaded, and is hurt.
+        self.walk_to(200, 200)
+        self.assertIn((3, 1), streamer.resident)  # Loaded to join the stray, evicted on the next turn.
+        self.walk_to(200, 200)
+        self.assertIsNone(self.scene.find_object("Rock 36,36"))
+        self.assertEqual(len(streamer.resident), 9)
+        self.walk_to(100, 40)
+        rock = self.scene.find_object("Rock 36,36")
+        self.assertEqual((rock.x, rock.y, rock.health), (100, 36, 7))
+        self.assertEqual(len(self.scene.get_objects_named("Rock 36,36")), 1)
+        self.assertIs(self.scene.player_character, self.player)
+        self.assertIn(self.player, self.scene.game_objects)
+
+    def test_loads_happen_off_the_game_thread(self):
+        """Stored chunks are read on the streamer's thread and added by a later update."""
+        streaming.ChunkStreamer(self.scene, "overworld", radius=0, max_chunks=1)
+        self.walk_to(8, 8)
+        threads = []
+        load = database.load_world_chunk
+
+        def recording_load(world, chunk):
+            import threading
+            threads.append(threading.current_thread().name)
+            return load(world, chunk)
+
+        with patch.object(database, 'load_world_chunk', recording_load):
+            self.player.x = 40
+            self.scene.stream()
+            self.assertIsNone(self.scene.find_object("Rock 36,4"))
+            self.scene.streamer.poll(wait=True)
+        self.assertIsNotNone(self.scene.find_object("Rock 36,4"))
+        self.assertTrue(threads and all(name.startswith("chunk-streamer") for name in threads))
+
+    def test_close_writes_back_resident_chunks(self):
+        """Closing stores every resident chunk, so a new session streams the same world."""
+        streamer = streaming.ChunkStreamer(self.scene, "overworld", radius=1, max_chunks=9)
+        self.walk_to(8, 8)
+        self.scene.find_object("Rock 4,4").health = 3
+        streamer.close()
+        self.assertIsNone(self.scene.streamer)
+        self.assertEqual(len(database.world_chunks("overworld")), 64)
+
+        scene = game.Scene("Overworld", 256, 256)
+        scene.set_player(game.Player(name="Aeron", x=8, y=8))
+        streaming.ChunkStreamer(scene, "overworld", radius=1, max_chunks=9)
+        self.scene = scene
+        self.player = scene.player_character
+        self.walk_to(8, 8)
+        self.assertEqual(scene.find_object("Rock 4,4").health, 3)
+        self.assertEqual(len(scene.game_objects), 1 + 4 * 4)  # The player's corner and its three neighbours.
+
+    def test_budget_must_cover_the_radius(self):
+        """A budget smaller than the chunks around the player is rejected."""
+        with self.assertRaises(ValueError):
+            streaming.ChunkStreamer(self.scene, "overworld", radius=1, max_chunks=8)
+
+    def test_streamer_is_not_saved(self):
+        """Scenes are saved without their streamer."""
+        streaming.ChunkStreamer(self.scene, "overworld")
+        self.assertNotIn('streamer', self.scene.__getstate__())
+
+    def test_architecture_loads_areas_through_the_streamer(self):
+        """`WorldLoadingStreaming.load_area` requests the chunk from the streamer."""
+        streamer = streaming.ChunkStreamer(self.scene, "overworld", radius=0, max_chunks=1)
+        self.walk_to(8, 8)
+        with patch('builtins.print'):
+            loading = architecture.WorldLoadingStreaming(streamer)
+            self.assertTrue(loading.load_area("2,2"))
+            self.assertFalse(loading.load_area((2, 2)))
+        streamer.poll(wait=True)
+        self.assertIn((2, 2), streamer.resident)
+        self.assertIsNotNone(self.scene.find_object("Rock 68,68"))
+
+
+if __name__ == '__main__':
+    unittest.main()